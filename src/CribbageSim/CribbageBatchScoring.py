@@ -0,0 +1,139 @@
+"""
+Defines functions for scoring many cribbage hands (or cribs) against many starter cards at once, using numpy. The results are the same
+as scoring each hand and starter with CribbageDeal.determine_score_showing_hand(...) or CribbageDeal.determine_score_showing_crib(...),
+but without a Python call per hand, starter, and scoring combination. This is intended for offline analysis, and for crib forming
+logic that averages over all possible starters.
+
+Cards are encoded as ints as defined in CribbageCardCodec.
+
+numpy is an optional dependency of CribbageSim. If it is not installed, this module can still be imported, but calling
+score_batch(...) raises ImportError.
+
+Exported Classes:
+    None
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    score_batch(...) - Score each of N hands against each of M starters, returning the N x M scores, and the mean and variance
+        of each hand's score over the starters.
+
+Logging:
+    None
+"""
+
+
+# Standard imports
+from itertools import combinations
+
+# Third party imports
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Local imports
+
+
+# Rank (code // 4) of a jack, for his nobs
+_JACK_RANK = 10
+
+# Subsets of the five cards (hand plus starter) that might add up to fifteen, as a 5 x 26 matrix of 0/1, where each column is one subset.
+# No single card counts more than 10, so only subsets of two or more cards are needed. Built on first use by _fifteen_subsets().
+_fifteen_subset_matrix = None
+
+# The 10 pairs of positions among the five cards, as two lists of positions. Built on first use by _fifteen_subsets().
+_pair_positions = None
+
+
+def _fifteen_subsets():
+    """
+    Utility function that builds, on first use, the matrix of subsets of the five cards that might add up to fifteen, and the
+    positions of the pairs of cards among the five cards.
+    :return: Tuple (5 x 26 subset matrix, (first positions, second positions)), (numpy array, (list of int, list of int))
+    """
+    global _fifteen_subset_matrix, _pair_positions
+    if _fifteen_subset_matrix is None:
+        subsets = [s for size in range(2, 6) for s in combinations(range(5), size)]
+        matrix = np.zeros((5, len(subsets)), dtype = np.int16)
+        for (j, subset) in enumerate(subsets):
+            matrix[list(subset), j] = 1
+        _fifteen_subset_matrix = matrix
+        pairs = list(combinations(range(5), 2))
+        _pair_positions = ([i for (i, j) in pairs], [j for (i, j) in pairs])
+    return (_fifteen_subset_matrix, _pair_positions)
+
+
+def score_batch(hands, starters, is_crib = False):
+    """
+    Score each of N hands (or cribs) against each of M starters.
+    :parameter hands: The hands, as an N x 4 array of card codes (see CribbageCardCodec), numpy array or nested list of int
+    :parameter starters: The starters, as an array of M card codes, numpy array or list of int
+    :parameter is_crib: If True, score the hands as cribs, which only changes the scoring of a flush, boolean
+    :return: Tuple (scores, mean, variance), where scores is an N x M array of int, with scores[n, m] the score of hand n with
+        starter m, or -1 if starter m is one of the cards in hand n. mean and variance are arrays of N float, the mean and (population)
+        variance of each hand's score over the starters that are not in the hand, or nan if there are no such starters,
+        (numpy array, numpy array, numpy array)
+    """
+    if np is None:
+        raise ImportError('score_batch(...) requires numpy, which is not installed.')
+
+    hands = np.asarray(hands, dtype = np.int64)
+    starters = np.asarray(starters, dtype = np.int64)
+    assert(hands.ndim == 2 and hands.shape[1] == 4)
+    assert(starters.ndim == 1)
+    n = hands.shape[0]
+    m = starters.shape[0]
+
+    (subset_matrix, (first, second)) = _fifteen_subsets()
+
+    # All five cards, hand plus starter, for every hand and starter, as an N x M x 5 array of codes
+    cards = np.empty((n, m, 5), dtype = np.int64)
+    cards[:, :, 0:4] = hands[:, np.newaxis, :]
+    cards[:, :, 4] = starters[np.newaxis, :]
+    ranks = cards // 4
+    suits = cards % 4
+    values = np.minimum(ranks + 1, 10)
+
+    # Fifteens: add up the values in each subset of the cards, and count the subsets that add up to fifteen
+    fifteens = np.count_nonzero((values @ subset_matrix) == 15, axis = 2)
+    score = 2 * fifteens
+
+    # Pairs: compare the ranks of each pair of positions
+    score += 2 * np.count_nonzero(ranks[:, :, first] == ranks[:, :, second], axis = 2)
+
+    # Runs: from the histogram of how many cards there are of each rank, the number of runs in a window of consecutive ranks is the
+    # product of the counts of each rank in the window. This is a "greedy" algorithm, scoring only the longest runs, so windows of 5 ranks
+    # are tried first, then 4, then 3.
+    histogram = np.count_nonzero(ranks[:, :, :, np.newaxis] == np.arange(13), axis = 2)
+    run_score = np.zeros((n, m), dtype = np.int64)
+    for size in (5, 4, 3):
+        windows = histogram[:, :, 0:13-size+1].copy()
+        for offset in range(1, size):
+            windows *= histogram[:, :, offset:13-size+1+offset]
+        runs = windows.sum(axis = 2)
+        run_score = np.where((run_score == 0) & (runs > 0), size * runs, run_score)
+    score += run_score
+
+    # Flush: the four cards in the hand all have the same suit. In a hand, that's 4, plus 1 if the starter also has the same suit.
+    # In the crib, it's 5 if the starter also has the same suit, otherwise nothing.
+    hand_flush = np.all(suits[:, :, 0:4] == suits[:, :, 0:1], axis = 2)
+    starter_flush = hand_flush & (suits[:, :, 4] == suits[:, :, 0])
+    if is_crib:
+        score += 5 * starter_flush
+    else:
+        score += 4 * hand_flush + starter_flush
+
+    # His nobs: a jack in the hand with the same suit as the starter
+    score += np.any((ranks[:, :, 0:4] == _JACK_RANK) & (suits[:, :, 0:4] == suits[:, :, 4:5]), axis = 2)
+
+    # Mark the starters that are one of the cards in the hand, and leave them out of the mean and variance
+    valid = ~np.any(cards[:, :, 0:4] == cards[:, :, 4:5], axis = 2)
+    score = np.where(valid, score, -1)
+    num_valid = valid.sum(axis = 1)
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        mean = np.where(valid, score, 0).sum(axis = 1) / num_valid
+        variance = np.where(valid, (score - mean[:, np.newaxis]) ** 2, 0).sum(axis = 1) / num_valid
+
+    return (score, mean, variance)
@@ -0,0 +1,258 @@
+"""
+Defines a bitboard representation of sets of cards, where a set of cards is one int, with bit i set if the card with code i (see
+CribbageCardCodec) is in the set. Membership, union and difference of sets are then single int operations, the number of cards in a
+set is a popcount, and a set can be copied or hashed as cheaply as any other int.
+
+A set of ranks is also one int, a 13-bit rank mask, with bit r set if a card of rank r (A=0, ..., K=12) is in the set.
+
+Exported Classes:
+    CribbageDealBitboard - The hands, piles, and crib of a cribbage deal, as one card mask each.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    card_bit(...) - The mask of a single card code.
+    cards_to_mask(...) - The mask of a list of Cards, or of a Hand.
+    codes_to_mask(...) - The mask of a list of card codes.
+    mask_to_codes(...) - The card codes in a mask, in ascending order.
+    mask_to_cards(...) - The interned Cards in a mask, in ascending code order.
+    mask_count(...) - The number of cards in a mask.
+    mask_rank_mask(...) - The 13-bit rank mask of the cards in a mask.
+    playable_mask(...) - The cards in a mask that can be played without a go round count exceeding 31.
+    playable_cards(...) - The cards in a list that can be played without a go round count exceeding 31, in the same order.
+
+Logging:
+    None
+"""
+
+
+# Standard imports
+
+# Local imports
+from CribbageSim.CribbageCardCodec import NUM_CODES, CODE_COUNTS, card_to_code, code_to_card
+
+
+# Mask with every card in the deck
+FULL_DECK = (1 << NUM_CODES) - 1
+
+# Mask of the 4 cards of each rank, A=0, ..., K=12
+RANK_CARDS = tuple([0b1111 << (4 * rank) for rank in range(13)])
+
+# PLAYABLE_UNDER[go_count] is the mask of cards that can be played when the go round count is go_count, that is, the cards with a count
+# value <= 31 - go_count, for go_count = 0...31
+PLAYABLE_UNDER = tuple([sum([1 << code for code in range(NUM_CODES) if CODE_COUNTS[code] <= 31 - go_count]) for go_count in range(32)])
+
+
+def card_bit(code = 0):
+    """
+    :parameter code: The code of a card, int [0...51]
+    :return: The mask with only that card, int
+    """
+    return 1 << code
+
+
+def cards_to_mask(cards = []):
+    """
+    :parameter cards: The cards, list of Card objects or Hand object
+    :return: The mask of the cards, int
+    """
+    mask = 0
+    for c in cards:
+        mask |= 1 << card_to_code(c)
+    return mask
+
+
+def codes_to_mask(codes = []):
+    """
+    :parameter codes: The card codes, sequence of int
+    :return: The mask of the cards, int
+    """
+    mask = 0
+    for code in codes:
+        mask |= 1 << code
+    return mask
+
+
+def mask_to_codes(mask = 0):
+    """
+    :parameter mask: A card mask, int
+    :return: The codes of the cards in mask, in ascending order, list of int
+    """
+    codes = []
+    while mask:
+        low = mask & -mask
+        codes.append(low.bit_length() - 1)
+        mask ^= low
+    return codes
+
+
+def mask_to_cards(mask = 0):
+    """
+    :parameter mask: A card mask, int
+    :return: The interned cards in mask, in ascending code order, list of Card objects
+    """
+    return [code_to_card(code) for code in mask_to_codes(mask)]
+
+
+def mask_count(mask = 0):
+    """
+    :parameter mask: A card mask, int
+    :return: The number of cards in mask, int
+    """
+    return mask.bit_count()
+
+
+def mask_rank_mask(mask = 0):
+    """
+    :parameter mask: A card mask, int
+    :return: The 13-bit rank mask, with bit r set if mask has at least one card of rank r, int
+    """
+    ranks = 0
+    for rank in range(13):
+        if mask & RANK_CARDS[rank]: ranks |= 1 << rank
+    return ranks
+
+
+def playable_mask(mask = 0, go_count = 0):
+    """
+    :parameter mask: A card mask, e.g., of the cards in a hand, int
+    :parameter go_count: The current cumulative count of the go round, int [0...31]
+    :return: The mask of the cards in mask that can be played without the count exceeding 31, int
+    """
+    return mask & PLAYABLE_UNDER[go_count]
+
+
+def playable_cards(cards = [], go_count = 0):
+    """
+    :parameter cards: The cards, e.g., in a hand, list of Card objects or Hand object
+    :parameter go_count: The current cumulative count of the go round, int [0...31]
+    :return: The cards that can be played without the count exceeding 31, in the same order as in cards, list of Card objects
+    """
+    playable = PLAYABLE_UNDER[go_count]
+    return [c for c in cards if (playable >> card_to_code(c)) & 1]
+
+
+class CribbageDealBitboard(object):
+    """
+    The hands, piles, and crib of a cribbage deal, and the starter, as one card mask each. All mask members are considered public, and can
+    be combined with the functions of this module. An instance is kept by CribbageDeal when it is constructed with use_bitboard = True.
+    A copy is a handful of ints, and key() is hashable, so that search based strategies can copy and remember deal states cheaply.
+    """
+    __slots__ = ('player_hand', 'dealer_hand', 'player_pile', 'dealer_pile', 'combined_pile', 'crib', 'starter', 'dealt')
+
+    def __init__(self):
+        """
+        Create an empty deal.
+        """
+        self.reset()
+
+    def reset(self):
+        """
+        Reset to an empty deal, before any cards are dealt.
+        :return: None
+        """
+        self.player_hand = 0
+        self.dealer_hand = 0
+        self.player_pile = 0
+        self.dealer_pile = 0
+        self.combined_pile = 0
+        self.crib = 0
+        self.starter = 0
+        # Cards dealt from the deck so far, to hands and as starter
+        self.dealt = 0
+        return None
+
+    def copy(self):
+        """
+        :return: A copy of self, CribbageDealBitboard object
+        """
+        other = CribbageDealBitboard.__new__(CribbageDealBitboard)
+        for name in self.__slots__:
+            setattr(other, name, getattr(self, name))
+        return other
+
+    def key(self):
+        """
+        :return: A hashable key that is equal for deal states with the same cards in the same places, tuple of int
+        """
+        return (self.player_hand, self.dealer_hand, self.player_pile, self.dealer_pile, self.combined_pile, self.crib, self.starter)
+
+    def deal_to_player(self, cards = []):
+        """
+        :parameter cards: Cards dealt to the player's hand, list of Card objects
+        :return: None
+        """
+        mask = cards_to_mask(cards)
+        self.player_hand |= mask
+        self.dealt |= mask
+        return None
+
+    def deal_to_dealer(self, cards = []):
+        """
+        :parameter cards: Cards dealt to the dealer's hand, list of Card objects
+        :return: None
+        """
+        mask = cards_to_mask(cards)
+        self.dealer_hand |= mask
+        self.dealt |= mask
+        return None
+
+    def set_starter(self, card):
+        """
+        :parameter card: The starter card, Card object
+        :return: None
+        """
+        self.starter = 1 << card_to_code(card)
+        self.dealt |= self.starter
+        return None
+
+    def player_to_crib(self, card):
+        """
+        :parameter card: Card moved from the player's hand to the crib, Card object
+        :return: None
+        """
+        bit = 1 << card_to_code(card)
+        self.player_hand &= ~bit
+        self.crib |= bit
+        return None
+
+    def dealer_to_crib(self, card):
+        """
+        :parameter card: Card moved from the dealer's hand to the crib, Card object
+        :return: None
+        """
+        bit = 1 << card_to_code(card)
+        self.dealer_hand &= ~bit
+        self.crib |= bit
+        return None
+
+    def player_plays(self, card):
+        """
+        :parameter card: Card played from the player's hand, Card object
+        :return: None
+        """
+        bit = 1 << card_to_code(card)
+        self.player_hand &= ~bit
+        self.player_pile |= bit
+        self.combined_pile |= bit
+        return None
+
+    def dealer_plays(self, card):
+        """
+        :parameter card: Card played from the dealer's hand, Card object
+        :return: None
+        """
+        bit = 1 << card_to_code(card)
+        self.dealer_hand &= ~bit
+        self.dealer_pile |= bit
+        self.combined_pile |= bit
+        return None
+
+    def clear_combined_pile(self):
+        """
+        Empty the combined pile, as at the start of a go round.
+        :return: None
+        """
+        self.combined_pile = 0
+        return None
@@ -12,7 +12,7 @@ Exported Functions:
 
 Logging:
     Uses a logger named 'cribbage_logger' for providing game output to the user. This logger is configured
-    by calling CribbageSimulator.setup_logging(...).
+    by calling CribbageSimulator.setup_logging(...). Nothing is logged by a headless board.
  """
 
 
@@ -22,7 +22,10 @@ import logging
 # Local imports
 from CribbageSim.CribbageCombination import CribbageComboInfo
 from CribbageSim.exceptions import CribbageGameOverError
-from CribbageSim.CribbageGameOutputEvents import CribbageGameOutputEvents, CribbageGameLogInfo
+
+
+# The logger 'cribbage_logger', looked up once, rather than on every call
+_logger = logging.getLogger('cribbage_logger')
 
 
 class CribbageBoard(object):
@@ -30,10 +33,12 @@ class CribbageBoard(object):
     Represents a cribbage board, so that progress through the game can be kept for both players.
     """
     
-    def __init__(self):
+    def __init__(self, headless = False):
         """
         Construct a cribbage board.
+        :parameter headless: If True, then pegging is not logged, boolean
         """
+        self._headless = headless
         # x_current = the peg position of the leading peg, that is, the current score
         # x_previous = the peg position of the traling peg, that is the score prior to the latest pegging 
         self._player1_current = 0
@@ -41,6 +46,15 @@ class CribbageBoard(object):
         self._player2_current = 0
         self._player2_previous = 0
     
+    def set_headless(self, headless = False):
+        """
+        Turn headless mode on or off, e.g., for a board restored from a saved game.
+        :parameter headless: If True, then pegging is not logged, boolean
+        :return: None
+        """
+        self._headless = headless
+        return None
+
     def _make_reasons_string(self, reasons=[]):
         """
         Utility function that converts a list of CribbageComboInfo objects to a string.
@@ -60,8 +74,6 @@ class CribbageBoard(object):
         :return: The current score for player 1, after pegging points, int
         """
         assert(points>0)
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
 
         # If a reason wasn't provided in the argument, add a default 'none' one to the list
         if len(reasons)==0: reasons=[CribbageComboInfo()]
@@ -71,10 +83,8 @@ class CribbageBoard(object):
         if self._player1_current >= 121:
             self._player1_current = 121
             raise CribbageGameOverError
-        logger.info(f"Player 1 peg locations: {self._player1_current},{self._player1_previous} After pegging:\n{self._make_reasons_string(reasons)}",
-                    extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_SCORE_PLAYER1,
-                                              score_player1=(self._player1_current,self._player1_previous),
-                                              score_record=reasons))
+        if not self._headless and _logger.isEnabledFor(logging.INFO):
+            _logger.info(f"Player 1 peg locations: {self._player1_current},{self._player1_previous} After pegging:\n{self._make_reasons_string(reasons)}")
         return self._player1_current
         
     def peg_for_player2(self, points = 1, reasons = []):
@@ -85,9 +95,7 @@ class CribbageBoard(object):
         :return: The current score for player 2, after pegging points, int
         """
         assert(points>0)
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
-        
+
         # If a reason wasn't provided in the argument, add a default 'none' one to the list
         if len(reasons)==0: reasons=[CribbageComboInfo()]
 
@@ -96,10 +104,8 @@ class CribbageBoard(object):
         if self._player2_current >= 121:
             self._player2_current = 121
             raise CribbageGameOverError
-        logger.info(f"Player 2 peg locations: {self._player2_current},{self._player2_previous} After pegging:\n{self._make_reasons_string(reasons)}",
-                    extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_SCORE_PLAYER2,
-                                              score_player2=(self._player2_current,self._player2_previous),
-                                              score_record=reasons))
+        if not self._headless and _logger.isEnabledFor(logging.INFO):
+            _logger.info(f"Player 2 peg locations: {self._player2_current},{self._player2_previous} After pegging:\n{self._make_reasons_string(reasons)}")
         return self._player2_current
     
     def get_scores(self):
@@ -0,0 +1,143 @@
+"""
+Defines the integer encoding of playing cards used wherever cards are handled in bulk, for example by the batch scoring in
+CribbageBatchScoring. Each of the 52 cards in a deck is encoded as one int:
+
+    code = 4 * (sequence count - 1) + suit index
+
+where the sequence count is A=1, [2...10], J=11, Q=12, K=13, and the suit index is S=0, C=1, H=2, D=3. So, codes 0...3 are the aces,
+codes 48...51 are the kings, code // 4 is the rank (0...12), and code % 4 is the suit index.
+
+There is exactly one interned Card for each code, returned by code_to_card(...) and used by CribbageDeck for every deal, so that no
+new Card objects are created while playing. Encoding an interned Card is a single dictionary lookup, and the rank, count value and suit
+index of a code are looked up in the CODE_RANKS, CODE_COUNTS and CODE_SUITS tables, so scoring can work on ints, and turn them back
+into Cards only where Cards are needed.
+
+Exported Classes:
+    None
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    card_to_code(...) - Encode a Card as an int.
+    code_to_card(...) - Decode an int to its interned Card.
+    intern_card(...) - The interned Card equal to a Card.
+    create_interned_deck(...) - A new list of the interned Cards, in the order of HandsDecksCards.deck.Deck.create_deck().
+    cards_to_codes(...) - Encode a list of Cards, or a Hand, as a list of ints.
+    code_rank(...) - The rank (0...12) of an encoded card.
+    code_suit(...) - The suit index (0...3) of an encoded card.
+    code_count(...) - The count value (A=1, [2...10], J/Q/K=10) of an encoded card.
+
+Logging:
+    None
+"""
+
+
+# Standard imports
+
+# Local imports
+from HandsDecksCards.card import Card
+
+
+# Suits in suit index order, which is also the order in which HandsDecksCards.deck.Deck.create_deck() builds a deck
+SUITS = ('S', 'C', 'H', 'D')
+
+# Pips in rank order
+PIPS = ('A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K')
+
+# Number of distinct cards, and so of distinct codes
+NUM_CODES = 52
+
+# Rank of each code, A=0, [1...9], J=10, Q=11, K=12
+CODE_RANKS = tuple([code // 4 for code in range(NUM_CODES)])
+
+# Count value of each code, A=1, [2...10], J/Q/K=10
+CODE_COUNTS = tuple([min(code // 4 + 1, 10) for code in range(NUM_CODES)])
+
+# Suit index of each code, S=0, C=1, H=2, D=3
+CODE_SUITS = tuple([code % 4 for code in range(NUM_CODES)])
+
+# Rank of a jack
+JACK_RANK = 10
+
+_suit_index = {suit: i for (i, suit) in enumerate(SUITS)}
+_pips_rank = {pips: i for (i, pips) in enumerate(PIPS)}
+
+# The interned Card for each code, and the code of each interned Card. Card does not define __eq__ or __hash__, so the dictionary is
+# keyed by identity, and only finds the interned Cards.
+_interned_cards = tuple([Card(SUITS[code % 4], PIPS[code // 4]) for code in range(NUM_CODES)])
+_interned_codes = {card: code for (code, card) in enumerate(_interned_cards)}
+
+# Codes in the order of HandsDecksCards.deck.Deck.create_deck(), that is, by suit S, C, H, D, and then by rank A...K within suit
+_deck_order = tuple([4 * rank + suit for suit in range(4) for rank in range(13)])
+
+
+def card_to_code(card = Card()):
+    """
+    Encode card as an int.
+    :parameter card: The card to encode, Card object
+    :return: The code of card, int [0...51]
+    """
+    code = _interned_codes.get(card)
+    if code is None:
+        code = 4 * _pips_rank[card.pips] + _suit_index[card.suit]
+    return code
+
+
+def code_to_card(code = 0):
+    """
+    Decode code to its interned Card.
+    :parameter code: The code of a card, int [0...51]
+    :return: The card, Card object
+    """
+    assert(code >= 0 and code < NUM_CODES)
+    return _interned_cards[code]
+
+
+def intern_card(card = Card()):
+    """
+    :parameter card: A card, Card object
+    :return: The interned Card with the same suit and pips as card, Card object
+    """
+    return _interned_cards[card_to_code(card)]
+
+
+def create_interned_deck():
+    """
+    Create a new list of the 52 interned Cards, in the same order as HandsDecksCards.deck.Deck.create_deck() creates new Cards.
+    :return: A list of Card objects, list
+    """
+    return [_interned_cards[code] for code in _deck_order]
+
+
+def cards_to_codes(cards = []):
+    """
+    Encode each of cards as an int.
+    :parameter cards: The cards to encode, list of Card objects or Hand object
+    :return: The codes of the cards, in the same order, list of int
+    """
+    return [card_to_code(c) for c in cards]
+
+
+def code_rank(code = 0):
+    """
+    :parameter code: The code of a card, int [0...51]
+    :return: The rank of the card, A=0, [1...9], J=10, Q=11, K=12, int
+    """
+    return CODE_RANKS[code]
+
+
+def code_suit(code = 0):
+    """
+    :parameter code: The code of a card, int [0...51]
+    :return: The suit index of the card, S=0, C=1, H=2, D=3, int
+    """
+    return CODE_SUITS[code]
+
+
+def code_count(code = 0):
+    """
+    :parameter code: The code of a card, int [0...51]
+    :return: The count value of the card, A=1, [2...10], J/Q/K=10, int
+    """
+    return CODE_COUNTS[code]
@@ -0,0 +1,194 @@
+"""
+Defines functions that map sets of cards, and multisets of ranks, to dense indices and back, using the combinatorial number system
+in colex order. These are perfect hashes, so a precomputed table over card sets can be a plain list or array, addressed directly by
+index, without a dictionary.
+
+Cards are encoded as ints 0...51 as defined in CribbageCardCodec. A set of k cards (k = 2...6) is indexed by its colex rank:
+
+    index = C(c[0], 1) + C(c[1], 2) + ... + C(c[k-1], k), for the codes in ascending order c[0] < c[1] < ... < c[k-1]
+
+so the sets of k cards have indices 0...C(52, k)-1. A multiset of k ranks (0...12, with repetition, k = 1...6) is mapped to a set by
+adding i to the i-th smallest rank, and is indexed by the colex rank of that set, giving indices 0...C(13+k-1, k)-1.
+
+numpy is an optional dependency of CribbageSim. The batch functions, which index many sets at once, raise ImportError if it is
+not installed.
+
+Exported Classes:
+    None
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    num_subsets(...) - The number of sets of k cards.
+    num_multisets(...) - The number of multisets of k ranks.
+    subset_rank(...) - The index of a set of card codes.
+    subset_unrank(...) - The set of card codes with an index.
+    cards_rank(...) - The index of a set of Cards.
+    multiset_rank(...) - The index of a multiset of ranks.
+    multiset_unrank(...) - The multiset of ranks with an index.
+    subset_rank_batch(...) - The indices of many sets of card codes, with numpy.
+    subset_unrank_batch(...) - The sets of card codes with many indices, with numpy.
+    multiset_rank_batch(...) - The indices of many multisets of ranks, with numpy.
+
+Logging:
+    None
+"""
+
+
+# Standard imports
+from math import comb
+
+# Third party imports
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Local imports
+from CribbageSim.CribbageCardCodec import NUM_CODES, card_to_code
+
+
+# Largest set size supported
+MAX_K = 6
+
+# Number of ranks
+NUM_RANKS = 13
+
+# Table of binomial coefficients, _binomial[n][k] = C(n, k), for n = 0...NUM_CODES and k = 0...MAX_K
+_binomial = [[comb(n, k) for k in range(MAX_K + 1)] for n in range(NUM_CODES + 1)]
+
+
+def num_subsets(k = 4):
+    """
+    :parameter k: The number of cards in a set, int
+    :return: The number of sets of k cards from a deck, C(52, k), int
+    """
+    return _binomial[NUM_CODES][k]
+
+
+def num_multisets(k = 4):
+    """
+    :parameter k: The number of ranks in a multiset, int
+    :return: The number of multisets of k ranks, C(13+k-1, k), int
+    """
+    return _binomial[NUM_RANKS + k - 1][k]
+
+
+def subset_rank(codes = ()):
+    """
+    Determine the index of a set of card codes.
+    :parameter codes: The card codes, in ascending order, with no repeats, sequence of int
+    :return: The colex rank of the set, int [0...num_subsets(len(codes))-1]
+    """
+    index = 0
+    for (i, code) in enumerate(codes):
+        index += _binomial[code][i + 1]
+    return index
+
+
+def subset_unrank(index = 0, k = 4):
+    """
+    Determine the set of card codes with an index.
+    :parameter index: The colex rank of the set, int [0...num_subsets(k)-1]
+    :parameter k: The number of cards in the set, int
+    :return: The card codes, in ascending order, list of int
+    """
+    assert(index >= 0 and index < num_subsets(k))
+    codes = [0] * k
+    code = NUM_CODES - 1
+    # Greedily find the largest code whose binomial coefficient fits in what remains of index, from the last position down
+    for i in range(k, 0, -1):
+        while _binomial[code][i] > index: code -= 1
+        codes[i - 1] = code
+        index -= _binomial[code][i]
+        code -= 1
+    return codes
+
+
+def cards_rank(cards = []):
+    """
+    Determine the index of a set of cards.
+    :parameter cards: The cards, in any order, list of Card objects or Hand object
+    :return: The colex rank of the set, int [0...num_subsets(len(cards))-1]
+    """
+    return subset_rank(sorted([card_to_code(c) for c in cards]))
+
+
+def multiset_rank(ranks = ()):
+    """
+    Determine the index of a multiset of ranks.
+    :parameter ranks: The ranks, A=0, [1...9], J=10, Q=11, K=12, in ascending order, sequence of int
+    :return: The index of the multiset, int [0...num_multisets(len(ranks))-1]
+    """
+    index = 0
+    for (i, rank) in enumerate(ranks):
+        index += _binomial[rank + i][i + 1]
+    return index
+
+
+def multiset_unrank(index = 0, k = 4):
+    """
+    Determine the multiset of ranks with an index.
+    :parameter index: The index of the multiset, int [0...num_multisets(k)-1]
+    :parameter k: The number of ranks in the multiset, int
+    :return: The ranks, in ascending order, list of int
+    """
+    assert(index >= 0 and index < num_multisets(k))
+    ranks = [0] * k
+    code = NUM_RANKS + k - 2
+    for i in range(k, 0, -1):
+        while _binomial[code][i] > index: code -= 1
+        ranks[i - 1] = code - (i - 1)
+        index -= _binomial[code][i]
+        code -= 1
+    return ranks
+
+
+def _binomial_array():
+    """
+    Utility function that returns the binomial coefficients table as a numpy array.
+    :return: _binomial as an array, numpy array
+    """
+    if np is None:
+        raise ImportError('The batch indexing functions require numpy, which is not installed.')
+    return np.array(_binomial, dtype = np.int64)
+
+
+def subset_rank_batch(codes):
+    """
+    Determine the indices of many sets of card codes.
+    :parameter codes: N sets of k card codes, each in any order, N x k array of int, numpy array or nested list
+    :return: The colex rank of each set, array of N int, numpy array
+    """
+    binomial = _binomial_array()
+    codes = np.sort(np.asarray(codes, dtype = np.int64), axis = 1)
+    return binomial[codes, np.arange(1, codes.shape[1] + 1)].sum(axis = 1)
+
+
+def subset_unrank_batch(indices, k = 4):
+    """
+    Determine the sets of card codes with many indices.
+    :parameter indices: N colex ranks, array of N int, numpy array or list
+    :parameter k: The number of cards in each set, int
+    :return: The card codes of each set, in ascending order, N x k array of int, numpy array
+    """
+    binomial = _binomial_array()
+    remaining = np.array(indices, dtype = np.int64)
+    codes = np.empty((remaining.shape[0], k), dtype = np.int64)
+    for i in range(k, 0, -1):
+        # The largest code c with C(c, i) <= remaining, found by searching the (increasing) column of binomial coefficients
+        code = np.searchsorted(binomial[:, i], remaining, side = 'right') - 1
+        codes[:, i - 1] = code
+        remaining -= binomial[code, i]
+    return codes
+
+
+def multiset_rank_batch(ranks):
+    """
+    Determine the indices of many multisets of ranks.
+    :parameter ranks: N multisets of k ranks (0...12), each in any order, N x k array of int, numpy array or nested list
+    :return: The index of each multiset, array of N int, numpy array
+    """
+    ranks = np.sort(np.asarray(ranks, dtype = np.int64), axis = 1)
+    return subset_rank_batch(ranks + np.arange(ranks.shape[1]))
@@ -18,6 +18,7 @@ Exported Classes:
         PairCombinationPlaying - Intended to search for, find, and score pairs in a cribbage play pile.
         RunCombinationPlaying - Intended to search for, find, and score runs in a cribbage play pile.
         FifteenCombinationPlaying - Intended to search for, find, and score 15's in a cribbage play pile.
+    CribbageShowDecomposition - The decomposition of a hand plus starter (ranks, count values, suits) shared by showing scoring combinations.
     CribbageCombinationShowing - Abstract interface for all scoring combinations during play.
         PairCombination - Intended to search for, find, and score pairs in a cribbage hand.
         FlushCombination - Intended to search for, find, and score pairs in a cribbage hand, but not in the crib.
@@ -30,7 +31,8 @@ Exported Exceptions:
     None    
  
 Exported Functions:
-    None
+    score_show_combinations(...) - Score a hand or crib for a list of showing combinations, sharing one decomposition of the hand.
+    score_show(...) - Fast total show score of a hand or crib (plus starter), using a table indexed by the rank multiset of the cards.
 
 Logging:
     None
@@ -39,16 +41,22 @@ Logging:
 
 # Standard imports
 from itertools import combinations
+from itertools import product
 
 # Local imports
 from HandsDecksCards.card import Card
 from HandsDecksCards.hand import Hand
+from CribbageSim.CribbageCardIndexer import num_multisets, multiset_rank, multiset_unrank
+from CribbageSim.CribbageCardCodec import card_to_code, CODE_RANKS, CODE_COUNTS, CODE_SUITS, JACK_RANK
 
 
 class CribbageComboInfo(object):
     """
     A class with all public members, containing information about a particular scoring combination's presence in a cribbage hand.
+    The instance_list may be provided lazily, as a function that builds it, so that it is only built if it is accessed.
     """
+    __slots__ = ('combo_name', 'number_instances', 'score', '_instance_list', '_instance_list_builder')
+
     def __init__(self):
         """
         combo_name: The name of the cribbage scoring combination, string
@@ -59,20 +67,51 @@ class CribbageComboInfo(object):
         self.combo_name = 'none'
         self.number_instances = 0
         self.score = 0
-        self.instance_list = []
+        self._instance_list = []
+        # If not None, a function without arguments that returns the list to use as instance_list the first time it is accessed
+        self._instance_list_builder = None
+
+    @property
+    def instance_list(self):
+        """
+        List of lists of Card(s) of the instances of the scoring combination in the cribbage hand, built on first access if
+        set_instance_list_builder(...) was used.
+        """
+        if self._instance_list_builder is not None:
+            self._instance_list = self._instance_list_builder()
+            self._instance_list_builder = None
+        return self._instance_list
+
+    @instance_list.setter
+    def instance_list(self, value):
+        self._instance_list = value
+        self._instance_list_builder = None
+
+    def set_instance_list_builder(self, builder):
+        """
+        Provide instance_list lazily.
+        :parameter builder: Function without arguments that returns the instance_list, called only if instance_list is accessed, callable
+        :return: None
+        """
+        assert(callable(builder))
+        self._instance_list_builder = builder
+        return None
+
+    def __getstate__(self):
+        """
+        Build any lazy instance_list before pickling, since the function that builds it may not be picklable.
+        """
+        return {'combo_name': self.combo_name, 'number_instances': self.number_instances, 'score': self.score,
+                '_instance_list': self.instance_list, '_instance_list_builder': None}
+
+    def __setstate__(self, state):
+        for (k, v) in state.items():
+            setattr(self, k, v)
         
     def __str__(self):
-        s = ''
-        if self.number_instances > 0:
-            s += f"{self.combo_name}: {str(self.number_instances)} for {str(self.score)}: "
-            for combo in self.instance_list:
-                for card in combo:
-                    s += f"{str(card)} "
-                s += ', '
-            if len(self.instance_list) > 0:
-                # Remove unneeded trailing space-comma-space
-                s = s[0:len(s)-3]
-        return s
+        if self.number_instances == 0: return ''
+        combos = ' , '.join([' '.join([str(card) for card in combo]) for combo in self.instance_list])
+        return f"{self.combo_name}: {self.number_instances} for {self.score}: {combos}"
 
 
 # TODO: Should score() be moved up to this class, so it becomes abstract? I think I put score() at the first child level
@@ -123,6 +162,56 @@ class CribbageCombinationPlaying(CribbageCombination):
         raise NotImplementedError
         return CribbageCombinInfo()
 
+    def score_only(self, pile = Hand()):
+        """
+        Score-only mode of score(...), for clients that need only the points and not the instances of the combination. Children should
+        override this with an implementation that builds no CribbageComboInfo. By default, score(...) is called and its score returned.
+        :parameter pile: The play pile to search for a scoring combination, Hand object
+        :return: The points scored for the scoring combination in the play pile, int
+        """
+        return self.score(pile).score
+
+
+class CribbageShowDecomposition(object):
+    """
+    A class with all public members, containing the decomposition of a cribbage hand (or crib) plus starter that the showing
+    scoring combinations work from. Building it once and passing it to the score_decomposed(...) method of each
+    CribbageCombinationShowing child means that the hand is only taken apart once, however many combinations are scored.
+    The attributes are slots, since a decomposition is created for every hand shown.
+    """
+    __slots__ = ('hand', 'starter', 'hand_cards', 'cards', 'codes', 'values', 'histogram', 'positions', 'flush_suit')
+
+    def __init__(self, hand = Hand(), starter = None):
+        """
+        hand: The hand being scored, Hand object
+        starter: The starter card, or None, Card object
+        hand_cards: The cards in the hand, without the starter, list of Card objects
+        cards: The cards in the hand, followed by the starter if there is one, list of Card objects
+        codes: The code of each card in cards (see CribbageCardCodec), list of int
+        values: The count value of each card in cards, A=1, [2...10], J/Q/K=10, list of int
+        histogram: How many of cards have each sequence count, indexed A=1, [2...10], J=11, Q=12, K=13 (index 0 is unused), list of int
+        positions: For each sequence count, the positions in cards of the cards with that sequence count, list of lists of int
+        flush_suit: The suit of the hand if all cards in the hand (not counting the starter) have the same suit, otherwise None, string
+        """
+        self.hand = hand
+        self.starter = starter
+        self.hand_cards = hand.get_cards()
+        self.cards = list(self.hand_cards)
+        if starter is not None: self.cards.append(starter)
+        self.codes = [card_to_code(c) for c in self.cards]
+        self.values = [CODE_COUNTS[code] for code in self.codes]
+        self.histogram = [0] * 14
+        self.positions = [[] for i in range(14)]
+        for (i, code) in enumerate(self.codes):
+            rank = CODE_RANKS[code] + 1
+            self.histogram[rank] += 1
+            self.positions[rank].append(i)
+        self.flush_suit = None
+        n = len(self.hand_cards)
+        if n > 0:
+            suit = CODE_SUITS[self.codes[0]]
+            if all(CODE_SUITS[self.codes[i]] == suit for i in range(1, n)): self.flush_suit = self.hand_cards[0].suit
+
 
 class CribbageCombinationShowing(CribbageCombination):
     """
@@ -130,8 +219,14 @@ class CribbageCombinationShowing(CribbageCombination):
     Each child must by convention and necessity implement these methods:
         score(...) - Searches a Hand and for the existence of one or more instances of the combination in the Hand.
             Returns information on the istances found and the score resulting from those instances.
+    Each child may also implement:
+        score_decomposed(...) - As score(...), but working from a CribbageShowDecomposition of the Hand, which can be shared with
+            other combinations. If not implemented, score(...) is called instead.
+        score_only_decomposed(...) - As score_decomposed(...), but returning only the points, without building a CribbageComboInfo.
+            If not implemented, score_decomposed(...) is called instead.
     The concept for using this class is that a client could hold a list of instances of children of this class, one for each scoring combination,
     and the client would iterate through that list, calling score(...) method for each one, to tally up the score when showing a hand.
+    See also score_show_combinations(...), which does this with one shared CribbageShowDecomposition.
     """
     def __init__(self):
         """
@@ -169,6 +264,33 @@ class CribbageCombinationShowing(CribbageCombination):
         """
         raise NotImplementedError
         return CribbageCombinInfo()
+
+    def score_decomposed(self, decomposition):
+        """
+        Score the hand and starter in decomposition. Children that can work from the decomposition should override this. By default,
+        score(...) is called with the hand and starter that decomposition was built from.
+        :parameter decomposition: The hand and starter to search for a scoring combination, CribbageShowDecomposition object
+        :return: CribbageComboInfo object with information about the scoring combination in the hand, CribbageComboInfo object
+        """
+        return self.score(decomposition.hand, decomposition.starter)
+
+    def score_only(self, hand = Hand(), starter = None):
+        """
+        Score-only mode of score(...), for clients that need only the points and not the instances of the combination.
+        :parameter hand: The hand to search for a scoring combination, Hand object
+        :parameter starter: The starter card, Card object
+        :return: The points scored for the scoring combination in the hand, int
+        """
+        return self.score_only_decomposed(CribbageShowDecomposition(hand, starter))
+
+    def score_only_decomposed(self, decomposition):
+        """
+        Score-only mode of score_decomposed(...). Children should override this with an implementation that builds no CribbageComboInfo.
+        By default, score_decomposed(...) is called and its score returned.
+        :parameter decomposition: The hand and starter to search for a scoring combination, CribbageShowDecomposition object
+        :return: The points scored for the scoring combination in the hand, int
+        """
+        return self.score_decomposed(decomposition).score
         
 
 class PairCombination(CribbageCombinationShowing):
@@ -190,31 +312,47 @@ class PairCombination(CribbageCombinationShowing):
         :parameter starter: The starter card, Card object
         :return: CribbageComboInfo object with information about the pairs in the hand, CribbageComboInfo object
         """
+        return self.score_decomposed(CribbageShowDecomposition(hand, starter))
+
+    def score_decomposed(self, decomposition):
+        """
+        Search the hand and starter in decomposition for all pairs, tally up the score, and return a CribbageComboInfo object.
+        :parameter decomposition: The hand and starter to search for pairs, CribbageShowDecomposition object
+        :return: CribbageComboInfo object with information about the pairs in the hand, CribbageComboInfo object
+        """
         # This is a cribbage hand, so make sure it has 4 cards ... NO ... pile during play may be more or less than 4
         # assert(hand.get_num_cards() == 4)
         
         info = CribbageComboInfo()
         info.combo_name = self._combo_name
         
-        cards = hand.get_cards()
-
-        # Add the starter card to the list of cards in the hand
-        if starter is not None: cards.append(starter)
+        # Every two cards of the same rank are a pair, so find the pairs from the positions of the cards of each rank.
+        pairs = []
+        for positions in decomposition.positions:
+            if len(positions) > 1:
+                pairs.extend(combinations(positions, 2))
         
-        # Create a list of all permutations of two cards in the hand.
-        permutations = self.permutations(2, cards)
-                    
-        # Iterate through the permutations and determine how many of them are pairs
-        for p in permutations:
-            if p[0].pips == p[1].pips:
-                info.number_instances += 1
-                info.instance_list.append(p)
+        if len(pairs) > 0:
+            # Order the pairs as they would be found by iterating through all permutations of two cards in the hand
+            pairs.sort()
+            cards = decomposition.cards
+            info.number_instances = len(pairs)
+            info.set_instance_list_builder(lambda: [[cards[i], cards[j]] for (i, j) in pairs])
                 
         # Set the score in the info object
         info.score = info.number_instances * self._score_per_combo      
         
         return info
 
+    def score_only_decomposed(self, decomposition):
+        """
+        Score-only mode of score_decomposed(...).
+        :parameter decomposition: The hand and starter to search for pairs, CribbageShowDecomposition object
+        :return: The points scored for pairs in the hand, int
+        """
+        # m cards of the same rank make m*(m-1)/2 pairs
+        return sum([m * (m - 1) // 2 for m in decomposition.histogram]) * self._score_per_combo
+
 
 class FlushCombination(CribbageCombinationShowing):
     """
@@ -235,35 +373,49 @@ class FlushCombination(CribbageCombinationShowing):
         :parameter starter: The starter card, Card object
         :return: CribbageComboInfo object with information about the flush in the hand, CribbageComboInfo object
         """
+        return self.score_decomposed(CribbageShowDecomposition(hand, starter))
+
+    def score_decomposed(self, decomposition):
+        """
+        Search the hand and starter in decomposition for a flush, tally up the score, and return a CribbageComboInfo object.
+        :parameter decomposition: The hand and starter to search for a flush, CribbageShowDecomposition object
+        :return: CribbageComboInfo object with information about the flush in the hand, CribbageComboInfo object
+        """
         # This is a cribbage hand, so make sure it has 4 cards
         # This is the correct assert to use, since flush is not a scoring combination during play, when we might not have 4 cards in the pile
-        assert(hand.get_num_cards() == 4)
+        assert(len(decomposition.hand_cards) == 4)
 
         info = CribbageComboInfo()
         info.combo_name = self._combo_name
         
-        cards = hand.get_cards()
-
         # Do all cards in the hand have the same suit?
-        is_flush = True
-        suit = cards[0].suit
-        for i in range(1, len(cards)):
-            if cards[i].suit != suit:
-                is_flush = False
-                break;
-
-        if is_flush:
+        suit = decomposition.flush_suit
+        if suit is not None:
             info.number_instances = 1
-            info.instance_list = [cards]
+            info.instance_list = [list(decomposition.hand_cards)]
             info.score = info.number_instances * self._score_per_combo
             
             # Check if the starter is also the same suit as the flush
+            starter = decomposition.starter
             if starter and starter.suit == suit:
                 info.instance_list[0].append(starter)
                 info.score = info.score + 1
         
         return info
 
+    def score_only_decomposed(self, decomposition):
+        """
+        Score-only mode of score_decomposed(...).
+        :parameter decomposition: The hand and starter to search for a flush, CribbageShowDecomposition object
+        :return: The points scored for a flush in the hand, int
+        """
+        assert(len(decomposition.hand_cards) == 4)
+        suit = decomposition.flush_suit
+        if suit is None: return 0
+        starter = decomposition.starter
+        if starter and starter.suit == suit: return self._score_per_combo + 1
+        return self._score_per_combo
+
 
 class CribFlushCombination(CribbageCombinationShowing):
     """
@@ -284,32 +436,43 @@ class CribFlushCombination(CribbageCombinationShowing):
         :parameter starter: The starter card, Card object
         :return: CribbageComboInfo object with information about the flush in the crib, CribbageComboInfo object
         """
+        return self.score_decomposed(CribbageShowDecomposition(hand, starter))
+
+    def score_decomposed(self, decomposition):
+        """
+        Search the crib and starter in decomposition for a flush, tally up the score, and return a CribbageComboInfo object.
+        :parameter decomposition: The crib and starter to search for a flush, CribbageShowDecomposition object
+        :return: CribbageComboInfo object with information about the flush in the crib, CribbageComboInfo object
+        """
         # This is a cribbage crib, so make sure it has 4 cards
         # This is the correct assert to use, since flush is not a scoring combination during play, when we might not have 4 cards in the pile
-        assert(hand.get_num_cards() == 4)
+        assert(len(decomposition.hand_cards) == 4)
 
         info = CribbageComboInfo()
         info.combo_name = self._combo_name
         
-        cards = hand.get_cards()
-
-        # Do all cards in the hand have the same suit?
-        is_flush = True
-        suit = cards[0].suit
-        for i in range(1, len(cards)):
-            if cards[i].suit != suit:
-                is_flush = False
-                break;
-
-        if is_flush and starter.suit == suit:
+        # Do all cards in the crib have the same suit?
+        suit = decomposition.flush_suit
+        starter = decomposition.starter
+        if suit is not None and starter.suit == suit:
             # In the crib, we only score a flush if all cards in the crib AND the starter card are of the same suit
             info.number_instances = 1
-            info.instance_list = [cards]
-            info.instance_list[0].append(starter)
+            info.instance_list = [list(decomposition.cards)]
             info.score = info.number_instances * self._score_per_combo +1
         
         return info
 
+    def score_only_decomposed(self, decomposition):
+        """
+        Score-only mode of score_decomposed(...).
+        :parameter decomposition: The crib and starter to search for a flush, CribbageShowDecomposition object
+        :return: The points scored for a flush in the crib, int
+        """
+        assert(len(decomposition.hand_cards) == 4)
+        suit = decomposition.flush_suit
+        if suit is not None and decomposition.starter.suit == suit: return self._score_per_combo + 1
+        return 0
+
 
 class HisNobsCombination(CribbageCombinationShowing):
     """
@@ -329,21 +492,27 @@ class HisNobsCombination(CribbageCombinationShowing):
         :parameter starter: The starter card, Card object
         :return: CribbageComboInfo object with information about his nobs in the hand, CribbageComboInfo object
         """
+        return self.score_decomposed(CribbageShowDecomposition(hand, starter))
+
+    def score_decomposed(self, decomposition):
+        """
+        Search the hand in decomposition for his nobs, tally up the score, and return a CribbageComboInfo object.
+        :parameter decomposition: The hand and starter to search for his nobs, CribbageShowDecomposition object
+        :return: CribbageComboInfo object with information about his nobs in the hand, CribbageComboInfo object
+        """
         # This is a cribbage hand, so make sure it has 4 cards
         # This is the correct assert to use, since his nobs is not a scoring combination during play, when we might not have 4 cards in the pile
-        assert(hand.get_num_cards() == 4)
+        assert(len(decomposition.hand_cards) == 4)
 
         info = CribbageComboInfo()
         info.combo_name = self._combo_name
-        
-        cards = hand.get_cards()
 
+        # Without a starter, there is no his nobs
+        if decomposition.starter is None: return info
+        
         # Are any of the cards in the hand a Jack? If so, does the suit of the Jack match the starter? Then list them.
-        jacks_in_hand = []
-        for i in range(len(cards)):
-            if cards[i].pips == "J":
-                if cards[i].suit == starter.suit:
-                    jacks_in_hand.append(cards[i])
+        starter_suit = decomposition.starter.suit
+        jacks_in_hand = [c for c in decomposition.hand_cards if c.pips == 'J' and c.suit == starter_suit]
 
         # Since cribbage should always be played with a single, non-infinite deck, we should never find more than one Jack where the suit
         # matches the starter.
@@ -357,6 +526,19 @@ class HisNobsCombination(CribbageCombinationShowing):
         
         return info
 
+    def score_only_decomposed(self, decomposition):
+        """
+        Score-only mode of score_decomposed(...).
+        :parameter decomposition: The hand and starter to search for his nobs, CribbageShowDecomposition object
+        :return: The points scored for his nobs in the hand, int
+        """
+        assert(len(decomposition.hand_cards) == 4)
+        if decomposition.starter is None: return 0
+        starter_suit = CODE_SUITS[card_to_code(decomposition.starter)]
+        for code in decomposition.codes[0:4]:
+            if CODE_RANKS[code] == JACK_RANK and CODE_SUITS[code] == starter_suit: return self._score_per_combo
+        return 0
+
 
 class FifteenCombination(CribbageCombinationShowing):
     """
@@ -376,37 +558,69 @@ class FifteenCombination(CribbageCombinationShowing):
         :parameter starter: The starter card, Card object
         :return: CribbageComboInfo object with information about the fifteens in the hand, CribbageComboInfo object
         """
+        return self.score_decomposed(CribbageShowDecomposition(hand, starter))
+
+    def score_decomposed(self, decomposition):
+        """
+        Search the hand and starter in decomposition for all fifteens, tally up the score, and return a CribbageComboInfo object.
+        :parameter decomposition: The hand and starter to search for fifteens, CribbageShowDecomposition object
+        :return: CribbageComboInfo object with information about the fifteens in the hand, CribbageComboInfo object
+        """
         # This is a cribbage hand, so make sure it has 4 cards ... NO ... pile during play may be more or less than 4
         # assert(hand.get_num_cards() == 4)
         
         info = CribbageComboInfo()
         info.combo_name = self._combo_name
         
-        cards = hand.get_cards()
-
-        # Add the starter card to the list of cards in the hand
-        if starter is not None: cards.append(starter)
-        
-        permutations = []
-        for size in range(2,len(cards)+1):
-            # Add to the list of permutations all permutations of size of cards in the hand.
-            permutations.extend(self.permutations(size, cards))
-                    
-        # Iterate through the many permutations and determine how many of them add to fifteen
-        for p in permutations:
-            # Add up the cards in the permutation
-            p_count = 0
-            for c in p:
-                p_count += c.count_card()
-            if p_count == 15:
-                info.number_instances += 1
-                info.instance_list.append(p)
+        # Count the fifteens first, and only build the lists of cards for each fifteen if there are any
+        info.number_instances = _count_fifteen_subsets(decomposition.values)
+        if info.number_instances > 0:
+            cards = decomposition.cards
+            values = decomposition.values
+            info.set_instance_list_builder(lambda: [[cards[i] for i in indices] for indices in _list_fifteen_subsets(values)])
                 
         # Set the score in the info object
         info.score = info.number_instances * self._score_per_combo      
         
         return info
 
+    def score_only_decomposed(self, decomposition):
+        """
+        Score-only mode of score_decomposed(...).
+        :parameter decomposition: The hand and starter to search for fifteens, CribbageShowDecomposition object
+        :return: The points scored for fifteens in the hand, int
+        """
+        return _count_fifteen_subsets(decomposition.values) * self._score_per_combo
+
+    def count(self, hand = Hand(), starter = None):
+        """
+        Counting mode of score(...). Determine the number of fifteens in hand without building any lists of cards.
+        :parameter hand: The hand to search for fifteens, Hand object
+        :parameter starter: The starter card, Card object
+        :return: The number of fifteens in the hand, int
+        """
+        cards = hand.get_cards()
+        if starter is not None: cards.append(starter)
+        return self.count_fifteens(cards)
+
+    def count_fifteens(self, cards = []):
+        """
+        Utility function that counts the subsets of cards whose count values add up to fifteen, without building any lists of cards.
+        Any number of cards may be counted.
+        :parameter cards: The cards to search for fifteens, list of Card objects
+        :return: The number of fifteens in cards, int
+        """
+        return _count_fifteen_subsets([c.count_card() for c in cards])
+
+    def list_fifteens(self, cards = []):
+        """
+        Utility function that builds the list of fifteens in cards, ordered by number of cards in the fifteen, and then in the same
+        order as itertools.combinations(...) would produce them. Any number of cards may be searched.
+        :parameter cards: The cards to search for fifteens, list of Card objects
+        :return: List of fifteens, where each fifteen is a list of Card objects, so, a list of lists
+        """
+        return [[cards[i] for i in indices] for indices in _list_fifteen_subsets([c.count_card() for c in cards])]
+
 
 class RunCombination(CribbageCombinationShowing):
     """
@@ -426,55 +640,50 @@ class RunCombination(CribbageCombinationShowing):
         :parameter starter: The starter card, Card object
         :return: CribbageComboInfo object with information about the runs in the hand, CribbageComboInfo object
         """
+        return self.score_decomposed(CribbageShowDecomposition(hand, starter))
+
+    def score_decomposed(self, decomposition):
+        """
+        Search the hand and starter in decomposition for all runs, tally up the score, and return a CribbageComboInfo object.
+        :parameter decomposition: The hand and starter to search for runs, CribbageShowDecomposition object
+        :return: CribbageComboInfo object with information about the runs in the hand, CribbageComboInfo object
+        """
         # This is a cribbage hand, so make sure it has 4 cards ... NO ... pile during play may be more or less than 4
         # assert(hand.get_num_cards() == 4)
         
         info = CribbageComboInfo()
         info.combo_name = self._combo_name
         
-        cards = hand.get_cards()
+        # Find the runs from the histogram of how many cards there are of each rank
+        (size, windows) = _find_runs(decomposition.histogram)
+        if size == 0: return info
+        info.number_instances = sum([multiplicity for (low, multiplicity) in windows])
+        info.score = info.number_instances * size
 
-        # Add the starter card to the list of cards in the hand
-        if starter is not None: cards.append(starter)
-        
-        # Must be a "greedy" algorithm, looking for long runs first
-
-        run_found = False
-        for size in range(5,2,-1): # The range is [5, 4, 3]
-        
-            # Create a list of all permutations of five cards in the hand.
-            permutations = self.permutations(size, cards)
-
-            # Do we have a run of size cards?
-            # Iterate through the size-card permutations and determine how many of them are a run
-            for p in permutations:
-                is_run = True
-                # Sort the cards in the permutation, this requires, Card class to have __lt__ method implemented
-                p.sort()
-                first_card = p.pop(0)
-                prev_sequence_count = first_card._get_sequence_count()
-                for c in p:
-                    if c._get_sequence_count() == prev_sequence_count + 1:
-                        prev_sequence_count = c._get_sequence_count()
-                    else:
-                        is_run = False
-                        break
-                if is_run:
-                    run_found = True
-                    info.number_instances += 1
-                    info.score += size
-                    # Since we popped the first card off p, when need to reassemble the original p to append it to the info.instance_list of lists
-                    list_to_append = [first_card]
-                    list_to_append.extend(p)
-                    info.instance_list.append(list_to_append)
-
-            # If we found one or more runs at the current size, then don't look for any more at the next lower size, because, of course
-            # if we have a run at (size+1) we will also have one at (size), but it will be duplicative.
-            # This is the algorithm being "greedy".
-            if run_found: break
+        # Expand the multiplicities into the instance list, if it is ever accessed. Order the runs in the same way as a search through
+        # itertools.combinations(...) would, that is, by the positions in cards of the cards that make up each run.
+        positions = decomposition.positions
+        cards = decomposition.cards
+        def build_instance_list():
+            runs = []
+            for (low, multiplicity) in windows:
+                for p in product(*[positions[rank] for rank in range(low, low + size)]):
+                    runs.append(p)
+            runs.sort(key = lambda p: sorted(p))
+            return [[cards[i] for i in p] for p in runs]
+        info.set_instance_list_builder(build_instance_list)
         
         return info
 
+    def score_only_decomposed(self, decomposition):
+        """
+        Score-only mode of score_decomposed(...).
+        :parameter decomposition: The hand and starter to search for runs, CribbageShowDecomposition object
+        :return: The points scored for runs in the hand, int
+        """
+        (size, windows) = _find_runs(decomposition.histogram)
+        return sum([multiplicity for (low, multiplicity) in windows]) * size
+
     
 class PairCombinationPlaying(CribbageCombinationPlaying):
     """
@@ -518,6 +727,20 @@ class PairCombinationPlaying(CribbageCombinationPlaying):
         
         return info
 
+    def score_only(self, pile = Hand()):
+        """
+        Score-only mode of score(...).
+        :parameter pile: The play pile to search for pairs, Hand object
+        :return: The points scored for pairs in the play pile, int
+        """
+        # Count how many of the most recently played cards, up to 4, have the same pips as the last one
+        n = len(pile)
+        if n < 2: return 0
+        rank = CODE_RANKS[card_to_code(pile[-1])]
+        same = 1
+        while same < 4 and same < n and CODE_RANKS[card_to_code(pile[-same-1])] == rank: same += 1
+        return same * (same - 1) * self._score_per_combo // 2
+
 
 class RunCombinationPlaying(CribbageCombinationPlaying):
     """
@@ -559,6 +782,27 @@ class RunCombinationPlaying(CribbageCombinationPlaying):
         
         return info
 
+    def score_only(self, pile = Hand()):
+        """
+        Score-only mode of score(...).
+        :parameter pile: The play pile to search for runs, Hand object
+        :return: The points scored for a run in the play pile, int
+        """
+        # Scan backward from the last card played. The last x cards are a run if their ranks are all different, and the highest
+        # less the lowest is x-1. Once a rank repeats, no longer stretch of cards can be a run, so stop there.
+        run_size = 0
+        ranks = set()
+        low = 14
+        high = 0
+        for x in range(1, len(pile) + 1):
+            rank = CODE_RANKS[card_to_code(pile[-x])]
+            if rank in ranks: break
+            ranks.add(rank)
+            low = min(low, rank)
+            high = max(high, rank)
+            if x >= 3 and high - low == x - 1: run_size = x
+        return run_size
+
     def test_last_x_cards_for_run(self, pile = Hand(), x = 3):
         """
         Utility function called by score().
@@ -616,3 +860,210 @@ class FifteenCombinationPlaying(CribbageCombinationPlaying):
                 info.instance_list.append(pile)
 
         return info
+
+    def score_only(self, pile = Hand()):
+        """
+        Score-only mode of score(...).
+        :parameter pile: The play pile to test for a fifteen, Hand object
+        :return: The points scored for a fifteen in the play pile, int
+        """
+        if sum([CODE_COUNTS[card_to_code(c)] for c in pile]) == 15: return self._score_per_combo
+        return 0
+
+
+def _count_fifteen_subsets(values = []):
+    """
+    Utility function that counts the subsets of values that add up to fifteen, using a subset-sum table, where ways[total] is the
+    number of subsets of the values considered so far that add up to total.
+    :parameter values: Count values of cards, list of int
+    :return: The number of subsets of values that add up to fifteen, int
+    """
+    ways = [1] + [0] * 15
+    for value in values:
+        # Iterate totals downward, so that each value is used at most once in a subset
+        for total in range(15, value - 1, -1):
+            ways[total] += ways[total - value]
+    return ways[15]
+
+
+def _list_fifteen_subsets(values = []):
+    """
+    Utility function that lists the subsets of values that add up to fifteen, ordered by number of values in the subset, and then in
+    the same order as itertools.combinations(...) would produce them. Partial sums greater than fifteen are pruned.
+    :parameter values: Count values of cards, list of int
+    :return: List of subsets, where each subset is a list of positions in values, so, a list of lists of int
+    """
+    found = []
+
+    def extend(start, total, chosen):
+        for i in range(start, len(values)):
+            new_total = total + values[i]
+            if new_total == 15:
+                found.append(chosen + [i])
+            elif new_total < 15:
+                extend(i + 1, new_total, chosen + [i])
+
+    extend(0, 0, [])
+    found.sort(key = lambda indices: (len(indices), indices))
+    return found
+
+
+def _find_runs(histogram = []):
+    """
+    Utility function that finds the runs in a hand from the histogram of how many cards there are of each rank. This is a "greedy"
+    algorithm, scoring only the longest runs. A run is at most 5 cards long, so a longer streak of consecutive ranks (in a play pile of
+    more than five cards) is scored as each of the 5-rank windows within it.
+    :parameter histogram: How many cards there are of each sequence count, indexed A=1, ..., K=13 (index 0 is unused), list of int
+    :return: Tuple (size, windows), where size is the number of cards in each run, or 0 if there are no runs, and windows is a list of
+        (lowest sequence count, number of runs) tuples, one for each window of size consecutive ranks. The number of runs in a window is
+        the product of the number of cards of each rank in the window, so, for example, a double run is a window with one rank having two
+        cards, (int, list of (int, int) tuples)
+    """
+    # Find the streaks of consecutive occupied ranks, as (first rank, length) tuples
+    streaks = []
+    rank = 1
+    while rank <= 13:
+        if histogram[rank] == 0:
+            rank += 1
+            continue
+        first = rank
+        while rank <= 13 and histogram[rank] > 0: rank += 1
+        streaks.append((first, rank - first))
+
+    size = min(5, max([length for (first, length) in streaks], default = 0))
+    if size < 3: return (0, [])
+
+    windows = []
+    for (first, length) in streaks:
+        for low in range(first, first + length - size + 1):
+            multiplicity = 1
+            for rank in range(low, low + size):
+                multiplicity *= histogram[rank]
+            windows.append((low, multiplicity))
+    return (size, windows)
+
+
+def score_show_combinations(combos = [], hand = Hand(), starter = None, score_reasons = None):
+    """
+    Score a hand or crib during show for every combination in combos, in a single pass that shares one CribbageShowDecomposition of
+    the hand and starter between all the combinations.
+    :parameter combos: The scoring combinations to search for, list of CribbageCombinationShowing objects
+    :parameter hand: The hand or crib to score, Hand object
+    :parameter starter: The starter card, or None to score the hand without a starter, Card object
+    :parameter score_reasons: If not None, then a CribbageComboInfo object for each combination found in the hand is appended to this list.
+        If None, then each combination is scored in score-only mode, without building CribbageComboInfo objects, list
+    :return: The total score of all combinations in the hand, int
+    """
+    decomposition = CribbageShowDecomposition(hand, starter)
+    score = 0
+    if score_reasons is None:
+        for combo in combos:
+            assert(isinstance(combo, CribbageCombinationShowing))
+            score += combo.score_only_decomposed(decomposition)
+        return score
+    for combo in combos:
+        assert(isinstance(combo, CribbageCombinationShowing))
+        info = combo.score_decomposed(decomposition)
+        if info.number_instances > 0:
+            score_reasons.append(info)
+        score += info.score
+    return score
+
+
+# Tables of (pairs + fifteens + runs) show points, one for four cards (a hand without a starter) and one for five cards (a hand plus
+# starter), each indexed by CribbageCardIndexer.multiset_rank(...) of the ranks of the cards. Suit plays no part in these three
+# combinations, so every hand with the same multiset of ranks shares one entry. The tables are built on first use by
+# _build_show_rank_table().
+_show_rank_tables = {}
+
+
+def _score_rank_multiset(ranks = ()):
+    """
+    Utility function that scores the pairs, fifteens, and runs in a multiset of card ranks, by enumerating subsets in the same way
+    as PairCombination, FifteenCombination, and RunCombination do for Card objects.
+    :parameter ranks: Sequence counts of the cards, A=1, [2...10], J=11, Q=12, K=13, tuple of int
+    :return: Total points for pairs, fifteens, and runs, int
+    """
+    score = 0
+    # Pairs
+    for p in combinations(ranks, 2):
+        if p[0] == p[1]: score += 2
+    # Fifteens, where J, Q, K count as 10
+    for size in range(2, len(ranks)+1):
+        for p in combinations(ranks, size):
+            if sum([min(r, 10) for r in p]) == 15: score += 2
+    # Runs, "greedy" from longest to shortest, as in RunCombination.score(...)
+    for size in range(min(5, len(ranks)), 2, -1):
+        run_score = 0
+        for p in combinations(ranks, size):
+            p = sorted(p)
+            if all(p[i] == p[0] + i for i in range(size)): run_score += size
+        if run_score > 0:
+            score += run_score
+            break
+    return score
+
+
+def _build_show_rank_table():
+    """
+    Utility function that fills _show_rank_tables for every multiset of four ranks (a hand without a starter) and five ranks
+    (a hand plus starter) that can occur in a single deck, that is, with no rank appearing more than four times.
+    :return: None
+    """
+    for size in (4, 5):
+        table = [0] * num_multisets(size)
+        for index in range(len(table)):
+            # Convert from indexer ranks (A=0, ..., K=12) to sequence counts (A=1, ..., K=13)
+            ranks = tuple([r + 1 for r in multiset_unrank(index, size)])
+            if size == 5 and ranks[0] == ranks[4]: continue # Five of a kind is not possible
+            table[index] = _score_rank_multiset(ranks)
+        _show_rank_tables[size] = table
+    return None
+
+
+def score_show(hand = Hand(), starter = None, is_crib = False):
+    """
+    Determine the total show score of a hand or crib, with the same result as summing the scores from PairCombination, FifteenCombination,
+    RunCombination, FlushCombination (or CribFlushCombination if is_crib), and HisNobsCombination. Pairs, fifteens, and runs are looked up
+    in a table indexed by the rank multiset of the cards, and flush and his nobs are determined by checking suits.
+    :parameter hand: The hand or crib to score, Hand object or list of Card objects
+    :parameter starter: The starter card, or None to score the hand without a starter, Card object
+    :parameter is_crib: If True, then flush is scored using the rules for the crib, boolean
+    :return: The total score of all combinations in the hand, int
+    """
+    cards = list(hand)
+    # This is a cribbage hand or crib, so make sure it has 4 cards, as FlushCombination and HisNobsCombination do
+    assert(len(cards) == 4)
+
+    if not _show_rank_tables: _build_show_rank_table()
+
+    codes = [card_to_code(c) for c in cards]
+    starter_code = None
+    if starter is not None: starter_code = card_to_code(starter)
+
+    ranks = [CODE_RANKS[code] for code in codes]
+    if starter_code is not None: ranks.append(CODE_RANKS[starter_code])
+    ranks.sort()
+    score = _show_rank_tables[len(ranks)][multiset_rank(ranks)]
+
+    # Flush
+    suit = CODE_SUITS[codes[0]]
+    is_flush = (CODE_SUITS[codes[1]] == suit and CODE_SUITS[codes[2]] == suit and CODE_SUITS[codes[3]] == suit)
+    starter_matches = (starter_code is not None and CODE_SUITS[starter_code] == suit)
+    if is_flush:
+        if not is_crib:
+            score += 4
+            if starter_matches: score += 1
+        elif starter_matches:
+            # In the crib, we only score a flush if all cards in the crib AND the starter card are of the same suit
+            score += 5
+
+    # His nobs
+    if starter_code is not None:
+        starter_suit = CODE_SUITS[starter_code]
+        for code in codes:
+            if CODE_RANKS[code] == JACK_RANK and CODE_SUITS[code] == starter_suit:
+                score += 1
+                break
+
+    return score
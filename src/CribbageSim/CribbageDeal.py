@@ -16,25 +16,40 @@ Exported Functions:
 
 Logging:
     Uses a logger named 'cribbage_logger' for providing game output to the user. This logger is configured
-    by calling CribbageSimulator.setup_logging(...).
+    by calling CribbageSimulator.setup_logging(...). Messages are only formatted if the logger is enabled for their level, and
+    a CribbageDeal constructed with headless = True does no logging at all.
  """
 
 # Standard imports
 import logging
 from enum import Enum
+from dataclasses import dataclass
 
 # Local imports
 from HandsDecksCards.card import Card
-from HandsDecksCards.deck import Deck, StackedDeck
+from HandsDecksCards.deck import StackedDeck
 from HandsDecksCards.hand import Hand
+from CribbageSim.CribbageDeck import CribbageDeck, CribbagePartialShuffleDeck
+from CribbageSim.CribbageHand import CribbageHand
 from CribbageSim.CribbagePlayStrategy import CribbagePlayStrategy
 from CribbageSim.CribbageCombination import CribbageCombinationShowing, CribbageComboInfo, PairCombination, FifteenCombination, RunCombination, FlushCombination, HisNobsCombination
-from CribbageSim.CribbageCombination import CribFlushCombination
+from CribbageSim.CribbageCombination import CribFlushCombination, score_show_combinations
 from CribbageSim.CribbageCombination import CribbageCombinationPlaying, FifteenCombinationPlaying, PairCombinationPlaying, RunCombinationPlaying
+from CribbageSim.CribbagePeggingState import CribbagePeggingState
+from CribbageSim.CribbageBitboard import CribbageDealBitboard, codes_to_mask
+from CribbageSim.CribbageDealState import CribbageDealState, NO_STARTER
+from CribbageSim.CribbageCardCodec import card_to_code, code_to_card, cards_to_codes
 from CribbageSim.exceptions import CribbageGameOverError
-from CribbageSim.CribbageGameOutputEvents import CribbageGameOutputEvents, CribbageGameLogInfo
+from CribbageSim.CribbageGameOutputEvents import UpdatePlayer1HandEvent, UpdatePlayer2HandEvent, UpdatePlayer1PileEvent, UpdatePlayer2PileEvent
+from CribbageSim.CribbageGameOutputEvents import UpdatePileCombinedEvent, UpdateStarterEvent, UpdateCribEvent
+from CribbageSim.CribbageEventBus import CribbageEventBus, get_event_bus
+from CribbageSim.CribbageGameRecord import CribbageDealRecord, ROLE_PLAYER, ROLE_DEALER
+from CribbageSim.CribbageTrainingExport import KIND_FORM_CRIB, KIND_FOLLOW, KIND_GO, NO_CARD
 
 
+# The logger 'cribbage_logger', looked up once, rather than on every call
+_logger = logging.getLogger('cribbage_logger')
+
 class CribbagePlayers(Enum):
     """
     An enumeration of the participants in a cribbage game.
@@ -51,23 +66,18 @@ class CribbageRole(Enum):
     PLAYER = 2
 
 
-# TODO: Consider using @dataclass decoration from module dataclasses for this type of member only class throughout.
-# See (https://docs.python.org/3/library/dataclasses.html#module-dataclasses)
+@dataclass(slots = True)
 class CribbageDealInfo:
     """
     A class with all members/attributes considered public. Used to return information about the results of a cribbage deal,
     from CribbageDeal.play(...).
     """
-    def __init__(self):
-        """
-        Create and initialize attributes.
-        """
-        self.player_play_score = 0
-        self.player_show_score = 0
-        self.dealer_play_score = 0
-        self.dealer_his_heals_score = 0 # Starter card was a J
-        self.dealer_show_score = 0
-        self.dealer_crib_score = 0
+    player_play_score: int = 0
+    player_show_score: int = 0
+    dealer_play_score: int = 0
+    dealer_his_heals_score: int = 0 # Starter card was a J
+    dealer_show_score: int = 0
+    dealer_crib_score: int = 0
 
 
 class CribbageDeal:
@@ -76,7 +86,9 @@ class CribbageDeal:
     """
     
     def __init__(self, player_strategy = CribbagePlayStrategy(), dealer_strategy = CribbagePlayStrategy(),
-                 player_peg_callback = None, dealer_peg_callback = None, player_participant = None, dealer_participant = None):
+                 player_peg_callback = None, dealer_peg_callback = None, player_participant = None, dealer_participant = None,
+                 use_bitboard = False, reuse_buffers = False, headless = False, event_bus = None, record = False,
+                 decision_exporter = None):
         """
         Construct a finite deck of Cards, an empty dealer Hand, an empty player Hand, and, and empty crib Hand.
         Create a starter card, which is expected to be replaced with a dealt one.
@@ -90,8 +102,31 @@ class CribbageDeal:
         :parameter dealer_peg_callback: Bound method for communicating scoring for dealer back to a game, e.g. CribbageDeal.peg_for_player2
         :parameter player_participant: Which game participant is the player for this deal?, CribbagePlayers Enum
         :parameter dealer_participant: Which game participant is the dealer for this deal?, CribbagePlayers Enum
+        :parameter use_bitboard: If True, also track where every card is as a CribbageDealBitboard, see get_bitboard(), boolean
+        :parameter reuse_buffers: If True, then reset_deal() empties and reuses the deck, hands, and piles of the previous deal rather than
+            constructing new ones, and cards are dealt from a CribbagePartialShuffleDeck. Note that this deals different cards than the
+            default for the same random number seed, boolean
+        :parameter headless: If True, then the deal does no logging, publishes no events, and keeps no play record, so that no time is
+            spent formatting output when playing many deals automatically, boolean
+        :parameter event_bus: The bus to publish output events on, or None for the default bus from get_event_bus(), CribbageEventBus object
+        :parameter record: If True, then keep a compact binary record of each deal, even when headless, see get_deal_record(), boolean
+        :parameter decision_exporter: If not None, then export a row for every form_crib, follow, and go decision to it, even when
+            headless, CribbageDecisionExporter object
         """
-        self._deck = Deck(isInfinite = False) # So that self has a valid _deck attribute when self.reset_deal() is called
+        if event_bus is None: event_bus = get_event_bus()
+        self._record = record
+        self._exporter = decision_exporter
+        self._event_bus = event_bus
+        self.set_headless(headless)
+        self._use_bitboard = use_bitboard
+        self._reuse_buffers = reuse_buffers
+        # So that self has a valid _deck attribute when self.reset_deal() is called
+        if self._reuse_buffers:
+            self._deck = CribbagePartialShuffleDeck()
+        else:
+            self._deck = CribbageDeck(isInfinite = False)
+        # So that reset_deal() constructs the hands and piles the first time it is called
+        self._dealer_hand = None
         self.reset_deal(player_peg_callback,dealer_peg_callback,player_participant,dealer_participant)
         self.set_dealer_play_strategy(dealer_strategy)
         self.set_player_play_strategy(player_strategy)
@@ -111,19 +146,41 @@ class CribbageDeal:
         :parameter dealer_participant: Which game participant is the dealer for this deal?, CribbagePlayers Enum
         :return: None
         """
-        # If a StackDeck has been injected, for example as part of unit testing, then leave it in place
-        if not isinstance(self._deck, StackedDeck): self._deck = Deck(isInfinite = False)
-        self._dealer_hand = Hand()
-        self._dealer_pile = Hand()
+        # If a StackDeck has been injected, for example as part of unit testing, then leave it in place. Any CribbageDeck, including
+        # one injected with set_deck(...), is restocked for the new deal.
+        if isinstance(self._deck, CribbageDeck):
+            self._deck.restock()
+        elif not isinstance(self._deck, StackedDeck):
+            self._deck = CribbageDeck(isInfinite = False)
+        if self._reuse_buffers and self._dealer_hand is not None:
+            # Empty and reuse the hands and piles from the previous deal
+            for h in (self._dealer_hand, self._dealer_pile, self._player_hand, self._crib_hand, self._player_pile, self._combined_pile):
+                h.clear()
+            self._pegging_state.reset()
+            if self._bitboard: self._bitboard.reset()
+        else:
+            self._dealer_hand = CribbageHand()
+            self._dealer_pile = CribbageHand()
+            self._player_hand = CribbageHand()
+            self._crib_hand = CribbageHand()
+            self._player_pile = CribbageHand()
+            self._combined_pile = CribbageHand()
+            # Tracks the count, and what is needed to score the next card played, for the combined pile during a go round
+            self._pegging_state = CribbagePeggingState()
+            # Optionally, track the hands, piles, and crib as card masks
+            self._bitboard = None
+            if self._use_bitboard: self._bitboard = CribbageDealBitboard()
         self._dealer_score = 0
-        self._player_hand = Hand()
-        self._crib_hand = Hand()
-        self._player_pile = Hand()
         self._player_score = 0
-        self._combined_pile = Hand()
         self._starter = Card()
+        # Has the starter been drawn from the deck?
+        self._starter_drawn = False
         # A string that could be used to help build a unit test, by passing it to @patch('sys.stdin', io.StringIO(_recorded_play)
         self._recorded_play = ''
+        # The compact binary record of the deal, if recording
+        self._deal_record = None
+        if self._record:
+            self._deal_record = CribbageDealRecord(dealer_participant.value if dealer_participant is not None else 0)
         if (player_peg_callback): assert(callable(player_peg_callback))
         if (dealer_peg_callback): assert(callable(dealer_peg_callback))
         self._player_peg_callback = player_peg_callback
@@ -145,6 +202,29 @@ class CribbageDeal:
             assert(len(self._combined_pile)>0)
             return self._combined_pile[len(self._combined_pile)-1]
         
+    def set_headless(self, headless = False):
+        """
+        Turn headless mode on or off.
+        :parameter headless: If True, then the deal does no logging, publishes no events, and keeps no play record, boolean
+        :return: None
+        """
+        self._headless = headless
+        # The bus that events are published on. When headless, a bus of its own that never has subscribers.
+        if headless:
+            self._events = CribbageEventBus()
+        else:
+            self._events = self._event_bus
+        return None
+
+    def _logging_enabled(self, level = logging.INFO):
+        """
+        Utility function that decides if messages at level should be logged. Check this before formatting a message, so that no message
+        strings are built when nothing would be output.
+        :parameter level: The logging level of the messages, int, e.g., logging.INFO
+        :return: True if messages at level should be logged, boolean
+        """
+        return not self._headless and _logger.isEnabledFor(level)
+
     def record_play(self, play_string = ''):
         """
         A utility function intended to help with creating unit tests. play_string argument is appended to self._recorded_play. The concept is that
@@ -153,9 +233,47 @@ class CribbageDeal:
         :parameter play_string: Append this string to self._recorded_play(), string
         :return: None
         """
+        # The play record is only ever output to the log, so there's no need to keep it when headless
+        if self._headless: return None
         self._recorded_play += play_string
         return None
         
+    def get_deal_record(self):
+        """
+        :return: The compact binary record of the deal, so far, or None if the deal isn't being recorded, CribbageDealRecord object
+        """
+        return self._deal_record
+
+    def get_deal_scores(self):
+        """
+        :return: (points pegged by the player, points pegged by the dealer) during the deal so far, tuple of int
+        """
+        return (self._player_score, self._dealer_score)
+
+    def _decision_state(self, hand = None):
+        """
+        Utility function that captures what a decision is exported with, before it is made.
+        :parameter hand: The hand of the role deciding, CribbageHand object
+        :return: (codes of the cards in hand, codes of the cards in the combined pile), tuple of tuples of int
+        """
+        return (tuple(cards_to_codes(hand)), tuple(cards_to_codes(self._combined_pile)))
+
+    def _export_decision(self, kind = KIND_FOLLOW, role = ROLE_PLAYER, state = ((), ()), count = 0, action = ()):
+        """
+        Utility function that exports the row of a decision.
+        :parameter kind: KIND_FORM_CRIB, KIND_FOLLOW, or KIND_GO, int
+        :parameter role: ROLE_PLAYER or ROLE_DEALER, int
+        :parameter state: What _decision_state(...) returned before the decision, tuple
+        :parameter count: The go round count before the decision, int
+        :parameter action: Codes of the cards laid in the crib, or played, tuple of int
+        :return: None
+        """
+        participant = self._participant_player if role == ROLE_PLAYER else self._participant_dealer
+        starter = card_to_code(self._starter) if self._starter_drawn else NO_CARD
+        self._exporter.add_decision(kind, role, participant.value if participant is not None else 0, count, starter, state[0], state[1],
+                                    action)
+        return None
+
     def set_player_play_strategy(self, ps = CribbagePlayStrategy()):
         """
         Set the player play strategy.
@@ -164,6 +282,13 @@ class CribbageDeal:
         """
         assert(isinstance(ps, CribbagePlayStrategy))
         self._player_play_strategy = ps
+        # Give the strategy read-only views of the hand and play pile if it can use them, otherwise copies
+        if ps.uses_state_views:
+            self._player_hand_callback = self.get_player_hand_view
+            self._player_pile_callback = self.get_combined_play_pile_view
+        else:
+            self._player_hand_callback = self.get_player_hand
+            self._player_pile_callback = self.get_combined_play_pile
         return None
             
     def set_dealer_play_strategy(self, ps = CribbagePlayStrategy()):
@@ -174,6 +299,13 @@ class CribbageDeal:
         """
         assert(isinstance(ps, CribbagePlayStrategy))
         self._dealer_play_strategy = ps
+        # Give the strategy read-only views of the hand and play pile if it can use them, otherwise copies
+        if ps.uses_state_views:
+            self._dealer_hand_callback = self.get_dealer_hand_view
+            self._dealer_pile_callback = self.get_combined_play_pile_view
+        else:
+            self._dealer_hand_callback = self.get_dealer_hand
+            self._dealer_pile_callback = self.get_combined_play_pile
         return None
 
     def get_combined_play_pile(self):
@@ -182,25 +314,128 @@ class CribbageDeal:
         :return: A list of the cards in the combined play pile, List of Card instances
         """
         return list(self._combined_pile.get_cards())
+
+    def get_combined_play_pile_view(self):
+        """
+        Return a read-only view of the cards in the combined play pile, without copying them. The view is only valid during the current
+        go round, so get a new one for each decision.
+        :return: A view of the cards in the combined play pile, CribbageCardsView object
+        """
+        return self._combined_pile.view()
     
+    def set_deck(self, deck = None):
+        """
+        Inject the deck that the deal draws from, in place of the default. A StackedDeck is left as it is by reset_deal(), and so is used up
+        by one deal. A CribbageDeck, for example a CribbageGeneratedDeck fed by a CribbageDealGenerator, is restocked by reset_deal(), and
+        so is used for every deal.
+        :parameter deck: The deck to draw from, Deck object
+        :return: None
+        """
+        self._deck = deck
+        return None
+
+    def get_bitboard(self):
+        """
+        Return the bitboard tracking the hands, piles, and crib of the deal. The bitboard is only tracked if the deal was constructed with
+        use_bitboard = True.
+        :return: The bitboard, or None if it is not tracked, CribbageDealBitboard object
+        """
+        return self._bitboard
+
+    def get_deal_state(self, go_round_count = None, next_to_play = None):
+        """
+        Capture the cards, count, and scores of the deal as a CribbageDealState, for example to explore what-if plays from it, and then
+        return to it with set_deal_state(...).
+        :parameter go_round_count: The count of the current go round, or None to use the count of the combined pile, int
+        :parameter next_to_play: Which role plays next, if known, CribbageRole Enum
+        :return: The state of the deal, CribbageDealState object
+        """
+        state = CribbageDealState()
+        if isinstance(self._deck, CribbageDeck):
+            state.deck = state.encode(self._deck.get_cards())
+        else:
+            # E.g., an injected StackedDeck, which has no accessor for its cards, but Deck.add_cards(...) returns a copy of them
+            state.deck = state.encode(self._deck.add_cards([]))
+        state.player_hand = state.encode(self._player_hand)
+        state.dealer_hand = state.encode(self._dealer_hand)
+        state.player_pile = state.encode(self._player_pile)
+        state.dealer_pile = state.encode(self._dealer_pile)
+        state.combined_pile = state.encode(self._combined_pile)
+        state.crib = state.encode(self._crib_hand)
+        if self._starter_drawn:
+            state.starter = card_to_code(self._starter)
+        if go_round_count is None:
+            self._pegging_state.sync(self._combined_pile)
+            go_round_count = self._pegging_state.get_count()
+        state.go_round_count = go_round_count
+        state.next_to_play = next_to_play
+        state.player_score = self._player_score
+        state.dealer_score = self._dealer_score
+        return state
+
+    def set_deal_state(self, state = CribbageDealState()):
+        """
+        Rebuild the deal from a CribbageDealState, keeping the deal's strategies, callbacks, and participants. The deck keeps its type,
+        with its remaining cards replaced by those of state.
+        Only the cards and scores are restored. The count of the go round follows from the combined pile, so state.go_round_count isn't
+        used, and state.next_to_play isn't either, since play() always plays a deal from its start: it can't resume in the middle of a
+        go round. A caller exploring plays from the state, e.g., a rollout, continues the go round itself, with the deal's play and
+        peg methods, from state.go_round_count and state.next_to_play.
+        :parameter state: The state to rebuild the deal from, e.g., returned by get_deal_state(), CribbageDealState object
+        :return: None
+        """
+        if isinstance(self._deck, CribbageDeck):
+            self._deck.set_cards(state.decode(state.deck))
+        elif isinstance(self._deck, StackedDeck):
+            self._deck = StackedDeck()
+            self._deck.add_cards(state.decode(state.deck))
+        for (h, codes) in ((self._player_hand, state.player_hand), (self._dealer_hand, state.dealer_hand),
+                           (self._player_pile, state.player_pile), (self._dealer_pile, state.dealer_pile),
+                           (self._combined_pile, state.combined_pile), (self._crib_hand, state.crib)):
+            h.clear()
+            h.add_cards(state.decode(codes))
+        if state.starter == NO_STARTER:
+            self._starter = Card()
+            self._starter_drawn = False
+        else:
+            self._starter = code_to_card(state.starter)
+            self._starter_drawn = True
+        self._pegging_state.reset()
+        self._pegging_state.sync(self._combined_pile)
+        self._player_score = state.player_score
+        self._dealer_score = state.dealer_score
+        if self._bitboard:
+            self._bitboard.player_hand = codes_to_mask(state.player_hand)
+            self._bitboard.dealer_hand = codes_to_mask(state.dealer_hand)
+            self._bitboard.player_pile = codes_to_mask(state.player_pile)
+            self._bitboard.dealer_pile = codes_to_mask(state.dealer_pile)
+            self._bitboard.combined_pile = codes_to_mask(state.combined_pile)
+            self._bitboard.crib = codes_to_mask(state.crib)
+            self._bitboard.starter = 0 if state.starter == NO_STARTER else 1 << state.starter
+            self._bitboard.dealt = (self._bitboard.player_hand | self._bitboard.dealer_hand | self._bitboard.player_pile |
+                                    self._bitboard.dealer_pile | self._bitboard.crib | self._bitboard.starter)
+        return None
+
     def draw_for_dealer(self, number=1):
         """
         Draw one or more cards from deck into dealer's hand.
         :parameter number: How many cards to draw into dealer's hand, int
         :return: A list of Card(s) in the hand after the draw
         """
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
-
         card_list = self._dealer_hand.add_cards(self._deck.draw(number))
+        if self._bitboard: self._bitboard.deal_to_dealer(card_list)
 
         # If dealer for this deal is player1 for the game, then we can log an updated hand to INFO, otherwise log it to DEBUG
         if self._participant_dealer == CribbagePlayers.PLAYER_1:
-            logger.info(f"Hand for {self._participant_dealer} after dealing: {self._dealer_hand}",
-                        extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PLAYER1_HAND, hand_player1=str(self._dealer_hand)))
+            if self._logging_enabled(logging.INFO):
+                _logger.info(f"Hand for {self._participant_dealer} after dealing: {self._dealer_hand}")
+            if self._events.update_player1_hand:
+                self._events.publish(UpdatePlayer1HandEvent(tuple(cards_to_codes(self._dealer_hand))))
         elif self._participant_dealer == CribbagePlayers.PLAYER_2:
-            logger.debug(f"Hand for {self._participant_dealer} after dealing: {self._dealer_hand}",
-                         extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PLAYER2_HAND, hand_player2=str(self._dealer_hand)))
+            if self._logging_enabled(logging.DEBUG):
+                _logger.debug(f"Hand for {self._participant_dealer} after dealing: {self._dealer_hand}")
+            if self._events.update_player2_hand:
+                self._events.publish(UpdatePlayer2HandEvent(tuple(cards_to_codes(self._dealer_hand))))
 
         return card_list
 
@@ -210,18 +445,20 @@ class CribbageDeal:
         :parameter number: How many cards to draw into player's hand, int
         :return: A list of Card(s) in the hand after the draw
         """
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
-
         card_list = self._player_hand.add_cards(self._deck.draw(number))
+        if self._bitboard: self._bitboard.deal_to_player(card_list)
 
         # If player for this deal is player1 for the game, then we can log an updated hand to INFO, otherwise log it to DEBUG
         if self._participant_player == CribbagePlayers.PLAYER_1:
-            logger.info(f"Hand for {self._participant_player} after deal: {self._player_hand}",
-                        extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PLAYER1_HAND, hand_player1=str(self._player_hand)))
+            if self._logging_enabled(logging.INFO):
+                _logger.info(f"Hand for {self._participant_player} after deal: {self._player_hand}")
+            if self._events.update_player1_hand:
+                self._events.publish(UpdatePlayer1HandEvent(tuple(cards_to_codes(self._player_hand))))
         elif self._participant_player == CribbagePlayers.PLAYER_2:
-            logger.debug(f"Hand for {self._participant_player} after deal: {self._player_hand}",
-                         extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PLAYER2_HAND, hand_player2=str(self._player_hand)))
+            if self._logging_enabled(logging.DEBUG):
+                _logger.debug(f"Hand for {self._participant_player} after deal: {self._player_hand}")
+            if self._events.update_player2_hand:
+                self._events.publish(UpdatePlayer2HandEvent(tuple(cards_to_codes(self._player_hand))))
 
         return card_list
 
@@ -239,12 +476,31 @@ class CribbageDeal:
         """
         return list(self._dealer_hand.get_cards())
 
+    def get_player_hand_view(self):
+        """
+        Return a read-only view of the cards remaining in the player's hand, without copying them. The view is only valid during the current
+        deal, so get a new one for each decision.
+        :return: A view of the cards remaining in the player's hand, CribbageCardsView object
+        """
+        return self._player_hand.view()
+
+    def get_dealer_hand_view(self):
+        """
+        Return a read-only view of the cards remaining in the dealer's hand, without copying them. The view is only valid during the current
+        deal, so get a new one for each decision.
+        :return: A view of the cards remaining in the dealer's hand, CribbageCardsView object
+        """
+        return self._dealer_hand.view()
+
     def draw_starter_card(self):
         """
         Draw one card from deck to be the starter card.
         :return: The starter card, Card object
         """
         self._starter = self._deck.draw()
+        self._starter_drawn = True
+        if self._deal_record: self._deal_record.starter = card_to_code(self._starter)
+        if self._bitboard: self._bitboard.set_starter(self._starter)
         return self._starter
 
     def play_card_for_player(self, index = 0):
@@ -253,34 +509,42 @@ class CribbageDeal:
         :parameter index: The index location in the player's hand of the card to play, int [0...number of cards in hand - 1]
         :return: The pips count of the card played, int
         """
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
-
         card = self._player_hand.remove_card(index)
+        if self._bitboard: self._bitboard.player_plays(card)
+        if self._deal_record: self._deal_record.add_play(ROLE_PLAYER, card_to_code(card))
         self._player_pile.add_cards(card)
         self._combined_pile.add_cards(card)
+        self._pegging_state.sync(self._combined_pile)
         
-        # Compute the total count of the play pile.
-        go_round_count = self._combined_pile.count_hand()
+        # The total count of the play pile.
+        go_round_count = self._pegging_state.get_count()
+
+        # Only build the messages if they will be logged, and the events if they have subscribers
+        info = self._logging_enabled(logging.INFO)
+        events = self._events
 
         # If player for this deal is player1 for the game, then we can log an updated hand to INFO, otherwise log it to DEBUG
         if self._participant_player == CribbagePlayers.PLAYER_1:
-            logger.info(f"     Hand for player {self._participant_player} after playing {card}: {self._player_hand}",
-                        extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PLAYER1_HAND, hand_player1=str(self._player_hand)))
-            # Also log to info update player1 play pile
-            logger.info(f"     Pile for player {self._participant_player} after playing {card}: {self._player_pile}",
-                extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PLAYER1_PILE, pile_player1=str(self._player_pile)))
+            if info:
+                _logger.info(f"     Hand for player {self._participant_player} after playing {card}: {self._player_hand}")
+                # Also log to info update player1 play pile
+                _logger.info(f"     Pile for player {self._participant_player} after playing {card}: {self._player_pile}")
+            if events.update_player1_hand: events.publish(UpdatePlayer1HandEvent(tuple(cards_to_codes(self._player_hand))))
+            if events.update_player1_pile: events.publish(UpdatePlayer1PileEvent(tuple(cards_to_codes(self._player_pile))))
         elif self._participant_player == CribbagePlayers.PLAYER_2:
-            logger.debug(f"     Hand for player {self._participant_player} after playing {card}: {self._player_hand}",
-                         extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PLAYER2_HAND, hand_player2=str(self._player_hand)))
+            if self._logging_enabled(logging.DEBUG):
+                _logger.debug(f"     Hand for player {self._participant_player} after playing {card}: {self._player_hand}")
             # Also log to info update player2 play pile
-            logger.info(f"     Pile for player {self._participant_player} after playing {card}: {self._player_pile}",
-                extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PLAYER2_PILE, pile_player2=str(self._player_pile)))
+            if info:
+                _logger.info(f"     Pile for player {self._participant_player} after playing {card}: {self._player_pile}")
+            if events.update_player2_hand: events.publish(UpdatePlayer2HandEvent(tuple(cards_to_codes(self._player_hand))))
+            if events.update_player2_pile: events.publish(UpdatePlayer2PileEvent(tuple(cards_to_codes(self._player_pile))))
 
         # Log updated combined play pile to info
-        logger.info(f"Combined pile after player {self._participant_player} played {card}: {self._combined_pile}",
-                    extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PILE_COMBINED, pile_combined=str(self._combined_pile),
-                                              go_round_count=go_round_count))
+        if info:
+            _logger.info(f"Combined pile after player {self._participant_player} played {card}: {self._combined_pile}")
+        if events.update_pile_combined:
+            events.publish(UpdatePileCombinedEvent(tuple(cards_to_codes(self._combined_pile)), go_round_count))
 
         return card.count_card()
         
@@ -290,34 +554,42 @@ class CribbageDeal:
         :parameter index: The index location in the dealer's hand of the card to play, int [0...number of cards in hand - 1]
         :return: The pips count of the card played, int
         """
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
-
         card = self._dealer_hand.remove_card(index)
+        if self._bitboard: self._bitboard.dealer_plays(card)
+        if self._deal_record: self._deal_record.add_play(ROLE_DEALER, card_to_code(card))
         self._dealer_pile.add_cards(card)
         self._combined_pile.add_cards(card)
+        self._pegging_state.sync(self._combined_pile)
 
-        # Compute the total count of the play pile.
-        go_round_count = self._combined_pile.count_hand()
+        # The total count of the play pile.
+        go_round_count = self._pegging_state.get_count()
+
+        # Only build the messages if they will be logged, and the events if they have subscribers
+        info = self._logging_enabled(logging.INFO)
+        events = self._events
 
         # If dealer for this deal is player1 for the game, then we can log an updated hand to INFO, otherwise log it to DEBUG
         if self._participant_dealer == CribbagePlayers.PLAYER_1:
-            logger.info(f"     Hand for dealer {self._participant_dealer} after playing {card}: {self._dealer_hand}",
-                        extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PLAYER1_HAND, hand_player1=str(self._dealer_hand)))
-            # Also log to info update player1 play pile
-            logger.info(f"     Pile for dealer {self._participant_dealer} after playing {card}: {self._dealer_pile}",
-                extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PLAYER1_PILE, pile_player1=str(self._dealer_pile)))
+            if info:
+                _logger.info(f"     Hand for dealer {self._participant_dealer} after playing {card}: {self._dealer_hand}")
+                # Also log to info update player1 play pile
+                _logger.info(f"     Pile for dealer {self._participant_dealer} after playing {card}: {self._dealer_pile}")
+            if events.update_player1_hand: events.publish(UpdatePlayer1HandEvent(tuple(cards_to_codes(self._dealer_hand))))
+            if events.update_player1_pile: events.publish(UpdatePlayer1PileEvent(tuple(cards_to_codes(self._dealer_pile))))
         elif self._participant_dealer == CribbagePlayers.PLAYER_2:
-            logger.debug(f"     Hand for dealer {self._participant_dealer} after playing {card}: {self._dealer_hand}",
-                         extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PLAYER2_HAND, hand_player2=str(self._dealer_hand)))
+            if self._logging_enabled(logging.DEBUG):
+                _logger.debug(f"     Hand for dealer {self._participant_dealer} after playing {card}: {self._dealer_hand}")
             # Also log to info update player2 play pile
-            logger.info(f"     Pile for dealer {self._participant_dealer} after playing {card}: {self._dealer_pile}",
-                extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PLAYER2_PILE, pile_player2=str(self._dealer_pile)))
+            if info:
+                _logger.info(f"     Pile for dealer {self._participant_dealer} after playing {card}: {self._dealer_pile}")
+            if events.update_player2_hand: events.publish(UpdatePlayer2HandEvent(tuple(cards_to_codes(self._dealer_hand))))
+            if events.update_player2_pile: events.publish(UpdatePlayer2PileEvent(tuple(cards_to_codes(self._dealer_pile))))
 
         # Log updated combined play pile to info
-        logger.info(f"Combined pile after dealer {self._participant_dealer} played {card}: {self._combined_pile}",
-                    extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PILE_COMBINED, pile_combined=str(self._combined_pile),
-                                              go_round_count=go_round_count))
+        if info:
+            _logger.info(f"Combined pile after dealer {self._participant_dealer} played {card}: {self._combined_pile}")
+        if events.update_pile_combined:
+            events.publish(UpdatePileCombinedEvent(tuple(cards_to_codes(self._combined_pile)), go_round_count))
 
         return card.count_card()
 
@@ -343,14 +615,14 @@ class CribbageDeal:
         if count > 0:
             # Update score for the deal
             self._player_score += count
+            if self._deal_record: self._deal_record.add_peg(ROLE_PLAYER, count)
             # Update score for the game
             if (self._player_peg_callback):
                 self._player_peg_callback(count, reasons)
             else:
                 # No callback available to peg for player, so, log scoring info from here
-                # Get the logger 'cribbage_logger'
-                logger = logging.getLogger('cribbage_logger')
-                logger.info(f"Player pegs a total of {count} for:\n{self._make_reasons_string(reasons)}")
+                if self._logging_enabled(logging.INFO):
+                    _logger.info(f"Player pegs a total of {count} for:\n{self._make_reasons_string(reasons)}")
         return self._player_score
 
     def peg_for_dealer(self, count = 1, reasons = []):
@@ -363,14 +635,14 @@ class CribbageDeal:
         if count > 0:
             # Update score for the deal
             self._dealer_score += count
+            if self._deal_record: self._deal_record.add_peg(ROLE_DEALER, count)
             # Update score for the game
             if (self._dealer_peg_callback):
                 self._dealer_peg_callback(count, reasons)
             else:
                 # No callback available to peg for dealer, so, log scoring info from here
-                # Get the logger 'cribbage_logger'
-                logger = logging.getLogger('cribbage_logger')
-                logger.info(f"Dealer pegs a total of {count} for:\n{self._make_reasons_string(reasons)}")                
+                if self._logging_enabled(logging.INFO):
+                    _logger.info(f"Dealer pegs a total of {count} for:\n{self._make_reasons_string(reasons)}")                
         return self._dealer_score
 
     def xfer_player_card_to_crib(self, index = 0):
@@ -381,19 +653,22 @@ class CribbageDeal:
         :parameter index: The index location in the player's hand of the card to play, int [0...number of cards in hand - 1]
         :return None:
         """
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
-
         card = self._player_hand.remove_card(index)
+        if self._bitboard: self._bitboard.player_to_crib(card)
+        if self._deal_record: self._deal_record.player_crib += (card_to_code(card),)
         self._crib_hand.add_cards(card)
 
         # If player for this deal is player1 for the game, then we can log an updated hand to INFO, otherwise log it to DEBUG
         if self._participant_player == CribbagePlayers.PLAYER_1:
-            logger.info(f"     Hand for {self._participant_player} after laying {card} in crib: {self._player_hand}",
-                        extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PLAYER1_HAND, hand_player1=str(self._player_hand)))
+            if self._logging_enabled(logging.INFO):
+                _logger.info(f"     Hand for {self._participant_player} after laying {card} in crib: {self._player_hand}")
+            if self._events.update_player1_hand:
+                self._events.publish(UpdatePlayer1HandEvent(tuple(cards_to_codes(self._player_hand))))
         elif self._participant_player == CribbagePlayers.PLAYER_2:
-            logger.debug(f"     Hand for {self._participant_player} after laying {card} in crib: {self._player_hand}",
-                         extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PLAYER2_HAND, hand_player2=str(self._player_hand)))
+            if self._logging_enabled(logging.DEBUG):
+                _logger.debug(f"     Hand for {self._participant_player} after laying {card} in crib: {self._player_hand}")
+            if self._events.update_player2_hand:
+                self._events.publish(UpdatePlayer2HandEvent(tuple(cards_to_codes(self._player_hand))))
 
         return None
 
@@ -405,19 +680,22 @@ class CribbageDeal:
         :parameter index: The index location in the dealer's hand of the card to play, int [0...number of cards in hand - 1]
         :return None:
         """
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
-
         card = self._dealer_hand.remove_card(index)
+        if self._bitboard: self._bitboard.dealer_to_crib(card)
+        if self._deal_record: self._deal_record.dealer_crib += (card_to_code(card),)
         self._crib_hand.add_cards(card)
 
         # If dealer for this deal is player1 for the game, then we can log an updated hand to INFO, otherwise log it to DEBUG
         if self._participant_dealer == CribbagePlayers.PLAYER_1:
-            logger.info(f"     Hand for {self._participant_dealer} after laying {card} in crib: {self._dealer_hand}",
-                        extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PLAYER1_HAND, hand_player1=str(self._dealer_hand)))
+            if self._logging_enabled(logging.INFO):
+                _logger.info(f"     Hand for {self._participant_dealer} after laying {card} in crib: {self._dealer_hand}")
+            if self._events.update_player1_hand:
+                self._events.publish(UpdatePlayer1HandEvent(tuple(cards_to_codes(self._dealer_hand))))
         elif self._participant_dealer == CribbagePlayers.PLAYER_2:
-            logger.debug(f"     Hand for {self._participant_dealer} after laying {card} in crib: {self._dealer_hand}",
-                         extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_PLAYER2_HAND, hand_player2=str(self._dealer_hand)))
+            if self._logging_enabled(logging.DEBUG):
+                _logger.debug(f"     Hand for {self._participant_dealer} after laying {card} in crib: {self._dealer_hand}")
+            if self._events.update_player2_hand:
+                self._events.publish(UpdatePlayer2HandEvent(tuple(cards_to_codes(self._dealer_hand))))
 
         return None
 
@@ -431,19 +709,8 @@ class CribbageDeal:
             the method.
         :return: The total score of all combinations in the hand, int
         """
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
-
-        score = 0
-        for combo in self._hand_show_combinations:
-            assert(isinstance(combo, CribbageCombinationShowing))
-            info = combo.score(hand, starter)
-            if info.number_instances > 0:
-                score_reasons.append(info)
-                # TODO: Remove the following logger line, once this has been "centralized" into pegging methods.
-                # logger.info(f"     {str(info)}")
-            score += info.score
-        return score
+        # Score all the combinations in one pass, sharing one decomposition of the hand and starter
+        return score_show_combinations(self._hand_show_combinations, hand, starter, score_reasons)
 
     def determine_score_showing_crib(self, hand = Hand(), starter = None, score_reasons = []):
         """
@@ -455,19 +722,8 @@ class CribbageDeal:
             the method.
         :return: The total score of all combinations in the crib, int
         """
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
-
-        score = 0
-        for combo in self._crib_show_combinations:
-            assert(isinstance(combo, CribbageCombinationShowing))
-            info = combo.score(hand, starter)
-            if info.number_instances > 0:
-                score_reasons.append(info)
-                # TODO: Remove the following logger line, once this has been "centralized" into pegging methods.
-                # logger.info(f"     {str(info)}")
-            score += info.score
-        return score
+        # Score all the combinations in one pass, sharing one decomposition of the crib and starter
+        return score_show_combinations(self._crib_show_combinations, hand, starter, score_reasons)
 
     def determine_score_playing(self, combined_pile = Hand(), role_that_played = None, score_reasons = []):
         """
@@ -479,27 +735,33 @@ class CribbageDeal:
             the method.
         :return: Points scored based on play of last card, int
         """
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
-
         info_list = []
 
+        # If combined_pile is the pile tracked by self._pegging_state, then the points for the last card played are already known,
+        # and only the combinations that scored need to be searched for, to provide the reasons for the score.
+        tracked_points = None
+        if self._pegging_state.matches(combined_pile):
+            (fifteen, pair, run) = self._pegging_state.get_last_points()
+            tracked_points = {FifteenCombinationPlaying: fifteen, PairCombinationPlaying: pair, RunCombinationPlaying: run}
+
         score = 0
         for combo in self._play_combinations:
             assert(isinstance(combo, CribbageCombinationPlaying))
+            if tracked_points is not None and type(combo) in tracked_points and tracked_points[type(combo)] == 0:
+                continue
             info = combo.score(combined_pile)
             if info.number_instances > 0:
                 info_list.append(info)
                 score_reasons.append(info)
             score += info.score
 
-        if score >0:
-            logger.info(f"Scoring combinations from {str(role_that_played)} play of card {str(self.last_card_played(combined_pile))}:")
+        if score >0 and self._logging_enabled(logging.INFO):
+            _logger.info(f"Scoring combinations from {str(role_that_played)} play of card {str(self.last_card_played(combined_pile))}:")
             for info in info_list:
                 # TODO: Remove the following logger line, once this has been "centralized" into pegging methods.
-                # logger.info(f"     {str(info)}")
+                # _logger.info(f"     {str(info)}")
                 pass
-            logger.info(f"     Score: {score}")
+            _logger.info(f"     Score: {score}")
 
         return score
 
@@ -508,11 +770,10 @@ class CribbageDeal:
         Logs current state of pegging for dealer and player cumulatively during the hand.
         :return: None
         """
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
+        if not self._logging_enabled(logging.DEBUG): return None
 
-        logger.debug(f"Dealer total score thus far for the dealt hand: {self._dealer_score}")
-        logger.debug(f"Player total score thus far for the dealt hand: {self._player_score}")
+        _logger.debug(f"Dealer total score thus far for the dealt hand: {self._dealer_score}")
+        _logger.debug(f"Player total score thus far for the dealt hand: {self._player_score}")
         return None
     
     def log_play_info(self, preface = '', go_round_count = 0):
@@ -522,16 +783,15 @@ class CribbageDeal:
         :parameter go_round_count: The current play count during the go round, int
         :return: None
         """
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
-
-        logger.debug(f"{preface}:")
-        logger.debug(f"     Dealer hand after card played: {self._dealer_hand}") # Always debug
-        logger.debug(f"     Dealer pile after card played: {self._dealer_pile}")
-        logger.debug(f"     Player hand after card played: {self._player_hand}") # Always debug
-        logger.debug(f"     Player pile after card played: {self._player_pile}")
-        logger.debug(f"     Combined pile after played: {self._combined_pile}")
-        logger.debug(f"     Play count after card played: {go_round_count}")
+        if not self._logging_enabled(logging.DEBUG): return None
+
+        _logger.debug(f"{preface}:")
+        _logger.debug(f"     Dealer hand after card played: {self._dealer_hand}") # Always debug
+        _logger.debug(f"     Dealer pile after card played: {self._dealer_pile}")
+        _logger.debug(f"     Player hand after card played: {self._player_hand}") # Always debug
+        _logger.debug(f"     Player pile after card played: {self._player_pile}")
+        _logger.debug(f"     Combined pile after played: {self._combined_pile}")
+        _logger.debug(f"     Play count after card played: {go_round_count}")
         return None
 
     # TODO: play() is very long. It would be good to refactor and break it apart into some smaller units.
@@ -540,42 +800,53 @@ class CribbageDeal:
         Play the cribbage deal.
         :return: Information about the results of the deal, CribbageDealInfo object
         """
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
+        # Decide once for the deal which messages to log, so that no messages are built unless they will be output
+        info = self._logging_enabled(logging.INFO)
+        debug = self._logging_enabled(logging.DEBUG)
 
         # Initialize the return object
         deal_info = CribbageDealInfo()
 
-        # Shuffle, that is, rebuild the deck
-        self._deck.create_deck()
+        # Shuffle, that is, rebuild the deck. A CribbagePartialShuffleDeck was already restocked by reset_deal().
+        if not self._reuse_buffers: self._deck.create_deck()
         
         # Deal player and dealer hands from the deck. In a normal game, this would be one card at a time alternating.
         # However, in this case it is advantageous to deal all six cards to each hand at once, to facilitate using a stacked deck for testing.
         self.draw_for_player(6)
-        logger.debug(f"Dealt player hand: {self._player_hand}")
+        if debug: _logger.debug(f"Dealt player hand: {self._player_hand}")
         # To facilitate creating a unit test from the deal
-        logger.debug(f"Dealt player hand: {repr(self._player_hand)}")
+        if debug: _logger.debug(f"Dealt player hand: {repr(self._player_hand)}")
         self.draw_for_dealer(6)
-        logger.debug(f"Dealt dealer hand: {self._dealer_hand}")
+        if debug: _logger.debug(f"Dealt dealer hand: {self._dealer_hand}")
         # To facilitate creating a unit test from the deal
-        logger.debug(f"Dealt dealer hand: {repr(self._dealer_hand)}")
+        if debug: _logger.debug(f"Dealt dealer hand: {repr(self._dealer_hand)}")
+        if self._deal_record:
+            self._deal_record.dealt = tuple(cards_to_codes(self._player_hand)) + tuple(cards_to_codes(self._dealer_hand))
         
         # Apply the player and dealer strategies to have player and dealer select two cards each from their hands to form the crib.
-        self._player_play_strategy.form_crib(self.xfer_player_card_to_crib, self.get_player_hand, self.record_play)
-        self._dealer_play_strategy.form_crib(self.xfer_dealer_card_to_crib, self.get_dealer_hand, self.record_play)
-        logger.debug(f"Player hand after crib formed: {self._player_hand}")
-        logger.debug(f"Dealer hand after crib formed: {self._dealer_hand}")
-        logger.debug(f"Crib hand: {self._crib_hand}")
+        if self._exporter:
+            self._exporter.begin_deal()
+            state = self._decision_state(self._player_hand)
+        self._player_play_strategy.form_crib(self.xfer_player_card_to_crib, self._player_hand_callback, self.record_play)
+        if self._exporter:
+            self._export_decision(KIND_FORM_CRIB, ROLE_PLAYER, state, 0, tuple(cards_to_codes(self._crib_hand)))
+            state = self._decision_state(self._dealer_hand)
+        self._dealer_play_strategy.form_crib(self.xfer_dealer_card_to_crib, self._dealer_hand_callback, self.record_play)
+        if self._exporter:
+            self._export_decision(KIND_FORM_CRIB, ROLE_DEALER, state, 0, tuple(cards_to_codes(self._crib_hand))[2:])
+        if debug: _logger.debug(f"Player hand after crib formed: {self._player_hand}")
+        if debug: _logger.debug(f"Dealer hand after crib formed: {self._dealer_hand}")
+        if debug: _logger.debug(f"Crib hand: {self._crib_hand}")
 
         # Deal the starter card. IFF it is a Jack, peg 2 for the dealer.
         starter = self.draw_starter_card()
-        logger.info(f"Starter card: {starter}",
-                    extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_STARTER, starter=str(starter)))
+        if info: _logger.info(f"Starter card: {starter}")
+        if self._events.update_starter: self._events.publish(UpdateStarterEvent(card_to_code(starter)))
         # To facilitate creating a unit test from the deal
-        logger.debug(f"Starter card: {repr(starter)}")
+        if debug: _logger.debug(f"Starter card: {repr(starter)}")
         if starter.pips == 'J':
             # Peg 2 for dealer
-            logger.info('Dealer scores 2 because the starter is a Jack, a.k.a. His Heels.')
+            if info: _logger.info('Dealer scores 2 because the starter is a Jack, a.k.a. His Heels.')
             deal_info.dealer_his_heals_score += 2
             # Build a CribbageComboInfo object to explain the reason for scoring
             reason = CribbageComboInfo()
@@ -588,7 +859,7 @@ class CribbageDeal:
             except CribbageGameOverError as e:
                 # (except covered by unit test)
                 # Output the play record to facilitate unit test creation
-                logger.debug(f"Play record: {self._recorded_play}")
+                if debug: _logger.debug(f"Play record: {self._recorded_play}")
                 # Raise a new CribbageGameOverError with the added deal_info
                 raise CribbageGameOverError('Game ended on drawing His Heels as starter', deal_info = deal_info)
 
@@ -604,7 +875,12 @@ class CribbageDeal:
             go_declared = False
         
             # Clear the combined pile of cards played during the go round, as this pile is used for scoring during play
-            self._combined_pile = Hand()
+            if self._reuse_buffers:
+                self._combined_pile.clear()
+            else:
+                self._combined_pile = CribbageHand()
+            self._pegging_state.reset()
+            if self._bitboard: self._bitboard.clear_combined_pile()
 
             # If go_declared, then it is a signal that the go round has finished inside this while loop by playing out a go, and it is
             # time to return to the outside while and launch the next go round. if go_round_count == 31, then it is a signal that the 
@@ -613,12 +889,17 @@ class CribbageDeal:
             while not go_declared and go_round_count != 31:
 
                 # Whoever is next to play follows using their play strategy.
-                prefix  = 'After play by ' + str(next_to_play)
+                prefix  = 'After play by ' + str(next_to_play) if debug else ''
                 match next_to_play:
                     case CribbageRole.PLAYER:
+                        if self._exporter: state = self._decision_state(self._player_hand)
                         (count, go_declared) = self._player_play_strategy.follow(go_round_count, self.play_card_for_player,
-                                                                                 self.get_player_hand, self.get_combined_play_pile,
+                                                                                 self._player_hand_callback, self._player_pile_callback,
                                                                                  self.record_play)
+                        if go_declared and self._deal_record: self._deal_record.add_go(ROLE_PLAYER)
+                        if self._exporter:
+                            self._export_decision(KIND_FOLLOW, ROLE_PLAYER, state, go_round_count,
+                                                  tuple(cards_to_codes(self._combined_pile))[len(state[1]):])
                         # Assess if any score in play has occured based on the player's follow. If so, peg it for the player.
                         if not go_declared:
                             reasons = []
@@ -629,15 +910,20 @@ class CribbageDeal:
                             except CribbageGameOverError as e:
                                 # (except covered by unit test)
                                 # Output the play record to facilitate unit test creation
-                                logger.debug(f"Play record: {self._recorded_play}")
+                                if debug: _logger.debug(f"Play record: {self._recorded_play}")
                                 # Raise a new CribbageGameOverError with the added deal_info
                                 raise CribbageGameOverError('Game ended while scoring player play combination', deal_info = deal_info)
                         # Rotate who will play next
                         next_to_play = CribbageRole.DEALER
                     case CribbageRole.DEALER:
+                        if self._exporter: state = self._decision_state(self._dealer_hand)
                         (count, go_declared) = self._dealer_play_strategy.follow(go_round_count, self.play_card_for_dealer,
-                                                                                 self.get_dealer_hand, self.get_combined_play_pile,
+                                                                                 self._dealer_hand_callback, self._dealer_pile_callback,
                                                                                  self.record_play)
+                        if go_declared and self._deal_record: self._deal_record.add_go(ROLE_DEALER)
+                        if self._exporter:
+                            self._export_decision(KIND_FOLLOW, ROLE_DEALER, state, go_round_count,
+                                                  tuple(cards_to_codes(self._combined_pile))[len(state[1]):])
                         # Assess if any score in play has occured based on the dealer's follow. If so, peg it for the dealer.
                         if not go_declared:
                             reasons = []
@@ -648,7 +934,7 @@ class CribbageDeal:
                             except CribbageGameOverError as e:
                                 # (except covered by unit test)
                                 # Output the play record to facilitate unit test creation
-                                logger.debug(f"Play record: {self._recorded_play}")
+                                if debug: _logger.debug(f"Play record: {self._recorded_play}")
                                 # Raise a new CribbageGameOverError with the added deal_info
                                 raise CribbageGameOverError('Game ended while scoring dealer play combination', deal_info = deal_info)
                         # Rotate who will play next
@@ -656,7 +942,7 @@ class CribbageDeal:
                 go_round_count += count
                 
                 self.log_play_info(prefix, go_round_count)
-                if go_declared: logger.info(f"     Go Declared?: {go_declared}")
+                if go_declared and info: _logger.info(f"     Go Declared?: {go_declared}")
                 self.log_pegging_info()
                 
                 # Has count for the go round reached exactly 31?
@@ -664,7 +950,7 @@ class CribbageDeal:
                     match next_to_play:
                         case CribbageRole.PLAYER:
                             # Since we rotate who will play next above, this means that dealer played to reach 31
-                            logger.info('Go round ends with count of 31 by Dealer.')
+                            if info: _logger.info('Go round ends with count of 31 by Dealer.')
                             deal_info.dealer_play_score += 2
                             # Build a CribbageComboInfo object to explain the reason for scoring
                             reason = CribbageComboInfo()
@@ -676,12 +962,12 @@ class CribbageDeal:
                             except CribbageGameOverError as e:
                                 # (except covered by unit test)
                                 # Output the play record to facilitate unit test creation
-                                logger.debug(f"Play record: {self._recorded_play}")
+                                if debug: _logger.debug(f"Play record: {self._recorded_play}")
                                 # Raise a new CribbageGameOverError with the added deal_info
                                 raise CribbageGameOverError('Game ended when dealer played to 31', deal_info = deal_info)
                         case CribbageRole.DEALER:
                             # Since we rotate who will play next above, this means that player played to reach 31
-                            logger.info('Go round ends with count of 31 by Player.')
+                            if info: _logger.info('Go round ends with count of 31 by Player.')
                             deal_info.player_play_score += 2
                             # Build a CribbageComboInfo object to explain the reason for scoring
                             reason = CribbageComboInfo()
@@ -693,7 +979,7 @@ class CribbageDeal:
                             except CribbageGameOverError as e:
                                 # (except covered by unit test)
                                 # Output the play record to facilitate unit test creation
-                                logger.debug(f"Play record: {self._recorded_play}")
+                                if debug: _logger.debug(f"Play record: {self._recorded_play}")
                                 # Raise a new CribbageGameOverError with the added deal_info
                                 raise CribbageGameOverError('Game ended when player played to 31', deal_info = deal_info)
                     self.log_pegging_info()
@@ -706,20 +992,27 @@ class CribbageDeal:
                             prefix  = 'After go declared by Dealer'
                             # Capture player score before play strategy GO call
                             pre_go_score = self._player_score
+                            if self._exporter: state = self._decision_state(self._player_hand)
                             # Try/Except requrired in case call to self.peg_for_player ends game.
                             try:
-                                count = self._player_play_strategy.go(go_round_count, self.play_card_for_player, self.get_player_hand,
-                                                                      self.get_combined_play_pile, self.determine_score_playing, self.peg_for_player,
+                                count = self._player_play_strategy.go(go_round_count, self.play_card_for_player, self._player_hand_callback,
+                                                                      self._player_pile_callback, self.determine_score_playing, self.peg_for_player,
                                                                       self.record_play)
                             except CribbageGameOverError as e:
                                 # (except covered by unit test)
                                 # Dig go_play_score out of e, and add it to deal_info
                                 deal_info.player_play_score += e.go_play_score
                                 # Output the play record to facilitate unit test creation
-                                logger.debug(f"Play record: {self._recorded_play}")
+                                if debug: _logger.debug(f"Play record: {self._recorded_play}")
+                                if self._exporter:
+                                    self._export_decision(KIND_GO, ROLE_PLAYER, state, go_round_count,
+                                                          tuple(cards_to_codes(self._combined_pile))[len(state[1]):])
                                 # Raise a new CribbageGameOverError with the added deal_info
                                 # TODO: Should I feed go_play_score into the new exception?
                                 raise CribbageGameOverError('Game ended when player scored a combination during GO', deal_info = deal_info)
+                            if self._exporter:
+                                self._export_decision(KIND_GO, ROLE_PLAYER, state, go_round_count,
+                                                      tuple(cards_to_codes(self._combined_pile))[len(state[1]):])
                             # Need to handle adding any play score during play strategy GO to deal_info
                             deal_info.player_play_score += (self._player_score - pre_go_score)
                             # Score 1 or 2 for the player, depending on how the player played out the go
@@ -736,7 +1029,7 @@ class CribbageDeal:
                                 except CribbageGameOverError as e:
                                     # (except covered by unit test)
                                     # Output the play record to facilitate unit test creation
-                                    logger.debug(f"Play record: {self._recorded_play}")
+                                    if debug: _logger.debug(f"Play record: {self._recorded_play}")
                                     # Raise a new CribbageGameOverError with the added deal_info
                                     raise CribbageGameOverError('Game ended when player scored after GO', deal_info = deal_info)
                             else:
@@ -751,7 +1044,7 @@ class CribbageDeal:
                                 except CribbageGameOverError as e:
                                     # (except covered by unit test)
                                     # Output the play record to facilitate unit test creation
-                                    logger.debug(f"Play record: {self._recorded_play}")
+                                    if debug: _logger.debug(f"Play record: {self._recorded_play}")
                                     # Raise a new CribbageGameOverError with the added deal_info
                                     raise CribbageGameOverError('Game ended when player scored after GO', deal_info = deal_info)
 
@@ -761,20 +1054,27 @@ class CribbageDeal:
                             prefix  = 'After go declared by Player'
                             # Capture dealer score before play strategy GO call
                             pre_go_score = self._dealer_score
+                            if self._exporter: state = self._decision_state(self._dealer_hand)
                             # Try/Except requrired in case call to self.peg_for_dealer ends game.
                             try:
-                                count = self._dealer_play_strategy.go(go_round_count, self.play_card_for_dealer, self.get_dealer_hand,
-                                                                      self.get_combined_play_pile, self.determine_score_playing, self.peg_for_dealer,
+                                count = self._dealer_play_strategy.go(go_round_count, self.play_card_for_dealer, self._dealer_hand_callback,
+                                                                      self._dealer_pile_callback, self.determine_score_playing, self.peg_for_dealer,
                                                                       self.record_play)
                             except CribbageGameOverError as e:
                                 # Dig go_play_score out of e, and add it to deal_info
                                 deal_info.dealer_play_score += e.go_play_score
                                 # (except covered by unit test)
                                 # Output the play record to facilitate unit test creation
-                                logger.debug(f"Play record: {self._recorded_play}")
+                                if debug: _logger.debug(f"Play record: {self._recorded_play}")
+                                if self._exporter:
+                                    self._export_decision(KIND_GO, ROLE_DEALER, state, go_round_count,
+                                                          tuple(cards_to_codes(self._combined_pile))[len(state[1]):])
                                 # Raise a new CribbageGameOverError with the added deal_info
                                 # TODO: Should I feed go_play_score into the new exception?
                                 raise CribbageGameOverError('Game ended when dealer scored a combination during GO', deal_info = deal_info)
+                            if self._exporter:
+                                self._export_decision(KIND_GO, ROLE_DEALER, state, go_round_count,
+                                                      tuple(cards_to_codes(self._combined_pile))[len(state[1]):])
                             # Need to handle adding any play score during play strategy GO to deal_info
                             deal_info.dealer_play_score += (self._dealer_score - pre_go_score)
                             # Score 1 or 2 for the dealer, depending on how the dealer played out the go
@@ -791,7 +1091,7 @@ class CribbageDeal:
                                 except CribbageGameOverError as e:
                                     # (except covered by unit test)
                                     # Output the play record to facilitate unit test creation
-                                    logger.debug(f"Play record: {self._recorded_play}")
+                                    if debug: _logger.debug(f"Play record: {self._recorded_play}")
                                     # Raise a new CribbageGameOverError with the added deal_info
                                     raise CribbageGameOverError('Game ended when dealer scored after GO', deal_info = deal_info)
                             else:
@@ -806,7 +1106,7 @@ class CribbageDeal:
                                 except CribbageGameOverError as e:
                                     # (except covered by unit test)
                                     # Output the play record to facilitate unit test creation
-                                    logger.debug(f"Play record: {self._recorded_play}")
+                                    if debug: _logger.debug(f"Play record: {self._recorded_play}")
                                     # Raise a new CribbageGameOverError with the added deal_info
                                     raise CribbageGameOverError('Game ended when dealer scored after GO', deal_info = deal_info)
                             # Rotate who will play next
@@ -825,54 +1125,57 @@ class CribbageDeal:
         # It's time to show (that is, count the hands after playing). During play, the hands have been emptied into the play piles, so score the piles.
  
         # Score the player's hand
-        logger.info(f"Showing player hand: {str(self._player_pile)}")
+        if info: _logger.info(f"Showing player hand: {str(self._player_pile)}")
         reasons = []
         score = self.determine_score_showing_hand(self._player_pile, starter, reasons)
-        logger.info(f"     Total player score from showing hand: {score}")
+        if info: _logger.info(f"     Total player score from showing hand: {score}")
         deal_info.player_show_score += score
         try:
             self.peg_for_player(score, reasons)
         except CribbageGameOverError as e:
             # (except covered by unit test)
             # Output the play record to facilitate unit test creation
-            logger.debug(f"Play record: {self._recorded_play}")
+            if debug: _logger.debug(f"Play record: {self._recorded_play}")
             # Raise a new CribbageGameOverError with the added deal_info
             raise CribbageGameOverError('Game ended while showing player hand', deal_info = deal_info)
  
         # Score the dealer's hand
-        logger.info(f"Showing dealer hand: {str(self._dealer_pile)}")
+        if info: _logger.info(f"Showing dealer hand: {str(self._dealer_pile)}")
         reasons = []
         score = self.determine_score_showing_hand(self._dealer_pile, starter, reasons)
-        logger.info(f"     Total dealer score from showing hand: {score}")
+        if info: _logger.info(f"     Total dealer score from showing hand: {score}")
         deal_info.dealer_show_score += score
         try:
             self.peg_for_dealer(score, reasons)
         except CribbageGameOverError as e:
             # (except covered by unit test)
             # Output the play record to facilitate unit test creation
-            logger.debug(f"Play record: {self._recorded_play}")
+            if debug: _logger.debug(f"Play record: {self._recorded_play}")
             # Raise a new CribbageGameOverError with the added deal_info
             raise CribbageGameOverError('Game ended while showing dealer hand', deal_info = deal_info)
         
         # Score the dealer's crib
-        logger.info(f"Showing dealer crib: {str(self._crib_hand)}",
-                    extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_CRIB,  crib=str(self._crib_hand)))
+        if info: _logger.info(f"Showing dealer crib: {str(self._crib_hand)}")
+        if self._events.update_crib: self._events.publish(UpdateCribEvent(tuple(cards_to_codes(self._crib_hand))))
         reasons = []
         score = self.determine_score_showing_crib(self._crib_hand, starter, reasons)
-        logger.info(f"     Total dealer score from showing crib: {score}")
+        if info: _logger.info(f"     Total dealer score from showing crib: {score}")
         deal_info.dealer_crib_score += score
         try:
             self.peg_for_dealer(score, reasons)
         except CribbageGameOverError as e:
             # (except covered by unit test)
             # Output the play record to facilitate unit test creation
-            logger.debug(f"Play record: {self._recorded_play}")
+            if debug: _logger.debug(f"Play record: {self._recorded_play}")
             # Raise a new CribbageGameOverError with the added deal_info
             raise CribbageGameOverError('Game ended while showing crib', deal_info = deal_info)
         
         self.log_pegging_info()
+
+        # The outcome of the deal's decisions
+        if self._exporter: self._exporter.end_deal(self._player_score, self._dealer_score)
         
         # Output the play record to facilitate unit test creation
-        logger.debug(f"Play record: {self._recorded_play}")
+        if debug: _logger.debug(f"Play record: {self._recorded_play}")
 
         return deal_info
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+Defines a generator that samples the cards of many cribbage deals at once, and a deck that deals them, for batch simulation.
+
+A deal only uses 13 cards: 6 for the player, 6 for the dealer, and the starter. The generator samples them in blocks of many deals, as
+the first 13 cards of a random permutation of the deck for each deal. With numpy, a block is one call: a random key for each of the 52
+cards of each deal, of which the 13 smallest are kept, in order of their keys. Without numpy, each deal is sampled with random.sample(...).
+Either way, the deals depend only on the seed, so a batch simulation is reproducible, and is independent of the random number sequence
+of the global random module that strategies may use.
+
+A CribbageGeneratedDeck deals the cards of one generated deal after another. Inject it into a CribbageDeal with set_deck(...), or into
+a CribbageGame with its deck argument, and every deal will take its cards from the generator.
+
+Exported Classes:
+    CribbageDealGenerator - Samples blocks of deals, and hands them out one at a time.
+    CribbageGeneratedDeck - A CribbageDeck that deals the cards of one generated deal per restock.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    generate_deals(...) - Sample a block of deals, with numpy.
+
+Logging:
+    None
+"""
+
+
+# Standard imports
+import random
+
+# Third party imports
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Local imports
+from CribbageSim.CribbageCardCodec import NUM_CODES, code_to_card
+from CribbageSim.CribbageDeck import CribbageDeck
+
+
+# Cards used by one deal: 6 for the player, 6 for the dealer, and the starter
+CARDS_PER_DEAL = 13
+
+
+def generate_deals(number = 1, rng = None):
+    """
+    Sample the cards of many deals at once.
+    :parameter number: The number of deals to sample, int
+    :parameter rng: The random number generator to use, numpy.random.Generator object
+    :return: The codes of the cards of each deal, in the order they are dealt, number x 13 array of uint8, numpy array
+    """
+    if np is None:
+        raise ImportError('generate_deals(...) requires numpy, which is not installed.')
+    if rng is None: rng = np.random.default_rng()
+    keys = rng.random((number, NUM_CODES))
+    # The 13 cards with the smallest keys, which are the first 13 cards of the random permutation that sorts the keys ...
+    chosen = np.argpartition(keys, CARDS_PER_DEAL - 1, axis = 1)[:, 0:CARDS_PER_DEAL]
+    # ... put in the order of their keys
+    order = np.argsort(np.take_along_axis(keys, chosen, axis = 1), axis = 1)
+    return np.take_along_axis(chosen, order, axis = 1).astype(np.uint8)
+
+
+class CribbageDealGenerator(object):
+    """
+    Samples the cards of deals in blocks, and hands them out one deal at a time.
+    """
+    def __init__(self, seed = None, block_size = 10000):
+        """
+        Construct a generator.
+        :parameter seed: Seed for the generator's own random number generator, or None for an unpredictable seed, int
+        :parameter block_size: The number of deals to sample at once, int
+        """
+        assert(block_size > 0)
+        self._block_size = block_size
+        if np is not None:
+            self._rng = np.random.default_rng(seed)
+        else:
+            self._rng = random.Random(seed)
+        self._block = []
+        self._next = 0
+
+    def _refill(self):
+        """
+        Utility function that samples the next block of deals.
+        :return: None
+        """
+        if np is not None:
+            self._block = generate_deals(self._block_size, self._rng).tolist()
+        else:
+            self._block = [self._rng.sample(range(NUM_CODES), CARDS_PER_DEAL) for i in range(self._block_size)]
+        self._next = 0
+        return None
+
+    def next_deal(self):
+        """
+        :return: The codes of the 13 cards of the next deal, in the order they are dealt, list of int
+        """
+        if self._next >= len(self._block): self._refill()
+        codes = self._block[self._next]
+        self._next += 1
+        return codes
+
+
+class CribbageGeneratedDeck(CribbageDeck):
+    """
+    A CribbageDeck that holds only the 13 cards of one deal from a CribbageDealGenerator, and deals them in order, like a StackedDeck.
+    restock() replaces them with the cards of the next generated deal, so the deck is used for any number of deals. The deck starts out
+    empty, so that the first deal taken from the generator is the one restocked by CribbageDeal.reset_deal(). If cards are drawn from an
+    empty deck, for example when more than 13 cards are drawn, the deck restocks itself. As with a StackedDeck, add_card(...) adds a card
+    to be drawn after the cards remaining.
+    """
+    def __init__(self, generator = None):
+        """
+        Construct an empty deck, which takes the cards of each deal from generator when it is restocked.
+        :parameter generator: The source of the deals, or None to use a new unseeded generator, CribbageDealGenerator object, or any
+            object with a next_deal() method returning 13 card codes, such as a CribbageDealLibrary
+        """
+        if generator is None: generator = CribbageDealGenerator()
+        self._generator = generator
+        self._isInfinite = False
+        self._deck = []
+        self._next = 0
+
+    def restock(self):
+        """
+        Replace the cards in the deck with those of the next generated deal.
+        :return: None
+        """
+        self._deck = [code_to_card(code) for code in self._generator.next_deal()]
+        self._next = 0
+        return None
+
+    def cards_remaining(self):
+        """
+        Return the number of cards left in the deck.
+        :return: The number of cards left in the deck, int
+        """
+        return len(self._deck) - self._next
+
+    def get_cards(self):
+        """
+        :return: The cards remaining in the deck, in the order they will be drawn, list of Card objects
+        """
+        return self._deck[self._next:]
+
+    def set_cards(self, cards = []):
+        """
+        Replace the cards remaining in the deck, e.g., to restore a saved deal.
+        :parameter cards: The cards to be the cards remaining in the deck, in the order they will be drawn, list of Card objects
+        :return: None
+        """
+        self._deck = list(cards)
+        self._next = 0
+        return None
+
+    def add_card(self, card = None):
+        """
+        Add a card to the deck, to be drawn after the cards remaining.
+        :parameter card: The card to add, Card object
+        :return: The cards remaining in the deck, list of Card objects
+        """
+        self._deck.append(card)
+        return self.get_cards()
+
+    def add_cards(self, cards = []):
+        """
+        Add cards to the deck, to be drawn in order after the cards remaining.
+        :parameter cards: The cards to add, list of Card objects
+        :return: The cards remaining in the deck, list of Card objects
+        """
+        for c in cards:
+            self.add_card(c)
+        return self.get_cards()
+
+    def draw(self, number = 1):
+        """
+        Draw cards in order from the deck, and remove them from the deck.
+        :param number: The number of cards to draw from the deck, int
+        :return: A single Card object or a list of Card objects
+        """
+        drawn = []
+        for c in range(number):
+            if self.cards_remaining() < 1: self.restock()
+            drawn.append(self._deck[self._next])
+            self._next += 1
+        if number == 1:
+            return drawn[0]
+        else:
+            return drawn
+
+    def __str__(self):
+        return ' '.join([str(c) for c in self.get_cards()])
@@ -0,0 +1,178 @@
+"""
+Defines a binary file format for a library of pre-generated cribbage deals, and a class for reading one. Playing the deals of a
+library, rather than deals drawn with the random module, gives exactly the same sequence of deals on any machine and with any version
+of the code, so that strategies can be compared, and benchmarks repeated, on identical workloads.
+
+Each deal is packed as the 13 card codes (see CribbageCardCodec) of its cards, one byte each, in the order they are dealt: 6 for the
+player, 6 for the dealer, and the starter. The file is a 32 byte header followed by the packed deals, and is opened with mmap, so
+nothing is parsed when it is opened, and a deal is read by slicing its 13 bytes.
+
+Build a library with build_deal_library(...), or from the command line:
+    python -m CribbageSim.CribbageDealLibrary <path> <number of deals> [--seed <seed>]
+or write any sequence of deals with write_deal_library(...).
+
+A CribbageDealLibrary has the same next_deal() method as a CribbageDealGenerator, so a CribbageGeneratedDeck can deal from it, and be
+injected into a CribbageDeal with set_deck(...), or into a CribbageGame with its deck argument. Deals are read sequentially, starting
+from the first deal or from the deal given to seek(...).
+
+Exported Classes:
+    CribbageDealLibrary - Opens a deal library file, and reads deals from it, by index or sequentially.
+
+Exported Exceptions:
+    None, but CribbageDealLibrary raises CribbageRecordError, see exceptions, if a file is not a valid deal library.
+
+Exported Functions:
+    write_deal_library(...) - Write a deal library file from a sequence of deals.
+    build_deal_library(...) - Write a deal library file of deals from a seeded CribbageDealGenerator.
+
+Logging:
+    None
+"""
+
+
+# Standard imports
+import os
+import mmap
+import struct
+import argparse
+
+# Local imports
+from CribbageSim.CribbageCardCodec import NUM_CODES
+from CribbageSim.CribbageDealGenerator import CribbageDealGenerator, CARDS_PER_DEAL
+from CribbageSim.exceptions import CribbageRecordError
+
+
+# File header: magic, version, number of deals, deal size, padded to 32 bytes
+_MAGIC = b'CRIBDEAL'
+_VERSION = 1
+_HEADER = struct.Struct('<8sIII12x')
+
+
+class CribbageDealLibrary(object):
+    """
+    Opens a deal library file written by write_deal_library(...), with mmap, and reads deals from it.
+    Can be used as a context manager, which closes the library on exit.
+    """
+    def __init__(self, path = ''):
+        """
+        Open the library file at path, and check its header. Raises CribbageRecordError, and closes the file, if it is not a valid library.
+        :parameter path: Path to the library file, string
+        """
+        self._file = open(path, 'rb')
+        self._map = None
+        try:
+            # An empty file can't be mapped
+            if os.fstat(self._file.fileno()).st_size < _HEADER.size:
+                raise CribbageRecordError(f"{path} is too short to be a deal library file")
+            self._map = mmap.mmap(self._file.fileno(), 0, access = mmap.ACCESS_READ)
+            (magic, version, num_deals, deal_size) = _HEADER.unpack_from(self._map, 0)
+            if magic != _MAGIC or version != _VERSION or deal_size != CARDS_PER_DEAL:
+                raise CribbageRecordError(f"{path} is not a version {_VERSION} deal library file")
+            if len(self._map) != _HEADER.size + num_deals * CARDS_PER_DEAL:
+                raise CribbageRecordError(f"{path} is not the size of a library of {num_deals} deals")
+        except CribbageRecordError:
+            self.close()
+            raise
+        self._num_deals = num_deals
+        # Index of the deal to be returned by next_deal()
+        self._next = 0
+
+    def close(self):
+        """
+        Close the library file.
+        :return: None
+        """
+        if self._map is not None: self._map.close()
+        self._file.close()
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __len__(self):
+        """
+        :return: The number of deals in the library, int
+        """
+        return self._num_deals
+
+    def get_deal(self, index = 0):
+        """
+        Read the deal at index.
+        :parameter index: The index of the deal, int [0...len(self)-1]
+        :return: The codes of the 13 cards of the deal, in the order they are dealt, bytes of length 13
+        """
+        if index < 0 or index >= self._num_deals:
+            raise IndexError(f"Deal {index} is not in the library of {self._num_deals} deals")
+        offset = _HEADER.size + index * CARDS_PER_DEAL
+        return self._map[offset:offset + CARDS_PER_DEAL]
+
+    def seek(self, index = 0):
+        """
+        Set the deal to be returned next by next_deal().
+        :parameter index: The index of the deal, int [0...len(self)]
+        :return: None
+        """
+        assert(index >= 0 and index <= self._num_deals)
+        self._next = index
+        return None
+
+    def tell(self):
+        """
+        :return: The index of the deal to be returned next by next_deal(), int
+        """
+        return self._next
+
+    def next_deal(self):
+        """
+        Read the next deal, in sequence. Raises IndexError if all deals have been read.
+        :return: The codes of the 13 cards of the deal, in the order they are dealt, bytes of length 13
+        """
+        deal = self.get_deal(self._next)
+        self._next += 1
+        return deal
+
+
+def write_deal_library(path = '', deals = []):
+    """
+    Write a deal library file, for opening with CribbageDealLibrary.
+    :parameter path: Path of the library file to write, string
+    :parameter deals: The deals, each the codes of its 13 cards in the order they are dealt, sequence of sequences of int
+    :return: The number of deals written, int
+    """
+    data = bytearray(_HEADER.size)
+    num_deals = 0
+    for codes in deals:
+        packed = bytes(codes)
+        assert(len(packed) == CARDS_PER_DEAL and len(set(packed)) == CARDS_PER_DEAL and max(packed) < NUM_CODES)
+        data += packed
+        num_deals += 1
+    _HEADER.pack_into(data, 0, _MAGIC, _VERSION, num_deals, CARDS_PER_DEAL)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return num_deals
+
+
+def build_deal_library(path = '', number = 1, seed = None):
+    """
+    Write a deal library file of deals from a CribbageDealGenerator.
+    :parameter path: Path of the library file to write, string
+    :parameter number: The number of deals to write, int
+    :parameter seed: Seed for the generator, int
+    :return: The number of deals written, int
+    """
+    generator = CribbageDealGenerator(seed, block_size = max(1, min(number, 100000)))
+    return write_deal_library(path, (generator.next_deal() for i in range(number)))
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = 'Build a library of pre-generated cribbage deals.')
+    parser.add_argument('path', help = 'Path of the library file to write')
+    parser.add_argument('number', type = int, help = 'Number of deals to write')
+    parser.add_argument('--seed', type = int, default = None, help = 'Seed for generating the deals')
+    args = parser.parse_args()
+    build_deal_library(args.path, args.number, args.seed)
@@ -0,0 +1,128 @@
+"""
+Defines a compact representation of the state of a cribbage deal, for lookahead, rollouts, and undo, without copying a CribbageDeal
+with its Deck, Hands, strategies, and callbacks.
+
+Every group of cards is a tuple of card codes (see CribbageCardCodec), in order, so the state is a handful of small immutable tuples
+and ints. A clone shares the tuples, and a snapshot is a single hashable tuple, so states can be branched, remembered, and compared
+cheaply. Use CribbageDeal.get_deal_state() to capture the state of a deal, and CribbageDeal.set_deal_state(...) to rebuild a deal from
+a state.
+
+Exported Classes:
+    CribbageDealState - The cards, counts, and scores of a cribbage deal, as tuples of card codes and ints.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    None
+
+Logging:
+    None
+"""
+
+
+# Standard imports
+
+# Local imports
+from CribbageSim.CribbageCardCodec import cards_to_codes, code_to_card
+
+
+# Value of starter when there is no starter card
+NO_STARTER = -1
+
+
+class CribbageDealState(object):
+    """
+    A class with all members considered public, containing the state of a cribbage deal:
+        deck: Codes of the cards remaining in the deck, in the deck's order, tuple of int
+        player_hand: Codes of the cards in the player's hand, in order, tuple of int
+        dealer_hand: Codes of the cards in the dealer's hand, in order, tuple of int
+        player_pile: Codes of the cards the player has played, in the order played, tuple of int
+        dealer_pile: Codes of the cards the dealer has played, in the order played, tuple of int
+        combined_pile: Codes of the cards played during the current go round, in the order played, tuple of int
+        crib: Codes of the cards in the crib, in order, tuple of int
+        starter: Code of the starter card, or NO_STARTER if it hasn't been drawn, int
+        go_round_count: The count of the current go round, int
+        next_to_play: Which role plays next, or None if not known, CribbageRole Enum
+        player_score: Points pegged by the player during the deal, int
+        dealer_score: Points pegged by the dealer during the deal, int
+    The tuples are never changed in place, so assign new tuples to change a state.
+    """
+    __slots__ = ('deck', 'player_hand', 'dealer_hand', 'player_pile', 'dealer_pile', 'combined_pile', 'crib', 'starter',
+                 'go_round_count', 'next_to_play', 'player_score', 'dealer_score')
+
+    def __init__(self):
+        """
+        Create the state of a deal before anything has been dealt, with an empty deck.
+        """
+        self.deck = ()
+        self.player_hand = ()
+        self.dealer_hand = ()
+        self.player_pile = ()
+        self.dealer_pile = ()
+        self.combined_pile = ()
+        self.crib = ()
+        self.starter = NO_STARTER
+        self.go_round_count = 0
+        self.next_to_play = None
+        self.player_score = 0
+        self.dealer_score = 0
+
+    def clone(self):
+        """
+        :return: A copy of self, which shares its (immutable) tuples with self, CribbageDealState object
+        """
+        other = CribbageDealState.__new__(CribbageDealState)
+        for name in self.__slots__:
+            setattr(other, name, getattr(self, name))
+        return other
+
+    def snapshot(self):
+        """
+        :return: The whole state as one hashable tuple, which can be given to restore(...), tuple
+        """
+        return (self.deck, self.player_hand, self.dealer_hand, self.player_pile, self.dealer_pile, self.combined_pile, self.crib,
+                self.starter, self.go_round_count, self.next_to_play, self.player_score, self.dealer_score)
+
+    def restore(self, snapshot = ()):
+        """
+        Set the whole state from a snapshot.
+        :parameter snapshot: A tuple returned by snapshot(), tuple
+        :return: None
+        """
+        (self.deck, self.player_hand, self.dealer_hand, self.player_pile, self.dealer_pile, self.combined_pile, self.crib,
+         self.starter, self.go_round_count, self.next_to_play, self.player_score, self.dealer_score) = snapshot
+        return None
+
+    @staticmethod
+    def from_snapshot(snapshot = ()):
+        """
+        :parameter snapshot: A tuple returned by snapshot(), tuple
+        :return: A new state set from snapshot, CribbageDealState object
+        """
+        state = CribbageDealState()
+        state.restore(snapshot)
+        return state
+
+    @staticmethod
+    def encode(cards = []):
+        """
+        :parameter cards: Cards, list of Card objects, Hand object, or CribbageCardsView object
+        :return: The codes of the cards, in the same order, tuple of int
+        """
+        return tuple(cards_to_codes(cards))
+
+    @staticmethod
+    def decode(codes = ()):
+        """
+        :parameter codes: Card codes, tuple of int
+        :return: The interned cards with the codes, in the same order, list of Card objects
+        """
+        return [code_to_card(code) for code in codes]
+
+    def __eq__(self, other):
+        """
+        States are equal if all their members are equal. States can be changed, so they aren't hashable, but their snapshots are.
+        """
+        if not isinstance(other, CribbageDealState): return NotImplemented
+        return self.snapshot() == other.snapshot()
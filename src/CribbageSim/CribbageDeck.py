@@ -0,0 +1,161 @@
+"""
+Defines the deck used to deal cribbage hands.
+
+Exported Classes:
+    CribbageDeck - A HandsDecksCards Deck built from the 52 interned Cards of CribbageCardCodec.
+    CribbagePartialShuffleDeck - A CribbageDeck that deals with a partial Fisher-Yates shuffle, and is restocked without allocating.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    None
+
+Logging:
+    None
+"""
+
+
+# Standard imports
+from random import randrange
+
+# Local imports
+from HandsDecksCards.deck import Deck
+from CribbageSim.CribbageCardCodec import create_interned_deck, card_to_code
+
+
+class CribbageDeck(Deck):
+    """
+    A Deck that is built from the 52 interned Cards of CribbageCardCodec, rather than from new Card objects, so that the same Card
+    objects are reused for every deal. The cards are in the same order as in a Deck, so drawing from a CribbageDeck draws the same cards,
+    for the same random number sequence, as drawing from a Deck.
+    """
+    def create_deck(self):
+        """
+        Create and return a list of the interned cards that represents a regular deck of playing cards.
+        :return: A list of Card objects, list
+        """
+        return create_interned_deck()
+
+    def restock(self):
+        """
+        Put all drawn cards back in the deck, ready for the next deal. For a CribbageDeck this is the same as constructing a new one.
+        :return: None
+        """
+        self._deck = self.create_deck()
+        return None
+
+    def get_cards(self):
+        """
+        :return: The cards remaining in the deck, in the deck's order, list of Card objects
+        """
+        return list(self._deck)
+
+    def set_cards(self, cards = []):
+        """
+        Replace the cards remaining in the deck, e.g., to restore a saved deal.
+        :parameter cards: The cards to be the cards remaining in the deck, in order, list of Card objects
+        :return: None
+        """
+        self._deck = list(cards)
+        return None
+
+
+class CribbagePartialShuffleDeck(CribbageDeck):
+    """
+    A CribbageDeck that keeps all 52 cards in one fixed list, and draws by a partial Fisher-Yates shuffle: each card drawn is chosen at
+    random from the cards remaining at the front of the list, and swapped to the back, behind the remaining cards. So drawing the 13
+    cards of a deal costs 13 swaps, instead of deleting from the middle of the list, and restock() only has to reset the number of
+    cards remaining.
+    Every card remaining is equally likely to be drawn, as with a Deck, but a seeded random number sequence draws different cards than it
+    does from a Deck.
+    Since the deck always holds the same 52 cards, only a card that has been drawn can be added back to it, with add_card(...). Adding a
+    card that is already in the deck raises ValueError.
+    """
+    def __init__(self):
+        """
+        Construct a full deck of the interned cards. A CribbagePartialShuffleDeck is never infinite.
+        """
+        super().__init__(isInfinite = False)
+        self._remaining = len(self._deck)
+
+    def restock(self):
+        """
+        Put all drawn cards back in the deck.
+        :return: None
+        """
+        self._remaining = len(self._deck)
+        return None
+
+    def cards_remaining(self):
+        """
+        Return the number of cards left in the deck.
+        :return: The number of cards left in the deck, int
+        """
+        return self._remaining
+
+    def get_cards(self):
+        """
+        :return: The cards remaining in the deck, in the deck's order, list of Card objects
+        """
+        return self._deck[0:self._remaining]
+
+    def set_cards(self, cards = []):
+        """
+        Replace the cards remaining in the deck, e.g., to restore a saved deal. The other interned cards are kept behind them, as drawn.
+        :parameter cards: The cards to be the cards remaining in the deck, in order, each an interned card at most once, list of Card objects
+        :return: None
+        """
+        remaining = set([card_to_code(c) for c in cards])
+        self._deck[:] = list(cards) + [c for c in create_interned_deck() if card_to_code(c) not in remaining]
+        self._remaining = len(remaining)
+        return None
+
+    def add_card(self, card = None):
+        """
+        Put a drawn card back in the deck. Raises ValueError if the card is already in the deck.
+        :parameter card: The card to put back, Card object
+        :return: The cards remaining in the deck, list of Card objects
+        """
+        code = card_to_code(card)
+        deck = self._deck
+        # The drawn cards are behind the remaining ones, so swap the card to just behind the remaining cards, and count it as remaining
+        for i in range(self._remaining, len(deck)):
+            if card_to_code(deck[i]) == code:
+                (deck[i], deck[self._remaining]) = (deck[self._remaining], deck[i])
+                self._remaining += 1
+                return self.get_cards()
+        raise ValueError(f"{card} is already in the deck")
+
+    def add_cards(self, cards = []):
+        """
+        Put drawn cards back in the deck. Raises ValueError if a card is already in the deck.
+        :parameter cards: The cards to put back, list of Card objects
+        :return: The cards remaining in the deck, list of Card objects
+        """
+        for c in cards:
+            self.add_card(c)
+        return self.get_cards()
+
+    def draw(self, number = 1):
+        """
+        Draw cards at random from the deck, and remove them from the deck. If the deck runs out of cards, it is restocked.
+        :param number: The number of cards to draw from the deck, int
+        :return: A single Card object or a list of Card objects
+        """
+        deck = self._deck
+        drawn = []
+        for c in range(number):
+            if self._remaining < 1: self.restock()
+            i = randrange(self._remaining)
+            self._remaining -= 1
+            last = self._remaining
+            (deck[i], deck[last]) = (deck[last], deck[i])
+            drawn.append(deck[last])
+        if number == 1:
+            return drawn[0]
+        else:
+            return drawn
+
+    def __str__(self):
+        return ' '.join([str(c) for c in self._deck[0:self._remaining]])
@@ -0,0 +1,418 @@
+"""
+Defines an in-process event bus, on which CribbageGame and CribbageDeal publish the typed output events defined in
+CribbageGameOutputEvents, and an output that puts the events on a queue as logging records, for a GUI.
+
+Subscribers register a callable for each event type they want. The bus has one member per event type, named as the lower case name of
+the CribbageGameOutputEvents member, e.g., update_player1_hand, holding the tuple of its subscribers, which is empty if there are none.
+Publishers check that one member before creating an event, so an event type with no subscribers costs one attribute check:
+    if bus.update_starter: bus.publish(UpdateStarterEvent(code))
+
+Like logging.getLogger(...), get_event_bus() returns one default bus, shared by everything that isn't given a bus of its own, so
+subscribing to it, e.g., in CribbageSimulator.setup_logging(...), attaches to every game.
+
+A queue fed by a CribbageQueueEventOutput, or a CribbageCoalescingEventOutput, gets two kinds of record for what happens in a game, where
+a record logged with extra = CribbageGameLogInfo(...) used to be both:
+    - An event record, for each event, with the attributes of the event's CribbageGameLogInfo, including event_type, and a readable
+      message rendered from them, e.g., 'Update starter: 5H'.
+    - A text record, for each message logged to 'cribbage_logger' through a QueueHandler on the same queue, e.g., 'Starter card: 5H',
+      with no event_type attribute.
+A consumer that updates its display from records should use the event records, found by their event_type attribute, and one that shows
+messages should show the text records, skipping the event records.
+
+A GUI that can't keep up with a fast engine should subscribe a CribbageCoalescingEventOutput, which puts records on a bounded queue,
+and only the latest of the updates superseded within a frame, rather than a CribbageQueueEventOutput, which puts every event on the
+queue.
+
+Exported Classes:
+    CribbageEventBus - Keeps the subscribers for each event type, and publishes events to them.
+    CribbageQueueEventOutput - A subscriber that puts events on a queue as logging records, with the attributes of CribbageGameLogInfo.
+    CribbageCoalescingEventOutput - A subscriber that puts events on a bounded queue, merging updates superseded within a frame.
+    CribbageQueuePolicy - Enum of what a CribbageCoalescingEventOutput does when its queue is full.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    get_event_bus() - The default bus.
+
+Logging:
+    None
+"""
+
+
+# Standard imports
+import logging
+import threading
+import time
+from enum import Enum
+from queue import Full
+
+# Local imports
+from CribbageSim.CribbageGameOutputEvents import CribbageGameOutputEvents, EVENT_CLASSES
+
+
+# The member of CribbageEventBus for each event type
+_event_members = {event_type: event_type.name.lower() for event_type in EVENT_CLASSES}
+
+
+def _event_message(event = None, info = None):
+    """
+    Utility function that renders an event as a readable message, the event type followed by the values of its members, e.g.,
+    'Update starter: 5H', or 'Update pile combined: 5H 10S, 15'.
+    :parameter event: The event, CribbageGameEvent object
+    :parameter info: The event as a CribbageGameLogInfo, from event.to_log_info(), CribbageGameLogInfo object
+    :return: The message, string
+    """
+    label = event.event_type.name.replace('_', ' ').capitalize()
+    # Why points were pegged is output by the board's own messages, so it is left out here
+    values = [str(info[name]) for name in event.__slots__ if name != 'score_record']
+    if not values: return label
+    return label + ': ' + ', '.join(values)
+
+
+def _event_to_record(event = None):
+    """
+    Utility function that makes the logging record for an event, which is put on a queue for a GUI.
+    :parameter event: The event, CribbageGameEvent object
+    :return: A record from the logger 'cribbage_logger', at level INFO, with the attributes of event.to_log_info(), and a readable
+        message, logging.LogRecord object
+    """
+    info = event.to_log_info()
+    record = logging.makeLogRecord({k: info[k] for k in info})
+    record.name = 'cribbage_logger'
+    record.levelno = logging.INFO
+    record.levelname = logging.getLevelName(logging.INFO)
+    record.msg = _event_message(event, info)
+    return record
+
+
+class CribbageEventBus(object):
+    """
+    Keeps the subscribers for each type of output event, and publishes events to them. Each event type has a member holding the tuple of
+    its subscribers, which publishers may check before creating an event. The members are considered read-only, use subscribe(...) and
+    unsubscribe(...) to change them.
+    """
+    __slots__ = ('_subscribers',) + tuple(_event_members.values())
+
+    def __init__(self):
+        """
+        Create a bus with no subscribers.
+        """
+        # Subscribers for each event type, the same tuples as the event type members
+        self._subscribers = {}
+        self.clear()
+
+    def clear(self):
+        """
+        Remove all subscribers.
+        :return: None
+        """
+        for (event_type, member) in _event_members.items():
+            self._subscribers[event_type] = ()
+            setattr(self, member, ())
+        return None
+
+    def _set_subscribers(self, event_type, subscribers = ()):
+        """
+        Utility function that sets the subscribers for event_type.
+        :parameter event_type: The event type, CribbageGameOutputEvents Enum
+        :parameter subscribers: The subscribers, tuple of callables
+        :return: None
+        """
+        self._subscribers[event_type] = subscribers
+        setattr(self, _event_members[event_type], subscribers)
+        return None
+
+    def subscribe(self, event_type = CribbageGameOutputEvents.NO_EVENT, subscriber = None):
+        """
+        Subscribe to an event type. A subscriber that is already subscribed to the event type is not added again.
+        :parameter event_type: The event type, CribbageGameOutputEvents Enum
+        :parameter subscriber: Called with each event of the type as its argument, callable
+        :return: None
+        """
+        assert(event_type in _event_members)
+        assert(callable(subscriber))
+        if subscriber not in self._subscribers[event_type]:
+            self._set_subscribers(event_type, self._subscribers[event_type] + (subscriber,))
+        return None
+
+    def unsubscribe(self, event_type = CribbageGameOutputEvents.NO_EVENT, subscriber = None):
+        """
+        Unsubscribe from an event type. Nothing happens if subscriber isn't subscribed to the event type.
+        :parameter event_type: The event type, CribbageGameOutputEvents Enum
+        :parameter subscriber: A subscriber passed to subscribe(...), callable
+        :return: None
+        """
+        assert(event_type in _event_members)
+        self._set_subscribers(event_type, tuple([s for s in self._subscribers[event_type] if s != subscriber]))
+        return None
+
+    def subscribe_all(self, subscriber = None):
+        """
+        Subscribe to every event type.
+        :parameter subscriber: Called with each event as its argument, callable
+        :return: None
+        """
+        for event_type in _event_members:
+            self.subscribe(event_type, subscriber)
+        return None
+
+    def unsubscribe_all(self, subscriber = None):
+        """
+        Unsubscribe from every event type.
+        :parameter subscriber: A subscriber passed to subscribe(...) or subscribe_all(...), callable
+        :return: None
+        """
+        for event_type in _event_members:
+            self.unsubscribe(event_type, subscriber)
+        return None
+
+    def has_subscribers(self, event_type = CribbageGameOutputEvents.NO_EVENT):
+        """
+        :parameter event_type: The event type, CribbageGameOutputEvents Enum
+        :return: True if the event type has any subscribers, boolean
+        """
+        return len(self._subscribers.get(event_type, ())) > 0
+
+    def publish(self, event = None):
+        """
+        Call each subscriber to the type of event with event, in the order they subscribed.
+        :parameter event: The event, CribbageGameEvent object
+        :return: None
+        """
+        for subscriber in self._subscribers[event.event_type]:
+            subscriber(event)
+        return None
+
+
+# The default bus, returned by get_event_bus()
+_default_bus = CribbageEventBus()
+
+
+def get_event_bus():
+    """
+    :return: The default bus, used by every CribbageGame and CribbageDeal not given a bus of its own, CribbageEventBus object
+    """
+    return _default_bus
+
+
+class CribbageQueueEventOutput(object):
+    """
+    A subscriber that puts each event on a queue, as a logging.LogRecord from the logger 'cribbage_logger', at level INFO, with the
+    attributes of the equivalent CribbageGameLogInfo, and a readable message, so a consumer of the queue, such as a
+    tkAppFramework.tkSimulatorApp, gets the event's attributes as when events were logged with extra = CribbageGameLogInfo(...). Messages
+    logged to 'cribbage_logger' are separate records, with no event_type, see the module docstring.
+    """
+    def __init__(self, queue = None):
+        """
+        :parameter queue: The queue to put records on, Queue object
+        """
+        self._queue = queue
+
+    def __eq__(self, other):
+        """
+        Outputs to the same queue are equal, so that the same queue isn't subscribed twice.
+        """
+        if not isinstance(other, CribbageQueueEventOutput): return NotImplemented
+        return self._queue is other._queue
+
+    def __hash__(self):
+        return id(self._queue)
+
+    def get_queue(self):
+        """
+        :return: The queue records are put on, Queue object
+        """
+        return self._queue
+
+    def __call__(self, event = None):
+        """
+        Put event on the queue.
+        :parameter event: The event, CribbageGameEvent object
+        :return: None
+        """
+        self._queue.put_nowait(_event_to_record(event))
+        return None
+
+
+class CribbageQueuePolicy(Enum):
+    """
+    What a CribbageCoalescingEventOutput does when its queue is full:
+        BLOCK: Wait until the consumer takes a record off the queue, which slows the engine to the pace of the consumer.
+        DROP_OLDEST: Discard the oldest record on the queue that may be dropped, i.e., an update of a type that is coalesced, or a
+            logger message, so the engine doesn't wait. Records of the other events, e.g., UPDATE_SCORE_PLAYER1 and END_GAME, are never
+            discarded: if the queue is full of them, the engine waits to put another one on the queue, and a record that may be dropped
+            is discarded instead of being put on the queue.
+    """
+    BLOCK = 1
+    DROP_OLDEST = 2
+
+
+class CribbageCoalescingEventOutput(object):
+    """
+    A subscriber that puts events on a bounded queue, as logging records like those of a CribbageQueueEventOutput, for a GUI that may
+    not keep up with the engine.
+
+    Updates of hands, piles, the combined pile, the starter, and the crib each replace the whole of what they update, so an update is
+    superseded by a later one of the same type. These are held back, and only the latest of each type is put on the queue, once per
+    frame, i.e., by the first event after frame_interval seconds have passed since the last time they were put on the queue. All other
+    events, including UPDATE_SCORE_PLAYER1, UPDATE_SCORE_PLAYER2, and END_GAME, are never merged: they are put on the queue as soon as
+    they are published, after the held back updates, so the consumer sees the state that led to them.
+
+    Updates still held back when the engine pauses, e.g., waiting on an interactive player, are put on the queue by flush(), which may be
+    called from any thread, e.g., by the consumer each time it polls the queue, or by the engine at the end of a game.
+
+    The output also has a put_nowait(...) method, which puts a record on the queue with the same policy, so it can be the queue of a
+    logging.handlers.QueueHandler, to send the logger's messages to the same bounded queue.
+
+    With CribbageQueuePolicy.DROP_OLDEST, the queue must be a queue.Queue, since records are removed from the middle of it.
+    """
+    # Event types whose events supersede earlier events of the same type
+    _COALESCED = frozenset((CribbageGameOutputEvents.UPDATE_PLAYER1_HAND, CribbageGameOutputEvents.UPDATE_PLAYER2_HAND,
+                            CribbageGameOutputEvents.UPDATE_PLAYER1_PILE, CribbageGameOutputEvents.UPDATE_PLAYER2_PILE,
+                            CribbageGameOutputEvents.UPDATE_PILE_COMBINED, CribbageGameOutputEvents.UPDATE_STARTER,
+                            CribbageGameOutputEvents.UPDATE_CRIB))
+
+    def __init__(self, queue = None, frame_interval = 0.05, policy = CribbageQueuePolicy.BLOCK, clock = time.monotonic):
+        """
+        :parameter queue: The queue to put records on, which should be bounded, e.g., Queue(maxsize = 1000), Queue object
+        :parameter frame_interval: Seconds between putting held back updates on the queue, or 0 to hold back nothing, float
+        :parameter policy: What to do when the queue is full, CribbageQueuePolicy Enum
+        :parameter clock: Returns the time in seconds, callable
+        """
+        assert(frame_interval >= 0)
+        self._queue = queue
+        self._frame_interval = frame_interval
+        self._policy = policy
+        self._clock = clock
+        # The latest held back update of each type, in the order the types were first held back during the frame
+        self._pending = {}
+        self._frame_start = clock()
+        # The number of records discarded because the queue was full, and the number of updates merged away
+        self._dropped = 0
+        self._coalesced = 0
+        # Subscribers are called on the engine's thread, and flush() may be called on the consumer's. Reentrant, since records are put on
+        # the queue with put_nowait(...), which is called both with and without the lock held.
+        self._lock = threading.RLock()
+
+    def __eq__(self, other):
+        """
+        Outputs to the same queue are equal, so that the same queue isn't subscribed twice.
+        """
+        if not isinstance(other, CribbageCoalescingEventOutput): return NotImplemented
+        return self._queue is other._queue
+
+    def __hash__(self):
+        return id(self._queue)
+
+    def get_queue(self):
+        """
+        :return: The queue records are put on, Queue object
+        """
+        return self._queue
+
+    def get_dropped(self):
+        """
+        :return: The number of records discarded because the queue was full, int
+        """
+        return self._dropped
+
+    def get_coalesced(self):
+        """
+        :return: The number of updates that were superseded before they were put on the queue, int
+        """
+        return self._coalesced
+
+    def _droppable(self, record = None):
+        """
+        Utility function that decides if record may be discarded when the queue is full.
+        :parameter record: The record, logging.LogRecord object
+        :return: True if record is a logger message, or the record of an update of a type that is coalesced, boolean
+        """
+        event_type = getattr(record, 'event_type', None)
+        return event_type is None or event_type in self._COALESCED
+
+    def _evict_oldest_droppable(self):
+        """
+        Utility function that removes the oldest record that may be discarded from the queue.
+        :return: True if a record was removed, False if there are only records that must be delivered, boolean
+        """
+        q = self._queue
+        with q.mutex:
+            for (i, record) in enumerate(q.queue):
+                if self._droppable(record):
+                    del q.queue[i]
+                    q.not_full.notify()
+                    return True
+        return False
+
+    def put_nowait(self, record = None):
+        """
+        Put record on the queue, applying the policy if the queue is full. With CribbageQueuePolicy.BLOCK, or for a record that must be
+        delivered, this may wait, despite the name, which is that of the method logging.handlers.QueueHandler calls.
+        :parameter record: The record, logging.LogRecord object
+        :return: None
+        """
+        if self._policy == CribbageQueuePolicy.BLOCK:
+            self._queue.put(record)
+        else:
+            with self._lock:
+                while True:
+                    try:
+                        self._queue.put_nowait(record)
+                        break
+                    except Full:
+                        if self._evict_oldest_droppable():
+                            self._dropped += 1
+                        elif self._droppable(record):
+                            # The queue is full of records that must be delivered, so discard this one instead
+                            self._dropped += 1
+                            break
+                        else:
+                            # Wait for the consumer to make room
+                            self._queue.put(record)
+                            break
+        return None
+
+    def _flush_pending(self):
+        """
+        Utility function that puts the held back updates on the queue, and starts a new frame. Call with self._lock held.
+        :return: None
+        """
+        pending = list(self._pending.values())
+        self._pending.clear()
+        self._frame_start = self._clock()
+        for event in pending:
+            self.put_nowait(_event_to_record(event))
+        return None
+
+    def flush(self):
+        """
+        Put the held back updates on the queue now. If the engine's thread is putting records on the queue at the same time, it will
+        put the held back updates on the queue itself, so nothing is done, and in particular the consumer of a full queue, blocking the
+        engine, doesn't wait on the engine.
+        :return: None
+        """
+        if self._lock.acquire(blocking = False):
+            try:
+                self._flush_pending()
+            finally:
+                self._lock.release()
+        return None
+
+    def __call__(self, event = None):
+        """
+        Hold back event if it is an update that a later one supersedes, otherwise put it on the queue. Held back updates are put on the
+        queue first if the frame has ended, or if event isn't held back.
+        :parameter event: The event, CribbageGameEvent object
+        :return: None
+        """
+        with self._lock:
+            if event.event_type in self._COALESCED and self._frame_interval > 0:
+                if event.event_type in self._pending: self._coalesced += 1
+                self._pending[event.event_type] = event
+                if self._clock() - self._frame_start >= self._frame_interval: self._flush_pending()
+            else:
+                if self._pending: self._flush_pending()
+                self.put_nowait(_event_to_record(event))
+        return None
@@ -13,45 +13,50 @@ Exported Functions:
 
 Logging:
     Uses a logger named 'cribbage_logger' for providing game output to the user. This logger is configured
-    by calling CribbageSimulator.setup_logging(...).
+    by calling CribbageSimulator.setup_logging(...). A CribbageGame constructed with headless = True does no logging at all,
+    and neither do its CribbageBoard and CribbageDeal.
  """
 
 
 # Standard imports
 import logging
 import shelve
+from dataclasses import dataclass
 
 # Local imports
 from CribbageSim.CribbageBoard import CribbageBoard
 from CribbageSim.CribbageDeal import CribbageDeal, CribbagePlayers
 from CribbageSim.CribbagePlayStrategy import CribbagePlayStrategy, InteractiveCribbagePlayStrategy, HoyleishPlayerCribbagePlayStrategy
 from CribbageSim.exceptions import CribbageGameOverError
-from CribbageSim.CribbageGameOutputEvents import CribbageGameOutputEvents, CribbageGameLogInfo
+from CribbageSim.CribbageGameOutputEvents import StartGameEvent, StartDealEvent, UpdateScorePlayer1Event, UpdateScorePlayer2Event, EndGameEvent
+from CribbageSim.CribbageEventBus import CribbageEventBus, get_event_bus
+from CribbageSim.CribbageGameRecord import CribbageGameRecord
 from UserResponseCollector.UserQueryCommand import UserQueryCommandPathOpen, UserQueryCommandPathSave
 import UserResponseCollector.UserQueryReceiver
 
 
+# The logger 'cribbage_logger', looked up once, rather than on every call
+_logger = logging.getLogger('cribbage_logger')
+
+
+@dataclass(slots = True)
 class CribbageGameInfo:
     """
     A class with all members/attributes considered public. Used to return information about the results of a cribbage game,
-    from CribbageGame.play(...).
+    from CribbageGame.play(...). Slotted, so that the results of many games can be kept compactly.
     """
-    def __init__(self):
-        """
-        Create and initialize attributes.
-        """
-        self.player1_total_play_score = 0
-        self.player1_total_his_heals_score = 0 # Starter card was a J
-        self.player1_total_show_score = 0
-        self.player1_total_crib_score = 0
-        self.player2_total_play_score = 0
-        self.player2_total_his_heals_score = 0 # Starter card was a J
-        self.player2_total_show_score = 0
-        self.player2_total_crib_score = 0
-        self.winning_player = ''
-        self.winning_player_final_score = 0
-        self.losing_player_final_score = 0
-        self.deals_in_game = 0
+    player1_total_play_score: int = 0
+    player1_total_his_heals_score: int = 0 # Starter card was a J
+    player1_total_show_score: int = 0
+    player1_total_crib_score: int = 0
+    player2_total_play_score: int = 0
+    player2_total_his_heals_score: int = 0 # Starter card was a J
+    player2_total_show_score: int = 0
+    player2_total_crib_score: int = 0
+    winning_player: str = ''
+    winning_player_final_score: int = 0
+    losing_player_final_score: int = 0
+    deals_in_game: int = 0
  
 
 class CribbageGame:
@@ -61,7 +66,8 @@ class CribbageGame:
     
     def __init__(self, name1 = 'human_player', name2 = 'machine_player',
                  player_strategy1 = InteractiveCribbagePlayStrategy(), player_strategy2 = HoyleishPlayerCribbagePlayStrategy(),
-                 dealer_strategy1 = None, dealer_strategy2 = None):
+                 dealer_strategy1 = None, dealer_strategy2 = None, reuse_deal_buffers = False, deck = None, headless = False,
+                 event_bus = None, record = False, record_writer = None, decision_exporter = None):
         """
         Construct a cribbage game with a CribbageBoard, two player names, and a CribbageDeal.
         :parameter name1: Name of player1, string
@@ -70,12 +76,29 @@ class CribbageGame:
         :parameter player_strategy2: Player strategy for player2, Instance of CribbagePlayStrategy
         :parameter dealer_strategy1: Dealer strategy for player1 (defaults to player_strategy1 if None), Instance of CribbagePlayStrategy
         :parameter dealer_strategy2: Dealer strategy for player2 (defaults to player_strategy2 if None), Instance of CribbagePlayStrategy
+        :parameter reuse_deal_buffers: Passed to CribbageDeal as reuse_buffers, so that each deal reuses the deck, hands, and piles, boolean
+        :parameter deck: If not None, the deck for every deal to draw from, e.g., a CribbageGeneratedDeck, CribbageDeck object
+        :parameter headless: If True, then the game, its board, and its deal do no logging and publish no events, for fast automatic
+            play, boolean
+        :parameter event_bus: The bus to publish output events on, or None for the default bus from get_event_bus(), CribbageEventBus object
+        :parameter record: If True, then keep a compact binary record of each game, see get_game_record(), boolean
+        :parameter record_writer: If not None, then keep a record of each game, and write each finished game's record with it,
+            CribbageRecordWriter object
+        :parameter decision_exporter: If not None, then export a row for every form_crib, follow, and go decision to it, with the
+            outcome of the deal and the game, CribbageDecisionExporter object
         """
         assert(isinstance(player_strategy1, CribbagePlayStrategy))
         assert(isinstance(player_strategy2, CribbagePlayStrategy))
         if dealer_strategy1: assert(isinstance(dealer_strategy1, CribbagePlayStrategy))
         if dealer_strategy2: assert(isinstance(dealer_strategy2, CribbagePlayStrategy))
-        self._board = CribbageBoard()
+        if event_bus is None: event_bus = get_event_bus()
+        self._headless = headless
+        # The bus that events are published on. When headless, a bus of its own that never has subscribers.
+        if headless:
+            self._events = CribbageEventBus()
+        else:
+            self._events = event_bus
+        self._board = CribbageBoard(headless = headless)
         self._player1 = name1
         self._player2 = name2
         self._player1_player_strategy = player_strategy1
@@ -88,10 +111,26 @@ class CribbageGame:
             self._player2_dealer_strategy = dealer_strategy2
         else:
             self._player2_dealer_strategy = player_strategy2
-        self._deal = CribbageDeal(self._player2_player_strategy, self._player1_dealer_strategy)
+        # Keep a record of each game, if asked to, or if there is a writer for the records
+        self._record_writer = record_writer
+        self._record = record or (record_writer is not None)
+        self._game_record = None
+        self._exporter = decision_exporter
+        self._deal = CribbageDeal(self._player2_player_strategy, self._player1_dealer_strategy, reuse_buffers = reuse_deal_buffers,
+                                  headless = headless, event_bus = event_bus, record = self._record,
+                                  decision_exporter = decision_exporter)
+        if deck is not None: self._deal.set_deck(deck)
         self._next_to_deal = CribbagePlayers.PLAYER_1
         self._deal_count = 0
 
+    def _logging_enabled(self, level = logging.INFO):
+        """
+        Utility function that decides if messages at level should be logged. Check this before formatting a message.
+        :parameter level: The logging level of the messages, int, e.g., logging.INFO
+        :return: True if messages at level should be logged, boolean
+        """
+        return not self._headless and _logger.isEnabledFor(level)
+
     def get_player1_name(self):
         """
         :return: Name of player1, string
@@ -110,6 +149,13 @@ class CribbageGame:
         """
         return self._board.get_scores()
         
+    def get_game_record(self):
+        """
+        :return: The compact binary record of the game being played, or last played, or None if games aren't being recorded,
+            CribbageGameRecord object
+        """
+        return self._game_record
+
     def peg_for_player1(self, count = 1, reason = []):
         """
         Peg on the board count for player1.
@@ -117,7 +163,10 @@ class CribbageGame:
         :parameter reason: Why the points are being pegged, list of CribbageComboInfo objects
         :return: Current peg total for player1 after pegging count, int
         """
-        return self._board.peg_for_player1(count, reason)
+        score = self._board.peg_for_player1(count, reason)
+        if self._events.update_score_player1:
+            self._events.publish(UpdateScorePlayer1Event(self._board.get_player1_status(), tuple(reason)))
+        return score
         
     def peg_for_player2(self, count = 1, reason = []):
         """
@@ -126,7 +175,10 @@ class CribbageGame:
         :parameter reason: Why the points are being pegged, list of CribbageComboInfo objects
         :return: Current peg total for player2 after pegging count, int
         """
-        return self._board.peg_for_player2(count, reason)
+        score = self._board.peg_for_player2(count, reason)
+        if self._events.update_score_player2:
+            self._events.publish(UpdateScorePlayer2Event(self._board.get_player2_status(), tuple(reason)))
+        return score
         
     def play(self, load_game=False):
         """
@@ -135,20 +187,18 @@ class CribbageGame:
         :return: Information about the results of the game, CribbageGameInfo object
         """
 
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
+        # Decide once for the game if messages are logged, so that no messages are built unless they will be output
+        info = self._logging_enabled(logging.INFO)
         
         if load_game:
             # Load a shelved game
-            logger.info(f"Restarting a saved game of cribbage with {self._player1} vs {self._player2}.",
-                        extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.START_GAME, name_player1=self._player1,
-                                                  name_player2=self._player2))
+            if info: _logger.info(f"Restarting a saved game of cribbage with {self._player1} vs {self._player2}.")
+            if self._events.start_game: self._events.publish(StartGameEvent(self._player1, self._player2))
             self.un_shelve_game()
         else:
             # Start a new game
-            logger.info(f"Starting a new game of cribbage with {self._player1} vs {self._player2}.",
-                        extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.START_GAME, name_player1=self._player1,
-                                                  name_player2=self._player2))
+            if info: _logger.info(f"Starting a new game of cribbage with {self._player1} vs {self._player2}.")
+            if self._events.start_game: self._events.publish(StartGameEvent(self._player1, self._player2))
             self._deal_count = 0
             # TODO: For now player1 will always deal first, but implement random selection, such as cutting for high card
             # Consider that this predictability is beneficial to unit testing.
@@ -156,6 +206,8 @@ class CribbageGame:
 
         return_val = CribbageGameInfo()
         game_over = False
+        if self._record: self._game_record = CribbageGameRecord()
+        if self._exporter: self._exporter.begin_game(self.get_player_scores)
         
         while not game_over:
         
@@ -164,8 +216,8 @@ class CribbageGame:
             # Reset deal so we are ready for a new deal
             match self._next_to_deal:
                 case CribbagePlayers.PLAYER_1:
-                    logger.info(f"Player {self._player1} will deal.",
-                                extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.START_DEAL, name_dealer=self._player1))
+                    if info: _logger.info(f"Player {self._player1} will deal.")
+                    if self._events.start_deal: self._events.publish(StartDealEvent(self._player1))
                     self._deal.reset_deal(self.peg_for_player2, self.peg_for_player1, player_participant=CribbagePlayers.PLAYER_2,
                                           dealer_participant=CribbagePlayers.PLAYER_1)
                     # Set the correct strategies for player and dealer
@@ -173,8 +225,8 @@ class CribbageGame:
                     self._deal.set_dealer_play_strategy(self._player1_dealer_strategy)
                     self._next_to_deal = CribbagePlayers.PLAYER_2
                 case CribbagePlayers.PLAYER_2:
-                    logger.info(f"Player {self._player2} will deal.",
-                                extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.START_DEAL, name_dealer=self._player2))
+                    if info: _logger.info(f"Player {self._player2} will deal.")
+                    if self._events.start_deal: self._events.publish(StartDealEvent(self._player2))
                     self._deal.reset_deal(self.peg_for_player1, self.peg_for_player2, player_participant=CribbagePlayers.PLAYER_1,
                                           dealer_participant=CribbagePlayers.PLAYER_2)
                     # Set the correct strategies for player and dealer
@@ -185,6 +237,7 @@ class CribbageGame:
             # Play the current deal
             try:
                 deal_info = self._deal.play()
+                if self._record: self._game_record.deals.append(self._deal.get_deal_record())
                 # Accumulate deal results info into game results info
                 match self._next_to_deal:
                     case CribbagePlayers.PLAYER_1:
@@ -205,7 +258,10 @@ class CribbageGame:
                         return_val.player1_total_crib_score += deal_info.dealer_crib_score
             except CribbageGameOverError as e:
                 # Log why the game ended, for example, that it ended while the crib was being shown. This information is obtained from the exception.
-                logger.info(e.args[0])
+                if info: _logger.info(e.args[0])
+                if self._record: self._game_record.deals.append(self._deal.get_deal_record())
+                # The deal wasn't played out, so its decisions get the points pegged before the game ended
+                if self._exporter: self._exporter.end_deal(*self._deal.get_deal_scores())
                 # Accumulate deal info for last deal of the game into game info, because it will not have happened above, due to the exception ending the game.
                 (p1_score, p2_score) = self._board.get_scores()
                 if p1_score == 121:
@@ -213,13 +269,13 @@ class CribbageGame:
                     return_val.winning_player_final_score = p1_score
                     return_val.losing_player_final_score = p2_score
                     return_val.deals_in_game = self._deal_count
-                    logger.info(f"Player {self._player1} wins the game.")
+                    if info: _logger.info(f"Player {self._player1} wins the game.")
                 else:
                     return_val.winning_player = self._player2
                     return_val.winning_player_final_score = p2_score
                     return_val.losing_player_final_score = p1_score
                     return_val.deals_in_game = self._deal_count
-                    logger.info(f"Player {self._player2} wins the game.")
+                    if info: _logger.info(f"Player {self._player2} wins the game.")
                 # Handle accumulating deal info that arrived in CribbageGameOverError into game info
                 match self._next_to_deal:
                     case CribbagePlayers.PLAYER_1:
@@ -243,11 +299,11 @@ class CribbageGame:
             except UserResponseCollector.UserQueryReceiver.UserQueryReceiverTerminateQueryingThreadError as e:
                 # For now, do nothing but (1) Log that game terminated early, and (2) return a default CribbageGameInfo object
                 # TODO: Investigate any problems
-                logger.info(f"Cribbage game terminating in the middle of play, at request of user.")
+                if info: _logger.info(f"Cribbage game terminating in the middle of play, at request of user.")
                 return CribbageGameInfo()
 
             # Log end of deal board
-            logger.info(f"After deal {str(self._deal_count)}:\n{str(self._board)}")
+            if info: _logger.info(f"After deal {str(self._deal_count)}:\n{str(self._board)}")
 
             # Query player 1 (since in a human/machine game, player 1 will be the human) play strategy
             # if we should save the current state of the game and end play, or if we should continue to the next deal.
@@ -265,34 +321,51 @@ class CribbageGame:
                     # For now, do nothing but (1) Log that game terminated early, and (2) return a default CribbageGameInfo object
                     # TODO: Investigate any problems
                     self.shelve_game()
-                    logger.info(f"Cribbage game terminating at end of deal, at request of player 1.",
-                                extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.END_GAME))
+                    if info: _logger.info(f"Cribbage game terminating at end of deal, at request of player 1.")
+                    if self._events.end_game: self._events.publish(EndGameEvent())
                     return CribbageGameInfo()
                 case (False, False): # Stop play, do NOT save game state
                     # For now, do nothing but (1) Log that game terminated early, and (2) return a default CribbageGameInfo object
                     # TODO: Investigate any problems
-                    logger.info(f"Cribbage game terminating at end of deal, at request of player 1.",
-                                extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.END_GAME))
+                    if info: _logger.info(f"Cribbage game terminating at end of deal, at request of player 1.")
+                    if self._events.end_game: self._events.publish(EndGameEvent())
                     return CribbageGameInfo()
  
+        # Complete the record of the game, and write it
+        if self._record:
+            (self._game_record.player1_score, self._game_record.player2_score) = self._board.get_scores()
+            if self._game_record.player1_score == 121:
+                self._game_record.winner = CribbagePlayers.PLAYER_1.value
+            else:
+                self._game_record.winner = CribbagePlayers.PLAYER_2.value
+            if self._record_writer is not None: self._record_writer.write(self._game_record)
+
+        # Complete the exported decisions with the outcome of the game
+        if self._exporter:
+            if self._board.get_scores()[0] == 121:
+                self._exporter.end_game(CribbagePlayers.PLAYER_1.value)
+            else:
+                self._exporter.end_game(CribbagePlayers.PLAYER_2.value)
+
         # Log end of game results
-        logger.info(f"At game end, after {self._deal_count} deals:\n{str(self._board)}",
-                    extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.END_GAME))
-        logger.info(f"     Winning Player: {return_val.winning_player}")
-        logger.info(f"     Winning Player Final Score: {return_val.winning_player_final_score}")
-        logger.info(f"     Losing Player Final Score: {return_val.losing_player_final_score}")
-        logger.info(f"Statistics for {self._player1}:")
-        logger.info(f"     Total Play Score: {return_val.player1_total_play_score}")
-        logger.info(f"     Total His Heals Score: {return_val.player1_total_his_heals_score}")
-        logger.info(f"     Total Show Score: {return_val.player1_total_show_score}")
-        logger.info(f"     Total Crib Score: {return_val.player1_total_crib_score}")
-        logger.info(f"     Check Sum: {return_val.player1_total_play_score + return_val.player1_total_his_heals_score + return_val.player1_total_show_score + return_val.player1_total_crib_score}")
-        logger.info(f"Statistics for {self._player2}:")
-        logger.info(f"     Total Play Score: {return_val.player2_total_play_score}")
-        logger.info(f"     Total His Heals Score: {return_val.player2_total_his_heals_score}")
-        logger.info(f"     Total Show Score: {return_val.player2_total_show_score}")
-        logger.info(f"     Total Crib Score: {return_val.player2_total_crib_score}")
-        logger.info(f"     Check Sum: {return_val.player2_total_play_score + return_val.player2_total_his_heals_score + return_val.player2_total_show_score + return_val.player2_total_crib_score}")
+        if self._events.end_game: self._events.publish(EndGameEvent())
+        if info:
+            _logger.info(f"At game end, after {self._deal_count} deals:\n{str(self._board)}")
+            _logger.info(f"     Winning Player: {return_val.winning_player}")
+            _logger.info(f"     Winning Player Final Score: {return_val.winning_player_final_score}")
+            _logger.info(f"     Losing Player Final Score: {return_val.losing_player_final_score}")
+            _logger.info(f"Statistics for {self._player1}:")
+            _logger.info(f"     Total Play Score: {return_val.player1_total_play_score}")
+            _logger.info(f"     Total His Heals Score: {return_val.player1_total_his_heals_score}")
+            _logger.info(f"     Total Show Score: {return_val.player1_total_show_score}")
+            _logger.info(f"     Total Crib Score: {return_val.player1_total_crib_score}")
+            _logger.info(f"     Check Sum: {return_val.player1_total_play_score + return_val.player1_total_his_heals_score + return_val.player1_total_show_score + return_val.player1_total_crib_score}")
+            _logger.info(f"Statistics for {self._player2}:")
+            _logger.info(f"     Total Play Score: {return_val.player2_total_play_score}")
+            _logger.info(f"     Total His Heals Score: {return_val.player2_total_his_heals_score}")
+            _logger.info(f"     Total Show Score: {return_val.player2_total_show_score}")
+            _logger.info(f"     Total Crib Score: {return_val.player2_total_crib_score}")
+            _logger.info(f"     Check Sum: {return_val.player2_total_play_score + return_val.player2_total_his_heals_score + return_val.player2_total_show_score + return_val.player2_total_crib_score}")
 
         return return_val
 
@@ -303,9 +376,6 @@ class CribbageGame:
             If no path is provided, then user will be queried.
         :return None:
         """
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
-
         if path is None:
             receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
             query_preface = 'Where do you want to save the game?'
@@ -314,7 +384,7 @@ class CribbageGame:
         else:
             save_path = path
 
-        logger.info(f"Saving game to path: {save_path}")
+        if self._logging_enabled(logging.INFO): _logger.info(f"Saving game to path: {save_path}")
 
         # Note that this does not shelve the play strategy attributes of the game.
 
@@ -336,9 +406,6 @@ class CribbageGame:
         :return None:
         """
 
-        # Get the logger 'cribbage_logger'
-        logger = logging.getLogger('cribbage_logger')
-
         if path is None:
             receiver = UserResponseCollector.UserQueryReceiver.UserQueryReceiver_GetCommandReceiver()
             query_preface = 'Which saved game do you want to open?'
@@ -347,7 +414,7 @@ class CribbageGame:
         else:
             load_path = path
 
-        logger.info(f"Loading game from path: {load_path}")
+        if self._logging_enabled(logging.INFO): _logger.info(f"Loading game from path: {load_path}")
 
         # Note that this does not un-shelve the play strategy attributes of the game.
 
@@ -358,13 +425,15 @@ class CribbageGame:
         self._player2=file['player2']
         self._next_to_deal=file['next_to_deal']
         self._deal_count=file['deal_count']
+        # The board was saved by a game that may or may not have been headless
+        self._board.set_headless(self._headless)
 
-        logger.info(f"Player 1 peg locations: {self._board.get_player1_status()[0]},{self._board.get_player1_status()[1]}",
-            extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_SCORE_PLAYER1,
-                                        score_player1=(self._board.get_player1_status()[0],self._board.get_player1_status()[0])))
-
-        logger.info(f"Player 2 peg locations: {self._board.get_player2_status()[0]},{self._board.get_player2_status()[1]}",
-            extra=CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_SCORE_PLAYER2,
-                                        score_player2=(self._board.get_player2_status()[0],self._board.get_player2_status()[0])))
+        if self._logging_enabled(logging.INFO):
+            _logger.info(f"Player 1 peg locations: {self._board.get_player1_status()[0]},{self._board.get_player1_status()[1]}")
+            _logger.info(f"Player 2 peg locations: {self._board.get_player2_status()[0]},{self._board.get_player2_status()[1]}")
+        if self._events.update_score_player1:
+            self._events.publish(UpdateScorePlayer1Event((self._board.get_player1_status()[0],self._board.get_player1_status()[0])))
+        if self._events.update_score_player2:
+            self._events.publish(UpdateScorePlayer2Event((self._board.get_player2_status()[0],self._board.get_player2_status()[0])))
 
         return None
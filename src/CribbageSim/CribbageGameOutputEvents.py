@@ -2,9 +2,18 @@
 Defines a couple of classes used to provide "structured" output of results during game play. This structured information
 could, for example, be used by a GUI to provide visual updates to the user of game results.
 
+Also defines a typed event class for each of the CribbageGameOutputEvents, which is what CribbageGame, CribbageDeal and CribbageBoard
+publish on a CribbageEventBus (see CribbageEventBus). Events are slotted, and carry card codes (see CribbageCardCodec), not strings,
+so they are cheap to create, and are only created when there is a subscriber for their type. to_log_info() converts an event to the
+equivalent CribbageGameLogInfo, with the cards rendered as strings, for outputs that expect those.
+
 Exported Classes:
     CribbageGameOutputEvents - Enumerated list of output (results) events during a cribbage game.
     CribbageGameLogInfo - Used as objectified message when logging from GribbageGame.play().
+    CribbageGameEvent - Base class of the typed events, one for each CribbageGameOutputEvents member:
+        StartGameEvent, StartDealEvent, UpdatePlayer1HandEvent, UpdatePlayer2HandEvent, UpdateStarterEvent, UpdateCribEvent,
+        UpdatePileCombinedEvent, UpdatePlayer1PileEvent, UpdatePlayer2PileEvent, UpdateScorePlayer1Event, UpdateScorePlayer2Event,
+        EndGameEvent
 
     The following is a list of CribbageGameOutputEvents and the attributes that are expect to be provided values in CribbageGameLogInfo:
         0. NO_EVENT:
@@ -36,6 +45,7 @@ Logging:
 from enum import Enum
 
 # Local imports
+from CribbageSim.CribbageCardCodec import code_to_card
 
 
 class CribbageGameOutputEvents(Enum):
@@ -60,7 +70,11 @@ class CribbageGameOutputEvents(Enum):
 class CribbageGameLogInfo:
     """
     A class with all members/attributes considered public. Used as objectified message when logging. with GribbageGame.play() and below.
+    The attributes are slots, so that the many instances created during a game have no per instance __dict__.
     """
+    __slots__ = ('event_type', 'name_player1', 'name_player2', 'name_dealer', 'hand_player1', 'hand_player2', 'starter', 'crib',
+                 'pile_combined', 'go_round_count', 'pile_player1', 'pile_player2', 'score_player1', 'score_player2', 'score_record')
+
     def __init__(self, **kwargs):
         """
         Create and initialize attributes. Which attributes are poplulated depends on event_type
@@ -82,13 +96,9 @@ class CribbageGameLogInfo:
         self.score_player2 = None # Tuple (leading peg position as int, trailing peg position as int)
         self.score_record = [] # List of CribbageComboInfo objects associated with the score
 
-        # Now process any kwargs to populate some of the attributes
+        # Now process any kwargs to populate some of the attributes, ignoring any that are not attributes
         for k,v in kwargs.items():
-            try:
-                self[k]
-                setattr(self,k,v)
-            except KeyError:
-                continue
+            if k in _log_info_attributes: setattr(self,k,v)
 
     def __str__(self):
         """
@@ -100,14 +110,240 @@ class CribbageGameLogInfo:
         """
         So that instance[key] works and instance is iterable.
         """
-        item_list =  [item_value for item_key, item_value in self.__dict__.items() if item_key == key]
-        if len(item_list) == 0:
+        if key not in _log_info_attributes:
             raise KeyError(f"Key = {key} not present in CribbageGameLogInfo instance")
-        value = item_list[0]
-        return value
+        return getattr(self, key)
 
     def __iter__(self):
-        return iter(self.__dict__)
+        return iter(self.__slots__)
+
+
+# The attribute names of CribbageGameLogInfo, for constant time checking of keys
+_log_info_attributes = frozenset(CribbageGameLogInfo.__slots__)
+
+
+def _codes_to_string(codes = ()):
+    """
+    Utility function that renders card codes the way a Hand is rendered, e.g., 'KH AD 2S JC'.
+    :parameter codes: Card codes, sequence of int
+    :return: The cards as a string, string
+    """
+    return ' '.join([str(code_to_card(code)) for code in codes])
+
+
+class CribbageGameEvent(object):
+    """
+    Base class of the typed output events, with all members considered public. Each child class sets event_type to its
+    CribbageGameOutputEvents member, and has slots named as the attributes of CribbageGameLogInfo that the event provides.
+    Members holding cards hold card codes, as a tuple of int for a group of cards, or an int for a single card.
+    """
+    __slots__ = ()
+    event_type = CribbageGameOutputEvents.NO_EVENT
+    # Names of the members that hold card codes, which to_log_info() renders as strings
+    _card_members = ()
+
+    def to_log_info(self):
+        """
+        :return: The equivalent of self as a CribbageGameLogInfo, with cards rendered as strings, CribbageGameLogInfo object
+        """
+        info = CribbageGameLogInfo(event_type = self.event_type)
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if name in self._card_members:
+                value = _codes_to_string((value,)) if isinstance(value, int) else _codes_to_string(value)
+            setattr(info, name, value)
+        return info
+
+    def __eq__(self, other):
+        if type(other) is not type(self): return NotImplemented
+        return all([getattr(self, name) == getattr(other, name) for name in self.__slots__])
+
+    def __repr__(self):
+        members = ', '.join([f"{name}={getattr(self, name)!r}" for name in self.__slots__])
+        return f"{type(self).__name__}({members})"
+
+
+class StartGameEvent(CribbageGameEvent):
+    """
+    A new game has started.
+    """
+    __slots__ = ('name_player1', 'name_player2')
+    event_type = CribbageGameOutputEvents.START_GAME
+
+    def __init__(self, name_player1 = '', name_player2 = ''):
+        """
+        :parameter name_player1: Name of player1, string
+        :parameter name_player2: Name of player2, string
+        """
+        self.name_player1 = name_player1
+        self.name_player2 = name_player2
+
+
+class StartDealEvent(CribbageGameEvent):
+    """
+    A new deal has started.
+    """
+    __slots__ = ('name_dealer',)
+    event_type = CribbageGameOutputEvents.START_DEAL
+
+    def __init__(self, name_dealer = ''):
+        """
+        :parameter name_dealer: Name of the player who will deal, string
+        """
+        self.name_dealer = name_dealer
+
+
+class UpdatePlayer1HandEvent(CribbageGameEvent):
+    """
+    Player1's hand has changed.
+    """
+    __slots__ = ('hand_player1',)
+    event_type = CribbageGameOutputEvents.UPDATE_PLAYER1_HAND
+    _card_members = ('hand_player1',)
+
+    def __init__(self, hand_player1 = ()):
+        """
+        :parameter hand_player1: Codes of the cards in player1's hand, in order, tuple of int
+        """
+        self.hand_player1 = hand_player1
+
+
+class UpdatePlayer2HandEvent(CribbageGameEvent):
+    """
+    Player2's hand has changed.
+    """
+    __slots__ = ('hand_player2',)
+    event_type = CribbageGameOutputEvents.UPDATE_PLAYER2_HAND
+    _card_members = ('hand_player2',)
+
+    def __init__(self, hand_player2 = ()):
+        """
+        :parameter hand_player2: Codes of the cards in player2's hand, in order, tuple of int
+        """
+        self.hand_player2 = hand_player2
+
+
+class UpdateStarterEvent(CribbageGameEvent):
+    """
+    The starter card has been drawn.
+    """
+    __slots__ = ('starter',)
+    event_type = CribbageGameOutputEvents.UPDATE_STARTER
+    _card_members = ('starter',)
+
+    def __init__(self, starter = 0):
+        """
+        :parameter starter: Code of the starter card, int
+        """
+        self.starter = starter
+
+
+class UpdateCribEvent(CribbageGameEvent):
+    """
+    The crib is being shown.
+    """
+    __slots__ = ('crib',)
+    event_type = CribbageGameOutputEvents.UPDATE_CRIB
+    _card_members = ('crib',)
+
+    def __init__(self, crib = ()):
+        """
+        :parameter crib: Codes of the cards in the crib, in order, tuple of int
+        """
+        self.crib = crib
+
+
+class UpdatePileCombinedEvent(CribbageGameEvent):
+    """
+    A card has been added to the combined play pile.
+    """
+    __slots__ = ('pile_combined', 'go_round_count')
+    event_type = CribbageGameOutputEvents.UPDATE_PILE_COMBINED
+    _card_members = ('pile_combined',)
+
+    def __init__(self, pile_combined = (), go_round_count = 0):
+        """
+        :parameter pile_combined: Codes of the cards played during the go round, in the order played, tuple of int
+        :parameter go_round_count: The count of the go round, int
+        """
+        self.pile_combined = pile_combined
+        self.go_round_count = go_round_count
+
+
+class UpdatePlayer1PileEvent(CribbageGameEvent):
+    """
+    Player1 has played a card.
+    """
+    __slots__ = ('pile_player1',)
+    event_type = CribbageGameOutputEvents.UPDATE_PLAYER1_PILE
+    _card_members = ('pile_player1',)
+
+    def __init__(self, pile_player1 = ()):
+        """
+        :parameter pile_player1: Codes of the cards player1 has played, in the order played, tuple of int
+        """
+        self.pile_player1 = pile_player1
+
+
+class UpdatePlayer2PileEvent(CribbageGameEvent):
+    """
+    Player2 has played a card.
+    """
+    __slots__ = ('pile_player2',)
+    event_type = CribbageGameOutputEvents.UPDATE_PLAYER2_PILE
+    _card_members = ('pile_player2',)
+
+    def __init__(self, pile_player2 = ()):
+        """
+        :parameter pile_player2: Codes of the cards player2 has played, in the order played, tuple of int
+        """
+        self.pile_player2 = pile_player2
+
+
+class UpdateScorePlayer1Event(CribbageGameEvent):
+    """
+    Player1 has pegged.
+    """
+    __slots__ = ('score_player1', 'score_record')
+    event_type = CribbageGameOutputEvents.UPDATE_SCORE_PLAYER1
+
+    def __init__(self, score_player1 = (0, 0), score_record = ()):
+        """
+        :parameter score_player1: (leading peg position, trailing peg position), tuple of int
+        :parameter score_record: Why the points were pegged, sequence of CribbageComboInfo objects
+        """
+        self.score_player1 = score_player1
+        self.score_record = score_record
+
+
+class UpdateScorePlayer2Event(CribbageGameEvent):
+    """
+    Player2 has pegged.
+    """
+    __slots__ = ('score_player2', 'score_record')
+    event_type = CribbageGameOutputEvents.UPDATE_SCORE_PLAYER2
+
+    def __init__(self, score_player2 = (0, 0), score_record = ()):
+        """
+        :parameter score_player2: (leading peg position, trailing peg position), tuple of int
+        :parameter score_record: Why the points were pegged, sequence of CribbageComboInfo objects
+        """
+        self.score_player2 = score_player2
+        self.score_record = score_record
+
+
+class EndGameEvent(CribbageGameEvent):
+    """
+    The game engine has ended the game.
+    """
+    __slots__ = ()
+    event_type = CribbageGameOutputEvents.END_GAME
+
+
+# The event class for each of the CribbageGameOutputEvents, other than NO_EVENT
+EVENT_CLASSES = {cls.event_type: cls for cls in (StartGameEvent, StartDealEvent, UpdatePlayer1HandEvent, UpdatePlayer2HandEvent,
+                                                 UpdateStarterEvent, UpdateCribEvent, UpdatePileCombinedEvent, UpdatePlayer1PileEvent,
+                                                 UpdatePlayer2PileEvent, UpdateScorePlayer1Event, UpdateScorePlayer2Event, EndGameEvent)}
 
 
 # (1) Start a new game (names of players, who will deal first, reset board score to 0-0)
@@ -141,5 +377,3 @@ class CribbageGameLogInfo:
 # (10) Update dealer score (as for player)
 #     information sent: name of player that scored (string), pegs scored (integer), score event info (dictionary?)
 #     action taken: Update dealer score on board in UI, display score achieved and event info (something like 'Peg 2 for playing to 31')
-
-
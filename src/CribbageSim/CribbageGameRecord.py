@@ -0,0 +1,460 @@
+"""
+Defines a compact binary record of cribbage games, and a file format for keeping the records of very many games, for auditing
+simulations, and for replaying games.
+
+A deal is recorded as a few dozen bytes (see CribbageDealRecord): which player dealt, the codes (see CribbageCardCodec) of the 12
+dealt cards and the starter, the codes of the cards each role laid in the crib, and a stream of actions, one or two bytes each, for
+each card played, each go declared, and each score pegged, in the order they happened. A game is recorded as its winner, final
+scores, and the records of its deals (see CribbageGameRecord).
+
+A record file is a 16 byte header followed by chunks, each a 16 byte chunk header and the zlib compressed records of up to
+records_per_chunk games. The chunk header holds the sizes of the chunk, the number of games in it, and the CRC-32 checksum of the
+uncompressed records, so that a damaged chunk is detected when it is read. Records are appended to a file with a CribbageRecordWriter,
+and read from it with a CribbageRecordReader.
+
+Construct a CribbageDeal with record = True for it to keep a record of each deal, see CribbageDeal.get_deal_record(), and a
+CribbageGame with record = True, or with a record_writer, for it to keep, or write, a record of each game.
+
+Exported Classes:
+    CribbageDealRecord - The compact record of a single deal.
+    CribbageGameRecord - The compact record of a game, as the records of its deals.
+    CribbageRecordWriter - Appends game records to a record file, in compressed, checksummed chunks.
+    CribbageRecordReader - Reads game records from a record file.
+
+Exported Exceptions:
+    None, but CribbageRecordWriter and CribbageRecordReader raise CribbageRecordError, see exceptions, if a file is not a valid record
+    file.
+
+Exported Functions:
+    None
+
+Logging:
+    None
+"""
+
+
+# Standard imports
+import struct
+import zlib
+
+# Local imports
+from CribbageSim.exceptions import CribbageRecordError
+
+
+# The roles, as recorded in the actions of a deal
+ROLE_PLAYER = 0
+ROLE_DEALER = 1
+
+# The kinds of actions of a deal
+ACTION_PLAY = 0
+ACTION_GO = 1
+ACTION_PEG = 2
+
+# An action is one byte, with the role in the high bit, and either the code of the card played, or a marker for a go or a peg. A peg
+# is followed by a second byte with the number of points.
+_VALUE_MASK = 0x7F
+_GO = 0x40
+_PEG = 0x41
+
+# The fixed part of a deal record: dealer, 12 dealt cards, starter, 4 crib cards, and the number of bytes of actions
+_DEAL_HEADER = struct.Struct('<B12sB4sB')
+# The fixed part of a game record: winner, final scores, and the number of deals
+_GAME_HEADER = struct.Struct('<BBBB')
+
+# File header: magic, version, padded to 16 bytes
+_MAGIC = b'CRIBREC\x00'
+_VERSION = 1
+_FILE_HEADER = struct.Struct('<8sI4x')
+# Chunk header: compressed size, uncompressed size, number of game records, CRC-32 of the uncompressed records
+_CHUNK_HEADER = struct.Struct('<IIII')
+# Each game record in a chunk is preceded by its size
+_RECORD_SIZE = struct.Struct('<H')
+
+
+class CribbageDealRecord(object):
+    """
+    A class with all members considered public, containing the record of a single deal:
+        dealer: Which game participant dealt, as the value of the CribbagePlayers Enum member, int
+        dealt: Codes of the 6 cards dealt to the player, then the 6 dealt to the dealer, in the order dealt, tuple of int
+        starter: Code of the starter card, or -1 if it hasn't been drawn, int
+        player_crib: Codes of the cards the player laid in the crib, in the order laid, tuple of int
+        dealer_crib: Codes of the cards the dealer laid in the crib, in the order laid, tuple of int
+        actions: The encoded actions of the deal, in the order they happened, see add_play(...), add_go(...), add_peg(...), and
+            get_actions(), bytearray
+    """
+    __slots__ = ('dealer', 'dealt', 'starter', 'player_crib', 'dealer_crib', 'actions')
+
+    def __init__(self, dealer = 0):
+        """
+        Create the record of a deal before anything has been dealt.
+        :parameter dealer: Which game participant deals, as the value of the CribbagePlayers Enum member, or 0 if not known, int
+        """
+        self.dealer = dealer
+        self.dealt = ()
+        self.starter = -1
+        self.player_crib = ()
+        self.dealer_crib = ()
+        self.actions = bytearray()
+
+    def add_play(self, role = ROLE_PLAYER, code = 0):
+        """
+        Record that role played a card.
+        :parameter role: ROLE_PLAYER or ROLE_DEALER, int
+        :parameter code: The code of the card played, int
+        :return: None
+        """
+        self.actions.append((role << 7) | code)
+        return None
+
+    def add_go(self, role = ROLE_PLAYER):
+        """
+        Record that role declared a go, that is, could not play.
+        :parameter role: ROLE_PLAYER or ROLE_DEALER, int
+        :return: None
+        """
+        self.actions.append((role << 7) | _GO)
+        return None
+
+    def add_peg(self, role = ROLE_PLAYER, points = 1):
+        """
+        Record that role pegged points.
+        :parameter role: ROLE_PLAYER or ROLE_DEALER, int
+        :parameter points: The number of points pegged, int [1...255]
+        :return: None
+        """
+        self.actions.append((role << 7) | _PEG)
+        self.actions.append(points)
+        return None
+
+    def get_actions(self):
+        """
+        Decode the actions of the deal.
+        :return: (kind, role, value) for each action, in the order they happened, where kind is ACTION_PLAY, ACTION_GO, or ACTION_PEG,
+            role is ROLE_PLAYER or ROLE_DEALER, and value is the code of the card played, 0 for a go, or the points pegged, list of tuples
+        """
+        decoded = []
+        actions = self.actions
+        i = 0
+        while i < len(actions):
+            byte = actions[i]
+            role = byte >> 7
+            value = byte & _VALUE_MASK
+            if value == _PEG:
+                decoded.append((ACTION_PEG, role, actions[i + 1]))
+                i += 2
+            elif value == _GO:
+                decoded.append((ACTION_GO, role, 0))
+                i += 1
+            else:
+                decoded.append((ACTION_PLAY, role, value))
+                i += 1
+        return decoded
+
+    def get_scores(self):
+        """
+        :return: (points pegged by the player, points pegged by the dealer) during the deal, tuple of int
+        """
+        scores = [0, 0]
+        for (kind, role, value) in self.get_actions():
+            if kind == ACTION_PEG: scores[role] += value
+        return tuple(scores)
+
+    def to_bytes(self):
+        """
+        :return: The record encoded in 19 bytes plus the actions, bytes
+        """
+        assert(len(self.dealt) == 12 and len(self.player_crib) == 2 and len(self.dealer_crib) == 2 and self.starter >= 0)
+        assert(len(self.actions) < 256)
+        return _DEAL_HEADER.pack(self.dealer, bytes(self.dealt), self.starter, bytes(self.player_crib + self.dealer_crib),
+                                 len(self.actions)) + bytes(self.actions)
+
+    @staticmethod
+    def from_bytes(data = b'', offset = 0):
+        """
+        Decode a record encoded by to_bytes().
+        :parameter data: The encoded record, possibly among others, bytes-like object
+        :parameter offset: Where the encoded record starts in data, int
+        :return: (the record, the offset just past it in data), tuple of (CribbageDealRecord object, int)
+        """
+        (dealer, dealt, starter, crib, num_actions) = _DEAL_HEADER.unpack_from(data, offset)
+        offset += _DEAL_HEADER.size
+        record = CribbageDealRecord(dealer)
+        record.dealt = tuple(dealt)
+        record.starter = starter
+        record.player_crib = tuple(crib[0:2])
+        record.dealer_crib = tuple(crib[2:4])
+        record.actions = bytearray(data[offset:offset + num_actions])
+        return (record, offset + num_actions)
+
+    def __eq__(self, other):
+        if not isinstance(other, CribbageDealRecord): return NotImplemented
+        return (self.dealer, self.dealt, self.starter, self.player_crib, self.dealer_crib, self.actions) == \
+            (other.dealer, other.dealt, other.starter, other.player_crib, other.dealer_crib, other.actions)
+
+
+class CribbageGameRecord(object):
+    """
+    A class with all members considered public, containing the record of a game:
+        winner: Which game participant won, as the value of the CribbagePlayers Enum member, or 0 if the game didn't finish, int
+        player1_score: Player1's final score, int
+        player2_score: Player2's final score, int
+        deals: The records of the deals, in the order played, list of CribbageDealRecord objects
+    """
+    __slots__ = ('winner', 'player1_score', 'player2_score', 'deals')
+
+    def __init__(self):
+        """
+        Create the record of a game before any deals.
+        """
+        self.winner = 0
+        self.player1_score = 0
+        self.player2_score = 0
+        self.deals = []
+
+    def to_bytes(self):
+        """
+        :return: The record encoded in 4 bytes plus the encoded deals, bytes
+        """
+        assert(len(self.deals) < 256)
+        parts = [_GAME_HEADER.pack(self.winner, self.player1_score, self.player2_score, len(self.deals))]
+        parts.extend([deal.to_bytes() for deal in self.deals])
+        return b''.join(parts)
+
+    @staticmethod
+    def from_bytes(data = b'', offset = 0):
+        """
+        Decode a record encoded by to_bytes().
+        :parameter data: The encoded record, possibly among others, bytes-like object
+        :parameter offset: Where the encoded record starts in data, int
+        :return: (the record, the offset just past it in data), tuple of (CribbageGameRecord object, int)
+        """
+        record = CribbageGameRecord()
+        (record.winner, record.player1_score, record.player2_score, num_deals) = _GAME_HEADER.unpack_from(data, offset)
+        offset += _GAME_HEADER.size
+        for i in range(num_deals):
+            (deal, offset) = CribbageDealRecord.from_bytes(data, offset)
+            record.deals.append(deal)
+        return (record, offset)
+
+    def __eq__(self, other):
+        if not isinstance(other, CribbageGameRecord): return NotImplemented
+        return (self.winner, self.player1_score, self.player2_score, self.deals) == \
+            (other.winner, other.player1_score, other.player2_score, other.deals)
+
+
+def _check_file_header(header = b'', path = ''):
+    """
+    Utility function that checks the header read from the start of a record file.
+    :parameter header: The bytes read from the start of the file, bytes
+    :parameter path: Path to the record file, for error messages, string
+    :return: None
+    """
+    if len(header) < _FILE_HEADER.size:
+        raise CribbageRecordError(f"{path} is too short to be a game record file")
+    (magic, version) = _FILE_HEADER.unpack(header)
+    if magic != _MAGIC or version != _VERSION:
+        raise CribbageRecordError(f"{path} is not a version {_VERSION} game record file")
+    return None
+
+
+class CribbageRecordWriter(object):
+    """
+    Appends game records to a record file, compressing them in chunks of records_per_chunk games. Records are buffered until a chunk
+    is full, so call flush() or close() to write a partial chunk. Can be used as a context manager, which closes the writer on exit.
+    """
+    def __init__(self, path = '', records_per_chunk = 1024, compress_level = 6):
+        """
+        Open the record file at path for appending, creating it if it doesn't exist. Raises CribbageRecordError if the file exists, and
+        is not a record file.
+        :parameter path: Path to the record file, string
+        :parameter records_per_chunk: The most game records in a chunk, int
+        :parameter compress_level: zlib compression level, int [0...9]
+        """
+        assert(records_per_chunk > 0)
+        self._records_per_chunk = records_per_chunk
+        self._compress_level = compress_level
+        # The encoded records of the chunk being built, each preceded by its size
+        self._chunk = bytearray()
+        self._chunk_records = 0
+        # Writes always go to the end of the file, whatever is read first
+        self._file = open(path, 'a+b')
+        try:
+            if self._file.tell() == 0:
+                self._file.write(_FILE_HEADER.pack(_MAGIC, _VERSION))
+            else:
+                self._file.seek(0)
+                _check_file_header(self._file.read(_FILE_HEADER.size), path)
+        except CribbageRecordError:
+            self.close()
+            raise
+
+    def write(self, record = None):
+        """
+        Add a game record to the file.
+        :parameter record: The record, CribbageGameRecord object
+        :return: None
+        """
+        data = record.to_bytes()
+        self._chunk += _RECORD_SIZE.pack(len(data))
+        self._chunk += data
+        self._chunk_records += 1
+        if self._chunk_records >= self._records_per_chunk: self.flush()
+        return None
+
+    def flush(self):
+        """
+        Write the buffered records to the file as a chunk, even if it isn't full.
+        :return: None
+        """
+        if self._chunk_records > 0:
+            compressed = zlib.compress(self._chunk, self._compress_level)
+            self._file.write(_CHUNK_HEADER.pack(len(compressed), len(self._chunk), self._chunk_records, zlib.crc32(self._chunk)))
+            self._file.write(compressed)
+            self._chunk = bytearray()
+            self._chunk_records = 0
+        self._file.flush()
+        return None
+
+    def close(self):
+        """
+        Write the buffered records, and close the file.
+        :return: None
+        """
+        self.flush()
+        self._file.close()
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class CribbageRecordReader(object):
+    """
+    Reads game records from a record file written by a CribbageRecordWriter. Iterating over the reader gives every game record in
+    the file, in order. Raises CribbageRecordError if the file is not a record file, or a chunk is damaged.
+    Can be used as a context manager, which closes the reader on exit.
+    """
+    def __init__(self, path = ''):
+        """
+        Open the record file at path, and check its header.
+        :parameter path: Path to the record file, string
+        """
+        self._file = open(path, 'rb')
+        try:
+            _check_file_header(self._file.read(_FILE_HEADER.size), path)
+        except CribbageRecordError:
+            self.close()
+            raise
+
+    def close(self):
+        """
+        Close the record file.
+        :return: None
+        """
+        self._file.close()
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def chunk_offsets(self):
+        """
+        Find the chunks of the file, without decompressing them.
+        :return: (file offset of the chunk, number of game records in it) for each chunk, in order, list of tuples of int
+        """
+        offsets = []
+        offset = _FILE_HEADER.size
+        while True:
+            self._file.seek(offset)
+            header = self._file.read(_CHUNK_HEADER.size)
+            if len(header) == 0: break
+            if len(header) < _CHUNK_HEADER.size:
+                raise CribbageRecordError(f"Chunk header at offset {offset} is truncated")
+            (compressed_size, size, num_records, checksum) = _CHUNK_HEADER.unpack(header)
+            offsets.append((offset, num_records))
+            offset += _CHUNK_HEADER.size + compressed_size
+        return offsets
+
+    def _read_chunk_data(self, offset = _FILE_HEADER.size):
+        """
+        Utility function that reads, checks, and decompresses the chunk at offset, and finds where its records are.
+        :parameter offset: File offset of the chunk, as returned by chunk_offsets(), int
+        :return: (the uncompressed records, the position of each record in them), tuple of (bytes, list of int)
+        """
+        self._file.seek(offset)
+        header = self._file.read(_CHUNK_HEADER.size)
+        if len(header) < _CHUNK_HEADER.size:
+            raise CribbageRecordError(f"Chunk header at offset {offset} is truncated")
+        (compressed_size, size, num_records, checksum) = _CHUNK_HEADER.unpack(header)
+        compressed = self._file.read(compressed_size)
+        try:
+            data = zlib.decompress(compressed)
+        except zlib.error as e:
+            raise CribbageRecordError(f"Chunk at offset {offset} can't be decompressed: {e}")
+        if len(data) != size or zlib.crc32(data) != checksum:
+            raise CribbageRecordError(f"Chunk at offset {offset} fails its checksum")
+        # Hop from record to record by their sizes, without decoding them
+        positions = []
+        pos = 0
+        for i in range(num_records):
+            (record_size,) = _RECORD_SIZE.unpack_from(data, pos)
+            pos += _RECORD_SIZE.size
+            positions.append(pos)
+            pos += record_size
+        return (data, positions)
+
+    def read_chunk(self, offset = _FILE_HEADER.size):
+        """
+        Read, check, and decode the chunk at offset.
+        :parameter offset: File offset of the chunk, as returned by chunk_offsets(), int
+        :return: The game records in the chunk, in order, list of CribbageGameRecord objects
+        """
+        (data, positions) = self._read_chunk_data(offset)
+        return [CribbageGameRecord.from_bytes(data, pos)[0] for pos in positions]
+
+    def read_game(self, offset = _FILE_HEADER.size, index = 0):
+        """
+        Read, check, and decompress the chunk at offset, and decode only one of its game records.
+        :parameter offset: File offset of the chunk, as returned by chunk_offsets(), int
+        :parameter index: Which game record of the chunk to decode, int [0...number of records in chunk - 1]
+        :return: The game record, CribbageGameRecord object
+        """
+        (data, positions) = self._read_chunk_data(offset)
+        return CribbageGameRecord.from_bytes(data, positions[index])[0]
+
+    def read_deal_counts(self, offset = _FILE_HEADER.size):
+        """
+        Read, check, and decompress the chunk at offset, and find how many deals each of its games had, without decoding them.
+        :parameter offset: File offset of the chunk, as returned by chunk_offsets(), int
+        :return: The number of deals of each game in the chunk, in order, list of int
+        """
+        (data, positions) = self._read_chunk_data(offset)
+        return [_GAME_HEADER.unpack_from(data, pos)[3] for pos in positions]
+
+    def read_game_of_deal(self, offset = _FILE_HEADER.size, deal = 0):
+        """
+        Read, check, and decompress the chunk at offset, and decode only the game record in which one of its deals was played.
+        :parameter offset: File offset of the chunk, as returned by chunk_offsets(), int
+        :parameter deal: Which deal of the chunk, counting through the deals of its games in order, int
+        :return: (the game record, the index of the deal in the game's deals), tuple of (CribbageGameRecord object, int)
+        """
+        (data, positions) = self._read_chunk_data(offset)
+        # Count through the deals of the games, from their headers, to find the game
+        for pos in positions:
+            num_deals = _GAME_HEADER.unpack_from(data, pos)[3]
+            if deal < num_deals:
+                return (CribbageGameRecord.from_bytes(data, pos)[0], deal)
+            deal -= num_deals
+        raise CribbageRecordError(f"Chunk at offset {offset} has fewer deals than expected")
+
+    def __iter__(self):
+        for (offset, num_records) in self.chunk_offsets():
+            yield from self.read_chunk(offset)
@@ -0,0 +1,89 @@
+"""
+Defines the hand used for the hands, play piles, and crib of a cribbage deal.
+
+Exported Classes:
+    CribbageHand - A HandsDecksCards Hand that can be emptied and reused.
+    CribbageCardsView - A read-only sequence view of the cards in a CribbageHand.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    None
+
+Logging:
+    None
+"""
+
+
+# Standard imports
+from collections.abc import Sequence
+
+# Local imports
+from HandsDecksCards.hand import Hand
+
+
+class CribbageCardsView(Sequence):
+    """
+    A read-only view of the cards in a CribbageHand. It can be indexed, iterated, and searched like a list of the cards, without copying
+    them, and always shows the current cards of the hand, so a view obtained before a card is played or removed from the hand no longer
+    shows that card. It has no methods to change the hand.
+    """
+    __slots__ = ('_cards',)
+
+    def __init__(self, cards = []):
+        """
+        Construct a view.
+        :parameter cards: The list of cards to view, which is not copied, list of Card objects
+        """
+        self._cards = cards
+
+    def __getitem__(self, index):
+        return self._cards[index]
+
+    def __len__(self):
+        return len(self._cards)
+
+    def __iter__(self):
+        return iter(self._cards)
+
+    def __contains__(self, card):
+        return card in self._cards
+
+    def index(self, card, start = 0, stop = None):
+        """
+        :parameter card: The card to find, Card object
+        :return: The position of card in the view, int
+        """
+        if stop is None: stop = len(self._cards)
+        return self._cards.index(card, start, stop)
+
+    def __str__(self):
+        return ' '.join([str(c) for c in self._cards])
+
+
+class CribbageHand(Hand):
+    """
+    A Hand that can be emptied, so that a CribbageDeal reusing its buffers can keep the same Hand objects from deal to deal,
+    rather than constructing new ones, and that provides a read-only view of its cards.
+    """
+    def __init__(self):
+        """
+        Construct an empty hand of playing cards.
+        """
+        super().__init__()
+        self._view = CribbageCardsView(self._cards)
+
+    def view(self):
+        """
+        :return: A read-only view of the cards in the hand, which shows the current cards of the hand, CribbageCardsView object
+        """
+        return self._view
+
+    def clear(self):
+        """
+        Remove all cards from the hand, keeping the same underlying list.
+        :return: None
+        """
+        self._cards.clear()
+        return None
@@ -0,0 +1,216 @@
+"""
+Defines a background logging pipeline for game output, so that the thread playing the game never blocks on writing to the terminal
+or to disk.
+
+In the pipeline, the logger's only output handler is a queue handler, which puts each record on an in-process queue, without
+formatting it. A CribbageLogListener, on a background thread, takes the records off the queue and hands them to handlers that buffer
+the formatted messages, writing and flushing them in one batch when the queue has been drained, or when the batch is full, rather than
+once per message.
+
+CribbageSimulator.setup_logging(..., background = True) sets up the pipeline, and CribbageSimulator.shutdown_logging() stops it,
+writing any records still queued.
+
+Exported Classes:
+    CribbageLogListener - A logging.handlers.QueueListener that flushes its handlers once per batch of records.
+    CribbageBatchedStreamHandler - A logging.StreamHandler that writes buffered messages to its stream when flushed.
+    CribbageBatchedRotatingFileHandler - A logging.handlers.RotatingFileHandler that writes buffered messages to its file when flushed.
+    CribbageRecordQueueHandler - A logging.handlers.QueueHandler that puts records on the queue as they are.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    None
+
+Logging:
+    None
+"""
+
+
+# Standard imports
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Local imports
+
+
+class CribbageRecordQueueHandler(QueueHandler):
+    """
+    A QueueHandler for a queue consumed in the same process, such as by a CribbageLogListener. Records are put on the queue as they
+    are, so the message isn't formatted on the logging thread, but by the handlers of the listener.
+    """
+    def prepare(self, record):
+        """
+        :parameter record: The record being logged, logging.LogRecord object
+        :return: record, unchanged, logging.LogRecord object
+        """
+        return record
+
+
+class CribbageBatchedStreamHandler(logging.StreamHandler):
+    """
+    A StreamHandler that buffers the formatted message of each record it handles, and only writes them to the stream, all at once,
+    when flushed. Intended as a handler of a CribbageLogListener, which flushes its handlers once per batch of records.
+    """
+    def __init__(self, stream = None):
+        """
+        :parameter stream: The stream to write to, or None for sys.stderr, file-like object
+        """
+        super().__init__(stream)
+        # The formatted messages waiting to be written, each with its terminator
+        self._pending = []
+
+    def emit(self, record):
+        """
+        Format record and add its message to the buffer.
+        :parameter record: The record to output, logging.LogRecord object
+        :return: None
+        """
+        try:
+            self._pending.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+        return None
+
+    def flush(self):
+        """
+        Write the buffered messages to the stream, and flush the stream.
+        :return: None
+        """
+        self.acquire()
+        try:
+            if self._pending:
+                text = ''.join(self._pending)
+                self._pending.clear()
+                self.stream.write(text)
+            if self.stream and hasattr(self.stream, 'flush'):
+                self.stream.flush()
+        finally:
+            self.release()
+        return None
+
+
+class CribbageBatchedRotatingFileHandler(RotatingFileHandler):
+    """
+    A RotatingFileHandler that buffers the formatted message of each record it handles, and only writes them to the file, all at once,
+    when flushed, or when the next message would make the file larger than maxBytes, in which case the buffer is written and the file
+    rolled over first. Intended as a handler of a CribbageLogListener, which flushes its handlers once per batch of records.
+    """
+    def __init__(self, filename = '', maxBytes = 0, backupCount = 0, encoding = None):
+        """
+        :parameter filename: Path of the log file, string
+        :parameter maxBytes: Size in bytes at which the file is rolled over, or 0 never to roll over, int
+        :parameter backupCount: The number of rolled over files to keep, int
+        :parameter encoding: Encoding of the log file, or None for the default, string
+        """
+        super().__init__(filename, maxBytes = maxBytes, backupCount = backupCount, encoding = encoding)
+        # The formatted messages waiting to be written, each with its terminator, and their total length
+        self._pending = []
+        self._pending_size = 0
+
+    def _write_pending(self):
+        """
+        Utility function that writes the buffered messages to the file, without flushing it.
+        :return: None
+        """
+        if self._pending:
+            if self.stream is None: self.stream = self._open()
+            self.stream.write(''.join(self._pending))
+            self._pending.clear()
+            self._pending_size = 0
+        return None
+
+    def emit(self, record):
+        """
+        Format record and add its message to the buffer, first writing the buffer and rolling over the file if the message would make
+        the file too large.
+        :parameter record: The record to output, logging.LogRecord object
+        :return: None
+        """
+        try:
+            msg = self.format(record) + self.terminator
+            if self.maxBytes > 0:
+                if self.stream is None: self.stream = self._open()
+                # Length of the message as characters, not encoded bytes, like RotatingFileHandler.shouldRollover(...)
+                if self.stream.tell() + self._pending_size + len(msg) >= self.maxBytes:
+                    self._write_pending()
+                    self.doRollover()
+            self._pending.append(msg)
+            self._pending_size += len(msg)
+        except Exception:
+            self.handleError(record)
+        return None
+
+    def flush(self):
+        """
+        Write the buffered messages to the file, and flush the file.
+        :return: None
+        """
+        self.acquire()
+        try:
+            self._write_pending()
+            if self.stream and hasattr(self.stream, 'flush'):
+                self.stream.flush()
+        finally:
+            self.release()
+        return None
+
+    def close(self):
+        """
+        Write the buffered messages to the file, and close it.
+        :return: None
+        """
+        self.flush()
+        super().close()
+        return None
+
+
+class CribbageLogListener(QueueListener):
+    """
+    A QueueListener that handles records on its background thread in batches. After handling a record, its handlers are flushed if
+    there are no more records waiting on the queue, or if batch_size records have been handled since they were last flushed, so that
+    a burst of records is written with one write and one flush per handler.
+    """
+    def __init__(self, queue = None, *handlers, batch_size = 256):
+        """
+        :parameter queue: The queue records are taken from, Queue or SimpleQueue object
+        :parameter handlers: The handlers of the records, logging.Handler objects
+        :parameter batch_size: The most records handled before the handlers are flushed, int
+        """
+        assert(batch_size > 0)
+        super().__init__(queue, *handlers, respect_handler_level = True)
+        self._batch_size = batch_size
+        # The number of records handled since the handlers were flushed
+        self._unflushed = 0
+
+    def _flush_handlers(self):
+        """
+        Utility function that flushes the handlers.
+        :return: None
+        """
+        for handler in self.handlers:
+            handler.flush()
+        self._unflushed = 0
+        return None
+
+    def handle(self, record):
+        """
+        Handle record with the handlers, and flush them at the end of a batch.
+        :parameter record: The record taken from the queue, logging.LogRecord object
+        :return: None
+        """
+        super().handle(record)
+        self._unflushed += 1
+        if self._unflushed >= self._batch_size or self.queue.empty():
+            self._flush_handlers()
+        return None
+
+    def stop(self):
+        """
+        Handle the records still on the queue, stop the background thread, and flush the handlers.
+        :return: None
+        """
+        if self._thread is not None:
+            super().stop()
+        self._flush_handlers()
+        return None
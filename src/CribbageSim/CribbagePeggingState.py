@@ -0,0 +1,184 @@
+"""
+Defines a class that tracks the state of the play (pegging) during a go round of a cribbage deal, so that the points for each
+card played can be determined as it is played, without searching the whole play pile again.
+
+Exported Classes:
+    CribbagePeggingState - The running count, same rank streak, and recent ranks of the cards played during a go round.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    None
+
+Logging:
+    None
+"""
+
+
+# Standard imports
+
+# Local imports
+from HandsDecksCards.card import Card
+from CribbageSim.CribbageCardCodec import card_to_code, CODE_RANKS, CODE_COUNTS
+
+
+class CribbagePeggingState(object):
+    """
+    Tracks the state of the play pile during a go round, updated card by card as cards are played, and determines the points for the
+    last card played directly from that state. The points are the same as those found by FifteenCombinationPlaying,
+    PairCombinationPlaying, and RunCombinationPlaying searching the play pile, but each card is scored in constant time:
+        - A fifteen only needs the running count.
+        - A pair, pair royal, or double pair royal only needs the number of cards of the same rank at the end of the pile.
+        - A run only needs the ranks at the end of the pile, back to the first repeated rank, which is never more than 13 cards.
+    The points that a card would score if it were played next can also be asked for, without changing the state, which is what a
+    play strategy needs to rate the cards in its hand.
+    """
+    def __init__(self, pile = []):
+        """
+        Construct the state for an empty play pile, and then add any cards in pile to it.
+        :parameter pile: Cards already played during the go round, in the order played, Hand object or list of Card objects
+        """
+        self.reset()
+        for card in pile:
+            self.add_card(card)
+
+    def reset(self):
+        """
+        Reset to the state for an empty play pile, as at the start of a go round.
+        :return: None
+        """
+        # The total count of the cards played during the go round
+        self._count = 0
+        # The ranks (A=0, ..., K=12, see CribbageCardCodec) of the cards played during the go round, in the order played
+        self._ranks = []
+        # The number of cards at the end of the pile that have the same rank as the last card played
+        self._same_rank_streak = 0
+        # The last card played, or None
+        self._last_card = None
+        # The points for the last card played, as a (fifteen, pair, run) tuple
+        self._last_points = (0, 0, 0)
+        return None
+
+    def get_count(self):
+        """
+        :return: The total count of the cards played during the go round, int
+        """
+        return self._count
+
+    def get_num_cards(self):
+        """
+        :return: The number of cards played during the go round, int
+        """
+        return len(self._ranks)
+
+    def get_last_card(self):
+        """
+        :return: The last card played, or None if no card has been played during the go round, Card object
+        """
+        return self._last_card
+
+    def get_last_points(self):
+        """
+        :return: The points scored by the last card played, as a (fifteen, pair, run) tuple of points, (int, int, int)
+        """
+        return self._last_points
+
+    def get_last_score(self):
+        """
+        :return: The total points scored by the last card played, int
+        """
+        return sum(self._last_points)
+
+    def matches(self, pile = []):
+        """
+        Quick check that pile is the play pile this state has been tracking, in that it has the same number of cards, and the same last card.
+        :parameter pile: A play pile, Hand object or list of Card objects
+        :return: True if pile appears to be the tracked play pile, otherwise False, boolean
+        """
+        n = len(pile)
+        if n != len(self._ranks): return False
+        if n == 0: return True
+        return pile[n - 1] is self._last_card
+
+    def sync(self, pile = []):
+        """
+        Make sure that the state is tracking pile. If pile is the tracked play pile with one more card played, then that card is added.
+        Otherwise, if pile has been changed in some other way, for example by a unit test adding cards to it directly, the state is rebuilt
+        from pile.
+        :parameter pile: The play pile, Hand object or list of Card objects
+        :return: None
+        """
+        if self.matches(pile): return None
+        n = len(pile)
+        if n == len(self._ranks) + 1 and (n == 1 or pile[n - 2] is self._last_card):
+            self.add_card(pile[n - 1])
+        else:
+            self.reset()
+            for card in pile:
+                self.add_card(card)
+        return None
+
+    def points_for(self, card = Card()):
+        """
+        Determine the points that card would score if it were played next, without changing the state.
+        :parameter card: The card that might be played next, Card object
+        :return: The points card would score, as a (fifteen, pair, run) tuple of points, (int, int, int)
+        """
+        code = card_to_code(card)
+        rank = CODE_RANKS[code]
+
+        # Fifteen
+        fifteen = 0
+        if self._count + CODE_COUNTS[code] == 15: fifteen = 2
+
+        # Pair, pair royal, or double pair royal, based on the number of cards of the same rank at the end of the pile
+        same = 1
+        if self._last_card is not None and self._ranks[-1] == rank:
+            same = min(4, self._same_rank_streak + 1)
+        pair = same * (same - 1)
+
+        # Run. Scan backward from the card. The last x cards are a run if their ranks are all different, and the highest less the lowest
+        # is x-1. Once a rank repeats, no longer stretch of cards can be a run, so stop there.
+        run = 0
+        if same == 1:
+            seen = 1 << rank
+            low = rank
+            high = rank
+            x = 1
+            for i in range(len(self._ranks) - 1, -1, -1):
+                r = self._ranks[i]
+                if seen & (1 << r): break
+                seen |= 1 << r
+                if r < low: low = r
+                if r > high: high = r
+                x += 1
+                if x >= 3 and high - low == x - 1: run = x
+
+        return (fifteen, pair, run)
+
+    def score_for(self, card = Card()):
+        """
+        Determine the total points that card would score if it were played next, without changing the state.
+        :parameter card: The card that might be played next, Card object
+        :return: The total points card would score, int
+        """
+        return sum(self.points_for(card))
+
+    def add_card(self, card = Card()):
+        """
+        Update the state for card being played, and determine the points it scores.
+        :parameter card: The card played, Card object
+        :return: The total points scored by card, int
+        """
+        self._last_points = self.points_for(card)
+        code = card_to_code(card)
+        rank = CODE_RANKS[code]
+        if self._last_card is not None and self._ranks[-1] == rank:
+            self._same_rank_streak += 1
+        else:
+            self._same_rank_streak = 1
+        self._ranks.append(rank)
+        self._count += CODE_COUNTS[code]
+        self._last_card = card
+        return sum(self._last_points)
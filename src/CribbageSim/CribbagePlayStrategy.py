@@ -34,12 +34,17 @@ Logging:
 
 # Standard imports
 import random
+from itertools import combinations
 
 # Local imports
 import UserResponseCollector.UserQueryReceiver # Leave this like it is, so that import can be used to do a swap out of the UserQueryReceiver between base and child if needed
 from UserResponseCollector.UserQueryCommand import UserQueryCommandMenu
 from CribbageSim.CribbageCombination import CribbageCombinationShowing, PairCombination, FifteenCombination, RunCombination, FlushCombination
+from CribbageSim.CribbageCombination import score_show_combinations
 from CribbageSim.CribbageCombination import CribbageCombinationPlaying, PairCombinationPlaying, FifteenCombinationPlaying, RunCombinationPlaying
+from CribbageSim.CribbagePeggingState import CribbagePeggingState
+from CribbageSim.CribbageBitboard import playable_cards
+from CribbageSim.CribbageCardCodec import NUM_CODES, CODE_RANKS, CODE_COUNTS, CODE_SUITS, JACK_RANK, cards_to_codes
 from HandsDecksCards.hand import Hand
 from CribbageSim.exceptions import CribbageGameOverError
 
@@ -49,19 +54,27 @@ class CribbageCribOption:
     A class with structured information about a possible option for forming the crib. All class attributes are intended to be "public".
         hand: List of 4 cards to be retained in the hand if a crib is formed using this option, list of Card objects
         hand_score: The guaranteed score of the cards in the hand when the hand is shown, that is, the score of the cards without
-            consideration of a possible starter card, int
+            consideration of a possible starter card, int. Or, if the strategy has a starter table, the expected score of the cards in the
+            hand over all possible starters, float
         crib: List of 2 cards to be layed in teh crib if a crib is formed using this option, list of Card objects
         crib_score: The guaranteed score of the two cards in the crib when the crib is shown, that is, the score of the cards without
-            consideration of a possible starter card or the other player's contribution to the crib, int
+            consideration of a possible starter card or the other player's contribution to the crib, int. Or, if the strategy has a
+            starter table, the expected score of the two cards with the starter, over the same starters as hand_score, still without
+            consideration of the other player's contribution, float. Either way, hand_score and crib_score are on the same basis, so
+            they can be added or subtracted
+        crib_indices: The positions of the 2 crib cards in the dealt hand, in ascending order, list of int
     """
+    __slots__ = ('hand', 'hand_score', 'crib', 'crib_score', 'crib_indices')
+
     def __init__(self):
         """
         Construct an object of this class.
         """
         self.hand = []
         self.hand_score = 0
-        self.crb = []
+        self.crib = []
         self.crib_score = 0
+        self.crib_indices = []
 
     def __str__(self):
         hand = Hand()
@@ -82,7 +95,13 @@ class CribbagePlayStrategy:
         go(...) - For playing out as many cards as possible AFTER opponent has declared "go".
         continue_save_end(...) - For deciding weether to continue by playing another deal, saving the game state and ending, or ending without
             saving the game state.
+    A child that only reads the cards returned by get_hand_callback and get_play_pile_callback, and does not change or keep them, can set
+    the class attribute uses_state_views to True. CribbageDeal then passes callbacks that return read-only views of its hands and play pile,
+    see CribbageCardsView, rather than callbacks that return a new list copy every time they are called.
     """
+    # True if the strategy can be given callbacks that return read-only views, rather than list copies
+    uses_state_views = False
+
     def form_crib(self, xfer_to_crib_callback, get_hand_callback, play_recorder_callback=None):
         """
         This is an abstract method that MUST be implemented by children. If called, it will raise NotImplementedError
@@ -163,10 +182,17 @@ class HoyleishCribbagePlayStrategy(CribbagePlayStrategy):
     implies that not all recommendations from Hoyle may be implemented, and other strategy components may be implemented alternatively or
     in addition too.
     """
-    def __init__(self):
+    # Hand and play pile are only read, so CribbageDeal can pass read-only views
+    uses_state_views = True
+
+    def __init__(self, starter_table = None):
         """
         Construct an object of this class.
+        :parameter starter_table: If not None, then crib forming is based on the expected score over all possible starters of the cards
+            kept in the hand, looked up in this table, and of the cards laid in the crib, rather than on the guaranteed scores,
+            CribbageStarterTable object
         """
+        self._starter_table = starter_table
         # All elements of the _guaranteed_4card_combinations and _guaranteed_2card_combinations lists must be children of
         # CribbageCombinationShowing class.
         self._guaranteed_4card_combinations = [PairCombination(), FifteenCombination(), RunCombination(), FlushCombination()]
@@ -195,29 +221,29 @@ class HoyleishCribbagePlayStrategy(CribbagePlayStrategy):
         # Default tuple to return, arbitrarily here a GO tuple, but expected to be set in all branches below
         return_val = (0, True)
         
+        # Get the cards in the hand once, since nothing is played from it until the card to follow has been chosen
+        hand = get_hand_callback()
+
         # Determine list of cards in the hand that can be played without go_count exceeding 31.
-        playable = [c for c in get_hand_callback() if c.count_card() <= (31 - go_count)]
+        playable = playable_cards(hand, go_count)
 
         if len(playable) > 0:
-            if len(get_play_pile_callback()) == 0:
+            pile = get_play_pile_callback()
+            if len(pile) == 0:
                 # The play pile has no cards in it, so this is a lead, so call lead(...) method
                 h = Hand()
                 h.add_cards(playable)
                 (count, card) = self.lead(h)
-                play_card_callback(get_hand_callback().index(card))
+                play_card_callback(hand.index(card))
                 return_val = (count, False)
             else:
                 # Apply logic for following
-                hand = Hand()
-                hand.add_cards(playable)
-                pile = Hand()
-                pile.add_cards(get_play_pile_callback())
-                priority_list = self.rate_follows_in_hand(hand, pile)
+                priority_list = self.rate_follows_in_hand(playable, pile)
                 # Sort priority_list by descending rating
                 sorted_list = sorted(priority_list, key = lambda rating: rating[1], reverse = True)
                 card = sorted_list[0][0]
                 count = card.count_card()
-                play_card_callback(get_hand_callback().index(card))
+                play_card_callback(hand.index(card))
                 return_val = (count, False)
                 
         else:
@@ -255,7 +281,8 @@ class HoyleishCribbagePlayStrategy(CribbagePlayStrategy):
         play_count = go_count
         
         # Generate list of which if any cards can still be played
-        playable = [c for c in get_hand_callback() if c.count_card() <= (31 - play_count)]
+        hand = get_hand_callback()
+        playable = playable_cards(hand, play_count)
 
         while (len(playable) > 0):
 
@@ -267,11 +294,7 @@ class HoyleishCribbagePlayStrategy(CribbagePlayStrategy):
 
             # For now though, we'll consider it close enough to optimize each individual choice of playable cards, one at a time,
             # and we will use rate_follows_in_hand() method to do so
-            hand = Hand()
-            hand.add_cards(playable)
-            pile = Hand()
-            pile.add_cards(get_play_pile_callback())
-            priority_list = self.rate_follows_in_hand(hand, pile)
+            priority_list = self.rate_follows_in_hand(playable, get_play_pile_callback())
             # Sort priority_list by descending rating
             sorted_list = sorted(priority_list, key = lambda rating: rating[1], reverse = True)
             card = sorted_list[0][0]
@@ -282,7 +305,7 @@ class HoyleishCribbagePlayStrategy(CribbagePlayStrategy):
             # for the pair plus 1 for the go.
 
             # Play card
-            play_card_callback(get_hand_callback().index(card))
+            play_card_callback(hand.index(card))
             play_count += count
 
             # Score any pairs or runs due to the played card
@@ -295,8 +318,9 @@ class HoyleishCribbagePlayStrategy(CribbagePlayStrategy):
                 # Raise a new CribbageGameOverError with the added information about score during play
                 raise CribbageGameOverError(e.args, go_play_score = score_count)
 
-            # Generate list of which if any cards can still be played
-            playable = [c for c in get_hand_callback() if c.count_card() <= (31 - play_count)]
+            # Generate list of which if any cards can still be played. Get the hand again, since a card has been played from it.
+            hand = get_hand_callback()
+            playable = playable_cards(hand, play_count)
         
         return (play_count - go_count)
     
@@ -337,12 +361,7 @@ class HoyleishCribbagePlayStrategy(CribbagePlayStrategy):
         :parameter hand: The cards to score, Hand object
         :return: Total points in the hand that have 100% expectation of being counted, int
         """
-        score = 0
-        for combo in self._guaranteed_4card_combinations:
-            assert(isinstance(combo, CribbageCombinationShowing))
-            info = combo.score(hand)
-            score += info.score
-        return score
+        return score_show_combinations(self._guaranteed_4card_combinations, hand)
 
     def guaranteed_crib_score(self, crib = Hand()):
         """
@@ -352,45 +371,85 @@ class HoyleishCribbagePlayStrategy(CribbagePlayStrategy):
         :parameter hand: The cards to score, Hand object
         :return: Total points in the crib from the 2-card contribution that have 100% expectation of being counted, int
         """
-        score = 0
-        for combo in self._guaranteed_2card_combinations:
-            assert(isinstance(combo, CribbageCombinationShowing))
-            info = combo.score(crib)
-            score += info.score
-        return score
+        return score_show_combinations(self._guaranteed_2card_combinations, crib)
+
+    def expected_crib_score(self, crib = [], dealt = []):
+        """
+        Utility function that determines the expected show points of a cribbage crib contribution of 2 cards together with the starter,
+        over the starters that are not in the dealt hand. Fifteens, pairs, a run of three, and his nobs are counted. Like
+        guaranteed_crib_score(...), the other player's contribution to the crib is not considered, and so neither is a flush.
+        :parameter crib: The 2 cards, list of Card objects
+        :parameter dealt: The 6 cards of the dealt hand, which include crib, list of Card objects
+        :return: Mean points over the starters not in dealt, float
+        """
+        (a, b) = cards_to_codes(crib)
+        dealt_codes = cards_to_codes(dealt)
+        (rank_a, rank_b) = (CODE_RANKS[a], CODE_RANKS[b])
+        (count_a, count_b) = (CODE_COUNTS[a], CODE_COUNTS[b])
+        # The number of starters of each rank that are not in the dealt hand
+        remaining = [4] * 13
+        for c in dealt_codes:
+            remaining[CODE_RANKS[c]] -= 1
+        total = 0
+        for rank in range(13):
+            if remaining[rank] == 0: continue
+            count = min(rank + 1, 10)
+            points = 0
+            # Fifteens and pairs of the 3 cards
+            if count_a + count_b == 15: points += 2
+            if count_a + count == 15: points += 2
+            if count_b + count == 15: points += 2
+            if count_a + count_b + count == 15: points += 2
+            if rank_a == rank_b: points += 2
+            if rank_a == rank: points += 2
+            if rank_b == rank: points += 2
+            # Run of three
+            ranks = sorted((rank_a, rank_b, rank))
+            if ranks[1] == ranks[0] + 1 and ranks[2] == ranks[1] + 1: points += 3
+            total += remaining[rank] * points
+        # His nobs, for a jack in the crib, with a starter of its suit
+        for c in (a, b):
+            if CODE_RANKS[c] == JACK_RANK:
+                total += 13 - sum([1 for d in dealt_codes if CODE_SUITS[d] == CODE_SUITS[c]])
+        return total / (NUM_CODES - len(dealt_codes))
 
     def permute_and_score_dealt_hand(self, hand = Hand()):
         """
         Utility function that permutes the dealt hand of six cards for all combinations of four cards, scores the four cards in the hand
         for each permutation, and scores teh two cards in the crib for each permutation.
-        :parameter hand: The six cards to permute and score, Hand object
+        :parameter hand: The six cards to permute and score, Hand object, list of Card objects, or CribbageCardsView object
         :return: A list of CribbageCribOption instance with hand, crib, and scores for each permutation, list of CribbageCribOption object
         """
         assert(len(hand) == 6)
         
-        # Get the cards in the hand, twice, so we have two lists that (for the moment) are duplicates
-        cards_1 = list(hand)
+        cards = list(hand)
         
-        # Need a CribbageCombinationShowing() object, to access it's permutations utility method
-        permutations = CribbageCombinationShowing().permutations(4, cards_1)
-
-        # Score each permutation and make a list of tuples (list of cards, score)
+        # Score each permutation, that is, each choice of 4 of the 6 positions in the hand to keep, in the same order as
+        # CribbageCombinationShowing().permutations(4, cards) would produce them, and make a list of CribbageCribOption(s).
         priority_list = []
-        for p in permutations:
+        for hand_indices in combinations(range(6), 4):
             crib_option = CribbageCribOption()
+            p = [cards[i] for i in hand_indices]
             crib_option.hand = p
-            h = Hand()
-            h.add_cards(p)
-            p_score = self.guaranteed_hand_score(h)
+            # The cards to be placed in the crib for permutation p are the ones at the other two positions
+            crib_option.crib_indices = [i for i in range(6) if i not in hand_indices]
+            cards_2 = [cards[i] for i in crib_option.crib_indices]
+            if self._starter_table is not None:
+                # Expected score over the 46 possible starters, that is, all cards other than the six in the dealt hand
+                p_score = self._starter_table.expected_score(p, excluded = cards_2)
+            else:
+                h = Hand()
+                h.add_cards(p)
+                p_score = self.guaranteed_hand_score(h)
             crib_option.hand_score = p_score
             priority_list.append(crib_option)
-            # Generate the list of cards to be placed in the crib for permutation p, by removing cards from hand
-            cards_2 = list(hand)
-            for c in p:
-                cards_2.remove(c)
-            h = Hand()
-            h.add_cards(cards_2)
-            p_score = self.guaranteed_crib_score(h)
+            if self._starter_table is not None:
+                # On the same basis as the hand, the expected score with the starter over the same 46 starters
+                p_score = self.expected_crib_score(cards_2, cards)
+            else:
+                h = Hand()
+                h.add_cards(cards_2)
+                p_score = self.guaranteed_crib_score(h)
             crib_option.crib_score = p_score
             crib_option.crib = cards_2
 
@@ -518,36 +577,27 @@ class HoyleishCribbagePlayStrategy(CribbagePlayStrategy):
         the card with the highest rating is the card that is considered a better follow, meaning that it is more likely to generate more play
         points for the leader and generate less play points for the opponent. Initial implementation is to play a card that will lead immediately
         to the highest play score. Possibly in the future incorporate playing on or off a potential sequence, etc.
-        :parameter hand: The hand of cards for which to generate scores/ratings, Hand object
-        :parameter pile: The play pile to use to test for play scores. Includes all previously played cards in the go round., Hand object
+        :parameter hand: The hand of cards for which to generate scores/ratings, Hand object or list of Card objects
+        :parameter pile: The play pile to use to test for play scores. Includes all previously played cards in the go round. Not changed., Hand object or list of Card objects
         :return: List of tuples (Card, Score/Rating), [(Card object, int)]
         """
         return_val = []
 
         # Highest priority is to play a card in the hand which generates play points.
-        # So, iterate through the playable cards one at a time, creating a play pile with that card as the last, test that play pile for
-        # play scoring combinations, or for increasing the go round count to 31, and score the card accordingly.
+        # So, build the pegging state of the play pile once, ask it what each playable card would score if played next, or whether the card
+        # would increase the go round count to 31, and score the card accordingly. The pile itself is not changed.
+        state = CribbagePeggingState(pile)
 
         for card in hand:
-            # Add card to pile
-            pile.add_cards(card)
-
-            # Score the pile using play scoring combinations
-            score = 0
-            for combo in self._play_combinations:
-                assert(isinstance(combo, CribbageCombinationPlaying))
-                info = combo.score(pile)
-                score += info.score
+            # Score the card as if it were played next, using play scoring combinations
+            score = state.score_for(card)
             # If card score is 0, and if card  would make the go round count 31, then score the card as 2
             if score == 0:
-                if sum([c.count_card() for c in pile]) == 31:
+                if state.get_count() + card.count_card() == 31:
                     score = 2
             # Use the pile score or the score for reaching 31 as the score/rating for card
             return_val.append((card, score))
 
-            # Remove card from pile
-            pile.remove_card()
-
         # If no card has received a non-zero score above, then provide an arbitrary "ranking" based on pips, where higher pip value
         # provides a higher ranking for the card. This should lean in the direction of both defensively pushing the go round count past
         # 15 and pushing the go round count as close to 31 as possible to try to force a declaration of GO from oponent.
@@ -601,10 +651,9 @@ class HoyleishDealerCribbagePlayStrategy(HoyleishCribbagePlayStrategy):
         cards = get_hand_callback()
        
         # Generate permutations of 4-card hands / 2-card crib contributions, and score them
-        h = Hand().add_cards(cards)
-        priority_list = self.permute_and_score_dealt_hand(h)
+        priority_list = self.permute_and_score_dealt_hand(cards)
         
-        # Sort priority_list by descending (guaranteed_hand_score + guaranteed_crib_score)
+        # Sort priority_list by descending (hand_score + crib_score), which are either both guaranteed scores, or both expected scores
         sorted_list = sorted(priority_list, key = lambda option: (option.hand_score + option.crib_score), reverse = True)
 
         # TODO: Could now filter sorted_list for all options that have the same hand_score + crib_score as the first item on the sorted list,
@@ -612,12 +661,10 @@ class HoyleishDealerCribbagePlayStrategy(HoyleishCribbagePlayStrategy):
         # often this prioritization scheme is ambiguous. This would be evidence of potential value in further work on prioritization, such as
         # incorporating expected probability scores.
 
-        # Now transfer to the crib the crib cards for the highest priority option
-        for c in sorted_list[0].crib:
-            i = cards.index(c)
-            xfer_to_crib_callback(i)
-            # Refresh cards, since we've pulled a card out of the hand, and thus changed the indexing
-            cards = get_hand_callback()
+        # Now transfer to the crib the crib cards for the highest priority option. The crib indices are in ascending order, so each card
+        # transferred moves the next one down by one position in the hand.
+        for (n, i) in enumerate(sorted_list[0].crib_indices):
+            xfer_to_crib_callback(i - n)
  
         return None
 
@@ -654,10 +701,9 @@ class HoyleishPlayerCribbagePlayStrategy(HoyleishCribbagePlayStrategy):
         cards = get_hand_callback()
         
         # Generate permutations of 4-card hands / 2-card crib contributions, and score them
-        h = Hand().add_cards(cards)
-        priority_list = self.permute_and_score_dealt_hand(h)
+        priority_list = self.permute_and_score_dealt_hand(cards)
         
-        # Sort priority_list by descending (guaranteed_hand_score + guaranteed_crib_score)
+        # Sort priority_list by descending (hand_score - crib_score), which are either both guaranteed scores, or both expected scores
         sorted_list = sorted(priority_list, key = lambda option: (option.hand_score - option.crib_score), reverse = True)
 
         # TODO: Could now filter sorted_list for all options that have the same (hand_score - crib_score) as the first item on the sorted list,
@@ -665,12 +711,10 @@ class HoyleishPlayerCribbagePlayStrategy(HoyleishCribbagePlayStrategy):
         # often this prioritization scheme is ambiguous. This would be evidence of potential value in further work on prioritization, such as
         # incorporating expected probability scores.
 
-        # Now transfer to the crib the crib cards for the highest priority option
-        for c in sorted_list[0].crib:
-            i = cards.index(c)
-            xfer_to_crib_callback(i)
-            # Refresh cards, since we've pulled a card out of the hand, and thus changed the indexing
-            cards = get_hand_callback()
+        # Now transfer to the crib the crib cards for the highest priority option. The crib indices are in ascending order, so each card
+        # transferred moves the next one down by one position in the hand.
+        for (n, i) in enumerate(sorted_list[0].crib_indices):
+            xfer_to_crib_callback(i - n)
  
         return None
 
@@ -749,7 +793,7 @@ class InteractiveCribbagePlayStrategy(CribbagePlayStrategy):
         # Generate list of which if any cards can still be played, which will use "lightly" later.
         # "Lightly" meaning that we will not restrict the list of cards available to choose from, though we will validate that any
         # choice by the user is a valid play.
-        playable = [c for c in get_hand_callback() if c.count_card() <= (31 - go_count)]
+        playable = playable_cards(get_hand_callback(), go_count)
 
         declare_go = False
         valid_choice = False
@@ -824,7 +868,7 @@ class InteractiveCribbagePlayStrategy(CribbagePlayStrategy):
         play_count = go_count
         
         # Generate list of which if any cards can still be played
-        playable = [c for c in get_hand_callback() if c.count_card() <= (31 - play_count)]
+        playable = playable_cards(get_hand_callback(), play_count)
 
         while (len(playable) > 0):
         
@@ -858,7 +902,7 @@ class InteractiveCribbagePlayStrategy(CribbagePlayStrategy):
                 raise CribbageGameOverError(e.args, go_play_score = score_count)
 
             # Generate list of which if any cards can still be played
-            playable = [c for c in get_hand_callback() if c.count_card() <= (31 - play_count)]
+            playable = playable_cards(get_hand_callback(), play_count)
         
         return (play_count - go_count)
 
@@ -894,6 +938,9 @@ class RandomCribbagePlayStrategy(CribbagePlayStrategy):
     This of course is a very unintelligent automatic play strategy, but as such, it is intended to be a reference against which to compare
     other automatic play strategies.
     """
+    # Hand and play pile are only read, so CribbageDeal can pass read-only views
+    uses_state_views = True
+
     def __init__(self):
         """
         Construct an object of this class.
@@ -930,22 +977,23 @@ class RandomCribbagePlayStrategy(CribbagePlayStrategy):
         # Default tuple to return, arbitrarily here a GO tuple, but expected to be set in all branches below
         return_val = (0, True)
         
+        # Get the cards in the hand once, since nothing is played from it until the card to follow has been chosen
+        hand = get_hand_callback()
+
         # Determine list of cards in the hand that can be played without go_count exceeding 31.
-        playable = [c for c in get_hand_callback() if c.count_card() <= (31 - go_count)]
+        playable = playable_cards(hand, go_count)
 
         if len(playable) > 0:
             if len(get_play_pile_callback()) == 0:
                 # The play pile has no cards in it, so this is a lead, so call lead(...) method
-                h = Hand()
-                h.add_cards(playable)
-                (count, card) = self.lead(h)
-                play_card_callback(get_hand_callback().index(card))
+                (count, card) = self.lead(playable)
+                play_card_callback(hand.index(card))
                 return_val = (count, False)
             else:
                 # Apply logic for following - which is just to pick a random card from playable list
                 card = playable[self._random_generator.randrange(len(playable))]
                 count = card.count_card()
-                play_card_callback(get_hand_callback().index(card))
+                play_card_callback(hand.index(card))
                 return_val = (count, False)
                 
         else:
@@ -981,7 +1029,8 @@ class RandomCribbagePlayStrategy(CribbagePlayStrategy):
         play_count = go_count
         
         # Generate list of which if any cards can still be played
-        playable = [c for c in get_hand_callback() if c.count_card() <= (31 - play_count)]
+        hand = get_hand_callback()
+        playable = playable_cards(hand, play_count)
 
         while (len(playable) > 0):
 
@@ -990,7 +1039,7 @@ class RandomCribbagePlayStrategy(CribbagePlayStrategy):
             count = card.count_card()
 
             # Play card
-            play_card_callback(get_hand_callback().index(card))
+            play_card_callback(hand.index(card))
             play_count += count
 
             # Score any pairs or runs due to the played card
@@ -1003,8 +1052,9 @@ class RandomCribbagePlayStrategy(CribbagePlayStrategy):
                 # Raise a new CribbageGameOverError with the added information about score during play
                 raise CribbageGameOverError(e.args, go_play_score = score_count)
 
-            # Generate list of which if any cards can still be played
-            playable = [c for c in get_hand_callback() if c.count_card() <= (31 - play_count)]
+            # Generate list of which if any cards can still be played. Get the hand again, since a card has been played from it.
+            hand = get_hand_callback()
+            playable = playable_cards(hand, play_count)
         
         return (play_count - go_count)
 
@@ -1012,7 +1062,7 @@ class RandomCribbagePlayStrategy(CribbagePlayStrategy):
         """
         Leads (plays) a first card in a go round by selecting a random playable card from the hand.
         This is a utility method intended to be called by follow(...) method, not by outsiders.
-        :parameter hand: The hand from which to lead a card, Hand object
+        :parameter hand: The hand from which to lead a card, Hand object or list of Card objects
         :return: Tuple of (The pips count of the card to be led, The card to be led) (int, Card object) 
         """
 
@@ -1039,16 +1089,14 @@ class RandomCribbagePlayStrategy(CribbagePlayStrategy):
         # Get the cards in the hand
         cards = get_hand_callback()
 
-        # Transfer the first card to the crib by selecting randomly from cards
-        crib_card_1 =cards[self._random_generator.randrange(len(cards))]
-        xfer_to_crib_callback(cards.index(crib_card_1))
+        # Transfer the first card to the crib by selecting randomly from the positions in cards
+        xfer_to_crib_callback(self._random_generator.randrange(len(cards)))
 
         # Refresh the list of cards to select from since we've transferred one out to the crib
         cards = get_hand_callback()
 
-        # Transfer the second card to the crib by selecting randomly from cards
-        crib_card_2 =cards[self._random_generator.randrange(len(cards))]
-        xfer_to_crib_callback(cards.index(crib_card_2))
+        # Transfer the second card to the crib by selecting randomly from the positions in cards
+        xfer_to_crib_callback(self._random_generator.randrange(len(cards)))
  
         return None
 
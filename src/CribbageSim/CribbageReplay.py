@@ -0,0 +1,393 @@
+"""
+Defines a replay engine, which plays recorded cribbage games and deals (see CribbageGameRecord) again, taking every decision from the
+record rather than from a strategy, and a seek index for record files, which finds any game or deal of a file by reading one chunk.
+
+Replay uses the real CribbageGame, CribbageDeal, and CribbageBoard: the recorded cards are dealt, and the recorded crib choices,
+plays, and gos are made, by CribbageReplayStrategy's reading from a shared CribbageReplayScript, while all scoring and pegging is done
+again by the deal and the board. So a replay both reproduces a stored game, e.g., headless = False to feed its output events to a GUI,
+and, by comparing the record of the replay with the stored record, checks that the current scoring code reproduces the stored scores.
+Replay is headless by default, and makes no decisions, so it is much faster than live play.
+
+A CribbageRecordIndex keeps, for each chunk of a record file, its file offset, and the numbers of the first game and first deal in it,
+so that game N, or deal K, is found by a binary search of the index, then one read of its chunk. Build it once with
+CribbageRecordIndex.build(...), and save(...) it next to the record file, to load(...) later.
+
+Exported Classes:
+    CribbageReplayScript - The recorded deals of a game, handed out one decision at a time to CribbageReplayStrategy's.
+    CribbageReplayStrategy - A CribbagePlayStrategy that makes the decisions of one role from a CribbageReplayScript.
+    CribbageReplayer - Replays recorded games and deals, and checks them against their records.
+    CribbageRecordIndex - A seek index of the chunks of a record file.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    None
+
+Logging:
+    None
+"""
+
+
+# Standard imports
+import bisect
+import struct
+
+# Local imports
+from CribbageSim.CribbageCardCodec import code_to_card
+from CribbageSim.CribbagePlayStrategy import CribbagePlayStrategy
+from CribbageSim.CribbageDealGenerator import CribbageGeneratedDeck
+from CribbageSim.CribbageDeal import CribbageDeal, CribbagePlayers
+from CribbageSim.CribbageGame import CribbageGame
+from CribbageSim.CribbageGameRecord import ROLE_PLAYER, ROLE_DEALER, ACTION_PLAY, ACTION_GO, ACTION_PEG
+from CribbageSim.exceptions import CribbageGameOverError, CribbageRecordError
+
+
+class CribbageReplayScript(object):
+    """
+    The recorded deals of a game, or a single recorded deal, in order. It is the deal source of the CribbageGeneratedDeck that deals the
+    recorded cards, and it hands out the recorded decisions to the CribbageReplayStrategy of each role, in the order they were made.
+    Recorded pegs are skipped, since the replaying deal scores for itself.
+    """
+    def __init__(self, deals = []):
+        """
+        :parameter deals: The records of the deals to replay, in order, list of CribbageDealRecord objects
+        """
+        self._deals = list(deals)
+        # The index of the deal to be returned next by next_deal()
+        self._next = 0
+        # The decisions of the current deal, and the index of the next one to be made
+        self._decisions = []
+        self._pos = 0
+        self._deal = None
+
+    def seek_deal(self, index = 0):
+        """
+        Set the deal to be returned next by next_deal().
+        :parameter index: The index of the deal, int [0...number of deals]
+        :return: None
+        """
+        assert(index >= 0 and index <= len(self._deals))
+        self._next = index
+        return None
+
+    def next_deal(self):
+        """
+        Start replaying the next deal.
+        :return: The codes of the 13 cards of the deal, in the order they are dealt, tuple of int
+        """
+        if self._next >= len(self._deals):
+            raise CribbageRecordError(f"Replay needs deal {self._next + 1}, but only {len(self._deals)} were recorded")
+        self._deal = self._deals[self._next]
+        self._next += 1
+        self._decisions = [(kind, role, value) for (kind, role, value) in self._deal.get_actions() if kind != ACTION_PEG]
+        self._pos = 0
+        return self._deal.dealt + (self._deal.starter,)
+
+    def get_crib(self, role = ROLE_PLAYER):
+        """
+        :parameter role: ROLE_PLAYER or ROLE_DEALER, int
+        :return: Codes of the cards role laid in the crib, in the order laid, tuple of int
+        """
+        if role == ROLE_PLAYER:
+            return self._deal.player_crib
+        else:
+            return self._deal.dealer_crib
+
+    def next_decision(self, role = ROLE_PLAYER):
+        """
+        Take the next decision of the deal, which must be role's.
+        :parameter role: ROLE_PLAYER or ROLE_DEALER, int
+        :return: (ACTION_PLAY or ACTION_GO, the code of the card played or 0), tuple of int
+        """
+        if self._pos >= len(self._decisions) or self._decisions[self._pos][1] != role:
+            raise CribbageRecordError(f"Replay of deal {self._next} diverged from the record at decision {self._pos}")
+        (kind, decision_role, value) = self._decisions[self._pos]
+        self._pos += 1
+        return (kind, value)
+
+    def next_is_play(self, role = ROLE_PLAYER):
+        """
+        :parameter role: ROLE_PLAYER or ROLE_DEALER, int
+        :return: True if the next decision of the deal is a card played by role, boolean
+        """
+        return self._pos < len(self._decisions) and self._decisions[self._pos][0] == ACTION_PLAY and self._decisions[self._pos][1] == role
+
+
+class CribbageReplayStrategy(CribbagePlayStrategy):
+    """
+    A CribbagePlayStrategy that decides nothing, but makes the recorded decisions of one role, from a CribbageReplayScript shared with
+    the strategy of the other role.
+    """
+    # Only reads the hand and pile
+    uses_state_views = True
+
+    def __init__(self, script = None, role = ROLE_PLAYER):
+        """
+        :parameter script: The source of the recorded decisions, CribbageReplayScript object
+        :parameter role: Whose decisions to make, ROLE_PLAYER or ROLE_DEALER, int
+        """
+        self._script = script
+        self._role = role
+
+    def _hand_index(self, hand = [], code = 0):
+        """
+        Utility function that finds a recorded card in the hand. Raises CribbageRecordError if it isn't there, e.g., in a damaged record.
+        :parameter hand: The cards in hand, list of Card objects or CribbageCardsView object
+        :parameter code: The code of the recorded card, int
+        :return: The position of the card in hand, int
+        """
+        try:
+            return hand.index(code_to_card(code))
+        except ValueError:
+            raise CribbageRecordError(f"Recorded card {code_to_card(code)} isn't in the hand")
+
+    def form_crib(self, xfer_to_crib_callback, get_hand_callback, play_recorder_callback=None):
+        """
+        Lay the recorded cards in the crib.
+        :parameter xfer_to_crib_callback: Bound method used to transfer cards from hand to crib, e.g., CribbageDeal.xfer_player_card_to_crib
+        :parameter get_hand_callback: Bound method used to obtain cards in hand, e.g., CribbageDeal.get_player_hand
+        :parameter play_recorder_callback: Not used
+        :return: None
+        """
+        for code in self._script.get_crib(self._role):
+            xfer_to_crib_callback(self._hand_index(get_hand_callback(), code))
+        return None
+
+    def follow(self, go_count, play_card_callback, get_hand_callback, get_play_pile_callback, play_recorder_callback=None):
+        """
+        Play the recorded card, or declare go if that was recorded.
+        :parameter go_count: The current cumulative count of the go round before the follow, int
+        :parameter play_card_callback: Bound method used to play a card from hand, e.g., CribbageDeal.play_card_for_player
+        :parameter get_hand_callback: Bound method used to obtain cards in hand, e.g., CribbageDeal.get_player_hand
+        :parameter get_play_pile_callback: Not used
+        :parameter play_recorder_callback: Not used
+        :return: (The pips count of the card played as int, Go declared as boolean), tuple
+        """
+        (kind, code) = self._script.next_decision(self._role)
+        if kind == ACTION_GO: return (0, True)
+        card = code_to_card(code)
+        play_card_callback(self._hand_index(get_hand_callback(), code))
+        return (card.count_card(), False)
+
+    def go(self, go_count, play_card_callback, get_hand_callback, get_play_pile_callback, score_play_callback, peg_callback,
+           play_recorder_callback=None):
+        """
+        Play the recorded cards after the opponent declared go, scoring and pegging each like HoyleishCribbagePlayStrategy.go(...).
+        :parameter go_count: The current cumulative count of the go round that caused opponent to declare go, int
+        :parameter play_card_callback: Bound method used to play a card from hand, e.g., CribbageDeal.play_card_for_player
+        :parameter get_hand_callback: Bound method used to obtain cards in hand, e.g., CribbageDeal.get_player_hand
+        :parameter get_play_pile_callback: Bound method used to obtain the pile of played cards, e.g., CribbageDeal.get_player_hand
+        :parameter score_play_callback: Bound method used to determine any scoring while go is being played out, e.g., CribbageDeal.determine_score_playing
+        :parameter peg_callback: Bound method used to determine any scoring while go is being played out, e.g., CribbageDeal.peg_for_player
+        :parameter play_recorder_callback: Not used
+        :return: The sum of pips count of any cards played, int
+        """
+        play_count = go_count
+        while self._script.next_is_play(self._role):
+            (kind, code) = self._script.next_decision(self._role)
+            card = code_to_card(code)
+            play_card_callback(self._hand_index(get_hand_callback(), code))
+            play_count += card.count_card()
+            # Score any pairs or runs due to the played card
+            reasons = []
+            score_count = score_play_callback(get_play_pile_callback(), score_reasons=reasons)
+            try:
+                peg_callback(score_count, reasons)
+            except CribbageGameOverError as e:
+                raise CribbageGameOverError(e.args, go_play_score = score_count)
+        return (play_count - go_count)
+
+    def continue_save_end(self):
+        """
+        A replay always plays on to the end of the game.
+        :return: (True, False), tuple
+        """
+        return (True, False)
+
+
+class CribbageReplayer(object):
+    """
+    Replays recorded games and deals, making the recorded decisions, and scoring them again.
+    """
+    def __init__(self, headless = True, event_bus = None):
+        """
+        :parameter headless: If True, then replays do no logging and publish no events, boolean
+        :parameter event_bus: The bus to publish output events on, if not headless, or None for the default bus, CribbageEventBus object
+        """
+        self._headless = headless
+        self._event_bus = event_bus
+
+    def replay_game(self, record = None, name1 = 'player1', name2 = 'player2'):
+        """
+        Replay a recorded game.
+        :parameter record: The record of the game, CribbageGameRecord object
+        :parameter name1: Name of player1, string
+        :parameter name2: Name of player2, string
+        :return: (Information about the results of the replayed game, the record of the replayed game), tuple of (CribbageGameInfo
+            object, CribbageGameRecord object)
+        """
+        script = CribbageReplayScript(record.deals)
+        deck = CribbageGeneratedDeck(script)
+        game = CribbageGame(name1, name2, player_strategy1 = CribbageReplayStrategy(script, ROLE_PLAYER),
+                            player_strategy2 = CribbageReplayStrategy(script, ROLE_PLAYER),
+                            dealer_strategy1 = CribbageReplayStrategy(script, ROLE_DEALER),
+                            dealer_strategy2 = CribbageReplayStrategy(script, ROLE_DEALER),
+                            deck = deck, headless = self._headless, event_bus = self._event_bus, record = True)
+        info = game.play()
+        return (info, game.get_game_record())
+
+    def replay_deal(self, record = None):
+        """
+        Replay a single recorded deal, on its own, outside of its game.
+        :parameter record: The record of the deal, CribbageDealRecord object
+        :return: (Information about the results of the replayed deal, the record of the replayed deal), tuple of (CribbageDealInfo
+            object, CribbageDealRecord object)
+        """
+        script = CribbageReplayScript([record])
+        deck = CribbageGeneratedDeck(script)
+        if record.dealer == CribbagePlayers.PLAYER_2.value:
+            (player, dealer) = (CribbagePlayers.PLAYER_1, CribbagePlayers.PLAYER_2)
+        else:
+            (player, dealer) = (CribbagePlayers.PLAYER_2, CribbagePlayers.PLAYER_1)
+        deal = CribbageDeal(CribbageReplayStrategy(script, ROLE_PLAYER), CribbageReplayStrategy(script, ROLE_DEALER),
+                            player_participant = player, dealer_participant = dealer, headless = self._headless,
+                            event_bus = self._event_bus, record = True)
+        deal.set_deck(deck)
+        deal.reset_deal(player_participant = player, dealer_participant = dealer)
+        info = deal.play()
+        return (info, deal.get_deal_record())
+
+    def verify_game(self, record = None):
+        """
+        Replay a recorded game, and check that it is scored, and ends, exactly as recorded.
+        :parameter record: The record of the game, CribbageGameRecord object
+        :return: True if the record of the replay is the same as record, boolean
+        """
+        try:
+            (info, replayed) = self.replay_game(record)
+        except CribbageRecordError:
+            # Scored differently enough that the recorded decisions no longer fit
+            return False
+        return replayed == record
+
+    def verify_file(self, reader = None):
+        """
+        Replay every game of a record file, and check each against its record.
+        :parameter reader: The open record file, CribbageRecordReader object
+        :return: The numbers of the games, counting from 0, whose replays differ from their records, list of int
+        """
+        failed = []
+        for (number, record) in enumerate(reader):
+            if not self.verify_game(record): failed.append(number)
+        return failed
+
+
+# Index file header: magic, version, number of chunks, padded to 16 bytes
+_INDEX_MAGIC = b'CRIBIDX\x00'
+_INDEX_VERSION = 1
+_INDEX_HEADER = struct.Struct('<8sII')
+# Index entry: chunk file offset, first game number, number of games, first deal number, number of deals
+_INDEX_ENTRY = struct.Struct('<QQIQI')
+
+
+class CribbageRecordIndex(object):
+    """
+    A seek index of the chunks of a record file, to find any game or deal in the file with one binary search and one chunk read.
+    Games and deals are numbered from 0, in the order they are in the file.
+    """
+    def __init__(self, entries = []):
+        """
+        :parameter entries: (chunk file offset, first game number, number of games, first deal number, number of deals) for each chunk,
+            in order, list of tuples of int
+        """
+        self._entries = list(entries)
+        # First game and first deal number of each chunk, for searching
+        self._first_games = [e[1] for e in self._entries]
+        self._first_deals = [e[3] for e in self._entries]
+
+    @staticmethod
+    def build(reader = None):
+        """
+        Build the index of a record file, by reading each of its chunks once.
+        :parameter reader: The open record file, CribbageRecordReader object
+        :return: The index, CribbageRecordIndex object
+        """
+        entries = []
+        num_games = 0
+        num_deals = 0
+        for (offset, chunk_games) in reader.chunk_offsets():
+            chunk_deals = sum(reader.read_deal_counts(offset))
+            entries.append((offset, num_games, chunk_games, num_deals, chunk_deals))
+            num_games += chunk_games
+            num_deals += chunk_deals
+        return CribbageRecordIndex(entries)
+
+    def save(self, path = ''):
+        """
+        Write the index to a file.
+        :parameter path: Path of the index file to write, string
+        :return: None
+        """
+        data = bytearray(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION, len(self._entries)))
+        for entry in self._entries:
+            data += _INDEX_ENTRY.pack(*entry)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return None
+
+    @staticmethod
+    def load(path = ''):
+        """
+        Read an index written by save(...). Raises CribbageRecordError if the file is not an index file.
+        :parameter path: Path of the index file, string
+        :return: The index, CribbageRecordIndex object
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < _INDEX_HEADER.size:
+            raise CribbageRecordError(f"{path} is too short to be a record index file")
+        (magic, version, num_entries) = _INDEX_HEADER.unpack_from(data, 0)
+        if magic != _INDEX_MAGIC or version != _INDEX_VERSION or len(data) != _INDEX_HEADER.size + num_entries * _INDEX_ENTRY.size:
+            raise CribbageRecordError(f"{path} is not a version {_INDEX_VERSION} record index file")
+        return CribbageRecordIndex([_INDEX_ENTRY.unpack_from(data, _INDEX_HEADER.size + i * _INDEX_ENTRY.size) for i in range(num_entries)])
+
+    def num_games(self):
+        """
+        :return: The number of games in the record file, int
+        """
+        if not self._entries: return 0
+        last = self._entries[-1]
+        return last[1] + last[2]
+
+    def num_deals(self):
+        """
+        :return: The number of deals in the record file, int
+        """
+        if not self._entries: return 0
+        last = self._entries[-1]
+        return last[3] + last[4]
+
+    def read_game(self, reader = None, number = 0):
+        """
+        Read game number from the record file.
+        :parameter reader: The open record file, CribbageRecordReader object
+        :parameter number: The number of the game, int [0...num_games() - 1]
+        :return: The record of the game, CribbageGameRecord object
+        """
+        if number < 0 or number >= self.num_games():
+            raise IndexError(f"Game {number} is not in the record file of {self.num_games()} games")
+        entry = self._entries[bisect.bisect_right(self._first_games, number) - 1]
+        return reader.read_game(entry[0], number - entry[1])
+
+    def read_deal(self, reader = None, number = 0):
+        """
+        Read deal number from the record file, along with the game it was played in.
+        :parameter reader: The open record file, CribbageRecordReader object
+        :parameter number: The number of the deal, int [0...num_deals() - 1]
+        :return: (the record of the game, the index of the deal in the game's deals), tuple of (CribbageGameRecord object, int)
+        """
+        if number < 0 or number >= self.num_deals():
+            raise IndexError(f"Deal {number} is not in the record file of {self.num_deals()} deals")
+        entry = self._entries[bisect.bisect_right(self._first_deals, number) - 1]
+        return reader.read_game_of_deal(entry[0], number - entry[3])
@@ -6,7 +6,7 @@ Right now it's utility is to set up logging.
 Note that logging is critical because it is the mechanism that provides output to the console for the user to see.
 
 Exported Classes:
-    CribbageSimulator: Defines setup_logging(...) method to configure logging for a cribbage game.
+    CribbageSimulator: Defines setup_logging(...) method to configure logging for a cribbage game, and shutdown_logging() to undo it.
 
 Exported Exceptions:
     None    
@@ -20,16 +20,75 @@ Logging:
     debug=True in method call.
     
     If queue=<Queue object> is passed into the method call, then a queue handler will also be set up, and could then be
-    used by a tkAppFramework.tkSimulatorApp implementation to capture game output.
+    used by a tkAppFramework.tkSimulatorApp implementation to capture game output. The structured game output events, which are
+    published on the default CribbageEventBus, are put on the same queue, as logging records, by a CribbageQueueEventOutput subscriber.
+    So the queue gets an event record, with an event_type attribute and a message like 'Update starter: 5H', for each event, and,
+    separately, a text record, like 'Starter card: 5H', with no event_type attribute, for each message logged (see CribbageEventBus).
+
+    If log_file=<path> is passed into the method call, then output goes to a rotating log file instead of stdout.
+
+    If background=True is passed into the method call, then the logger only puts records on an in-process queue, and a background
+    thread, a CribbageLogListener, formats them and writes them to stdout or the log file in batches, so that playing the game never
+    waits on terminal or disk output. Call shutdown_logging() to write any records still queued, which also happens at exit.
+
+    If frame_interval=<seconds> is also passed into the method call, then the game output events are put on the queue by a
+    CribbageCoalescingEventOutput, which merges updates superseded within a frame, and applies queue_policy when the queue, which should
+    be bounded, is full. The logger's messages go through it too, so they are subject to the same policy.
+
+    Calling setup_logging(...) again replaces the handlers set up by the previous call, rather than adding more.
  """
 
 
 # Standard imports
 import logging
 from logging.handlers import QueueHandler as QueueHandler
+from logging.handlers import RotatingFileHandler
+from queue import SimpleQueue
 import sys
+import atexit
 
 # Local imports
+from CribbageSim.CribbageGameOutputEvents import CribbageGameOutputEvents
+from CribbageSim.CribbageEventBus import get_event_bus, CribbageQueueEventOutput, CribbageCoalescingEventOutput, CribbageQueuePolicy
+from CribbageSim.CribbageLogPipeline import CribbageLogListener, CribbageRecordQueueHandler
+from CribbageSim.CribbageLogPipeline import CribbageBatchedStreamHandler, CribbageBatchedRotatingFileHandler
+
+
+# Handlers added to 'cribbage_logger' by setup_logging(...) are given names starting with this, so that they can be found and removed
+_HANDLER_NAME_PREFIX = 'cribbage_simulator.'
+
+# The background listener, and the subscriber putting game output events on a queue, set up by the last call to setup_logging(...)
+_listener = None
+_queue_output = None
+
+
+def _teardown_logging():
+    """
+    Utility function that undoes the last call to CribbageSimulator.setup_logging(...): stops the background listener, if any, after it
+    has written the records still queued, and removes the handlers and the game output event subscriber that it set up.
+    :return: None
+    """
+    global _listener, _queue_output
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    logger = logging.getLogger('cribbage_logger')
+    for handler in list(logger.handlers):
+        if handler.get_name() is not None and handler.get_name().startswith(_HANDLER_NAME_PREFIX):
+            logger.removeHandler(handler)
+            handler.close()
+    if _queue_output is not None:
+        get_event_bus().unsubscribe_all(_queue_output)
+        # Put any updates a CribbageCoalescingEventOutput is holding back on the queue
+        if hasattr(_queue_output, 'flush'): _queue_output.flush()
+        _queue_output = None
+    return None
+
+
+# Make sure the background listener has written everything before the interpreter exits, since its thread is a daemon
+atexit.register(_teardown_logging)
 
 
 class CribbageSimulator:
@@ -38,14 +97,28 @@ class CribbageSimulator:
     This class does very little currently. Conceptually it is a level above CribbageGame, with the idea that it could be used to have multiple
     games played automatically, for example to generate game-play statistics. Right now it's utility is to set up logging.
     """
-    def setup_logging(self, debug = False, queue = None):
+    def setup_logging(self, debug = False, queue = None, background = False, log_file = None, max_bytes = 0, backup_count = 0,
+                      frame_interval = None, queue_policy = CribbageQueuePolicy.BLOCK):
         """
         This method configures logging. It should be called ahead of any calls to CribbageGame.play() or CribbageDeal.play() to ensure the
-        expected behavior of logging. Though failure to do so should not be breaking.
+        expected behavior of logging. Though failure to do so should not be breaking. Calling it again replaces the configuration of the
+        previous call.
         :parameter debug: If True, then logger level set to DEBUG (and hidden information will be revealed in output), boolean
-        :parameter queue: If is not None, then a queue handler will be set up with this queue. Queue object
+        :parameter queue: If is not None, then a queue handler will be set up with this queue, and game output events will be put on
+            it, as records separate from the logged messages, with an event_type attribute. Queue object
+        :parameter background: If True, then output is formatted and written in batches by a background thread, boolean
+        :parameter log_file: If is not None, then output is written to this rotating log file instead of stdout, string
+        :parameter max_bytes: Size in bytes at which the log file is rolled over, or 0 never to roll over, int
+        :parameter backup_count: The number of rolled over log files to keep, int
+        :parameter frame_interval: If is not None, then updates superseded within this many seconds are merged before going on queue,
+            float
+        :parameter queue_policy: What to do when queue is full, if frame_interval is not None, CribbageQueuePolicy Enum
         :return: None
         """
+        global _listener, _queue_output
+        # Undo the previous call, so handlers aren't stacked up
+        _teardown_logging()
+
         # Create a logger with name 'cribbage_logger'. This is NOT the root logger, which is one level up from here, and has no name.
         # This logger is currently intended to handle everything that isn't form_crib, follow, or go data going to file, like for AI training.
         logger = logging.getLogger('cribbage_logger')
@@ -60,9 +133,27 @@ class CribbageSimulator:
             logger.setLevel(logging.INFO)
         else:
             logger.setLevel(logging.DEBUG)
-        # Set up this highest level below root logger with a stream handler
-        # The stream handler logs to sys.stdout, not the default of sys.stderr, so that, I hope, interlaces appropriately withs prints
-        sh = logging.StreamHandler(stream=sys.stdout)
+
+        if not background:
+            if log_file is None:
+                # Set up this highest level below root logger with a stream handler
+                # The stream handler logs to sys.stdout, not the default of sys.stderr, so that, I hope, interlaces appropriately withs prints
+                sh = logging.StreamHandler(stream=sys.stdout)
+            else:
+                sh = RotatingFileHandler(log_file, maxBytes = max_bytes, backupCount = backup_count)
+        else:
+            # The handler that does the output belongs to the listener, and buffers messages until the listener flushes it
+            if log_file is None:
+                output_handler = CribbageBatchedStreamHandler(stream=sys.stdout)
+            else:
+                output_handler = CribbageBatchedRotatingFileHandler(log_file, maxBytes = max_bytes, backupCount = backup_count)
+            output_handler.setLevel(logging.DEBUG)
+            record_queue = SimpleQueue()
+            _listener = CribbageLogListener(record_queue, output_handler)
+            _listener.start()
+            # The logger's handler only puts records on the listener's queue
+            sh = CribbageRecordQueueHandler(record_queue)
+        sh.set_name(_HANDLER_NAME_PREFIX + 'output')
         # Set the threshold for the stream handler itself, which will come into play only after the logger threshold is met.
         sh.setLevel(logging.DEBUG)
         # Add the stream handler to the logger
@@ -70,14 +161,27 @@ class CribbageSimulator:
 
         # if argument queue is not None, then set up the highest level below root logger with a QueueHandler
         if queue is not None:
-            qh = QueueHandler(queue)
+            if frame_interval is None:
+                _queue_output = CribbageQueueEventOutput(queue)
+                qh = QueueHandler(queue)
+            else:
+                # The queue handler puts records on the queue through the output, with its policy for a full queue
+                _queue_output = CribbageCoalescingEventOutput(queue, frame_interval, queue_policy)
+                qh = QueueHandler(_queue_output)
+            qh.set_name(_HANDLER_NAME_PREFIX + 'queue')
             # Set the threshold for the queue handler itself, which will come into play only after the logger threshold is met.
             qh.setLevel(logging.DEBUG)
             # Add the queue handler to the logger
             logger.addHandler(qh)
+            # Subscribe to the game output events, which are put on the queue too. Player 2's hand is hidden information, which, like
+            # the messages about it, is only output when debugging.
+            bus = get_event_bus()
+            bus.subscribe_all(_queue_output)
+            if not debug: bus.unsubscribe(CribbageGameOutputEvents.UPDATE_PLAYER2_HAND, _queue_output)
     
         # Create the new logger that will handle form_crib/follow/go data going to file.
         # Create it as a child of the logger, 'cribbage_logger'
+        # The data itself is exported as binary rows by a CribbageDecisionExporter, which logs here when it finishes a shard file.
         logger = logging.getLogger('cribbage_logger.crib_follow_go_logger')
         # Set the logger's level to INFO. If this is left at the NOTSET default, then all messages would be sent to parent
         # (Except that propagate is set to False below.) 
@@ -85,4 +189,13 @@ class CribbageSimulator:
         # Don't propagate to parents from this logger
         logger.propagate = False
         
+        return None
+
+    def shutdown_logging(self):
+        """
+        This method undoes setup_logging(...). If output is written in the background, then it first waits for all records logged so far
+        to be written.
+        :return: None
+        """
+        _teardown_logging()
         return None
\ No newline at end of file
@@ -0,0 +1,286 @@
+"""
+Defines a precomputed, on-disk table of how every 4-card cribbage hand (or crib) scores with each possible starter card, and a class
+for reading it. The table is a binary file that is opened with mmap, so that nothing is parsed when it is opened, and several processes
+reading the same table file share one copy of it in memory.
+
+The table holds one fixed-size record for each of the 270,725 4-card hands, in colex order of the sorted card codes of the hand
+(see CribbageCardCodec and CribbageCardIndexer), so the record for a hand is found directly from its cards. Each record contains, for the hand scored as a
+hand and as a crib:
+    - The score with each of the 52 possible starters, with 255 for starters that are one of the cards in the hand.
+    - The histogram of the scores over the 48 starters not in the hand, for scores 0...29.
+    - The mean and (population) variance of the scores over the 48 starters not in the hand.
+Since the score with each starter is available, the exact mean over any smaller set of starters, e.g., the 46 starters not in a
+dealt 6-card hand, can also be found.
+
+Build the table with build_starter_table(...), or from the command line:
+    python -m CribbageSim.CribbageStarterTable <path>
+Hands that differ only by a permutation of suits score the same, so each is scored only once, for its canonical suits
+(see CribbageSuitCanonicalization). If numpy is installed, the scoring is done with CribbageBatchScoring, otherwise with score_show(...).
+
+Exported Classes:
+    CribbageStarterDistribution - The distribution of a hand's scores over the possible starters, as read from the table.
+    CribbageStarterTable - Opens a table file, and looks up hands in it.
+
+Exported Exceptions:
+    None, but CribbageStarterTable raises CribbageRecordError, see exceptions, if a file is not a valid starter table.
+
+Exported Functions:
+    build_starter_table(...) - Build a table file.
+
+Logging:
+    None
+"""
+
+
+# Standard imports
+import os
+import mmap
+import struct
+import argparse
+from itertools import combinations
+
+# Local imports
+from HandsDecksCards.hand import Hand
+from CribbageSim.CribbageCardCodec import NUM_CODES, card_to_code, code_to_card
+from CribbageSim.CribbageCombination import score_show
+from CribbageSim.CribbageSuitCanonicalization import canonical_key_codes, key_to_codes
+from CribbageSim.CribbageCardIndexer import num_subsets, subset_rank
+from CribbageSim import CribbageBatchScoring
+from CribbageSim.exceptions import CribbageRecordError
+
+
+# File header: magic, version, number of records, record size, padded to 32 bytes
+_MAGIC = b'CRIBSTRT'
+_VERSION = 1
+_HEADER = struct.Struct('<8sIII12x')
+
+# Number of 4-card hands, and so of records
+NUM_HANDS = num_subsets(4)
+
+# Scores are 0...29
+NUM_SCORES = 30
+
+# Per-starter score of a starter that is one of the cards in the hand
+NO_SCORE = 255
+
+# Record: hand scores by starter code, crib scores by starter code, hand histogram, crib histogram,
+# hand mean, hand variance, crib mean, crib variance
+_RECORD = struct.Struct(f"<{NUM_CODES}s{NUM_CODES}s{NUM_SCORES}s{NUM_SCORES}s4f")
+
+# Offsets of the parts of a record
+_HAND_SCORES = 0
+_CRIB_SCORES = NUM_CODES
+_STATS = 2 * NUM_CODES + 2 * NUM_SCORES
+_STATS_FORMAT = struct.Struct('<4f')
+
+
+class CribbageStarterDistribution(object):
+    """
+    A class with all public members, containing the distribution of a 4-card hand's scores over the possible starters, as read from a
+    CribbageStarterTable.
+    """
+    __slots__ = ('hand_histogram', 'hand_mean', 'hand_variance', 'crib_histogram', 'crib_mean', 'crib_variance')
+
+    def __init__(self):
+        """
+        hand_histogram: Number of starters (not in the hand) with each score 0...29 for the cards shown as a hand, list of int
+        hand_mean: Mean score over the starters not in the hand, for the cards shown as a hand, float
+        hand_variance: Variance of the score over the starters not in the hand, for the cards shown as a hand, float
+        crib_histogram: As hand_histogram, but for the cards shown as a crib, list of int
+        crib_mean: As hand_mean, but for the cards shown as a crib, float
+        crib_variance: As hand_variance, but for the cards shown as a crib, float
+        """
+        self.hand_histogram = []
+        self.hand_mean = 0.0
+        self.hand_variance = 0.0
+        self.crib_histogram = []
+        self.crib_mean = 0.0
+        self.crib_variance = 0.0
+
+
+class CribbageStarterTable(object):
+    """
+    Opens a starter table file built by build_starter_table(...), with mmap, and looks up 4-card hands in it.
+    Can be used as a context manager, which closes the table on exit.
+    """
+    def __init__(self, path = ''):
+        """
+        Open the table file at path, and check its header. Raises CribbageRecordError, and closes the file, if it is not a valid table.
+        :parameter path: Path to the table file, string
+        """
+        self._file = open(path, 'rb')
+        self._map = None
+        try:
+            # An empty file can't be mapped
+            if os.fstat(self._file.fileno()).st_size < _HEADER.size:
+                raise CribbageRecordError(f"{path} is too short to be a starter table file")
+            self._map = mmap.mmap(self._file.fileno(), 0, access = mmap.ACCESS_READ)
+            (magic, version, num_records, record_size) = _HEADER.unpack_from(self._map, 0)
+            if magic != _MAGIC or version != _VERSION or num_records != NUM_HANDS or record_size != _RECORD.size:
+                raise CribbageRecordError(f"{path} is not a version {_VERSION} starter table file")
+            if len(self._map) != _HEADER.size + NUM_HANDS * _RECORD.size:
+                raise CribbageRecordError(f"{path} is not the size of a starter table")
+        except CribbageRecordError:
+            self.close()
+            raise
+
+    def close(self):
+        """
+        Close the table file.
+        :return: None
+        """
+        if self._map is not None: self._map.close()
+        self._file.close()
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _offset(self, hand = []):
+        """
+        Utility function that determines the offset in the table file of the record for hand.
+        :parameter hand: The 4 cards, in any order, list of Card objects or Hand object
+        :return: The offset of the record, int
+        """
+        codes = sorted([card_to_code(c) for c in hand])
+        assert(len(codes) == 4)
+        return _HEADER.size + subset_rank(codes) * _RECORD.size
+
+    def get_distribution(self, hand = []):
+        """
+        Look up the distribution of hand's scores over the possible starters.
+        :parameter hand: The 4 cards, in any order, list of Card objects or Hand object
+        :return: The distribution, CribbageStarterDistribution object
+        """
+        (hand_scores, crib_scores, hand_histogram, crib_histogram, hand_mean, hand_variance, crib_mean, crib_variance) = \
+            _RECORD.unpack_from(self._map, self._offset(hand))
+        dist = CribbageStarterDistribution()
+        dist.hand_histogram = list(hand_histogram)
+        dist.hand_mean = hand_mean
+        dist.hand_variance = hand_variance
+        dist.crib_histogram = list(crib_histogram)
+        dist.crib_mean = crib_mean
+        dist.crib_variance = crib_variance
+        return dist
+
+    def get_starter_scores(self, hand = [], is_crib = False):
+        """
+        Look up the score of hand with each possible starter.
+        :parameter hand: The 4 cards, in any order, list of Card objects or Hand object
+        :parameter is_crib: If True, then the scores for the cards shown as a crib, otherwise as a hand, boolean
+        :return: The score with each starter, indexed by starter card code, with NO_SCORE for the cards in the hand, bytes of length 52
+        """
+        offset = self._offset(hand) + (_CRIB_SCORES if is_crib else _HAND_SCORES)
+        return self._map[offset:offset + NUM_CODES]
+
+    def expected_score(self, hand = [], is_crib = False, excluded = []):
+        """
+        Determine the exact mean score of hand over the starters that are not in hand, and not in excluded.
+        :parameter hand: The 4 cards, in any order, list of Card objects or Hand object
+        :parameter is_crib: If True, then the mean for the cards shown as a crib, otherwise as a hand, boolean
+        :parameter excluded: Cards that are known not to be the starter, e.g., the cards laid away in the crib, list of Card objects
+        :return: The mean score, float
+        """
+        if len(excluded) == 0:
+            offset = self._offset(hand) + _STATS
+            if is_crib:
+                return _STATS_FORMAT.unpack_from(self._map, offset)[2]
+            return _STATS_FORMAT.unpack_from(self._map, offset)[0]
+        scores = self.get_starter_scores(hand, is_crib)
+        total = sum(scores) - NO_SCORE * 4
+        number = NUM_CODES - 4
+        for c in excluded:
+            s = scores[card_to_code(c)]
+            if s != NO_SCORE:
+                total -= s
+                number -= 1
+        return total / number
+
+
+def _score_classes(class_codes = []):
+    """
+    Utility function that scores each of a list of 4-card hands with every starter, as a hand and as a crib.
+    :parameter class_codes: The card codes of each hand, list of lists of 4 int
+    :return: Tuple (hand scores, crib scores), each a list with a list of 52 scores for each hand, NO_SCORE for starters in the hand
+    """
+    if CribbageBatchScoring.np is not None:
+        hand_scores = CribbageBatchScoring.score_batch(class_codes, range(NUM_CODES), False)[0]
+        crib_scores = CribbageBatchScoring.score_batch(class_codes, range(NUM_CODES), True)[0]
+        hand_scores[hand_scores < 0] = NO_SCORE
+        crib_scores[crib_scores < 0] = NO_SCORE
+        return (hand_scores.tolist(), crib_scores.tolist())
+
+    cards = [code_to_card(c) for c in range(NUM_CODES)]
+    hand_scores = []
+    crib_scores = []
+    for codes in class_codes:
+        h = Hand()
+        h.add_cards([cards[c] for c in codes])
+        hand_scores.append([NO_SCORE if s in codes else score_show(h, cards[s]) for s in range(NUM_CODES)])
+        crib_scores.append([NO_SCORE if s in codes else score_show(h, cards[s], True) for s in range(NUM_CODES)])
+    return (hand_scores, crib_scores)
+
+
+def _stats(scores = []):
+    """
+    Utility function that determines the histogram, mean and variance of the scores of a hand over the starters not in the hand.
+    :parameter scores: The score with each starter, NO_SCORE for starters in the hand, list of 52 int
+    :return: Tuple (histogram, mean, variance), (bytes, float, float)
+    """
+    valid = [s for s in scores if s != NO_SCORE]
+    histogram = [0] * NUM_SCORES
+    for s in valid: histogram[s] += 1
+    mean = sum(valid) / len(valid)
+    variance = sum([(s - mean) ** 2 for s in valid]) / len(valid)
+    return (bytes(histogram), mean, variance)
+
+
+def build_starter_table(path = ''):
+    """
+    Build a starter table file, for opening with CribbageStarterTable.
+    :parameter path: Path of the table file to write, string
+    :return: None
+    """
+    # Find the canonical class of each hand, and the suit permutation that maps the hand to it
+    class_index = {}
+    class_codes = []
+    hand_classes = []
+    for codes in combinations(range(NUM_CODES), 4):
+        (key, permutation) = canonical_key_codes(codes)
+        if key not in class_index:
+            class_index[key] = len(class_codes)
+            class_codes.append(key_to_codes(key)[0])
+        hand_classes.append((codes, class_index[key], permutation))
+
+    # Score each class, and determine the parts of the records that are the same for every hand in the class
+    (hand_scores, crib_scores) = _score_classes(class_codes)
+    class_stats = []
+    for i in range(len(class_codes)):
+        (hand_histogram, hand_mean, hand_variance) = _stats(hand_scores[i])
+        (crib_histogram, crib_mean, crib_variance) = _stats(crib_scores[i])
+        class_stats.append((hand_histogram, crib_histogram, hand_mean, hand_variance, crib_mean, crib_variance))
+
+    # Write the records, mapping the per-starter scores of the class back to the suits of the hand
+    data = bytearray(_HEADER.size + NUM_HANDS * _RECORD.size)
+    _HEADER.pack_into(data, 0, _MAGIC, _VERSION, NUM_HANDS, _RECORD.size)
+    for (codes, i, permutation) in hand_classes:
+        canonical = [4 * (s // 4) + permutation[s % 4] for s in range(NUM_CODES)]
+        hand_bytes = bytes([hand_scores[i][c] for c in canonical])
+        crib_bytes = bytes([crib_scores[i][c] for c in canonical])
+        _RECORD.pack_into(data, _HEADER.size + subset_rank(codes) * _RECORD.size, hand_bytes, crib_bytes, *class_stats[i])
+
+    with open(path, 'wb') as f:
+        f.write(data)
+    return None
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = 'Build a table of how every 4-card cribbage hand scores with each possible starter.')
+    parser.add_argument('path', help = 'Path of the table file to write')
+    args = parser.parse_args()
+    build_starter_table(args.path)
@@ -0,0 +1,126 @@
+"""
+Defines functions that map a set of cards to a canonical key that is the same for every set of cards that differs only by a
+permutation of suits. Cribbage scores, and so crib forming decisions, do not change when suits are permuted, since only whether cards
+share a suit matters, never which suit it is. So, a cache or table keyed by the canonical key can share one entry between all
+equivalent hands, and so hold many times fewer entries for the same coverage.
+
+A canonical key is built from one 13 bit rank mask per suit, where bit (sequence count - 1) is set if the card of that rank and suit
+is in the set of cards. The suits are put in canonical order by sorting their rank masks, highest first, and the masks are packed into
+one int in that order. Suits with equal masks are interchangeable, unless the set of cards includes a starter card, whose suit is
+distinguished from the others (it matters for flushes and his nobs), in which case the starter's suit sorts first among equal masks.
+The starter itself is not included in the rank masks. Instead, its rank and canonical suit are packed above them.
+
+Card ranks and suit indices are as defined in CribbageCardCodec, and cards are encoded with it, so the key is built from ints, with
+the codec's rank and suit tables.
+
+Exported Classes:
+    None
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    canonical_key(...) - The canonical key of a set of cards, plus optional starter, and the suit permutation used to build it.
+    canonical_key_codes(...) - As canonical_key(...), for cards already encoded as card codes.
+    key_to_codes(...) - The card codes of the canonical set of cards represented by a canonical key.
+    permute_card(...) - Apply a suit permutation to a card.
+    invert_permutation(...) - The inverse of a suit permutation.
+
+Logging:
+    None
+"""
+
+
+# Standard imports
+
+# Local imports
+from HandsDecksCards.card import Card
+from CribbageSim.CribbageCardCodec import CODE_RANKS, CODE_SUITS, card_to_code, cards_to_codes, code_to_card
+
+
+# Number of bits per suit in a canonical key
+_RANK_BITS = 13
+
+# Offset of the starter in a canonical key, above the four rank masks
+_STARTER_SHIFT = 4 * _RANK_BITS
+
+def canonical_key(cards = [], starter = None):
+    """
+    Determine the canonical key of cards plus starter, which is the same for every set of cards that differs from this one only by a
+    permutation of suits.
+    :parameter cards: The cards, e.g., a 4 card hand, or a 6 card deal, list of Card objects or Hand object
+    :parameter starter: An optional starter card, whose suit is distinguished from the suits of cards, Card object
+    :return: Tuple (key, permutation), where permutation[suit index] is the canonical suit index of the suit, (int, tuple of 4 int)
+    """
+    return canonical_key_codes(cards_to_codes(cards), None if starter is None else card_to_code(starter))
+
+
+def canonical_key_codes(codes = [], starter = None):
+    """
+    Determine the canonical key of cards plus starter, given as card codes, see canonical_key(...).
+    :parameter codes: The codes of the cards, see CribbageCardCodec, list of int
+    :parameter starter: The code of an optional starter card, whose suit is distinguished from the suits of cards, int
+    :return: Tuple (key, permutation), where permutation[suit index] is the canonical suit index of the suit, (int, tuple of 4 int)
+    """
+    masks = [0, 0, 0, 0]
+    for code in codes:
+        masks[CODE_SUITS[code]] |= 1 << CODE_RANKS[code]
+
+    # Sort the suits by rank mask, highest first, with the starter's suit first among equal masks
+    starter_suit = -1
+    if starter is not None: starter_suit = CODE_SUITS[starter]
+    order = sorted(range(4), key = lambda s: (masks[s], s == starter_suit), reverse = True)
+
+    key = 0
+    permutation = [0, 0, 0, 0]
+    for (canonical, suit) in enumerate(order):
+        permutation[suit] = canonical
+        key |= masks[suit] << (_RANK_BITS * canonical)
+
+    if starter is not None:
+        # Pack the starter as 1 + its code, in the canonical suit, so that a key with a starter never equals one without
+        code = 4 * CODE_RANKS[starter] + permutation[starter_suit]
+        key |= (code + 1) << _STARTER_SHIFT
+
+    return (key, tuple(permutation))
+
+
+def key_to_codes(key = 0):
+    """
+    Determine the cards represented by a canonical key, in the canonical suits.
+    :parameter key: A canonical key, from canonical_key(...), int
+    :return: Tuple (codes, starter code), where codes are the card codes (see CribbageCardCodec) in ascending order, and starter code is
+        None if there is no starter, (list of int, int)
+    """
+    codes = []
+    for rank in range(_RANK_BITS):
+        for suit in range(4):
+            if key & (1 << (_RANK_BITS * suit + rank)):
+                codes.append(4 * rank + suit)
+    starter_code = None
+    if key >> _STARTER_SHIFT:
+        starter_code = (key >> _STARTER_SHIFT) - 1
+    return (codes, starter_code)
+
+
+def permute_card(card = Card(), permutation = (0, 1, 2, 3)):
+    """
+    Apply a suit permutation to card, e.g., to map a card to its canonical suit, using the permutation from canonical_key(...), or to map
+    a canonical card back, using the inverse permutation.
+    :parameter card: The card, Card object
+    :parameter permutation: permutation[suit index] is the suit index to map the suit to, tuple of 4 int
+    :return: The interned card (see CribbageCardCodec) with the same pips, and the permuted suit, Card object
+    """
+    code = card_to_code(card)
+    return code_to_card(4 * CODE_RANKS[code] + permutation[CODE_SUITS[code]])
+
+
+def invert_permutation(permutation = (0, 1, 2, 3)):
+    """
+    :parameter permutation: permutation[suit index] is the suit index to map the suit to, tuple of 4 int
+    :return: The inverse of permutation, tuple of 4 int
+    """
+    inverse = [0, 0, 0, 0]
+    for (suit, canonical) in enumerate(permutation):
+        inverse[canonical] = suit
+    return tuple(inverse)
@@ -0,0 +1,382 @@
+"""
+Defines a binary export of the form_crib, follow, and go decisions made while playing, as fixed width rows for training, e.g., an AI
+player, and the size capped shard files they are written to.
+
+Each decision is one 32 byte row (see ROW), holding the state it was made in, the action taken, and the eventual outcome:
+    kind: KIND_FORM_CRIB, KIND_FOLLOW, or KIND_GO
+    role: Who decided, ROLE_PLAYER or ROLE_DEALER, see CribbageGameRecord
+    participant: Who decided, the value of the CribbagePlayers Enum member
+    deal_index: The number of the deal in the game, counting from 0
+    count: The go round count before the decision, 0 for form_crib
+    starter: Code of the starter card, or NO_CARD for form_crib, which is decided before the starter is drawn
+    hand: Codes of the cards in the decider's hand before the decision, padded with NO_CARD to 6 bytes
+    pile: Codes of the cards played so far in the go round, in order, padded with NO_CARD to 8 bytes
+    own_score, opponent_score: Board scores of the decider and their opponent before the decision
+    num_action: The number of cards in action, 0 for a go declared when following
+    action: Codes of the cards laid in the crib, or played, in order, padded with NO_CARD to 4 bytes
+    own_deal_points, opponent_deal_points: The points pegged during the deal by the decider and their opponent
+    result: RESULT_WON or RESULT_LOST for the decider, or RESULT_UNKNOWN if the game didn't finish
+Card codes are those of CribbageCardCodec.
+
+A CribbageDecisionExporter collects the rows of a game, fills in their outcome when the deal and the game end, and passes them to a
+CribbageShardWriter, which buffers them, and writes them in bulk to shard files of at most max_shard_bytes each. Shards are named
+<prefix>-<number>.crows, and are a 16 byte header followed by the rows, so they can be read with read_shard(...), or loaded as a numpy
+structured array with load_shard_array(...).
+
+Construct a CribbageGame, or a CribbageDeal, with decision_exporter = a CribbageDecisionExporter to export its decisions. Export does
+not depend on logging, and works when headless.
+
+Exported Classes:
+    CribbageShardWriter - Writes rows in bulk to a numbered series of size capped shard files.
+    CribbageDecisionExporter - Collects the decision rows of games, and fills in their outcomes.
+
+Exported Exceptions:
+    None
+
+Exported Functions:
+    read_shard(...) - Read the rows of a shard file, as tuples.
+    load_shard_array(...) - Read the rows of a shard file, as a numpy structured array.
+
+Logging:
+    When a shard file is finished, a message is logged to 'cribbage_logger.crib_follow_go_logger' at level INFO.
+"""
+
+
+# Standard imports
+import os
+import struct
+import logging
+
+# Third party imports
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Local imports
+from CribbageSim.exceptions import CribbageRecordError
+
+
+# The logger 'cribbage_logger.crib_follow_go_logger', looked up once, rather than on every call
+_logger = logging.getLogger('cribbage_logger.crib_follow_go_logger')
+
+# The kinds of decisions
+KIND_FORM_CRIB = 0
+KIND_FOLLOW = 1
+KIND_GO = 2
+
+# Padding for card codes, and the value of result before the game has finished
+NO_CARD = 0xFF
+RESULT_LOST = 0
+RESULT_WON = 1
+RESULT_UNKNOWN = 0xFF
+
+# A row: kind, role, participant, deal_index, count, starter, hand, pile, own_score, opponent_score, num_action, action,
+# own_deal_points, opponent_deal_points, result, padded to 32 bytes
+ROW = struct.Struct('<6B6s8s3B4s3B2x')
+# Names of the fields of a row, in order
+ROW_FIELDS = ('kind', 'role', 'participant', 'deal_index', 'count', 'starter', 'hand', 'pile', 'own_score', 'opponent_score',
+              'num_action', 'action', 'own_deal_points', 'opponent_deal_points', 'result')
+# Byte offsets in a row of the outcome, which is filled in after the row is added
+_OFFSET_DEAL_POINTS = 27
+_OFFSET_RESULT = 29
+
+# Shard file header: magic, version, row size, padded to 16 bytes
+_MAGIC = b'CRIBROWS'
+_VERSION = 1
+_SHARD_HEADER = struct.Struct('<8sHH4x')
+_SHARD_SUFFIX = '.crows'
+
+
+def _pad(codes = (), width = 0):
+    """
+    Utility function that packs card codes into width bytes, padded with NO_CARD.
+    :parameter codes: The card codes, at most width of them, sequence of int
+    :parameter width: The number of bytes, int
+    :return: The padded codes, bytes
+    """
+    return bytes(codes) + bytes((NO_CARD,)) * (width - len(codes))
+
+
+class CribbageShardWriter(object):
+    """
+    Writes rows to a numbered series of shard files in a directory, each at most max_shard_bytes. Rows are buffered, and written with
+    one write per buffer_bytes, so call close() to write the last of them. Can be used as a context manager, which closes the writer
+    on exit.
+    """
+    def __init__(self, directory = '.', prefix = 'decisions', max_shard_bytes = 64 * 1024 * 1024, buffer_bytes = 1024 * 1024):
+        """
+        :parameter directory: The directory to write shards to, which is created if it doesn't exist, string
+        :parameter prefix: Shard files are named <prefix>-<number>.crows, string
+        :parameter max_shard_bytes: The most bytes in a shard file, including its header, int
+        :parameter buffer_bytes: The bytes of rows to buffer before writing them, int
+        """
+        assert(max_shard_bytes >= _SHARD_HEADER.size + ROW.size)
+        os.makedirs(directory, exist_ok = True)
+        self._directory = directory
+        self._prefix = prefix
+        # Each shard holds a whole number of rows
+        self._rows_per_shard = (max_shard_bytes - _SHARD_HEADER.size) // ROW.size
+        self._buffer_rows = max(1, buffer_bytes // ROW.size)
+        self._buffer = bytearray()
+        # Number the shards after any already in the directory with the same prefix
+        self._number = 0
+        while os.path.exists(self._shard_path(self._number)): self._number += 1
+        self._file = None
+        self._rows_in_shard = 0
+        self._paths = []
+
+    def _shard_path(self, number = 0):
+        """
+        Utility function that makes the path of a shard.
+        :parameter number: The number of the shard, int
+        :return: Path of the shard file, string
+        """
+        return os.path.join(self._directory, f"{self._prefix}-{number:05d}{_SHARD_SUFFIX}")
+
+    def _finish_shard(self):
+        """
+        Utility function that closes the current shard file, if there is one.
+        :return: None
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            if _logger.isEnabledFor(logging.INFO):
+                _logger.info(f"Wrote {self._rows_in_shard} decision rows to {self._paths[-1]}")
+        return None
+
+    def _write_buffer(self):
+        """
+        Utility function that writes the buffered rows, starting new shards as the current one fills up.
+        :return: None
+        """
+        data = memoryview(self._buffer)
+        start = 0
+        while start < len(data):
+            if self._file is None or self._rows_in_shard >= self._rows_per_shard:
+                self._finish_shard()
+                path = self._shard_path(self._number)
+                self._number += 1
+                self._file = open(path, 'wb')
+                self._file.write(_SHARD_HEADER.pack(_MAGIC, _VERSION, ROW.size))
+                self._paths.append(path)
+                self._rows_in_shard = 0
+            rows = min((len(data) - start) // ROW.size, self._rows_per_shard - self._rows_in_shard)
+            self._file.write(data[start:start + rows * ROW.size])
+            self._rows_in_shard += rows
+            start += rows * ROW.size
+        data.release()
+        self._buffer = bytearray()
+        return None
+
+    def write_rows(self, rows = b''):
+        """
+        Add rows to the buffer, and write the buffer if it is full.
+        :parameter rows: Whole rows, bytes-like object
+        :return: None
+        """
+        assert(len(rows) % ROW.size == 0)
+        self._buffer += rows
+        if len(self._buffer) >= self._buffer_rows * ROW.size: self._write_buffer()
+        return None
+
+    def flush(self):
+        """
+        Write the buffered rows.
+        :return: None
+        """
+        if self._buffer: self._write_buffer()
+        if self._file is not None: self._file.flush()
+        return None
+
+    def close(self):
+        """
+        Write the buffered rows, and close the current shard file.
+        :return: None
+        """
+        self.flush()
+        self._finish_shard()
+        return None
+
+    def get_paths(self):
+        """
+        :return: Paths of the shard files written so far, in order, list of string
+        """
+        return list(self._paths)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+class CribbageDecisionExporter(object):
+    """
+    Collects the decision rows of a game as it is played, fills in the deal points of each deal's rows when the deal ends, and the
+    result of each row when the game ends, and then passes the game's rows to a CribbageShardWriter.
+    CribbageDeal calls begin_deal(), add_decision(...), and, when the deal is played out, end_deal(...). CribbageGame calls
+    begin_game(...), end_deal(...) when the game ends during a deal, and end_game(...).
+    """
+    def __init__(self, writer = None):
+        """
+        :parameter writer: Where to write the rows of each finished game, CribbageShardWriter object
+        """
+        self._writer = writer
+        # Returns (player1 score, player2 score) on the board, or None outside of a game
+        self._score_source = None
+        # The rows of the game so far, the index of the first row of the current deal, and the number of the deal in the game
+        self._rows = bytearray()
+        self._deal_start = 0
+        self._deal_index = 0
+        self._deal_ended = True
+        self._num_rows = 0
+
+    def begin_game(self, score_source = None):
+        """
+        Start collecting the rows of a game. Any rows of an unfinished game are written, with result RESULT_UNKNOWN.
+        :parameter score_source: Returns (player1 score, player2 score) on the board, e.g., CribbageGame.get_player_scores, callable
+        :return: None
+        """
+        self._write_rows()
+        self._score_source = score_source
+        self._deal_index = 0
+        return None
+
+    def begin_deal(self):
+        """
+        Start collecting the rows of a deal.
+        :return: None
+        """
+        # A deal that wasn't ended, e.g., a standalone deal, has no rows of its own after this
+        if not self._deal_ended: self._deal_index += 1
+        self._deal_start = len(self._rows)
+        self._deal_ended = False
+        return None
+
+    def add_decision(self, kind = KIND_FOLLOW, role = 0, participant = 0, count = 0, starter = NO_CARD, hand = (), pile = (), action = ()):
+        """
+        Add the row of a decision.
+        :parameter kind: KIND_FORM_CRIB, KIND_FOLLOW, or KIND_GO, int
+        :parameter role: ROLE_PLAYER or ROLE_DEALER, int
+        :parameter participant: Who decided, the value of the CribbagePlayers Enum member, int
+        :parameter count: The go round count before the decision, int
+        :parameter starter: Code of the starter card, or NO_CARD, int
+        :parameter hand: Codes of the cards in hand before the decision, sequence of int
+        :parameter pile: Codes of the cards played so far in the go round, sequence of int
+        :parameter action: Codes of the cards laid in the crib, or played, sequence of int
+        :return: None
+        """
+        (own_score, opponent_score) = (0, 0)
+        if self._score_source is not None:
+            scores = self._score_source()
+            if participant == 2:
+                (own_score, opponent_score) = (scores[1], scores[0])
+            else:
+                (own_score, opponent_score) = (scores[0], scores[1])
+        self._rows += ROW.pack(kind, role, participant, self._deal_index, count, starter, _pad(hand, 6), _pad(pile, 8),
+                               own_score, opponent_score, len(action), _pad(action, 4), 0, 0, RESULT_UNKNOWN)
+        return None
+
+    def end_deal(self, player_points = 0, dealer_points = 0):
+        """
+        Fill in the deal points of the rows of the deal. Ending a deal that has already ended does nothing.
+        :parameter player_points: The points pegged by the player during the deal, int
+        :parameter dealer_points: The points pegged by the dealer during the deal, int
+        :return: None
+        """
+        if self._deal_ended: return None
+        for offset in range(self._deal_start, len(self._rows), ROW.size):
+            # The role is the second byte of the row
+            if self._rows[offset + 1] == 0:
+                points = (player_points, dealer_points)
+            else:
+                points = (dealer_points, player_points)
+            struct.pack_into('<BB', self._rows, offset + _OFFSET_DEAL_POINTS, min(points[0], 255), min(points[1], 255))
+        self._deal_ended = True
+        self._deal_index += 1
+        return None
+
+    def end_game(self, winner = 0):
+        """
+        Fill in the result of the rows of the game, and write them.
+        :parameter winner: Who won, the value of the CribbagePlayers Enum member, or 0 if the game didn't finish, int
+        :return: None
+        """
+        if winner != 0:
+            for offset in range(0, len(self._rows), ROW.size):
+                # The participant is the third byte of the row
+                self._rows[offset + _OFFSET_RESULT] = RESULT_WON if self._rows[offset + 2] == winner else RESULT_LOST
+        self._write_rows()
+        self._score_source = None
+        return None
+
+    def _write_rows(self):
+        """
+        Utility function that passes the collected rows to the writer.
+        :return: None
+        """
+        if self._rows:
+            self._writer.write_rows(self._rows)
+            self._num_rows += len(self._rows) // ROW.size
+            self._rows = bytearray()
+        self._deal_start = 0
+        self._deal_ended = True
+        return None
+
+    def get_num_rows(self):
+        """
+        :return: The number of rows passed to the writer so far, int
+        """
+        return self._num_rows
+
+    def close(self):
+        """
+        Write the rows of any unfinished game, with result RESULT_UNKNOWN, and close the writer.
+        :return: None
+        """
+        self._write_rows()
+        self._writer.close()
+        return None
+
+
+def _read_shard_data(path = ''):
+    """
+    Utility function that reads a shard file and checks its header.
+    :parameter path: Path of the shard file, string
+    :return: The rows, bytes
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < _SHARD_HEADER.size:
+        raise CribbageRecordError(f"{path} is too short to be a decision shard file")
+    (magic, version, row_size) = _SHARD_HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != _VERSION or row_size != ROW.size or (len(data) - _SHARD_HEADER.size) % ROW.size != 0:
+        raise CribbageRecordError(f"{path} is not a version {_VERSION} decision shard file")
+    return data[_SHARD_HEADER.size:]
+
+
+def read_shard(path = ''):
+    """
+    Read the rows of a shard file.
+    :parameter path: Path of the shard file, string
+    :return: The rows, each a tuple of the fields in ROW_FIELDS, with hand, pile, and action as bytes, list of tuples
+    """
+    return list(ROW.iter_unpack(_read_shard_data(path)))
+
+
+def load_shard_array(path = ''):
+    """
+    Read the rows of a shard file as a numpy structured array, with a field for each of ROW_FIELDS.
+    :parameter path: Path of the shard file, string
+    :return: The rows, numpy structured array
+    """
+    if np is None:
+        raise ImportError('load_shard_array(...) requires numpy, which is not installed.')
+    dtype = np.dtype([('kind', 'u1'), ('role', 'u1'), ('participant', 'u1'), ('deal_index', 'u1'), ('count', 'u1'), ('starter', 'u1'),
+                      ('hand', 'u1', (6,)), ('pile', 'u1', (8,)), ('own_score', 'u1'), ('opponent_score', 'u1'), ('num_action', 'u1'),
+                      ('action', 'u1', (4,)), ('own_deal_points', 'u1'), ('opponent_deal_points', 'u1'), ('result', 'u1'), ('pad', 'u1', (2,))])
+    assert(dtype.itemsize == ROW.size)
+    return np.frombuffer(_read_shard_data(path), dtype = dtype)
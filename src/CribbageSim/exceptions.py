@@ -7,6 +7,7 @@ Exported Classes:
 Exported Exceptions:
     CribbageError - Base exception class for all custom exceptions specific to CribbageSim package.
     CribbageGameOverError - Custom exception to be raised when pegging the CribbageBoard results in one player reaching a score of 121, and thus ending the game.
+    CribbageRecordError - Custom exception to be raised when a game record file, or another binary data file, is not valid, or is damaged.
 
 Note that the end of game upon one player reaching a score of 121 is handled as an exception, because the game ends
 immediately when that happens, and this could happen in the middle of playing a deal.
@@ -37,4 +38,13 @@ class CribbageGameOverError(CribbageError):
     def __init__(self, *args, **kwargs):
         super().__init__(*args)
         self.deal_info = kwargs.get('deal_info')
-        self.go_play_score = kwargs.get('go_play_score')
\ No newline at end of file
+        self.go_play_score = kwargs.get('go_play_score')
+
+
+class CribbageRecordError(CribbageError):
+    """
+    Custom exception to be raised when a game record file, see CribbageGameRecord, is not valid, or is damaged, for example when a chunk
+    fails its checksum. Also raised for the other binary data files of the package, e.g., a deal library or a starter table, that are
+    not valid.
+    """
+    pass
@@ -0,0 +1,80 @@
+# Standard
+import unittest
+import random
+
+# Third party
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Local
+from HandsDecksCards.card import Card
+from HandsDecksCards.hand import Hand
+from CribbageSim.CribbageCardCodec import cards_to_codes, code_to_card
+from CribbageSim.CribbageBatchScoring import score_batch
+from CribbageSim.CribbageDeal import CribbageDeal
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class Test_CribbageBatchScoring(unittest.TestCase):
+
+    def test_score_batch_29(self):
+
+        hands = [cards_to_codes([Card('H','5'), Card('S','5'), Card('C','5'), Card('D','J')])]
+        starters = cards_to_codes([Card('D','5'), Card('H','J'), Card('S','5')])
+        (scores, mean, variance) = score_batch(hands, starters)
+
+        # The starter 5S is already in the hand
+        exp_val = [29, 22, -1]
+        act_val = list(scores[0])
+        self.assertListEqual(exp_val, act_val)
+
+        self.assertAlmostEqual(25.5, mean[0])
+        self.assertAlmostEqual(12.25, variance[0])
+
+    def test_score_batch_crib_flush(self):
+
+        hands = [cards_to_codes([Card('S','2'), Card('S','4'), Card('S','8'), Card('S','Q')])]
+        starters = cards_to_codes([Card('S','A'), Card('D','A')])
+        
+        (scores, mean, variance) = score_batch(hands, starters, is_crib = True)
+        # Two fifteens with either starter, plus the flush with AS
+        exp_val = [9, 4]
+        act_val = list(scores[0])
+        self.assertListEqual(exp_val, act_val)
+
+        (scores, mean, variance) = score_batch(hands, starters, is_crib = False)
+        exp_val = [9, 8]
+        act_val = list(scores[0])
+        self.assertListEqual(exp_val, act_val)
+
+    def test_score_batch_matches_deal(self):
+
+        deal = CribbageDeal()
+        rng = random.Random(1234567895)
+        hands = [rng.sample(range(52), 4) for i in range(40)]
+        starters = list(range(52))
+
+        for is_crib in (False, True):
+            (scores, mean, variance) = score_batch(hands, starters, is_crib)
+            self.assertTupleEqual((40, 52), scores.shape)
+            for (n, codes) in enumerate(hands):
+                h = Hand()
+                h.add_cards([code_to_card(c) for c in codes])
+                exp_scores = []
+                for s in starters:
+                    if s in codes:
+                        self.assertEqual(-1, scores[n, s])
+                        continue
+                    if is_crib:
+                        exp_val = deal.determine_score_showing_crib(h, code_to_card(s), [])
+                    else:
+                        exp_val = deal.determine_score_showing_hand(h, code_to_card(s), [])
+                    self.assertEqual(exp_val, scores[n, s])
+                    exp_scores.append(exp_val)
+                self.assertAlmostEqual(np.mean(exp_scores), mean[n])
+                self.assertAlmostEqual(np.var(exp_scores), variance[n])
+
+
+if __name__ == '__main__':
+    unittest.main()
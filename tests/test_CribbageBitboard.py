@@ -0,0 +1,71 @@
+# Standard
+import unittest
+
+# Local
+from HandsDecksCards.card import Card
+from HandsDecksCards.deck import Deck
+from CribbageSim.CribbageCardCodec import card_to_code
+from CribbageSim.CribbageBitboard import cards_to_mask, codes_to_mask, mask_to_codes, mask_to_cards, mask_count, mask_rank_mask
+from CribbageSim.CribbageBitboard import playable_mask, playable_cards, CribbageDealBitboard, PLAYABLE_UNDER, FULL_DECK
+
+class Test_CribbageBitboard(unittest.TestCase):
+
+    def test_mask_round_trip(self):
+
+        cards = [Card('D','K'), Card('S','A'), Card('H','5')]
+        mask = cards_to_mask(cards)
+        exp_val = sorted([card_to_code(c) for c in cards])
+        self.assertListEqual(exp_val, mask_to_codes(mask))
+        self.assertEqual(mask, codes_to_mask(exp_val))
+        self.assertListEqual(['AS', '5H', 'KD'], [str(c) for c in mask_to_cards(mask)])
+        self.assertEqual(3, mask_count(mask))
+        self.assertEqual(FULL_DECK, cards_to_mask(Deck().create_deck()))
+
+    def test_mask_rank_mask(self):
+
+        # A, 5, 5, K -> ranks 0, 4, 12
+        mask = cards_to_mask([Card('S','A'), Card('H','5'), Card('C','5'), Card('D','K')])
+        exp_val = (1 << 0) | (1 << 4) | (1 << 12)
+        self.assertEqual(exp_val, mask_rank_mask(mask))
+
+    def test_playable_under(self):
+
+        # Every card can be played on an empty pile, nothing on 31, only aces on 30
+        self.assertEqual(FULL_DECK, PLAYABLE_UNDER[0])
+        self.assertEqual(0, PLAYABLE_UNDER[31])
+        self.assertEqual(0b1111, PLAYABLE_UNDER[30])
+        
+        # On 22, only cards counting 9 or less
+        hand = cards_to_mask([Card('S','9'), Card('C','10'), Card('H','Q')])
+        self.assertEqual(cards_to_mask([Card('S','9')]), playable_mask(hand, 22))
+
+    def test_playable_cards(self):
+
+        hand = [Card('D','K'), Card('S','2'), Card('H','8'), Card('C','A')]
+        exp_val = ['2S', '8H', 'AC']
+        act_val = [str(c) for c in playable_cards(hand, 22)]
+        self.assertListEqual(exp_val, act_val)
+
+    def test_deal_bitboard(self):
+
+        bb = CribbageDealBitboard()
+        bb.deal_to_player([Card('S','5'), Card('H','5')])
+        bb.deal_to_dealer([Card('D','J'), Card('C','4')])
+        bb.player_to_crib(Card('H','5'))
+        bb.dealer_plays(Card('C','4'))
+        
+        other = bb.copy()
+        self.assertEqual(bb.key(), other.key())
+        other.player_plays(Card('S','5'))
+        self.assertNotEqual(bb.key(), other.key())
+
+        self.assertEqual(cards_to_mask([Card('S','5')]), bb.player_hand)
+        self.assertEqual(cards_to_mask([Card('H','5')]), bb.crib)
+        self.assertEqual(cards_to_mask([Card('C','4'), Card('S','5')]), other.combined_pile)
+        other.clear_combined_pile()
+        self.assertEqual(0, other.combined_pile)
+        self.assertEqual(cards_to_mask([Card('S','5')]), other.player_pile)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 # Standard
 import unittest
+import logging
 
 # Local
 from CribbageSim.CribbageBoard import CribbageBoard
@@ -86,7 +87,20 @@ class Test_CribbageBoard(unittest.TestCase):
         act_val = str(board)
         self.assertEqual(exp_val, act_val)
 
-    
+    def test_headless(self):
+
+        board = CribbageBoard(headless = True)
+        with self.assertNoLogs('cribbage_logger', level = logging.DEBUG):
+            board.peg_for_player1(6)
+            board.peg_for_player2(3)
+        self.assertTupleEqual((6, 3), board.get_scores())
+
+        # Once headless mode is turned off, pegging is logged again
+        board.set_headless(False)
+        with self.assertLogs('cribbage_logger', level = logging.INFO) as cm:
+            board.peg_for_player1(2)
+        self.assertEqual(1, len(cm.output))
+
+
 if __name__ == '__main__':
     unittest.main()
-
@@ -0,0 +1,64 @@
+# Standard
+import unittest
+
+# Local
+from HandsDecksCards.card import Card
+from HandsDecksCards.deck import Deck
+from CribbageSim.CribbageCardCodec import card_to_code, code_to_card, cards_to_codes, code_rank, code_suit, code_count
+from CribbageSim.CribbageCardCodec import intern_card, create_interned_deck
+from CribbageSim.CribbageDeck import CribbageDeck
+
+class Test_CribbageCardCodec(unittest.TestCase):
+
+    def test_card_to_code(self):
+
+        exp_val = [0, 1, 39, 51]
+        act_val = cards_to_codes([Card('S','A'), Card('C','A'), Card('D','10'), Card('D','K')])
+        self.assertListEqual(exp_val, act_val)
+
+    def test_round_trip(self):
+
+        for card in Deck().create_deck():
+            code = card_to_code(card)
+            self.assertEqual(str(card), str(code_to_card(code)))
+            self.assertEqual(card._get_sequence_count() - 1, code_rank(code))
+            self.assertEqual(card.count_card(), code_count(code))
+        
+        self.assertEqual(52, len(set(cards_to_codes(Deck().create_deck()))))
+
+    def test_code_suit(self):
+
+        exp_val = 2
+        act_val = code_suit(card_to_code(Card('H','Q')))
+        self.assertEqual(exp_val, act_val)
+
+    def test_interned_cards(self):
+
+        # Decoding a code always returns the same Card object
+        self.assertIs(code_to_card(17), code_to_card(17))
+        
+        # A new Card interns to the interned Card with the same suit and pips
+        card = intern_card(Card('H','Q'))
+        self.assertIs(code_to_card(card_to_code(Card('H','Q'))), card)
+        self.assertEqual('QH', str(card))
+
+    def test_create_interned_deck(self):
+
+        # Same order as Deck, and the same Card objects every time
+        exp_val = [str(c) for c in Deck().create_deck()]
+        deck = create_interned_deck()
+        self.assertListEqual(exp_val, [str(c) for c in deck])
+        for (c1, c2) in zip(deck, create_interned_deck()):
+            self.assertIs(c1, c2)
+
+    def test_cribbage_deck(self):
+
+        # A CribbageDeck deals the interned Cards
+        deck = CribbageDeck(isInfinite = False)
+        for i in range(52):
+            card = deck.draw()
+            self.assertIs(code_to_card(card_to_code(card)), card)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# Standard
+import unittest
+from itertools import combinations, combinations_with_replacement
+
+# Third party
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Local
+from HandsDecksCards.card import Card
+from CribbageSim.CribbageCardIndexer import num_subsets, num_multisets, subset_rank, subset_unrank, cards_rank
+from CribbageSim.CribbageCardIndexer import multiset_rank, multiset_unrank, subset_rank_batch, subset_unrank_batch, multiset_rank_batch
+
+class Test_CribbageCardIndexer(unittest.TestCase):
+
+    def test_num_subsets(self):
+
+        self.assertEqual(1326, num_subsets(2))
+        self.assertEqual(270725, num_subsets(4))
+        self.assertEqual(20358520, num_subsets(6))
+
+    def test_subset_rank_is_dense(self):
+
+        # combinations(...) of codes in reversed order produces the sets in descending colex order
+        for k in (2, 3):
+            ranks = [subset_rank(sorted(codes)) for codes in combinations(range(51, -1, -1), k)]
+            self.assertListEqual(list(range(num_subsets(k) - 1, -1, -1)), ranks)
+
+    def test_subset_unrank(self):
+
+        for k in range(2, 7):
+            for index in (0, 1, 1000, num_subsets(k) // 3, num_subsets(k) - 1):
+                codes = subset_unrank(index, k)
+                self.assertEqual(k, len(codes))
+                self.assertEqual(index, subset_rank(codes))
+
+    def test_cards_rank(self):
+
+        exp_val = subset_rank([0, 1, 39, 51])
+        act_val = cards_rank([Card('D','K'), Card('S','A'), Card('D','10'), Card('C','A')])
+        self.assertEqual(exp_val, act_val)
+
+    def test_multiset_rank(self):
+
+        for k in (1, 4, 5):
+            indices = sorted([multiset_rank(ranks) for ranks in combinations_with_replacement(range(13), k)])
+            self.assertListEqual(list(range(num_multisets(k))), indices)
+            for index in range(0, num_multisets(k), 97):
+                self.assertEqual(index, multiset_rank(multiset_unrank(index, k)))
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_batch(self):
+
+        codes = [[51, 0, 17, 3], [5, 4, 3, 2], [48, 49, 50, 51]]
+        exp_val = [subset_rank(sorted(c)) for c in codes]
+        act_val = list(subset_rank_batch(codes))
+        self.assertListEqual(exp_val, act_val)
+
+        exp_val = [sorted(c) for c in codes]
+        act_val = subset_unrank_batch(act_val, 4).tolist()
+        self.assertListEqual(exp_val, act_val)
+
+        ranks = [[12, 0, 0, 5, 5], [4, 4, 4, 4, 9]]
+        exp_val = [multiset_rank(sorted(r)) for r in ranks]
+        act_val = list(multiset_rank_batch(ranks))
+        self.assertListEqual(exp_val, act_val)
+
+
+if __name__ == '__main__':
+    unittest.main()
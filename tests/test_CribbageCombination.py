@@ -1,10 +1,16 @@
 # Standard
 import unittest
+import random
+import pickle
 
 # Local
 from HandsDecksCards.card import Card
 from HandsDecksCards.hand import Hand
-from CribbageSim.CribbageCombination import CribbageCombination, CribbageCombinationPlaying, CribbageCombinationShowing
+from HandsDecksCards.deck import Deck
+from CribbageSim.CribbageCombination import CribbageCombination, CribbageCombinationPlaying, CribbageCombinationShowing, score_show
+from CribbageSim.CribbageCombination import PairCombination, FifteenCombination, RunCombination, FlushCombination, CribFlushCombination
+from CribbageSim.CribbageCombination import HisNobsCombination, CribbageShowDecomposition, score_show_combinations, CribbageComboInfo
+from CribbageSim.CribbageCombination import PairCombinationPlaying, RunCombinationPlaying, FifteenCombinationPlaying
 
 class Test_CribbageCombination(unittest.TestCase):
     
@@ -77,6 +83,155 @@ class Test_CribbageCombination(unittest.TestCase):
         # Try to create permutations of size 5
         self.assertRaises(AssertionError, ccs.permutations, 6, h.get_cards())
 
+    def test_score_show_hand(self):
+        
+        h = Hand()
+        h.add_cards([Card('S','5'), Card('C','5'), Card('H','5'), Card('D','J')])
+        s = Card('D','5')
+        
+        # 8 fifteens for 16, 6 pairs for 12, his nobs for 1, all total = 29
+        exp_val = 29
+        act_val = score_show(h, s)
+        self.assertEqual(exp_val, act_val)
+
+    def test_score_show_crib_flush(self):
+        
+        h = Hand()
+        h.add_cards([Card('S','9'), Card('S','6'), Card('S','7'), Card('S','8')])
+        
+        # 3 15's for 6, 2 runs of 4 for 8, 1 pair for 2, flush for 5, all total = 21
+        exp_val = 21
+        act_val = score_show(h, Card('S','6'), is_crib = True)
+        self.assertEqual(exp_val, act_val)
+        
+        # Starter is a different suit, so no flush in the crib: 3 15's for 6, 1 run of 4 for 4, all total = 10
+        exp_val = 10
+        act_val = score_show(h, Card('H','A'), is_crib = True)
+        self.assertEqual(exp_val, act_val)
+
+    def test_score_show_without_starter(self):
+        
+        h = Hand()
+        h.add_cards([Card('S','9'), Card('S','9'), Card('S','10'), Card('S','J')])
+        
+        # 2 runs of 3 for 6, 1 pair for 2, flush for 4, all total = 12
+        exp_val = 12
+        act_val = score_show(h)
+        self.assertEqual(exp_val, act_val)
+
+    def test_score_show_matches_combinations(self):
+        
+        hand_combos = [PairCombination(), FifteenCombination(), RunCombination(), FlushCombination(), HisNobsCombination()]
+        crib_combos = [PairCombination(), FifteenCombination(), RunCombination(), CribFlushCombination(), HisNobsCombination()]
+        
+        rng = random.Random(1234567890)
+        for i in range(500):
+            cards = rng.sample(Deck().create_deck(), 5)
+            h = Hand()
+            h.add_cards(cards[0:4])
+            s = cards[4]
+            
+            exp_val = sum([combo.score(h, s).score for combo in hand_combos])
+            act_val = score_show(h, s)
+            self.assertEqual(exp_val, act_val)
+
+            exp_val = sum([combo.score(h, s).score for combo in crib_combos])
+            act_val = score_show(h, s, is_crib = True)
+            self.assertEqual(exp_val, act_val)
+
+    def test_show_decomposition(self):
+        
+        h = Hand()
+        h.add_cards([Card('S','9'), Card('S','J'), Card('S','9'), Card('S','10')])
+        s = Card('D','A')
+        d = CribbageShowDecomposition(h, s)
+
+        self.assertEqual(5, len(d.cards))
+        self.assertEqual([9, 10, 9, 10, 1], d.values)
+        self.assertEqual(2, d.histogram[9])
+        self.assertEqual([1], d.positions[11])
+        self.assertEqual('S', d.flush_suit)
+        self.assertFalse(hasattr(d, '__dict__'))
+
+    def test_score_show_combinations_reasons(self):
+        
+        combos = [PairCombination(), FifteenCombination(), RunCombination(), FlushCombination(), HisNobsCombination()]
+        
+        rng = random.Random(1234567891)
+        for i in range(200):
+            cards = rng.sample(Deck().create_deck(), 5)
+            h = Hand()
+            h.add_cards(cards[0:4])
+            s = cards[4]
+            
+            exp_reasons = [combo.score(h, s) for combo in combos]
+            exp_reasons = [str(info) for info in exp_reasons if info.number_instances > 0]
+            reasons = []
+            act_val = score_show_combinations(combos, h, s, reasons)
+            self.assertEqual(score_show(h, s), act_val)
+            self.assertEqual(exp_reasons, [str(info) for info in reasons])
+
+    def test_combo_info_lazy_instance_list(self):
+        
+        built = []
+        def builder():
+            built.append(True)
+            return [[Card('S','5'), Card('H','10')]]
+        
+        info = CribbageComboInfo()
+        info.combo_name = 'fifteen'
+        info.number_instances = 1
+        info.score = 2
+        info.set_instance_list_builder(builder)
+        self.assertEqual([], built)
+        
+        exp_val = 'fifteen: 1 for 2: 5S 10H'
+        act_val = str(info)
+        self.assertEqual(exp_val, act_val)
+        self.assertEqual(1, len(info.instance_list))
+        self.assertEqual([True], built)
+
+    def test_combo_info_pickle(self):
+        
+        info = CribbageComboInfo()
+        info.combo_name = 'fifteen'
+        info.number_instances = 1
+        info.score = 2
+        info.set_instance_list_builder(lambda: [[Card('S','5'), Card('H','10')]])
+        self.assertFalse(hasattr(info, '__dict__'))
+        
+        # The lazy instance_list is built before pickling, since the lambda can't be pickled
+        copy = pickle.loads(pickle.dumps(info))
+        exp_val = 'fifteen: 1 for 2: 5S 10H'
+        act_val = str(copy)
+        self.assertEqual(exp_val, act_val)
+
+    def test_score_only_showing(self):
+        
+        combos = [PairCombination(), FifteenCombination(), RunCombination(), FlushCombination(), CribFlushCombination(), HisNobsCombination()]
+        
+        rng = random.Random(1234567892)
+        for i in range(200):
+            cards = rng.sample(Deck().create_deck(), 5)
+            h = Hand()
+            h.add_cards(cards[0:4])
+            s = cards[4]
+            for combo in combos:
+                self.assertEqual(combo.score(h, s).score, combo.score_only(h, s))
+
+    def test_score_only_playing(self):
+        
+        combos = [PairCombinationPlaying(), RunCombinationPlaying(), FifteenCombinationPlaying()]
+        
+        rng = random.Random(1234567893)
+        for i in range(500):
+            # Draw from a small set of ranks, so that pairs and runs are common
+            pile = Hand()
+            for j in range(rng.randint(1, 8)):
+                pile.add_cards(Card(rng.choice(['S','C','H','D']), rng.choice(['A','2','3','4','5','6'])))
+            for combo in combos:
+                self.assertEqual(combo.score(pile).score, combo.score_only(pile))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,7 @@
 # Standard
 import unittest
 import io
+import logging
 from unittest.mock import patch
 
 # Local
@@ -9,6 +10,8 @@ from HandsDecksCards.hand import Hand
 from HandsDecksCards.deck import StackedDeck
 from CribbageSim.CribbagePlayStrategy import InteractiveCribbagePlayStrategy, HoyleishPlayerCribbagePlayStrategy, HoyleishDealerCribbagePlayStrategy
 from CribbageSim.CribbageDeal import CribbageDeal, CribbageDealInfo
+from CribbageSim.CribbageBitboard import cards_to_mask
+from CribbageSim.CribbageHand import CribbageCardsView
 
 class Test_CribbageDeal(unittest.TestCase):
     
@@ -304,6 +307,164 @@ class Test_CribbageDeal(unittest.TestCase):
         act_val = info.player_play_score + info.player_show_score
         self.assertEqual(exp_val, act_val)
 
+    def test_play_automatic_bitboard(self):
+
+        # Seed the random number generator, same as test_play_automatic_1
+        from random import seed
+        seed(1234567890)
+
+        deal = CribbageDeal(HoyleishPlayerCribbagePlayStrategy(), HoyleishDealerCribbagePlayStrategy(), use_bitboard = True)
+        info = deal.play()
+        
+        # Tracking the bitboard doesn't change the deal
+        exp_val = 21
+        act_val = info.dealer_his_heals_score + info.dealer_play_score + info.dealer_show_score + info.dealer_crib_score
+        self.assertEqual(exp_val, act_val)
+
+        # Does the bitboard agree with the Hands of the deal?
+        bb = deal.get_bitboard()
+        self.assertEqual(0, bb.player_hand)
+        self.assertEqual(0, bb.dealer_hand)
+        self.assertEqual(cards_to_mask(deal._player_pile), bb.player_pile)
+        self.assertEqual(cards_to_mask(deal._dealer_pile), bb.dealer_pile)
+        self.assertEqual(cards_to_mask(deal._combined_pile), bb.combined_pile)
+        self.assertEqual(cards_to_mask(deal._crib_hand), bb.crib)
+        self.assertEqual(cards_to_mask([deal._starter]), bb.starter)
+        self.assertEqual(13, bb.dealt.bit_count())
+
+    def test_play_headless(self):
+
+        # Seed the random number generator, same as test_play_automatic_1
+        from random import seed
+        seed(1234567890)
+
+        deal = CribbageDeal(HoyleishPlayerCribbagePlayStrategy(), HoyleishDealerCribbagePlayStrategy(), headless = True)
+        with self.assertNoLogs('cribbage_logger', level = logging.DEBUG):
+            info = deal.play()
+
+        # Headless play doesn't change the deal
+        self.assertEqual(21, info.dealer_his_heals_score + info.dealer_play_score + info.dealer_show_score + info.dealer_crib_score)
+        self.assertEqual(13, info.player_play_score + info.player_show_score)
+        self.assertEqual('', deal._recorded_play)
+
+    def test_play_logs_when_not_headless(self):
+
+        from random import seed
+        seed(1234567890)
+
+        deal = CribbageDeal(HoyleishPlayerCribbagePlayStrategy(), HoyleishDealerCribbagePlayStrategy())
+        with self.assertLogs('cribbage_logger', level = logging.DEBUG) as cm:
+            deal.play()
+        self.assertTrue(any(['Starter card:' in line for line in cm.output]))
+        self.assertTrue(any(['Play record:' in line for line in cm.output]))
+
+    def test_play_reuse_buffers_stacked_deck(self):
+
+        # Same stacked deal as test_play_interactive_1, played by machine strategies, with and without reusing buffers
+        card_list = [Card('D','J'), Card('S','10'), Card('H','8'), Card('C','7'), Card('H','5'), Card('C','3'),
+                     Card('S','K'), Card('D','9'), Card('C','9'), Card('D','8'), Card('S','7'), Card('H','A'),
+                     Card('S','6')]
+        scores = []
+        for reuse in (False, True):
+            sd = StackedDeck()
+            sd.add_cards(card_list)
+            deal = CribbageDeal(HoyleishPlayerCribbagePlayStrategy(), HoyleishDealerCribbagePlayStrategy(), reuse_buffers = reuse)
+            deal._deck = sd
+            info = deal.play()
+            scores.append((info.player_play_score, info.player_show_score, info.dealer_play_score, info.dealer_show_score,
+                           info.dealer_crib_score))
+        self.assertEqual(scores[0], scores[1])
+
+    def test_play_reuse_buffers(self):
+
+        from random import seed
+        seed(1234567890)
+
+        deal = CribbageDeal(HoyleishPlayerCribbagePlayStrategy(), HoyleishDealerCribbagePlayStrategy(), reuse_buffers = True)
+        deck = deal._deck
+        crib = deal._crib_hand
+        for i in range(3):
+            deal.reset_deal()
+            deal.play()
+            # The same deck and hands are used for every deal
+            self.assertIs(deck, deal._deck)
+            self.assertIs(crib, deal._crib_hand)
+            self.assertEqual(4, len(deal._crib_hand))
+            self.assertEqual(4, len(deal._player_pile))
+            self.assertEqual(4, len(deal._dealer_pile))
+            # 13 cards drawn, from a restocked deck
+            self.assertEqual(52 - 13, deck.cards_remaining())
+
+    def test_state_view_callbacks(self):
+
+        # Machine strategies get views, the interactive strategy gets list copies
+        deal = CribbageDeal(HoyleishPlayerCribbagePlayStrategy(), InteractiveCribbagePlayStrategy())
+        deal.draw_for_player(6)
+        deal.draw_for_dealer(6)
+        self.assertIsInstance(deal._player_hand_callback(), CribbageCardsView)
+        self.assertIsInstance(deal._player_pile_callback(), CribbageCardsView)
+        self.assertIsInstance(deal._dealer_hand_callback(), list)
+        self.assertIsInstance(deal._dealer_pile_callback(), list)
+        self.assertListEqual(deal.get_player_hand(), list(deal.get_player_hand_view()))
+
+    def test_deal_state_round_trip(self):
+
+        from random import seed
+        seed(1234567890)
+
+        for reuse in (False, True):
+            deal = CribbageDeal(HoyleishPlayerCribbagePlayStrategy(), HoyleishDealerCribbagePlayStrategy(), use_bitboard = True,
+                                reuse_buffers = reuse)
+            deal.draw_for_player(6)
+            deal.draw_for_dealer(6)
+            deal.xfer_player_card_to_crib(0)
+            deal.xfer_dealer_card_to_crib(0)
+            deal.draw_starter_card()
+            deal.play_card_for_player(0)
+            state = deal.get_deal_state()
+            bb = deal.get_bitboard().key()
+            self.assertEqual(39, len(state.deck))
+            self.assertEqual(4, len(state.player_hand))
+            self.assertEqual(deal.get_combined_play_pile()[0].count_card(), state.go_round_count)
+
+            # Play on, then go back to the saved state
+            deal.play_card_for_dealer(0)
+            deal.play_card_for_player(0)
+            deal.peg_for_player(2)
+            self.assertNotEqual(state, deal.get_deal_state())
+            deal.set_deal_state(state)
+            self.assertEqual(state, deal.get_deal_state())
+            self.assertEqual(bb, deal.get_bitboard().key())
+            self.assertEqual(1, deal._pegging_state.get_num_cards())
+            self.assertEqual(39, deal._deck.cards_remaining())
+
+            # The count of the go round isn't restored, it follows from the combined pile
+            other = state.clone()
+            other.go_round_count = 25
+            deal.set_deal_state(other)
+            self.assertEqual(state, deal.get_deal_state())
+
+    def test_deal_state_stacked_deck(self):
+
+        sd = StackedDeck()
+        sd.add_cards([Card('D','J'), Card('S','10'), Card('H','8')])
+        deal = CribbageDeal()
+        deal._deck = sd
+        deal.draw_for_player(1)
+        state = deal.get_deal_state()
+        self.assertEqual(2, len(state.deck))
+        self.assertEqual(-1, state.starter)
+        deal.draw_for_player(2)
+        deal.set_deal_state(state)
+        # The stacked deck draws the same cards again, in order
+        self.assertIsInstance(deal._deck, StackedDeck)
+        self.assertEqual('10S', str(deal._deck.draw()))
+
+    def test_no_bitboard_by_default(self):
+
+        deal = CribbageDeal()
+        self.assertIsNone(deal.get_bitboard())
+
     
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,110 @@
+# Standard
+import unittest
+
+# Local
+from CribbageSim.CribbageCardCodec import card_to_code
+from CribbageSim.CribbagePlayStrategy import HoyleishPlayerCribbagePlayStrategy, HoyleishDealerCribbagePlayStrategy
+from CribbageSim.CribbageDeal import CribbageDeal
+from CribbageSim.CribbageGame import CribbageGame
+from CribbageSim import CribbageDealGenerator
+from CribbageSim.CribbageDealGenerator import CribbageDealGenerator as Generator, CribbageGeneratedDeck, generate_deals
+
+class Test_CribbageDealGenerator(unittest.TestCase):
+
+    def test_next_deal(self):
+
+        gen = Generator(seed = 12345, block_size = 7)
+        for i in range(20):
+            codes = gen.next_deal()
+            self.assertEqual(13, len(codes))
+            self.assertEqual(13, len(set(codes)))
+            self.assertTrue(all([c >= 0 and c < 52 for c in codes]))
+
+    def test_reproducible(self):
+
+        gen1 = Generator(seed = 12345, block_size = 100)
+        gen2 = Generator(seed = 12345, block_size = 100)
+        for i in range(150):
+            self.assertListEqual(gen1.next_deal(), gen2.next_deal())
+
+    @unittest.skipIf(CribbageDealGenerator.np is None, 'numpy is not installed')
+    def test_generate_deals_uniform(self):
+
+        # Each card should be the first card dealt about 1/52 of the time, and be in a deal about 13/52 of the time
+        import numpy as np
+        deals = generate_deals(52 * 400, np.random.default_rng(54321))
+        self.assertEqual((52 * 400, 13), deals.shape)
+        first = np.bincount(deals[:, 0], minlength = 52)
+        self.assertGreater(first.min(), 300)
+        self.assertLess(first.max(), 500)
+        anywhere = np.bincount(deals.ravel(), minlength = 52)
+        self.assertGreater(anywhere.min(), 13 * 400 - 300)
+        self.assertLess(anywhere.max(), 13 * 400 + 300)
+
+    def test_generated_deck(self):
+
+        deck = CribbageGeneratedDeck(Generator(seed = 1, block_size = 10))
+        codes = [card_to_code(c) for c in deck.draw(13)]
+        self.assertEqual(0, len(deck))
+        self.assertEqual(13, len(set(codes)))
+        deck.restock()
+        self.assertEqual(13, len(deck))
+
+    def test_generated_deck_starts_empty(self):
+
+        # Constructing the deck takes no deal from the generator, so nothing is skipped
+        deck = CribbageGeneratedDeck(Generator(seed = 1, block_size = 10))
+        self.assertEqual(0, len(deck))
+        codes = [card_to_code(c) for c in deck.draw(13)]
+        self.assertListEqual(Generator(seed = 1, block_size = 10).next_deal(), codes)
+
+    def test_generated_deck_add_card(self):
+
+        deck = CribbageGeneratedDeck(Generator(seed = 1, block_size = 10))
+        drawn = deck.draw(13)
+        deck.add_cards(drawn[0:2])
+        self.assertListEqual(drawn[0:2], deck.add_card(drawn[2])[0:2])
+        self.assertListEqual(drawn[0:3], deck.draw(3))
+
+    def test_deal_plays_generated_deals(self):
+
+        # Each deal is dealt the cards of the next generated deal, starting with the first
+        gen = Generator(seed = 1, block_size = 4)
+        deal = CribbageDeal(HoyleishPlayerCribbagePlayStrategy(), HoyleishDealerCribbagePlayStrategy(), headless = True, record = True)
+        deal.set_deck(CribbageGeneratedDeck(Generator(seed = 1, block_size = 4)))
+        for j in range(6):
+            deal.reset_deal()
+            deal.play()
+            record = deal.get_deal_record()
+            self.assertListEqual(gen.next_deal(), list(record.dealt) + [record.starter])
+
+    def test_deal_with_generated_deck(self):
+
+        # The same seed deals the same cards, so plays the same deals
+        results = []
+        for i in range(2):
+            deal = CribbageDeal(HoyleishPlayerCribbagePlayStrategy(), HoyleishDealerCribbagePlayStrategy())
+            deal.set_deck(CribbageGeneratedDeck(Generator(seed = 99, block_size = 4)))
+            scores = []
+            for j in range(6):
+                deal.reset_deal()
+                info = deal.play()
+                scores.append((info.player_play_score, info.player_show_score, info.dealer_play_score, info.dealer_show_score,
+                               info.dealer_crib_score))
+            results.append(scores)
+        self.assertListEqual(results[0], results[1])
+
+    def test_game_with_generated_deck(self):
+
+        winners = []
+        for i in range(2):
+            game = CribbageGame(player_strategy1 = HoyleishPlayerCribbagePlayStrategy(), player_strategy2 = HoyleishPlayerCribbagePlayStrategy(),
+                                dealer_strategy1 = HoyleishDealerCribbagePlayStrategy(), dealer_strategy2 = HoyleishDealerCribbagePlayStrategy(),
+                                deck = CribbageGeneratedDeck(Generator(seed = 7)))
+            info = game.play()
+            winners.append((info.winning_player, info.losing_player_final_score, info.deals_in_game))
+        self.assertEqual(winners[0], winners[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
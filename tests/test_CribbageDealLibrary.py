@@ -0,0 +1,115 @@
+# Standard
+import os
+import unittest
+import tempfile
+
+# Local
+from CribbageSim.CribbageCardCodec import card_to_code
+from CribbageSim.CribbagePlayStrategy import HoyleishPlayerCribbagePlayStrategy, HoyleishDealerCribbagePlayStrategy
+from CribbageSim.CribbageDeal import CribbageDeal
+from CribbageSim.CribbageDealGenerator import CribbageDealGenerator, CribbageGeneratedDeck
+from CribbageSim.CribbageDealLibrary import CribbageDealLibrary, write_deal_library, build_deal_library
+from CribbageSim.exceptions import CribbageRecordError
+
+class Test_CribbageDealLibrary(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls._dir = tempfile.TemporaryDirectory()
+        cls._path = os.path.join(cls._dir.name, 'deals.bin')
+        build_deal_library(cls._path, 50, seed = 2468)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._dir.cleanup()
+
+    def test_library_matches_generator(self):
+
+        gen = CribbageDealGenerator(seed = 2468, block_size = 50)
+        with CribbageDealLibrary(self._path) as library:
+            self.assertEqual(50, len(library))
+            for i in range(50):
+                self.assertListEqual(gen.next_deal(), list(library.get_deal(i)))
+
+    def test_file_size(self):
+
+        self.assertEqual(32 + 50 * 13, os.path.getsize(self._path))
+
+    def test_write_deal_library(self):
+
+        path = os.path.join(self._dir.name, 'two.bin')
+        deals = [list(range(13)), list(range(51, 38, -1))]
+        self.assertEqual(2, write_deal_library(path, deals))
+        with CribbageDealLibrary(path) as library:
+            self.assertEqual(2, len(library))
+            self.assertEqual(bytes(range(13)), library.get_deal(0))
+            self.assertListEqual(deals[1], list(library.get_deal(1)))
+
+    def test_next_deal_and_seek(self):
+
+        with CribbageDealLibrary(self._path) as library:
+            self.assertEqual(0, library.tell())
+            first = library.next_deal()
+            second = library.next_deal()
+            self.assertEqual(2, library.tell())
+            self.assertEqual(library.get_deal(1), second)
+            library.seek(0)
+            self.assertEqual(first, library.next_deal())
+            library.seek(50)
+            self.assertRaises(IndexError, library.next_deal)
+
+    def test_get_deal_out_of_range(self):
+
+        with CribbageDealLibrary(self._path) as library:
+            self.assertRaises(IndexError, library.get_deal, 50)
+            self.assertRaises(IndexError, library.get_deal, -1)
+
+    def test_generated_deck_from_library(self):
+
+        with CribbageDealLibrary(self._path) as library:
+            library.seek(10)
+            deck = CribbageGeneratedDeck(library)
+            codes = [card_to_code(c) for c in deck.draw(13)]
+            self.assertListEqual(list(library.get_deal(10)), codes)
+            self.assertEqual(11, library.tell())
+
+    def test_deal_with_library(self):
+
+        # Each deal is dealt the cards of the next deal of the library, starting from the deal seeked to, and playing the same deals
+        # gives the same results
+        results = []
+        with CribbageDealLibrary(self._path) as library:
+            for start in (0, 0, 3):
+                library.seek(start)
+                deal = CribbageDeal(HoyleishPlayerCribbagePlayStrategy(), HoyleishDealerCribbagePlayStrategy(), headless = True,
+                                    record = True)
+                deal.set_deck(CribbageGeneratedDeck(library))
+                scores = []
+                for j in range(6):
+                    deal.reset_deal()
+                    info = deal.play()
+                    record = deal.get_deal_record()
+                    self.assertListEqual(list(library.get_deal(start + j)), list(record.dealt) + [record.starter])
+                    scores.append((info.player_play_score, info.player_show_score, info.dealer_play_score, info.dealer_show_score,
+                                   info.dealer_crib_score))
+                self.assertEqual(start + 6, library.tell())
+                results.append(scores)
+        self.assertListEqual(results[0], results[1])
+        # Starting from deal 3, the deals played from the start are played again, with the same results
+        self.assertListEqual(results[0][3:], results[2][0:3])
+
+    def test_not_a_library_file(self):
+
+        path = os.path.join(self._dir.name, 'bad.bin')
+        with open(self._path, 'rb') as f:
+            good = f.read()
+        for data in (b'', b'NOTDEALS' + bytes(24), good[:-1]):
+            with open(path, 'wb') as f:
+                f.write(data)
+            self.assertRaises(CribbageRecordError, CribbageDealLibrary, path)
+        # The file was closed, so it can be removed
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
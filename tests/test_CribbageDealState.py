@@ -0,0 +1,56 @@
+# Standard
+import unittest
+
+# Local
+from HandsDecksCards.card import Card
+from CribbageSim.CribbageDealState import CribbageDealState, NO_STARTER
+
+class Test_CribbageDealState(unittest.TestCase):
+
+    def make_state(self):
+        state = CribbageDealState()
+        state.deck = (0, 1, 2)
+        state.player_hand = CribbageDealState.encode([Card('S','5'), Card('H','J')])
+        state.crib = (40, 41)
+        state.starter = 51
+        state.go_round_count = 15
+        state.player_score = 2
+        return state
+
+    def test_encode_decode(self):
+
+        cards = [Card('S','5'), Card('H','J')]
+        codes = CribbageDealState.encode(cards)
+        self.assertEqual((16, 42), codes)
+        self.assertListEqual(['5S', 'JH'], [str(c) for c in CribbageDealState.decode(codes)])
+
+    def test_clone(self):
+
+        state = self.make_state()
+        other = state.clone()
+        self.assertEqual(state, other)
+        # Changing the clone doesn't change the original
+        other.player_hand = other.player_hand[1:]
+        other.go_round_count = 25
+        self.assertNotEqual(state, other)
+        self.assertEqual(2, len(state.player_hand))
+        self.assertEqual(15, state.go_round_count)
+
+    def test_snapshot_restore(self):
+
+        state = self.make_state()
+        snap = state.snapshot()
+        # Snapshots are hashable, e.g., for a table of states already searched
+        seen = {snap: 1}
+        state.starter = NO_STARTER
+        state.dealer_score = 5
+        self.assertNotIn(state.snapshot(), seen)
+        state.restore(snap)
+        self.assertIn(state.snapshot(), seen)
+        self.assertEqual(51, state.starter)
+        self.assertEqual(0, state.dealer_score)
+        self.assertEqual(state, CribbageDealState.from_snapshot(snap))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# Standard
+import unittest
+from random import seed
+
+# Local
+from CribbageSim.CribbageCardCodec import card_to_code
+from CribbageSim.CribbageDeck import CribbagePartialShuffleDeck
+
+class Test_CribbagePartialShuffleDeck(unittest.TestCase):
+
+    def test_draw_all(self):
+
+        deck = CribbagePartialShuffleDeck()
+        drawn = deck.draw(52)
+        self.assertEqual(0, len(deck))
+        self.assertEqual(52, len(set([card_to_code(c) for c in drawn])))
+
+    def test_restock(self):
+
+        deck = CribbagePartialShuffleDeck()
+        drawn = deck.draw(13)
+        self.assertEqual(39, deck.cards_remaining())
+        # Drawn cards are no longer in the deck
+        remaining = str(deck).split(' ')
+        for c in drawn:
+            self.assertNotIn(str(c), remaining)
+        deck.restock()
+        self.assertEqual(52, deck.cards_remaining())
+        self.assertEqual(52, len(str(deck).split(' ')))
+
+    def test_restock_when_empty(self):
+
+        deck = CribbagePartialShuffleDeck()
+        deck.draw(52)
+        card = deck.draw()
+        self.assertEqual(51, len(deck))
+        self.assertIsNotNone(card)
+
+    def test_draw_uniform(self):
+
+        # Each card should be drawn first about 1/52 of the time
+        seed(12345)
+        deck = CribbagePartialShuffleDeck()
+        counts = [0] * 52
+        for i in range(52 * 200):
+            deck.restock()
+            counts[card_to_code(deck.draw())] += 1
+        self.assertGreater(min(counts), 120)
+        self.assertLess(max(counts), 290)
+
+    def test_add_card(self):
+
+        deck = CribbagePartialShuffleDeck()
+        drawn = deck.draw(3)
+        self.assertEqual(49, len(deck))
+        remaining = deck.add_card(drawn[1])
+        self.assertEqual(50, len(remaining))
+        self.assertIn(drawn[1], remaining)
+        self.assertNotIn(drawn[0], remaining)
+        # The cards remaining and the cards still drawn are all 52 cards, once each
+        self.assertEqual(52, len(set([card_to_code(c) for c in remaining + [drawn[0], drawn[2]]])))
+        # A card that is already in the deck can't be added
+        self.assertRaises(ValueError, deck.add_card, drawn[1])
+        self.assertRaises(ValueError, deck.add_card, remaining[0])
+        self.assertEqual(52, len(deck.add_cards([drawn[0], drawn[2]])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,300 @@
+# Standard
+import logging
+import queue
+import unittest
+
+# Local
+from HandsDecksCards.card import Card
+from HandsDecksCards.deck import StackedDeck
+from CribbageSim.CribbageCardCodec import card_to_code
+from CribbageSim.CribbageGameOutputEvents import CribbageGameOutputEvents, StartDealEvent, UpdateStarterEvent, UpdatePileCombinedEvent
+from CribbageSim.CribbageGameOutputEvents import UpdatePlayer1HandEvent, UpdateScorePlayer1Event, EndGameEvent
+from CribbageSim.CribbageEventBus import CribbageEventBus, CribbageQueueEventOutput, get_event_bus
+from CribbageSim.CribbageEventBus import CribbageCoalescingEventOutput, CribbageQueuePolicy
+from CribbageSim.CribbagePlayStrategy import HoyleishPlayerCribbagePlayStrategy, HoyleishDealerCribbagePlayStrategy
+from CribbageSim.CribbageDeal import CribbageDeal, CribbagePlayers
+from CribbageSim.CribbageGame import CribbageGame
+
+class Test_CribbageEventBus(unittest.TestCase):
+
+    def test_subscribe_and_publish(self):
+
+        bus = CribbageEventBus()
+        received = []
+        # No subscribers, so the member for the event type is empty
+        self.assertFalse(bus.start_deal)
+        self.assertFalse(bus.has_subscribers(CribbageGameOutputEvents.START_DEAL))
+        bus.subscribe(CribbageGameOutputEvents.START_DEAL, received.append)
+        self.assertTrue(bus.start_deal)
+        self.assertFalse(bus.update_starter)
+        bus.publish(StartDealEvent('Alice'))
+        self.assertListEqual([StartDealEvent('Alice')], received)
+
+    def test_subscribe_twice(self):
+
+        bus = CribbageEventBus()
+        received = []
+        bus.subscribe(CribbageGameOutputEvents.UPDATE_STARTER, received.append)
+        bus.subscribe(CribbageGameOutputEvents.UPDATE_STARTER, received.append)
+        bus.publish(UpdateStarterEvent(5))
+        self.assertEqual(1, len(received))
+
+    def test_unsubscribe(self):
+
+        bus = CribbageEventBus()
+        received = []
+        bus.subscribe_all(received.append)
+        bus.unsubscribe(CribbageGameOutputEvents.UPDATE_STARTER, received.append)
+        self.assertFalse(bus.update_starter)
+        self.assertTrue(bus.start_deal)
+        bus.unsubscribe_all(received.append)
+        self.assertFalse(bus.start_deal)
+        # Unsubscribing what isn't subscribed does nothing
+        bus.unsubscribe(CribbageGameOutputEvents.START_DEAL, received.append)
+
+    def test_queue_output(self):
+
+        q = queue.Queue()
+        output = CribbageQueueEventOutput(q)
+        output(UpdatePileCombinedEvent((card_to_code(Card('H','K')), card_to_code(Card('D','A'))), 11))
+        record = q.get_nowait()
+        self.assertIsInstance(record, logging.LogRecord)
+        self.assertEqual('cribbage_logger', record.name)
+        self.assertEqual(logging.INFO, record.levelno)
+        self.assertEqual(CribbageGameOutputEvents.UPDATE_PILE_COMBINED, record.event_type)
+        self.assertEqual('KH AD', record.pile_combined)
+        self.assertEqual(11, record.go_round_count)
+        # Outputs to the same queue are the same subscriber
+        self.assertEqual(output, CribbageQueueEventOutput(q))
+        self.assertNotEqual(output, CribbageQueueEventOutput(queue.Queue()))
+
+    def test_deal_publishes(self):
+
+        card_list = [Card('D','J'), Card('S','10'), Card('H','8'), Card('C','7'), Card('H','5'), Card('C','3'),
+                     Card('S','K'), Card('D','9'), Card('C','9'), Card('D','8'), Card('S','7'), Card('H','A'),
+                     Card('S','6')]
+        sd = StackedDeck()
+        sd.add_cards(card_list)
+
+        bus = CribbageEventBus()
+        received = []
+        bus.subscribe_all(received.append)
+        deal = CribbageDeal(HoyleishPlayerCribbagePlayStrategy(), HoyleishDealerCribbagePlayStrategy(),
+                            player_participant = CribbagePlayers.PLAYER_2, dealer_participant = CribbagePlayers.PLAYER_1, event_bus = bus)
+        deal._deck = sd
+        deal.play()
+
+        types = [e.event_type for e in received]
+        # Dealer is player1, so the dealt hand of player2, the player, comes first, then player1's
+        self.assertEqual(CribbageGameOutputEvents.UPDATE_PLAYER2_HAND, types[0])
+        self.assertEqual(tuple([card_to_code(c) for c in card_list[0:6]]), received[0].hand_player2)
+        self.assertEqual(CribbageGameOutputEvents.UPDATE_PLAYER1_HAND, types[1])
+        starters = [e for e in received if e.event_type == CribbageGameOutputEvents.UPDATE_STARTER]
+        self.assertListEqual([UpdateStarterEvent(card_to_code(card_list[12]))], starters)
+        self.assertEqual(8, types.count(CribbageGameOutputEvents.UPDATE_PILE_COMBINED))
+        self.assertEqual(CribbageGameOutputEvents.UPDATE_CRIB, types[-1])
+        self.assertEqual(4, len(received[-1].crib))
+
+    def test_game_publishes(self):
+
+        from random import seed
+        seed(1234567891)
+        bus = CribbageEventBus()
+        received = []
+        bus.subscribe_all(received.append)
+        game = CribbageGame(player_strategy1 = HoyleishPlayerCribbagePlayStrategy(), player_strategy2 = HoyleishPlayerCribbagePlayStrategy(),
+                            dealer_strategy1 = HoyleishDealerCribbagePlayStrategy(), dealer_strategy2 = HoyleishDealerCribbagePlayStrategy(),
+                            event_bus = bus)
+        info = game.play()
+
+        types = [e.event_type for e in received]
+        self.assertEqual(CribbageGameOutputEvents.START_GAME, types[0])
+        self.assertEqual(CribbageGameOutputEvents.START_DEAL, types[1])
+        self.assertEqual(info.deals_in_game, types.count(CribbageGameOutputEvents.START_DEAL))
+        # The last score event for each player has their score before the winning points, and the game ends with END_GAME
+        self.assertEqual(CribbageGameOutputEvents.END_GAME, types[-1])
+        scores = [e.score_player1[0] for e in received if e.event_type == CribbageGameOutputEvents.UPDATE_SCORE_PLAYER1]
+        self.assertEqual(info.losing_player_final_score, scores[-1])
+
+    def test_headless_game_publishes_nothing(self):
+
+        from random import seed
+        seed(1234567891)
+        bus = CribbageEventBus()
+        received = []
+        bus.subscribe_all(received.append)
+        game = CribbageGame(player_strategy1 = HoyleishPlayerCribbagePlayStrategy(), player_strategy2 = HoyleishPlayerCribbagePlayStrategy(),
+                            event_bus = bus, headless = True)
+        game.play()
+        self.assertListEqual([], received)
+
+    def test_default_bus(self):
+
+        self.assertIs(get_event_bus(), get_event_bus())
+
+
+
+class _FakeClock(object):
+    """
+    A clock whose time is set by the test.
+    """
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _drain(q):
+    records = []
+    while not q.empty():
+        records.append(q.get_nowait())
+    return records
+
+
+class Test_CribbageCoalescingEventOutput(unittest.TestCase):
+
+    def test_coalesce_within_frame(self):
+
+        clock = _FakeClock()
+        q = queue.Queue(maxsize = 100)
+        output = CribbageCoalescingEventOutput(q, frame_interval = 0.1, clock = clock)
+        for i in range(5):
+            output(UpdatePileCombinedEvent(tuple(range(i + 1)), i))
+            output(UpdatePlayer1HandEvent(tuple(range(i, 6))))
+        # Still within the frame, so everything is held back
+        self.assertTrue(q.empty())
+        self.assertEqual(8, output.get_coalesced())
+        clock.now = 0.2
+        output(UpdatePileCombinedEvent((0, 1, 2, 3, 4, 5), 6))
+        records = _drain(q)
+        self.assertEqual(2, len(records))
+        self.assertEqual(CribbageGameOutputEvents.UPDATE_PILE_COMBINED, records[0].event_type)
+        self.assertEqual(6, records[0].go_round_count)
+        self.assertEqual(CribbageGameOutputEvents.UPDATE_PLAYER1_HAND, records[1].event_type)
+
+    def test_always_delivered(self):
+
+        clock = _FakeClock()
+        q = queue.Queue(maxsize = 100)
+        output = CribbageCoalescingEventOutput(q, frame_interval = 0.1, clock = clock)
+        output(UpdatePlayer1HandEvent((1, 2)))
+        output(UpdateScorePlayer1Event((2, 0), ('pair',)))
+        output(UpdateScorePlayer1Event((4, 2), ('pair',)))
+        output(EndGameEvent())
+        # Held back update first, then every score, then the end of the game
+        types = [r.event_type for r in _drain(q)]
+        self.assertListEqual([CribbageGameOutputEvents.UPDATE_PLAYER1_HAND, CribbageGameOutputEvents.UPDATE_SCORE_PLAYER1,
+                              CribbageGameOutputEvents.UPDATE_SCORE_PLAYER1, CribbageGameOutputEvents.END_GAME], types)
+
+    def test_flush(self):
+
+        q = queue.Queue(maxsize = 100)
+        output = CribbageCoalescingEventOutput(q, frame_interval = 10.0, clock = _FakeClock())
+        output(UpdateStarterEvent(3))
+        self.assertTrue(q.empty())
+        output.flush()
+        self.assertEqual(1, q.qsize())
+
+    def test_drop_oldest(self):
+
+        q = queue.Queue(maxsize = 3)
+        output = CribbageCoalescingEventOutput(q, frame_interval = 0, policy = CribbageQueuePolicy.DROP_OLDEST)
+        for i in range(5):
+            output(UpdateStarterEvent(i))
+        self.assertEqual(2, output.get_dropped())
+        self.assertListEqual(['AH', 'AD', '2S'], [r.starter for r in _drain(q)])
+
+    def test_drop_oldest_keeps_scores(self):
+
+        # Only updates and logger messages are discarded to make room
+        q = queue.Queue(maxsize = 3)
+        output = CribbageCoalescingEventOutput(q, frame_interval = 0, policy = CribbageQueuePolicy.DROP_OLDEST)
+        output(UpdateScorePlayer1Event((2, 0), ('pair',)))
+        output.put_nowait(logging.makeLogRecord({'msg': 'message'}))
+        output(UpdateScorePlayer1Event((4, 2), ('pair',)))
+        for i in range(5):
+            output(UpdateStarterEvent(i))
+        self.assertEqual(5, output.get_dropped())
+        records = _drain(q)
+        self.assertListEqual([CribbageGameOutputEvents.UPDATE_SCORE_PLAYER1, CribbageGameOutputEvents.UPDATE_SCORE_PLAYER1,
+                              CribbageGameOutputEvents.UPDATE_STARTER], [r.event_type for r in records])
+        self.assertEqual('2S', records[2].starter)
+
+    def test_drop_oldest_waits_for_scores(self):
+
+        import threading
+        q = queue.Queue(maxsize = 2)
+        output = CribbageCoalescingEventOutput(q, frame_interval = 0, policy = CribbageQueuePolicy.DROP_OLDEST)
+        output(UpdateScorePlayer1Event((2, 0), ('pair',)))
+        output(UpdateScorePlayer1Event((4, 2), ('pair',)))
+        # An update is discarded when the queue is full of scores ...
+        output(UpdateStarterEvent(0))
+        self.assertEqual(1, output.get_dropped())
+        # ... but the engine waits to put the end of the game on the queue
+        t = threading.Thread(target = output, args = (EndGameEvent(),))
+        t.start()
+        t.join(0.05)
+        self.assertTrue(t.is_alive())
+        self.assertEqual(CribbageGameOutputEvents.UPDATE_SCORE_PLAYER1, q.get().event_type)
+        t.join(1.0)
+        self.assertFalse(t.is_alive())
+        self.assertListEqual([CribbageGameOutputEvents.UPDATE_SCORE_PLAYER1, CribbageGameOutputEvents.END_GAME],
+                             [r.event_type for r in _drain(q)])
+
+    def test_drop_oldest_game(self):
+
+        # Play a game through a small queue, with a slow consumer, and count the score events published and received
+        import threading
+        import time
+        bus = CribbageEventBus()
+        published = []
+        bus.subscribe(CribbageGameOutputEvents.UPDATE_SCORE_PLAYER1, published.append)
+        bus.subscribe(CribbageGameOutputEvents.UPDATE_SCORE_PLAYER2, published.append)
+        q = queue.Queue(maxsize = 50)
+        output = CribbageCoalescingEventOutput(q, frame_interval = 0.05, policy = CribbageQueuePolicy.DROP_OLDEST)
+        bus.subscribe_all(output)
+        received = []
+        def consume():
+            while True:
+                record = q.get()
+                if record is None: break
+                received.append(record)
+                time.sleep(0.0002)
+        consumer = threading.Thread(target = consume)
+        consumer.start()
+        game = CribbageGame(player_strategy1 = HoyleishPlayerCribbagePlayStrategy(), player_strategy2 = HoyleishPlayerCribbagePlayStrategy(),
+                            dealer_strategy1 = HoyleishDealerCribbagePlayStrategy(), dealer_strategy2 = HoyleishDealerCribbagePlayStrategy(),
+                            event_bus = bus)
+        game.play()
+        output.flush()
+        q.put(None)
+        consumer.join(10.0)
+        scores = [r for r in received if r.event_type in (CribbageGameOutputEvents.UPDATE_SCORE_PLAYER1,
+                                                          CribbageGameOutputEvents.UPDATE_SCORE_PLAYER2)]
+        self.assertGreater(len(published), 10)
+        self.assertEqual(len(published), len(scores))
+        self.assertEqual(CribbageGameOutputEvents.END_GAME, received[-1].event_type)
+
+    def test_block(self):
+
+        import threading
+        q = queue.Queue(maxsize = 1)
+        output = CribbageCoalescingEventOutput(q, frame_interval = 0, policy = CribbageQueuePolicy.BLOCK)
+        output(UpdateStarterEvent(0))
+        t = threading.Thread(target = output, args = (UpdateStarterEvent(1),))
+        t.start()
+        # The engine is blocked until the consumer takes a record
+        t.join(0.05)
+        self.assertTrue(t.is_alive())
+        # flush() doesn't wait on the blocked engine
+        output.flush()
+        self.assertEqual('AS', q.get().starter)
+        t.join(1.0)
+        self.assertFalse(t.is_alive())
+        self.assertEqual('AC', q.get_nowait().starter)
+        self.assertEqual(0, output.get_dropped())
+
+
+if __name__ == '__main__':
+    unittest.main()
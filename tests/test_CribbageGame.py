@@ -1,6 +1,7 @@
 # Standard
 import unittest
 import io
+import logging
 from unittest.mock import patch
 
 # Local
@@ -788,5 +789,26 @@ class Test_CribbageGame(unittest.TestCase):
         self.assertEqual(exp_val, act_val)
 
 
+    def test_play_headless(self):
+
+        # A headless game plays exactly as a logged game does, but logs nothing, even at DEBUG level
+        from random import seed
+        seed(1234567891)
+        game = CribbageGame(player_strategy1 = HoyleishPlayerCribbagePlayStrategy(), player_strategy2 = HoyleishPlayerCribbagePlayStrategy(),
+                            dealer_strategy1 = HoyleishDealerCribbagePlayStrategy(), dealer_strategy2 = HoyleishDealerCribbagePlayStrategy(),
+                            headless = True)
+        with self.assertNoLogs('cribbage_logger', level = logging.DEBUG):
+            return_val = game.play()
+
+        self.assertEqual(game._player2, return_val.winning_player)
+        self.assertEqual(99, return_val.losing_player_final_score)
+        self.assertEqual(8, return_val.deals_in_game)
+        self.assertEqual(25, return_val.player1_total_play_score)
+        self.assertEqual(91, return_val.player2_total_show_score)
+
+        # Nothing is kept for the play record either
+        self.assertEqual('', game._deal._recorded_play)
+
+
 if __name__ == '__main__':
     unittest.main()
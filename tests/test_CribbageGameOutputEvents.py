@@ -0,0 +1,79 @@
+# Standard
+import unittest
+
+# Local
+from HandsDecksCards.card import Card
+from CribbageSim.CribbageCardCodec import card_to_code
+from CribbageSim.CribbageGameOutputEvents import CribbageGameOutputEvents, CribbageGameLogInfo, EVENT_CLASSES
+from CribbageSim.CribbageGameOutputEvents import UpdatePlayer1HandEvent, UpdateStarterEvent, UpdateScorePlayer2Event, EndGameEvent
+
+class Test_CribbageGameLogInfo(unittest.TestCase):
+
+    def test_kwargs(self):
+
+        info = CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_STARTER, starter='KH', not_an_attribute=1)
+        self.assertEqual(CribbageGameOutputEvents.UPDATE_STARTER, info.event_type)
+        self.assertEqual('KH', info['starter'])
+        # Attributes not set by kwargs have their defaults, and kwargs that are not attributes are ignored
+        self.assertEqual(0, info['go_round_count'])
+        self.assertFalse(hasattr(info, 'not_an_attribute'))
+
+    def test_getitem_missing_key(self):
+
+        info = CribbageGameLogInfo()
+        self.assertRaises(KeyError, info.__getitem__, 'not_an_attribute')
+
+    def test_iter(self):
+
+        # As used by logging, when info is passed as extra
+        info = CribbageGameLogInfo(event_type=CribbageGameOutputEvents.UPDATE_CRIB, crib='KH AD 2S JC')
+        d = {k: info[k] for k in info}
+        self.assertEqual(15, len(d))
+        self.assertEqual('KH AD 2S JC', d['crib'])
+
+    def test_defaults_not_shared(self):
+
+        info1 = CribbageGameLogInfo()
+        info2 = CribbageGameLogInfo()
+        info1.hand_player2.append('KH')
+        self.assertListEqual([], info2.hand_player2)
+
+
+
+class Test_CribbageGameEvent(unittest.TestCase):
+
+    def test_event_classes(self):
+
+        # There is an event class for every event type but NO_EVENT
+        self.assertEqual(len(CribbageGameOutputEvents) - 1, len(EVENT_CLASSES))
+        for (event_type, cls) in EVENT_CLASSES.items():
+            self.assertEqual(event_type, cls.event_type)
+            # Events are slotted
+            self.assertFalse(hasattr(cls(), '__dict__'))
+
+    def test_to_log_info(self):
+
+        codes = tuple([card_to_code(c) for c in [Card('H','K'), Card('D','A'), Card('S','10')]])
+        info = UpdatePlayer1HandEvent(codes).to_log_info()
+        self.assertIsInstance(info, CribbageGameLogInfo)
+        self.assertEqual(CribbageGameOutputEvents.UPDATE_PLAYER1_HAND, info.event_type)
+        self.assertEqual('KH AD 10S', info.hand_player1)
+
+        info = UpdateStarterEvent(card_to_code(Card('C','5'))).to_log_info()
+        self.assertEqual('5C', info.starter)
+
+        info = UpdateScorePlayer2Event((12, 10), ()).to_log_info()
+        self.assertTupleEqual((12, 10), info.score_player2)
+
+        info = EndGameEvent().to_log_info()
+        self.assertEqual(CribbageGameOutputEvents.END_GAME, info.event_type)
+
+    def test_eq(self):
+
+        self.assertEqual(UpdateStarterEvent(3), UpdateStarterEvent(3))
+        self.assertNotEqual(UpdateStarterEvent(3), UpdateStarterEvent(4))
+        self.assertNotEqual(UpdateStarterEvent(3), UpdatePlayer1HandEvent((3,)))
+
+
+if __name__ == '__main__':
+    unittest.main()
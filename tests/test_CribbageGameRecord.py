@@ -0,0 +1,173 @@
+# Standard
+import os
+import tempfile
+import unittest
+from random import seed
+
+# Local
+from HandsDecksCards.card import Card
+from HandsDecksCards.deck import StackedDeck
+from CribbageSim.CribbageCardCodec import card_to_code
+from CribbageSim.CribbageGameRecord import CribbageDealRecord, CribbageGameRecord, CribbageRecordWriter, CribbageRecordReader
+from CribbageSim.CribbageGameRecord import ROLE_PLAYER, ROLE_DEALER, ACTION_PLAY, ACTION_GO, ACTION_PEG
+from CribbageSim.CribbageDeal import CribbageDeal, CribbagePlayers
+from CribbageSim.CribbageGame import CribbageGame
+from CribbageSim.CribbagePlayStrategy import HoyleishPlayerCribbagePlayStrategy, HoyleishDealerCribbagePlayStrategy
+from CribbageSim.exceptions import CribbageRecordError
+
+
+def _make_deal_record():
+    record = CribbageDealRecord(CribbagePlayers.PLAYER_1.value)
+    record.dealt = tuple(range(12))
+    record.starter = 51
+    record.player_crib = (0, 1)
+    record.dealer_crib = (6, 7)
+    record.add_play(ROLE_PLAYER, 2)
+    record.add_play(ROLE_DEALER, 8)
+    record.add_peg(ROLE_DEALER, 2)
+    record.add_go(ROLE_PLAYER)
+    record.add_peg(ROLE_DEALER, 1)
+    return record
+
+
+def _play_recorded_game(game_seed = 1234567890, record_writer = None):
+    seed(game_seed)
+    game = CribbageGame(player_strategy1 = HoyleishPlayerCribbagePlayStrategy(), player_strategy2 = HoyleishPlayerCribbagePlayStrategy(),
+                        dealer_strategy1 = HoyleishDealerCribbagePlayStrategy(), dealer_strategy2 = HoyleishDealerCribbagePlayStrategy(),
+                        headless = True, record = True, record_writer = record_writer)
+    info = game.play()
+    return (game, info)
+
+
+class Test_CribbageGameRecord(unittest.TestCase):
+
+    def test_deal_record_actions(self):
+
+        record = _make_deal_record()
+        self.assertListEqual([(ACTION_PLAY, ROLE_PLAYER, 2), (ACTION_PLAY, ROLE_DEALER, 8), (ACTION_PEG, ROLE_DEALER, 2),
+                              (ACTION_GO, ROLE_PLAYER, 0), (ACTION_PEG, ROLE_DEALER, 1)], record.get_actions())
+        self.assertTupleEqual((0, 3), record.get_scores())
+        # Each play and go is one byte, and each peg two
+        self.assertEqual(7, len(record.actions))
+
+    def test_deal_record_bytes(self):
+
+        record = _make_deal_record()
+        data = record.to_bytes()
+        self.assertEqual(19 + 7, len(data))
+        (decoded, offset) = CribbageDealRecord.from_bytes(b'xx' + data, 2)
+        self.assertEqual(record, decoded)
+        self.assertEqual(len(data) + 2, offset)
+
+    def test_game_record_bytes(self):
+
+        record = CribbageGameRecord()
+        record.winner = CribbagePlayers.PLAYER_2.value
+        record.player1_score = 97
+        record.player2_score = 121
+        record.deals = [_make_deal_record(), _make_deal_record()]
+        (decoded, offset) = CribbageGameRecord.from_bytes(record.to_bytes())
+        self.assertEqual(record, decoded)
+
+    def test_deal_records(self):
+
+        # Player will be dealt cards 1 - 6, dealer cards 7 - 12, and the starter is card 13
+        card_list = [Card('D','J'), Card('S','10'), Card('H','8'), Card('C','7'), Card('H','5'), Card('C','3'),
+                     Card('S','K'), Card('D','9'), Card('C','9'), Card('D','8'), Card('S','7'), Card('H','A'),
+                     Card('S','6')]
+        sd = StackedDeck()
+        sd.add_cards(card_list)
+        deal = CribbageDeal(HoyleishPlayerCribbagePlayStrategy(), HoyleishDealerCribbagePlayStrategy(), player_participant = CribbagePlayers.PLAYER_2,
+                            dealer_participant = CribbagePlayers.PLAYER_1, headless = True, record = True)
+        deal._deck = sd
+        deal.play()
+
+        record = deal.get_deal_record()
+        self.assertEqual(CribbagePlayers.PLAYER_1.value, record.dealer)
+        self.assertTupleEqual(tuple([card_to_code(c) for c in card_list[0:12]]), record.dealt)
+        self.assertEqual(card_to_code(card_list[12]), record.starter)
+        self.assertEqual(2, len(record.player_crib))
+        self.assertEqual(2, len(record.dealer_crib))
+        plays = [a for a in record.get_actions() if a[0] == ACTION_PLAY]
+        self.assertEqual(8, len(plays))
+        # The player leads
+        self.assertEqual(ROLE_PLAYER, plays[0][1])
+        self.assertTupleEqual((deal._player_score, deal._dealer_score), record.get_scores())
+
+    def test_not_recording(self):
+
+        deal = CribbageDeal(HoyleishPlayerCribbagePlayStrategy(), HoyleishDealerCribbagePlayStrategy(), headless = True)
+        deal.play()
+        self.assertIsNone(deal.get_deal_record())
+
+    def test_game_record(self):
+
+        (game, info) = _play_recorded_game()
+        record = game.get_game_record()
+        self.assertEqual(info.deals_in_game, len(record.deals))
+        self.assertEqual(CribbagePlayers.PLAYER_1.value, record.winner)
+        self.assertEqual(info.winning_player_final_score, record.player1_score)
+        self.assertEqual(info.losing_player_final_score, record.player2_score)
+        # Player1 deals first, and the deal alternates
+        self.assertListEqual([1, 2, 1, 2], [d.dealer for d in record.deals[0:4]])
+        # The loser's points pegged during the deals add up to their final score
+        player2_points = 0
+        for d in record.deals:
+            (player_points, dealer_points) = d.get_scores()
+            player2_points += dealer_points if d.dealer == CribbagePlayers.PLAYER_2.value else player_points
+        self.assertEqual(record.player2_score, player2_points)
+
+    def test_write_and_read(self):
+
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, 'games.crec')
+            records = []
+            with CribbageRecordWriter(path, records_per_chunk = 2) as writer:
+                for game_seed in range(1234567890, 1234567895):
+                    (game, info) = _play_recorded_game(game_seed, writer)
+                    records.append(game.get_game_record())
+            # Appending to an existing file
+            with CribbageRecordWriter(path) as writer:
+                writer.write(records[0])
+            records.append(records[0])
+
+            with CribbageRecordReader(path) as reader:
+                self.assertListEqual([2, 2, 1, 1], [n for (offset, n) in reader.chunk_offsets()])
+                self.assertListEqual(records, list(reader))
+
+    def test_damaged_chunk(self):
+
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, 'games.crec')
+            record = CribbageGameRecord()
+            record.deals = [_make_deal_record()]
+            with CribbageRecordWriter(path, compress_level = 0) as writer:
+                writer.write(record)
+            # Flip a bit of the stored record
+            with open(path, 'r+b') as f:
+                f.seek(-10, os.SEEK_END)
+                byte = f.read(1)
+                f.seek(-10, os.SEEK_END)
+                f.write(bytes([byte[0] ^ 0x01]))
+            with CribbageRecordReader(path) as reader:
+                with self.assertRaises(CribbageRecordError):
+                    list(reader)
+
+    def test_not_a_record_file(self):
+
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, 'games.crec')
+            for data in (b'CRIB', b'not a cribbage record file'):
+                with open(path, 'wb') as f:
+                    f.write(data)
+                self.assertRaises(CribbageRecordError, CribbageRecordReader, path)
+                # Nor is anything appended to it
+                self.assertRaises(CribbageRecordError, CribbageRecordWriter, path)
+                with open(path, 'rb') as f:
+                    self.assertEqual(data, f.read())
+            # The file was closed, so it can be removed
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
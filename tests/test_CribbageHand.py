@@ -0,0 +1,45 @@
+# Standard
+import unittest
+
+# Local
+from HandsDecksCards.card import Card
+from CribbageSim.CribbageHand import CribbageHand, CribbageCardsView
+
+class Test_CribbageHand(unittest.TestCase):
+
+    def test_clear(self):
+
+        h = CribbageHand()
+        cards = h._cards
+        h.add_cards([Card('S','5'), Card('H','J')])
+        h.clear()
+        self.assertEqual(0, len(h))
+        # The same list is reused
+        self.assertIs(cards, h._cards)
+        h.add_cards([Card('D','K')])
+        self.assertEqual('KD', str(h))
+
+    def test_view(self):
+
+        h = CribbageHand()
+        c1 = Card('S','5')
+        c2 = Card('H','J')
+        h.add_cards([c1, c2])
+        v = h.view()
+        self.assertIsInstance(v, CribbageCardsView)
+        self.assertEqual(2, len(v))
+        self.assertIs(c2, v[1])
+        self.assertEqual(1, v.index(c2))
+        self.assertIn(c1, v)
+        self.assertEqual('5S JH', str(v))
+        # The view shows the current cards of the hand
+        h.remove_card(0)
+        self.assertListEqual([c2], list(v))
+        # And can't change them
+        self.assertFalse(hasattr(v, 'append'))
+        with self.assertRaises(TypeError):
+            v[0] = c1
+
+
+if __name__ == '__main__':
+    unittest.main()
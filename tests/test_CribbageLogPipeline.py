@@ -0,0 +1,90 @@
+# Standard
+import io
+import os
+import logging
+import queue
+import tempfile
+import unittest
+
+# Local
+from CribbageSim.CribbageLogPipeline import CribbageLogListener, CribbageRecordQueueHandler
+from CribbageSim.CribbageLogPipeline import CribbageBatchedStreamHandler, CribbageBatchedRotatingFileHandler
+
+
+class _CountingStream(io.StringIO):
+    """
+    A StringIO that counts calls to write(...).
+    """
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+
+def _make_record(msg = ''):
+    return logging.makeLogRecord({'name': 'cribbage_logger', 'levelno': logging.INFO, 'levelname': 'INFO', 'msg': msg})
+
+
+class Test_CribbageLogPipeline(unittest.TestCase):
+
+    def test_batched_stream_handler(self):
+
+        stream = _CountingStream()
+        handler = CribbageBatchedStreamHandler(stream)
+        handler.handle(_make_record('one'))
+        handler.handle(_make_record('two'))
+        # Nothing is written until flushed
+        self.assertEqual('', stream.getvalue())
+        handler.flush()
+        self.assertEqual('one\ntwo\n', stream.getvalue())
+        self.assertEqual(1, stream.writes)
+
+    def test_batched_rotating_file_handler(self):
+
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, 'cribbage.log')
+            handler = CribbageBatchedRotatingFileHandler(path, maxBytes = 40, backupCount = 2)
+            for i in range(10):
+                # Each message is 10 characters with its terminator
+                handler.handle(_make_record(f"message {i}"))
+            handler.close()
+            with open(path) as f:
+                self.assertEqual('message 9\n', f.read())
+            with open(path + '.1') as f:
+                self.assertEqual('message 6\nmessage 7\nmessage 8\n', f.read())
+            self.assertTrue(os.path.exists(path + '.2'))
+            self.assertFalse(os.path.exists(path + '.3'))
+
+    def test_record_queue_handler(self):
+
+        q = queue.SimpleQueue()
+        handler = CribbageRecordQueueHandler(q)
+        record = _make_record('Score %d')
+        record.args = (5,)
+        handler.handle(record)
+        # The record isn't formatted, it's the same record
+        self.assertIs(record, q.get_nowait())
+
+    def test_listener(self):
+
+        stream = _CountingStream()
+        q = queue.SimpleQueue()
+        for i in range(100):
+            q.put(_make_record(f"message {i}"))
+        listener = CribbageLogListener(q, CribbageBatchedStreamHandler(stream), batch_size = 30)
+        listener.start()
+        listener.stop()
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(100, len(lines))
+        self.assertEqual('message 0', lines[0])
+        self.assertEqual('message 99', lines[-1])
+        # Written in batches of at most 30
+        self.assertGreaterEqual(stream.writes, 4)
+        self.assertLess(stream.writes, 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+# Standard
+import unittest
+import random
+
+# Local
+from HandsDecksCards.card import Card
+from HandsDecksCards.hand import Hand
+from CribbageSim.CribbageCombination import FifteenCombinationPlaying, PairCombinationPlaying, RunCombinationPlaying
+from CribbageSim.CribbagePeggingState import CribbagePeggingState
+
+class Test_CribbagePeggingState(unittest.TestCase):
+
+    def test_add_card(self):
+
+        state = CribbagePeggingState()
+
+        exp_val = 0
+        act_val = state.add_card(Card('S','7'))
+        self.assertEqual(exp_val, act_val)
+
+        # Fifteen and pair
+        exp_val = (2, 0, 0)
+        state.add_card(Card('H','8'))
+        act_val = state.get_last_points()
+        self.assertTupleEqual(exp_val, act_val)
+
+        # Run of 3
+        exp_val = (0, 0, 3)
+        state.add_card(Card('D','6'))
+        act_val = state.get_last_points()
+        self.assertTupleEqual(exp_val, act_val)
+
+        # Pair
+        exp_val = 2
+        act_val = state.add_card(Card('C','6'))
+        self.assertEqual(exp_val, act_val)
+
+        self.assertEqual(27, state.get_count())
+        self.assertEqual(4, state.get_num_cards())
+
+    def test_pair_royal(self):
+
+        state = CribbagePeggingState()
+        state.add_card(Card('S','4'))
+        state.add_card(Card('H','4'))
+
+        exp_val = 6
+        act_val = state.add_card(Card('D','4'))
+        self.assertEqual(exp_val, act_val)
+
+        exp_val = 12
+        act_val = state.add_card(Card('C','4'))
+        self.assertEqual(exp_val, act_val)
+
+    def test_points_for_does_not_change_state(self):
+
+        pile = Hand()
+        pile.add_cards([Card('S','3'), Card('H','5')])
+        state = CribbagePeggingState(pile)
+
+        # Run of 3
+        exp_val = (0, 0, 3)
+        act_val = state.points_for(Card('D','4'))
+        self.assertTupleEqual(exp_val, act_val)
+
+        self.assertEqual(8, state.get_count())
+        self.assertEqual(2, state.get_num_cards())
+        self.assertTrue(state.matches(pile))
+
+    def test_sync(self):
+
+        pile = Hand()
+        pile.add_cards([Card('S','K'), Card('H','5')])
+        state = CribbagePeggingState()
+
+        # Rebuild from a pile not played through state
+        state.sync(pile)
+        self.assertEqual(15, state.get_count())
+        self.assertEqual(2, state.get_last_score())
+
+        # Add the one new card
+        pile.add_cards(Card('D','5'))
+        state.sync(pile)
+        self.assertEqual(20, state.get_count())
+        self.assertEqual(2, state.get_last_score())
+        self.assertTrue(state.matches(pile))
+
+    def test_matches_combinations(self):
+
+        combos = [FifteenCombinationPlaying(), PairCombinationPlaying(), RunCombinationPlaying()]
+
+        rng = random.Random(1234567894)
+        for i in range(500):
+            # Draw from a small set of ranks, so that pairs and runs are common
+            state = CribbagePeggingState()
+            pile = Hand()
+            for j in range(rng.randint(1, 8)):
+                card = Card(rng.choice(['S','C','H','D']), rng.choice(['A','2','3','4','5','6','7']))
+                next_pile = pile.get_cards() + [card]
+                exp_val = [combo.score(next_pile).score for combo in combos]
+                self.assertEqual(sum(exp_val), state.score_for(card))
+                pile.add_cards(card)
+                state.add_card(card)
+                self.assertTupleEqual(tuple(exp_val), state.get_last_points())
+                self.assertEqual(pile.count_hand(), state.get_count())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+# Standard
+import os
+import tempfile
+import unittest
+from random import seed
+
+# Local
+from CribbageSim.CribbageGame import CribbageGame
+from CribbageSim.CribbagePlayStrategy import HoyleishPlayerCribbagePlayStrategy, HoyleishDealerCribbagePlayStrategy
+from CribbageSim.CribbageGameRecord import CribbageGameRecord, CribbageRecordWriter, CribbageRecordReader
+from CribbageSim.CribbageGameOutputEvents import CribbageGameOutputEvents
+from CribbageSim.CribbageEventBus import CribbageEventBus
+from CribbageSim.CribbageReplay import CribbageReplayer, CribbageRecordIndex
+from CribbageSim.exceptions import CribbageRecordError
+
+
+def _play_recorded_game(game_seed = 1234567890, record_writer = None):
+    seed(game_seed)
+    game = CribbageGame(player_strategy1 = HoyleishPlayerCribbagePlayStrategy(), player_strategy2 = HoyleishPlayerCribbagePlayStrategy(),
+                        dealer_strategy1 = HoyleishDealerCribbagePlayStrategy(), dealer_strategy2 = HoyleishDealerCribbagePlayStrategy(),
+                        headless = True, record = True, record_writer = record_writer)
+    info = game.play()
+    return (info, game.get_game_record())
+
+
+class Test_CribbageReplay(unittest.TestCase):
+
+    def test_replay_game(self):
+
+        (info, record) = _play_recorded_game()
+        (replayed_info, replayed) = CribbageReplayer().replay_game(record)
+        self.assertEqual(record, replayed)
+        self.assertEqual(info.deals_in_game, replayed_info.deals_in_game)
+        self.assertEqual(info.winning_player_final_score, replayed_info.winning_player_final_score)
+        self.assertEqual(info.losing_player_final_score, replayed_info.losing_player_final_score)
+        self.assertEqual(info.player1_total_crib_score, replayed_info.player1_total_crib_score)
+        self.assertEqual(info.player2_total_play_score, replayed_info.player2_total_play_score)
+
+    def test_verify_game(self):
+
+        replayer = CribbageReplayer()
+        for game_seed in range(1234567890, 1234567895):
+            (info, record) = _play_recorded_game(game_seed)
+            self.assertTrue(replayer.verify_game(record))
+
+    def test_verify_game_wrong_score(self):
+
+        (info, record) = _play_recorded_game()
+        # Change the points of the first peg of the first deal, as if it had been scored wrongly
+        actions = record.deals[0].actions
+        for i in range(len(actions)):
+            if actions[i] & 0x7F == 0x41:
+                actions[i + 1] += 1
+                break
+        self.assertFalse(CribbageReplayer().verify_game(record))
+
+    def test_verify_game_truncated(self):
+
+        (info, record) = _play_recorded_game()
+        # Remove the last deal, so the replay runs out of recorded deals
+        record.deals.pop()
+        self.assertFalse(CribbageReplayer().verify_game(record))
+
+    def test_verify_game_wrong_play(self):
+
+        (info, record) = _play_recorded_game()
+        # Change the first card the player played in the first deal to the starter, which can't have been in the hand
+        deal = record.deals[0]
+        actions = deal.actions
+        i = 0
+        while actions[i] >= 0x40:
+            # Skip a peg and its points, or a card played by the dealer or a go
+            i += 2 if actions[i] & 0x7F == 0x41 else 1
+        actions[i] = deal.starter
+        self.assertFalse(CribbageReplayer().verify_game(record))
+
+    def test_replay_deal(self):
+
+        (info, record) = _play_recorded_game()
+        deal = record.deals[1]
+        (deal_info, replayed) = CribbageReplayer().replay_deal(deal)
+        self.assertEqual(deal, replayed)
+        (player_points, dealer_points) = deal.get_scores()
+        self.assertEqual(player_points, deal_info.player_play_score + deal_info.player_show_score)
+        self.assertEqual(dealer_points, deal_info.dealer_play_score + deal_info.dealer_his_heals_score + deal_info.dealer_show_score +
+                         deal_info.dealer_crib_score)
+
+    def test_replay_publishes(self):
+
+        (info, record) = _play_recorded_game()
+        bus = CribbageEventBus()
+        received = []
+        bus.subscribe(CribbageGameOutputEvents.START_DEAL, received.append)
+        CribbageReplayer(headless = False, event_bus = bus).replay_game(record)
+        self.assertEqual(len(record.deals), len(received))
+
+    def test_index(self):
+
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, 'games.crec')
+            records = []
+            with CribbageRecordWriter(path, records_per_chunk = 3) as writer:
+                for game_seed in range(1234567890, 1234567898):
+                    records.append(_play_recorded_game(game_seed, writer)[1])
+            deals = [(game, index) for game in records for index in range(len(game.deals))]
+
+            with CribbageRecordReader(path) as reader:
+                index = CribbageRecordIndex.build(reader)
+                index_path = path + '.idx'
+                index.save(index_path)
+                index = CribbageRecordIndex.load(index_path)
+
+                self.assertEqual(8, index.num_games())
+                self.assertEqual(len(deals), index.num_deals())
+                for number in (0, 2, 3, 7):
+                    self.assertEqual(records[number], index.read_game(reader, number))
+                for number in (0, len(deals) // 2, len(deals) - 1):
+                    (game, deal_index) = index.read_deal(reader, number)
+                    self.assertEqual(deals[number][0], game)
+                    self.assertEqual(deals[number][1], deal_index)
+                # A deal is found by decompressing its chunk once
+                calls = []
+                read_chunk_data = reader._read_chunk_data
+                reader._read_chunk_data = lambda offset: calls.append(offset) or read_chunk_data(offset)
+                index.read_deal(reader, len(deals) - 1)
+                self.assertEqual(1, len(calls))
+                del reader._read_chunk_data
+                with self.assertRaises(IndexError):
+                    index.read_game(reader, 8)
+                with self.assertRaises(IndexError):
+                    index.read_deal(reader, len(deals))
+
+                # Verify every game of the file
+                self.assertListEqual([], CribbageReplayer().verify_file(reader))
+
+            # An empty, truncated, or damaged index file is not an index
+            with open(index_path, 'rb') as f:
+                good = f.read()
+            for data in (b'', good[:10], good[:-1], b'NOTINDEX' + good[8:]):
+                with open(index_path, 'wb') as f:
+                    f.write(data)
+                self.assertRaises(CribbageRecordError, CribbageRecordIndex.load, index_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
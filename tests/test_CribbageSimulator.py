@@ -2,14 +2,22 @@
 import logging
 import unittest
 import io
+import os
+import queue
+import tempfile
+from random import seed
 from unittest.mock import patch
 
 # Local
 from HandsDecksCards.card import Card
 from HandsDecksCards.deck import StackedDeck
 from CribbageSim.CribbageSimulator import CribbageSimulator
+from CribbageSim.CribbageLogPipeline import CribbageRecordQueueHandler
+from CribbageSim.CribbageEventBus import get_event_bus, CribbageQueuePolicy
 from CribbageSim.CribbageGame import CribbageGame
+from CribbageSim.CribbageGameOutputEvents import CribbageGameOutputEvents
 from CribbageSim.CribbagePlayStrategy import InteractiveCribbagePlayStrategy
+from CribbageSim.CribbagePlayStrategy import HoyleishPlayerCribbagePlayStrategy, HoyleishDealerCribbagePlayStrategy
 
 class Test_CribbageSimulator(unittest.TestCase):
  
@@ -84,5 +92,80 @@ class Test_CribbageSimulator(unittest.TestCase):
         self.assertEqual(cm.output[2], 'DEBUG:cribbage_logger:Hand for CribbagePlayers.PLAYER_2 after deal: 10S 5C 10D 3C 8H KH')
 
 
+    def test_setup_logging_twice(self):
+
+        sim = CribbageSimulator()
+        q = queue.Queue()
+        sim.setup_logging(queue = q)
+        sim.setup_logging(queue = q)
+        logger = logging.getLogger('cribbage_logger')
+        # One output handler and one queue handler, not two of each
+        self.assertEqual(2, len(logger.handlers))
+        self.assertTrue(get_event_bus().start_game)
+        sim.shutdown_logging()
+        self.assertEqual(0, len(logger.handlers))
+        self.assertFalse(get_event_bus().start_game)
+
+    def test_setup_logging_queue_records(self):
+
+        sim = CribbageSimulator()
+        q = queue.Queue()
+        sim.setup_logging(queue = q)
+        seed(1234567890)
+        game = CribbageGame(player_strategy1 = HoyleishPlayerCribbagePlayStrategy(), player_strategy2 = HoyleishPlayerCribbagePlayStrategy(),
+                            dealer_strategy1 = HoyleishDealerCribbagePlayStrategy(), dealer_strategy2 = HoyleishDealerCribbagePlayStrategy())
+        with patch('sys.stdout', io.StringIO()):
+            game.play()
+        sim.shutdown_logging()
+        records = []
+        while not q.empty(): records.append(q.get_nowait())
+
+        # Each starter drawn is an event record, with the event's attributes and a readable message, and a separate text record
+        events = [r for r in records if hasattr(r, 'event_type')]
+        texts = [r for r in records if not hasattr(r, 'event_type')]
+        starters = [r for r in events if r.event_type == CribbageGameOutputEvents.UPDATE_STARTER]
+        self.assertLess(0, len(starters))
+        text_messages = [r.getMessage() for r in texts]
+        for r in starters:
+            self.assertEqual(f"Update starter: {r.starter}", r.getMessage())
+            self.assertIn(f"Starter card: {r.starter}", text_messages)
+        # No message is just the name of an event type
+        for r in records:
+            self.assertFalse(r.getMessage().startswith('CribbageGameOutputEvents.'))
+
+    def test_setup_logging_background(self):
+
+        sim = CribbageSimulator()
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, 'cribbage.log')
+            sim.setup_logging(background = True, log_file = path)
+            logger = logging.getLogger('cribbage_logger')
+            self.assertEqual(1, len(logger.handlers))
+            self.assertIsInstance(logger.handlers[0], CribbageRecordQueueHandler)
+            for i in range(1000):
+                logger.info(f"Message {i}")
+            # Shutting down waits for everything logged to be written
+            sim.shutdown_logging()
+            with open(path) as f:
+                lines = f.read().splitlines()
+        self.assertEqual(1000, len(lines))
+        self.assertEqual('Message 0', lines[0])
+        self.assertEqual('Message 999', lines[-1])
+
+
+    def test_setup_logging_coalescing(self):
+
+        sim = CribbageSimulator()
+        q = queue.Queue(maxsize = 10)
+        sim.setup_logging(queue = q, frame_interval = 60.0, queue_policy = CribbageQueuePolicy.DROP_OLDEST)
+        logger = logging.getLogger('cribbage_logger')
+        # The logger's messages are subject to the policy too, so the bounded queue never overflows
+        for i in range(20):
+            logger.info(f"Message {i}")
+        self.assertEqual(10, q.qsize())
+        self.assertEqual('Message 10', q.get_nowait().getMessage())
+        sim.shutdown_logging()
+
+
 if __name__ == '__main__':
     unittest.main()
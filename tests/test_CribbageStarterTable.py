@@ -0,0 +1,109 @@
+# Standard
+import unittest
+import random
+import os
+import tempfile
+
+# Third party
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Local
+from HandsDecksCards.card import Card
+from HandsDecksCards.hand import Hand
+from CribbageSim.CribbageCardCodec import code_to_card
+from CribbageSim.CribbageCombination import score_show
+from CribbageSim.CribbageStarterTable import CribbageStarterTable, build_starter_table, NO_SCORE
+from CribbageSim.CribbagePlayStrategy import HoyleishPlayerCribbagePlayStrategy
+from CribbageSim.exceptions import CribbageRecordError
+
+
+class Test_CribbageStarterTableFile(unittest.TestCase):
+
+    def test_not_a_table_file(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bad.bin')
+            for data in (b'', b'NOTSTART' + bytes(24), b'CRIBSTRT' + bytes(24)):
+                with open(path, 'wb') as f:
+                    f.write(data)
+                self.assertRaises(CribbageRecordError, CribbageStarterTable, path)
+
+# Building the table without numpy takes minutes, so these tests only run with numpy
+@unittest.skipIf(np is None, 'numpy is not installed')
+class Test_CribbageStarterTable(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls._dir = tempfile.TemporaryDirectory()
+        cls._path = os.path.join(cls._dir.name, 'starter_table.bin')
+        build_starter_table(cls._path)
+        cls._table = CribbageStarterTable(cls._path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._table.close()
+        cls._dir.cleanup()
+
+    def test_get_distribution(self):
+
+        # Three fives and the jack of diamonds. 29 with the five of diamonds.
+        hand = [Card('H','5'), Card('S','5'), Card('C','5'), Card('D','J')]
+        dist = self._table.get_distribution(hand)
+
+        exp_val = 1
+        act_val = dist.hand_histogram[29]
+        self.assertEqual(exp_val, act_val)
+
+        self.assertEqual(48, sum(dist.hand_histogram))
+        self.assertEqual(48, sum(dist.crib_histogram))
+
+    def test_starter_scores(self):
+
+        rng = random.Random(1234567898)
+        for i in range(100):
+            codes = rng.sample(range(52), 4)
+            cards = [code_to_card(c) for c in codes]
+            h = Hand()
+            h.add_cards(cards)
+            for is_crib in (False, True):
+                scores = self._table.get_starter_scores(cards, is_crib)
+                exp_val = [NO_SCORE if s in codes else score_show(h, code_to_card(s), is_crib) for s in range(52)]
+                self.assertListEqual(exp_val, list(scores))
+
+    def test_expected_score(self):
+
+        rng = random.Random(1234567899)
+        for i in range(100):
+            codes = rng.sample(range(52), 6)
+            cards = [code_to_card(c) for c in codes]
+            h = Hand()
+            h.add_cards(cards[0:4])
+            
+            exp_val = sum([score_show(h, code_to_card(s)) for s in range(52) if s not in codes]) / 46
+            act_val = self._table.expected_score(cards[0:4], excluded = cards[4:6])
+            self.assertAlmostEqual(exp_val, act_val)
+
+            exp_val = sum([score_show(h, code_to_card(s), True) for s in range(52) if s not in codes[0:4]]) / 48
+            act_val = self._table.expected_score(cards[0:4], is_crib = True)
+            self.assertAlmostEqual(exp_val, act_val, places = 5)
+
+    def test_strategy_uses_expected_score(self):
+
+        hand = Hand()
+        hand.add_cards([Card('H','5'), Card('S','6'), Card('C','7'), Card('D','J'), Card('D','2'), Card('S','K')])
+        strategy = HoyleishPlayerCribbagePlayStrategy(starter_table = self._table)
+        options = strategy.permute_and_score_dealt_hand(hand)
+
+        for option in options:
+            exp_val = self._table.expected_score(option.hand, excluded = option.crib)
+            self.assertAlmostEqual(exp_val, option.hand_score)
+            # The crib is scored on the same basis, with the starter
+            exp_val = strategy.expected_crib_score(option.crib, list(hand))
+            self.assertAlmostEqual(exp_val, option.crib_score)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# Standard
+import unittest
+import random
+from itertools import combinations, permutations
+
+# Local
+from HandsDecksCards.card import Card
+from HandsDecksCards.hand import Hand
+from HandsDecksCards.deck import Deck
+from CribbageSim.CribbageCardCodec import cards_to_codes, card_to_code
+from CribbageSim.CribbageCombination import score_show
+from CribbageSim.CribbageSuitCanonicalization import canonical_key, canonical_key_codes, key_to_codes, permute_card, invert_permutation
+
+class Test_CribbageSuitCanonicalization(unittest.TestCase):
+
+    def test_two_card_classes(self):
+
+        # 13 pairs, plus 78 suited and 78 offsuit combinations of two ranks
+        keys = set([canonical_key(cards)[0] for cards in combinations(Deck().create_deck(), 2)])
+        exp_val = 169
+        act_val = len(keys)
+        self.assertEqual(exp_val, act_val)
+
+    def test_suit_permutations_share_key(self):
+
+        rng = random.Random(1234567896)
+        for i in range(200):
+            cards = rng.sample(Deck().create_deck(), 5)
+            hand = cards[0:4]
+            starter = cards[4]
+            (key, perm) = canonical_key(hand, starter)
+            for p in permutations(range(4)):
+                permuted = [permute_card(c, p) for c in hand]
+                self.assertEqual(key, canonical_key(permuted, permute_card(starter, p))[0])
+
+    def test_canonical_key_codes(self):
+
+        rng = random.Random(1234567897)
+        for i in range(50):
+            cards = rng.sample(Deck().create_deck(), 5)
+            exp_val = canonical_key(cards[0:4], cards[4])
+            act_val = canonical_key_codes(cards_to_codes(cards[0:4]), card_to_code(cards[4]))
+            self.assertTupleEqual(exp_val, act_val)
+        self.assertTupleEqual(canonical_key(cards), canonical_key_codes(cards_to_codes(cards)))
+
+    def test_key_to_codes(self):
+
+        hand = [Card('D','5'), Card('H','5'), Card('H','J'), Card('C','K')]
+        starter = Card('D','6')
+        (key, perm) = canonical_key(hand, starter)
+        (codes, starter_code) = key_to_codes(key)
+
+        # The canonical cards are the hand cards mapped by the permutation
+        exp_val = sorted(cards_to_codes([permute_card(c, perm) for c in hand]))
+        self.assertListEqual(exp_val, codes)
+        self.assertEqual(card_to_code(permute_card(starter, perm)), starter_code)
+
+        # And the inverse permutation maps them back
+        inverse = invert_permutation(perm)
+        exp_val = [str(c) for c in hand]
+        act_val = [str(permute_card(permute_card(c, perm), inverse)) for c in hand]
+        self.assertListEqual(exp_val, act_val)
+
+    def test_starter_suit_distinguished(self):
+
+        # Same cards, but in one the starter makes a five card flush
+        (key_1, perm) = canonical_key([Card('S','2'), Card('S','4'), Card('S','6'), Card('S','8')], Card('S','K'))
+        (key_2, perm) = canonical_key([Card('S','2'), Card('S','4'), Card('S','6'), Card('S','8')], Card('H','K'))
+        self.assertNotEqual(key_1, key_2)
+
+    def test_equal_keys_score_the_same(self):
+
+        rng = random.Random(1234567897)
+        scores = {}
+        for i in range(2000):
+            cards = rng.sample(Deck().create_deck(), 5)
+            h = Hand()
+            h.add_cards(cards[0:4])
+            (key, perm) = canonical_key(cards[0:4], cards[4])
+            score = score_show(h, cards[4])
+            self.assertEqual(scores.setdefault(key, score), score)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+# Standard
+import os
+import logging
+import tempfile
+import unittest
+from random import seed
+
+# Local
+from CribbageSim.CribbageTrainingExport import CribbageShardWriter, CribbageDecisionExporter, read_shard, load_shard_array
+from CribbageSim.CribbageTrainingExport import ROW, ROW_FIELDS, KIND_FORM_CRIB, KIND_FOLLOW, KIND_GO, NO_CARD
+from CribbageSim.CribbageTrainingExport import RESULT_WON, RESULT_LOST, RESULT_UNKNOWN
+from CribbageSim.CribbageGameRecord import ROLE_PLAYER, ROLE_DEALER
+from CribbageSim.CribbageDeal import CribbagePlayers
+from CribbageSim.CribbageGame import CribbageGame
+from CribbageSim.CribbagePlayStrategy import HoyleishPlayerCribbagePlayStrategy, HoyleishDealerCribbagePlayStrategy
+from CribbageSim.exceptions import CribbageRecordError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Index of each field in a row read with read_shard(...)
+_FIELD = {name: index for (index, name) in enumerate(ROW_FIELDS)}
+
+
+def _play_exported_game(game_seed = 1234567890, exporter = None):
+    seed(game_seed)
+    game = CribbageGame(player_strategy1 = HoyleishPlayerCribbagePlayStrategy(), player_strategy2 = HoyleishPlayerCribbagePlayStrategy(),
+                        dealer_strategy1 = HoyleishDealerCribbagePlayStrategy(), dealer_strategy2 = HoyleishDealerCribbagePlayStrategy(),
+                        headless = True, record = True, decision_exporter = exporter)
+    info = game.play()
+    return (game, info)
+
+
+class Test_CribbageTrainingExport(unittest.TestCase):
+
+    def test_row_size(self):
+        self.assertEqual(32, ROW.size)
+        self.assertEqual(15, len(ROW_FIELDS))
+
+    def test_shard_rotation(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            # Room for the 16 byte header and 3 rows
+            with CribbageShardWriter(directory, max_shard_bytes = 16 + 3 * ROW.size + 10, buffer_bytes = 2 * ROW.size) as writer:
+                for i in range(8):
+                    writer.write_rows(bytes([i]) * ROW.size)
+            paths = writer.get_paths()
+            self.assertEqual(3, len(paths))
+            self.assertEqual(os.path.join(directory, 'decisions-00000.crows'), paths[0])
+            self.assertListEqual([16 + 3 * ROW.size, 16 + 3 * ROW.size, 16 + 2 * ROW.size], [os.path.getsize(p) for p in paths])
+            rows = [row for path in paths for row in read_shard(path)]
+            self.assertListEqual(list(range(8)), [row[_FIELD['kind']] for row in rows])
+
+            # A new writer numbers its shards after those already written
+            with CribbageShardWriter(directory) as writer:
+                writer.write_rows(bytes(ROW.size))
+            self.assertListEqual([os.path.join(directory, 'decisions-00003.crows')], writer.get_paths())
+
+    def test_buffered_until_flush(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            writer = CribbageShardWriter(directory, buffer_bytes = 4 * ROW.size)
+            writer.write_rows(bytes(ROW.size))
+            self.assertListEqual([], writer.get_paths())
+            writer.write_rows(bytes(3 * ROW.size))
+            self.assertEqual(1, len(writer.get_paths()))
+            writer.write_rows(bytes(ROW.size))
+            writer.close()
+            self.assertEqual(5, len(read_shard(writer.get_paths()[0])))
+
+    def test_exporter_outcomes(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            exporter = CribbageDecisionExporter(CribbageShardWriter(directory))
+            exporter.begin_game(lambda: (10, 20))
+            exporter.begin_deal()
+            exporter.add_decision(KIND_FORM_CRIB, ROLE_PLAYER, CribbagePlayers.PLAYER_2.value, 0, NO_CARD, (1, 2, 3, 4, 5, 6), (), (1, 2))
+            exporter.add_decision(KIND_FOLLOW, ROLE_DEALER, CribbagePlayers.PLAYER_1.value, 5, 40, (7, 8), (3,), (7,))
+            exporter.end_deal(4, 9)
+            # Ending it again does nothing
+            exporter.end_deal(100, 100)
+            exporter.begin_deal()
+            exporter.add_decision(KIND_GO, ROLE_PLAYER, CribbagePlayers.PLAYER_1.value, 29, 40, (11,), (3, 7), ())
+            exporter.end_deal(2, 0)
+            exporter.end_game(CribbagePlayers.PLAYER_1.value)
+            exporter.close()
+            self.assertEqual(3, exporter.get_num_rows())
+            rows = read_shard(os.path.join(directory, 'decisions-00000.crows'))
+
+        self.assertTupleEqual((KIND_FORM_CRIB, ROLE_PLAYER, 2, 0, 0, NO_CARD, bytes([1, 2, 3, 4, 5, 6]), bytes([NO_CARD] * 8), 20, 10,
+                               2, bytes([1, 2, NO_CARD, NO_CARD]), 4, 9, RESULT_LOST), rows[0])
+        self.assertTupleEqual((KIND_FOLLOW, ROLE_DEALER, 1, 0, 5, 40, bytes([7, 8] + [NO_CARD] * 4), bytes([3] + [NO_CARD] * 7), 10, 20,
+                               1, bytes([7, NO_CARD, NO_CARD, NO_CARD]), 9, 4, RESULT_WON), rows[1])
+        self.assertTupleEqual((KIND_GO, ROLE_PLAYER, 1, 1, 29, 40, bytes([11] + [NO_CARD] * 5), bytes([3, 7] + [NO_CARD] * 6), 10, 20,
+                               0, bytes([NO_CARD] * 4), 2, 0, RESULT_WON), rows[2])
+
+    def test_unfinished_game(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            exporter = CribbageDecisionExporter(CribbageShardWriter(directory))
+            exporter.begin_game(lambda: (0, 0))
+            exporter.begin_deal()
+            exporter.add_decision(KIND_FORM_CRIB, ROLE_PLAYER, 1, 0, NO_CARD, (1, 2, 3, 4, 5, 6), (), (1, 2))
+            exporter.close()
+            rows = read_shard(os.path.join(directory, 'decisions-00000.crows'))
+        self.assertEqual(1, len(rows))
+        self.assertEqual(RESULT_UNKNOWN, rows[0][_FIELD['result']])
+
+    def test_exported_game(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            writer = CribbageShardWriter(directory)
+            exporter = CribbageDecisionExporter(writer)
+            (game, info) = _play_exported_game(1234567890, exporter)
+            exporter.close()
+            rows = [row for path in writer.get_paths() for row in read_shard(path)]
+
+        self.assertEqual(len(rows), exporter.get_num_rows())
+        record = game.get_game_record()
+        num_deals = len(record.deals)
+        self.assertEqual(info.deals_in_game, num_deals)
+        # Every deal has a form_crib decision by each role, made before the starter is drawn
+        crib_rows = [row for row in rows if row[_FIELD['kind']] == KIND_FORM_CRIB]
+        self.assertEqual(2 * num_deals, len(crib_rows))
+        for row in crib_rows:
+            self.assertEqual(NO_CARD, row[_FIELD['starter']])
+            self.assertEqual(2, row[_FIELD['num_action']])
+            self.assertTrue(set(row[_FIELD['action']][:2]) <= set(row[_FIELD['hand']]))
+        # The rows of each deal have its starter, and the points each role pegged in it
+        for (deal_index, deal) in enumerate(record.deals):
+            deal_rows = [row for row in rows if row[_FIELD['deal_index']] == deal_index]
+            (player_points, dealer_points) = deal.get_scores()
+            for row in deal_rows:
+                if row[_FIELD['kind']] != KIND_FORM_CRIB: self.assertEqual(deal.starter, row[_FIELD['starter']])
+                if row[_FIELD['role']] == ROLE_PLAYER:
+                    expected = (min(player_points, 255), min(dealer_points, 255))
+                else:
+                    expected = (min(dealer_points, 255), min(player_points, 255))
+                # Pegged points past the end of the game are in the record, but not on the board
+                if deal_index < num_deals - 1:
+                    self.assertTupleEqual(expected, (row[_FIELD['own_deal_points']], row[_FIELD['opponent_deal_points']]))
+        # The winner's decisions are won, and the loser's lost
+        if info.winning_player == game._player1:
+            winner = CribbagePlayers.PLAYER_1.value
+        else:
+            winner = CribbagePlayers.PLAYER_2.value
+        for row in rows:
+            self.assertEqual(RESULT_WON if row[_FIELD['participant']] == winner else RESULT_LOST, row[_FIELD['result']])
+        # A card played when following is in the hand, and a declared go plays nothing
+        for row in rows:
+            if row[_FIELD['kind']] == KIND_FOLLOW and row[_FIELD['num_action']] == 1:
+                self.assertIn(row[_FIELD['action']][0], row[_FIELD['hand']])
+                self.assertLessEqual(row[_FIELD['count']], 30)
+
+    def test_shard_logged(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertLogs('cribbage_logger.crib_follow_go_logger', level = logging.INFO) as cm:
+                with CribbageShardWriter(directory) as writer:
+                    writer.write_rows(bytes(2 * ROW.size))
+            self.assertIn(f"Wrote 2 decision rows to {writer.get_paths()[0]}", cm.output[0])
+
+    def test_not_a_shard_file(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bad.crows')
+            with open(path, 'wb') as f:
+                f.write(b'NOTROWS!' + bytes(40))
+            self.assertRaises(CribbageRecordError, read_shard, path)
+            with open(path, 'wb') as f:
+                f.write(b'CRIB')
+            self.assertRaises(CribbageRecordError, read_shard, path)
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_load_shard_array(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            writer = CribbageShardWriter(directory)
+            exporter = CribbageDecisionExporter(writer)
+            _play_exported_game(1234567891, exporter)
+            exporter.close()
+            path = writer.get_paths()[0]
+            rows = read_shard(path)
+            array = load_shard_array(path)
+        self.assertEqual(len(rows), len(array))
+        for name in ('kind', 'role', 'participant', 'count', 'starter', 'result'):
+            self.assertListEqual([row[_FIELD[name]] for row in rows], array[name].tolist())
+        self.assertListEqual(list(rows[5][_FIELD['hand']]), array['hand'][5].tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
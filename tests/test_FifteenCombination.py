@@ -3,8 +3,8 @@ import unittest
 
 # Local
 from HandsDecksCards.card import Card
-from HandsDecksCards. import Hand
-from CribbageCombination import FifteenCombination
+from HandsDecksCards.hand import Hand
+from CribbageSim.CribbageCombination import FifteenCombination
 
 class Test_FifteenCombination(unittest.TestCase):
     
@@ -80,6 +80,36 @@ class Test_FifteenCombination(unittest.TestCase):
         act_val = str(info)
         self.assertEqual(exp_val, act_val)        
 
+    def test_count(self):
+        
+        h = Hand()
+        h.add_cards([Card('S','5'), Card('C','5'), Card('H','5'), Card('D','J')])
+        s = Card('D','5')
+        fc = FifteenCombination()
+
+        # 4 of J+5, 4 of 5+5+5
+        exp_val = 8
+        act_val = fc.count(h, s)
+        self.assertEqual(exp_val, act_val)
+
+    def test_score_pile_of_six(self):
+        
+        pile = Hand()
+        pile.add_cards([Card('S','A'), Card('C','2'), Card('H','3'), Card('D','4'), Card('S','5'), Card('C','K')])
+        fc = FifteenCombination()
+        info = fc.score(pile)
+
+        exp_val = 'fifteen: 4 for 8: 5S KC , AS 4D KC , 2C 3H KC , AS 2C 3H 4D 5S'
+        act_val = str(info)
+        self.assertEqual(exp_val, act_val)
+
+        # Now six cards plus a starter, which is more cards than can be enumerated with CribbageCombinationShowing.permutations(...)
+        info = fc.score(pile, Card('D','5'))
+
+        exp_val = 8
+        act_val = info.number_instances
+        self.assertEqual(exp_val, act_val)
+
 
 
 if __name__ == '__main__':
@@ -45,5 +45,16 @@ class Test_HisNobsCombination(unittest.TestCase):
         self.assertEqual(exp_val, act_val) 
 
 
+    def test_score_no_starter(self):
+
+        h = Hand()
+        h.add_cards([Card('S','2'), Card('D','6'), Card('H','J'), Card('S','K')])
+        hnc = HisNobsCombination()
+
+        self.assertEqual(0, hnc.score_only(h))
+        self.assertEqual(0, hnc.score_only(h, None))
+        self.assertEqual('', str(hnc.score(h, None)))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
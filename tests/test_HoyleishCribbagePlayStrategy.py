@@ -64,6 +64,35 @@ class Test_HoyleishCribbagePlayStrategy(unittest.TestCase):
         act_val = hcp.guaranteed_crib_score(h)
         self.assertEqual(exp_val, act_val)
 
+    def test_expected_crib_score(self):
+
+        import random
+        from CribbageSim.CribbageCardCodec import code_to_card, card_to_code
+        from CribbageSim.CribbageCombination import PairCombination, FifteenCombination, RunCombination
+        from CribbageSim.CribbageCombination import score_show_combinations
+        
+        hcp = HoyleishCribbagePlayStrategy()
+        combos = [PairCombination(), FifteenCombination(), RunCombination()]
+        
+        # Compare with scoring the 2 crib cards with each starter not in the dealt hand, including hands with jacks, pairs, and runs
+        rng = random.Random(1234567899)
+        dealts = [[code_to_card(c) for c in rng.sample(range(52), 6)] for i in range(200)]
+        dealts.append([Card('H','J'), Card('S','5'), Card('C','7'), Card('D','2'), Card('H','2'), Card('S','K')])
+        dealts.append([Card('C','9'), Card('S','10'), Card('C','7'), Card('D','8'), Card('H','9'), Card('S','A')])
+        for dealt in dealts:
+            crib = dealt[0:2]
+            h = Hand()
+            h.add_cards(crib)
+            dealt_codes = [card_to_code(c) for c in dealt]
+            codes = [c for c in range(52) if c not in dealt_codes]
+            exp_val = sum([score_show_combinations(combos, h, code_to_card(c)) for c in codes])
+            # His nobs, for a jack in the crib with a starter of its suit
+            jacks = [card_to_code(j) for j in crib if card_to_code(j) // 4 == 10]
+            exp_val += sum([1 for j in jacks for c in codes if c % 4 == j % 4])
+            exp_val /= 46
+            act_val = hcp.expected_crib_score(crib, dealt)
+            self.assertAlmostEqual(exp_val, act_val)
+
     def test_permute_and_score_dealt_hand(self):
 
         hcp = HoyleishCribbagePlayStrategy()
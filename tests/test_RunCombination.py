@@ -1,9 +1,12 @@
 # Standard
 import unittest
+import random
+from itertools import combinations
 
 # Local
 from HandsDecksCards.card import Card
 from HandsDecksCards.hand import Hand
+from HandsDecksCards.deck import Deck
 from CribbageSim.CribbageCombination import RunCombination
 
 class Test_RunCombination(unittest.TestCase):
@@ -56,6 +59,55 @@ class Test_RunCombination(unittest.TestCase):
         act_val = str(info)
         self.assertEqual(exp_val, act_val)        
 
+    def test_score_triple_run(self):
+        
+        h = Hand()
+        h.add_cards([Card('S','4'), Card('C','4'), Card('H','5'), Card('D','4')])
+        s = Card('S','3')
+        rc = RunCombination()
+        info = rc.score(h, s)
+
+        exp_val = 'run: 3 for 9: 3S 4S 5H , 3S 4C 5H , 3S 4D 5H'
+        act_val = str(info)
+        self.assertEqual(exp_val, act_val)
+
+    def test_score_pile_of_six_with_two_runs(self):
+        
+        pile = Hand()
+        pile.add_cards([Card('S','A'), Card('C','9'), Card('H','2'), Card('D','8'), Card('S','3'), Card('C','7')])
+        rc = RunCombination()
+        info = rc.score(pile)
+
+        exp_val = 'run: 2 for 6: AS 2H 3S , 7C 8D 9C'
+        act_val = str(info)
+        self.assertEqual(exp_val, act_val)
+
+    def test_score_matches_combination_search(self):
+
+        def search_runs(cards):
+            # Reference: the "greedy" search through 5, 4, and 3 card combinations that RunCombination.score(...) used to do
+            for size in range(5,2,-1):
+                runs = []
+                for p in combinations(cards, size):
+                    p = sorted(p)
+                    if all(p[i]._get_sequence_count() == p[0]._get_sequence_count() + i for i in range(size)):
+                        runs.append(p)
+                if len(runs) > 0: return (size, runs)
+            return (0, [])
+
+        rc = RunCombination()
+        rng = random.Random(1234567890)
+        for i in range(500):
+            cards = rng.sample(Deck().create_deck(), rng.choice([5, 6]))
+            h = Hand()
+            h.add_cards(cards)
+            info = rc.score(h)
+            (size, runs) = search_runs(cards)
+
+            self.assertEqual(len(runs), info.number_instances)
+            self.assertEqual(size * len(runs), info.score)
+            self.assertEqual(runs, info.instance_list)
+
 
 
 if __name__ == '__main__':